@@ -221,6 +221,16 @@ class CLI:
                 ' If not specified, cartography by default will run all AWS sync modules available.'
             ),
         )
+        parser.add_argument(
+            '--aws-s3-cache-dir',
+            type=str,
+            default=None,
+            help=(
+                'Directory in which to keep a local cache of the regions of S3 buckets, keyed by each bucket\'s '
+                'creation date. Buckets that have not been recreated since the previous sync reuse the cached region '
+                'instead of looking it up again. Optional; caching is disabled if omitted.'
+            ),
+        )
         parser.add_argument(
             '--analysis-job-directory',
             type=str,
@@ -270,6 +280,28 @@ class CLI:
                 'Required if you are using the GitHub intel module. Ignored otherwise.'
             ),
         )
+        parser.add_argument(
+            '--github-cache-dir',
+            type=str,
+            default=None,
+            help=(
+                'Directory in which to keep a local cache of GitHub repo collaborators, keyed by each repo\'s '
+                'updatedAt and pushedAt timestamps. Repos that have not changed since the previous sync reuse the '
+                'cached data instead of querying the GitHub API again. Changes to the permission of a collaborator '
+                'do not change these timestamps, so they are only picked up when the cached entry is refreshed; see '
+                '--github-cache-max-age. Optional; caching is disabled if omitted.'
+            ),
+        )
+        parser.add_argument(
+            '--github-cache-max-age',
+            type=float,
+            default=None,
+            help=(
+                'The age in hours after which the cached collaborators of a GitHub repo are fetched again even if the '
+                'repo did not change. Collaborator permission changes are only picked up on such a refresh. Only '
+                'used with --github-cache-dir. Default = 24.'
+            ),
+        )
         parser.add_argument(
             '--digitalocean-token-env-var',
             type=str,
@@ -395,6 +427,35 @@ class CLI:
                 'The port of your statsd server. Only used if --statsd-enabled is on. Default = UDP 8125.'
             ),
         )
+        parser.add_argument(
+            '--profile-output-dir',
+            type=str,
+            default=None,
+            help=(
+                'If set, profiles the sync and writes a report of the wall time, API calls, Neo4j transactions, rows '
+                'written and peak memory of every sync stage, AWS resource function and job statement to this '
+                'directory, as profile.json, profile.html and profile.folded (a flame graph input).'
+            ),
+        )
+        parser.add_argument(
+            '--neo4j-slow-query-log-size',
+            type=int,
+            default=None,
+            help=(
+                'If set, times every Neo4j query run during the sync, sends the total query time and update counters '
+                'to statsd, and logs this number of slowest queries, with their timings and update counters, at the '
+                'end of the sync. Off by default.'
+            ),
+        )
+        parser.add_argument(
+            '--neo4j-change-detection',
+            action='store_true',
+            help=(
+                'Store a hash of the properties of each node loaded through a node schema, and only write the '
+                'properties of the nodes whose hash changed since the last sync. Unchanged nodes only have their '
+                'lastupdated field set.'
+            ),
+        )
         parser.add_argument(
             '--pagerduty-api-key-env-var',
             type=str,
@@ -707,6 +768,9 @@ class CLI:
                 f'Metrics have prefix "{config.statsd_prefix}".',
             )
 
+        if config.profile_output_dir:
+            logger.debug(f'Profiling enabled. Writing the sync profile to {config.profile_output_dir}.')
+
         # Pagerduty config
         if config.pagerduty_api_key_env_var:
             logger.debug(f"Reading API key for PagerDuty from environment variable {config.pagerduty_api_key_env_var}")
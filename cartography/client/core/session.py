@@ -0,0 +1,371 @@
+"""
+Query-level instrumentation of Neo4j sessions.
+
+When the slow-query log is turned on (see `--neo4j-slow-query-log-size`), `InstrumentedSession` wraps the
+neo4j.Session handed to the sync stages. Every query run through it, whether with `session.run()` or inside a
+`read_transaction()`/`write_transaction()` function, is timed until its result has been read to the end, and its
+ResultSummary counters and server timings are recorded in a `QueryLog` under the fingerprint of the query text. The
+QueryLog sends the total query time and update counters to statsd and keeps the slowest executions in a slow-query log.
+"""
+import hashlib
+import heapq
+import itertools
+import logging
+import re
+import threading
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import neo4j
+
+from cartography.stats import get_stats_client
+
+logger = logging.getLogger(__name__)
+stat_handler = get_stats_client('neo4j.query')
+
+DEFAULT_SLOW_QUERY_LOG_SIZE = 10
+
+# The ResultSummary counters recorded for every query.
+QUERY_COUNTERS = (
+    'nodes_created',
+    'nodes_deleted',
+    'relationships_created',
+    'relationships_deleted',
+    'properties_set',
+    'labels_added',
+    'labels_removed',
+)
+
+_COMMENT_RE = re.compile(r'//[^\n]*')
+_STRING_LITERAL_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_query(query: str) -> str:
+    """
+    Return the query with comments removed, literals replaced by `?` and whitespace collapsed, so that queries that
+    only differ in formatting or in inlined values normalize to the same text.
+    """
+    query = _COMMENT_RE.sub(' ', query)
+    query = _STRING_LITERAL_RE.sub('?', query)
+    query = _NUMBER_LITERAL_RE.sub('?', query)
+    return _WHITESPACE_RE.sub(' ', query).strip()
+
+
+def _fingerprint_normalized(normalized_query: str) -> str:
+    return hashlib.sha1(normalized_query.encode('utf-8')).hexdigest()[:12]
+
+
+def fingerprint_query(query: str) -> str:
+    """
+    Return a short, stable identifier of the normalized query text, usable as a statsd metric name component.
+    """
+    return _fingerprint_normalized(normalize_query(query))
+
+
+@dataclass
+class QueryStats:
+    """
+    The numbers recorded for all executions of one query fingerprint.
+    """
+    fingerprint: str
+    query: str
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    server_seconds: float = 0.0
+    counters: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class SlowQuery:
+    """
+    One execution of a query, as kept in the slow-query log.
+    """
+    fingerprint: str
+    query: str
+    seconds: float
+    server_seconds: float
+    counters: Dict[str, int]
+
+
+def _summary_counters(summary: neo4j.ResultSummary) -> Dict[str, int]:
+    return {name: getattr(summary.counters, name) for name in QUERY_COUNTERS}
+
+
+def _server_seconds(summary: neo4j.ResultSummary) -> float:
+    # Both timings are in milliseconds and are None if the server did not report them.
+    return ((summary.result_available_after or 0) + (summary.result_consumed_after or 0)) / 1000
+
+
+class QueryLog:
+    """
+    Aggregates the executions of the queries run through InstrumentedSessions, by query fingerprint, and keeps the
+    `slow_query_log_size` slowest executions.
+    """
+
+    def __init__(self, slow_query_log_size: int = DEFAULT_SLOW_QUERY_LOG_SIZE):
+        self.slow_query_log_size = slow_query_log_size
+        self._lock = threading.Lock()
+        self._stats: Dict[str, QueryStats] = {}
+        # Min-heap of (seconds, insertion order, SlowQuery) so that the fastest of the slow queries is evicted first.
+        self._slow_queries: List[Tuple[float, int, SlowQuery]] = []
+        self._sequence = itertools.count()
+
+    def record(
+        self, query: str, seconds: float, summary: Optional[neo4j.ResultSummary], failed: bool = False,
+    ) -> None:
+        """
+        Record one execution of the given query.
+        :param query: The query text
+        :param seconds: The wall time of the execution, including the time to fetch all of its records
+        :param summary: The ResultSummary of the execution, or None if it failed or was not read to the end
+        :param failed: Whether the execution failed
+        """
+        normalized = normalize_query(query)
+        fingerprint = _fingerprint_normalized(normalized)
+        counters = _summary_counters(summary) if summary is not None else {}
+        server_seconds = _server_seconds(summary) if summary is not None else 0.0
+
+        with self._lock:
+            stats = self._stats.get(fingerprint)
+            if stats is None:
+                stats = self._stats[fingerprint] = QueryStats(fingerprint, normalized)
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.server_seconds += server_seconds
+            for name, value in counters.items():
+                stats.counters[name] = stats.counters.get(name, 0) + value
+
+            if self.slow_query_log_size > 0:
+                slow_query = SlowQuery(fingerprint, normalized, seconds, server_seconds, counters)
+                entry = (seconds, next(self._sequence), slow_query)
+                if len(self._slow_queries) < self.slow_query_log_size:
+                    heapq.heappush(self._slow_queries, entry)
+                elif seconds > self._slow_queries[0][0]:
+                    heapq.heapreplace(self._slow_queries, entry)
+
+        # Only totals are sent: metrics named after query fingerprints would have an unbounded cardinality.
+        stat_handler.timing('duration', seconds * 1000)
+        for name, value in counters.items():
+            if value:
+                stat_handler.incr(name, value)
+        if failed:
+            stat_handler.incr('errors')
+
+    def get_stats(self) -> List[QueryStats]:
+        """
+        Return the stats of every query fingerprint, by decreasing total time.
+        """
+        with self._lock:
+            stats = [QueryStats(**asdict(s)) for s in self._stats.values()]
+        return sorted(stats, key=lambda s: s.total_seconds, reverse=True)
+
+    def get_slow_queries(self) -> List[SlowQuery]:
+        """
+        Return the slowest executions recorded, slowest first.
+        """
+        with self._lock:
+            return [entry[2] for entry in sorted(self._slow_queries, reverse=True)]
+
+    def log_slow_queries(self) -> None:
+        slow_queries = self.get_slow_queries()
+        if not slow_queries:
+            return
+        logger.info(f"The {len(slow_queries)} slowest Neo4j queries of the sync:")
+        for slow_query in slow_queries:
+            logger.info(
+                f"{slow_query.seconds:.3f}s (server {slow_query.server_seconds:.3f}s) [{slow_query.fingerprint}] "
+                f"{slow_query.counters} {slow_query.query[:500]}",
+            )
+
+
+class _InstrumentedResult:
+    """
+    A proxy for a neo4j.Result that records its query in the QueryLog once the result has been read to the end or
+    consumed, so that the recorded time includes fetching all of its records. The records are streamed to the caller
+    as they arrive, and the parts of the neo4j.Result API that are not wrapped here are passed through.
+    """
+
+    def __init__(self, result: neo4j.Result, query_log: QueryLog, query_text: str, start: float):
+        self._result = result
+        self._query_log = query_log
+        self._query_text = query_text
+        self._start = start
+        self._recorded = False
+
+    def _record(self, summary: Optional[neo4j.ResultSummary], failed: bool = False) -> None:
+        if not self._recorded:
+            self._recorded = True
+            self._query_log.record(self._query_text, time.perf_counter() - self._start, summary, failed=failed)
+
+    def _finish(self) -> None:
+        try:
+            summary = self._result.consume()
+        except Exception:
+            self._record(None, failed=True)
+            raise
+        self._record(summary)
+
+    def abandon(self) -> None:
+        """
+        Record the query of a result that the caller stopped reading, with the time elapsed so far and without its
+        update counters. The driver discards or buffers such a result when the next query of the session is run.
+        """
+        self._record(None)
+
+    def __iter__(self) -> Iterator[neo4j.Record]:
+        try:
+            for record in self._result:
+                yield record
+        except Exception:
+            self._record(None, failed=True)
+            raise
+        self._finish()
+
+    def consume(self) -> neo4j.ResultSummary:
+        try:
+            summary = self._result.consume()
+        except Exception:
+            self._record(None, failed=True)
+            raise
+        self._record(summary)
+        return summary
+
+    def _read_all(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        # These methods read the result to the end, so the query is recorded right after them.
+        try:
+            value = getattr(self._result, method)(*args, **kwargs)
+        except Exception:
+            self._record(None, failed=True)
+            raise
+        self._finish()
+        return value
+
+    def single(self, *args: Any, **kwargs: Any) -> Optional[neo4j.Record]:
+        return self._read_all('single', *args, **kwargs)
+
+    def data(self, *keys: Any) -> List[Dict[str, Any]]:
+        return self._read_all('data', *keys)
+
+    def value(self, *args: Any, **kwargs: Any) -> List[Any]:
+        return self._read_all('value', *args, **kwargs)
+
+    def values(self, *keys: Any) -> List[List[Any]]:
+        return self._read_all('values', *keys)
+
+    def graph(self) -> Any:
+        return self._read_all('graph')
+
+    def to_df(self, *args: Any, **kwargs: Any) -> Any:
+        return self._read_all('to_df', *args, **kwargs)
+
+    def to_eager_result(self) -> Any:
+        return self._read_all('to_eager_result')
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._result, name)
+
+
+def _run_instrumented(
+    run: Callable[..., neo4j.Result],
+    query_log: QueryLog,
+    query: Any,
+    parameters: Optional[Dict[str, Any]],
+    kwargs: Dict[str, Any],
+) -> _InstrumentedResult:
+    query_text = str(getattr(query, 'text', query))
+    start = time.perf_counter()
+    try:
+        result = run(query, parameters, **kwargs)
+        instrumented = _InstrumentedResult(result, query_log, query_text, start)
+        # A query that returns no columns has no records to stream, e.g. most ingestion queries, and is often never
+        # read by its caller. Consume it now so that it is recorded with its update counters.
+        if not result.keys():
+            instrumented.consume()
+    except Exception:
+        query_log.record(query_text, time.perf_counter() - start, None, failed=True)
+        raise
+    return instrumented
+
+
+class _InstrumentedTransaction:
+    def __init__(self, tx: neo4j.Transaction, query_log: QueryLog):
+        self._tx = tx
+        self._query_log = query_log
+        self.results: List[_InstrumentedResult] = []
+
+    def run(self, query: Any, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any) -> _InstrumentedResult:
+        result = _run_instrumented(self._tx.run, self._query_log, query, parameters, kwargs)
+        self.results.append(result)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._tx, name)
+
+
+class InstrumentedSession:
+    """
+    A proxy for a neo4j.Session that records every query run through it in the given QueryLog.
+    """
+
+    def __init__(self, session: neo4j.Session, query_log: QueryLog):
+        self._session = session
+        self._query_log = query_log
+        self._last_result: Optional[_InstrumentedResult] = None
+
+    @property
+    def query_log(self) -> QueryLog:
+        return self._query_log
+
+    def _abandon_last_result(self) -> None:
+        if self._last_result is not None:
+            self._last_result.abandon()
+            self._last_result = None
+
+    def run(self, query: Any, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any) -> _InstrumentedResult:
+        self._abandon_last_result()
+        self._last_result = _run_instrumented(self._session.run, self._query_log, query, parameters, kwargs)
+        return self._last_result
+
+    def _wrap_transaction_function(self, transaction_function: Callable[..., Any]) -> Callable[..., Any]:
+        self._abandon_last_result()
+
+        def instrumented_transaction_function(tx: neo4j.Transaction, *args: Any, **kwargs: Any) -> Any:
+            instrumented_tx = _InstrumentedTransaction(tx, self._query_log)
+            try:
+                return transaction_function(instrumented_tx, *args, **kwargs)
+            finally:
+                for result in instrumented_tx.results:
+                    result.abandon()
+        return instrumented_transaction_function
+
+    def read_transaction(self, transaction_function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return self._session.read_transaction(self._wrap_transaction_function(transaction_function), *args, **kwargs)
+
+    def write_transaction(self, transaction_function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return self._session.write_transaction(self._wrap_transaction_function(transaction_function), *args, **kwargs)
+
+    def execute_read(self, transaction_function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return self._session.execute_read(self._wrap_transaction_function(transaction_function), *args, **kwargs)
+
+    def execute_write(self, transaction_function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return self._session.execute_write(self._wrap_transaction_function(transaction_function), *args, **kwargs)
+
+    def close(self) -> None:
+        self._abandon_last_result()
+        self._session.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
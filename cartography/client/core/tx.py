@@ -1,3 +1,6 @@
+import hashlib
+import json
+from dataclasses import asdict
 from typing import Any
 from typing import Dict
 from typing import List
@@ -9,9 +12,15 @@ import neo4j
 
 from cartography.graph.querybuilder import build_create_index_queries
 from cartography.graph.querybuilder import build_ingestion_query
+from cartography.graph.querybuilder import PROPERTIES_HASH_FIELD
 from cartography.models.core.nodes import CartographyNodeSchema
+from cartography.profiler import record_neo4j_transaction
 from cartography.util import batch
 
+# If True, `load()` only writes the properties of nodes whose properties changed since they were last loaded. See
+# `enable_change_detection()`.
+_change_detection_enabled = False
+
 
 def read_list_of_values_tx(tx: neo4j.Transaction, query: str, **kwargs) -> List[Union[str, int]]:
     """
@@ -213,6 +222,7 @@ def load_graph_data(
             DictList=data_batch,
             **kwargs,
         )
+        record_neo4j_transaction(len(data_batch))
 
 
 def ensure_indexes(neo4j_session: neo4j.Session, node_schema: CartographyNodeSchema) -> None:
@@ -234,6 +244,53 @@ def ensure_indexes(neo4j_session: neo4j.Session, node_schema: CartographyNodeSch
         neo4j_session.run(query)
 
 
+def enable_change_detection(enabled: bool = True) -> None:
+    """
+    Turn change detection on or off for all the nodes loaded with `load()`. When it is on, a hash of the properties of
+    each node is computed before loading and stored on the node, and the properties of the node are only written when
+    the hash differs from the stored one. Unchanged nodes only have their `lastupdated` field set, which saves the
+    writes of their properties to the transaction log.
+    :param enabled: Whether change detection is on
+    :return: None
+    """
+    global _change_detection_enabled
+    _change_detection_enabled = enabled
+
+
+def _get_property_value(data: Dict[str, Any], name: str) -> Any:
+    """
+    Return the value that the ingestion query reads for a PropertyRef name. Dotted names such as `category.name` walk
+    nested dicts in the same way as the Cypher map access `item.category.name`.
+    """
+    value: Any = data
+    for key in name.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def get_node_properties_hash(node_schema: CartographyNodeSchema, item: Dict[str, Any], **kwargs) -> str:
+    """
+    Return a stable hash of the node properties that `load()` would write for the given data dict. `lastupdated` is
+    left out since it changes on every sync, and the node labels are included so that adding a label to a schema
+    updates the existing nodes.
+    :param node_schema: The CartographyNodeSchema of the node
+    :param item: The data dict of the node
+    :param kwargs: The keyword args supplied to the Neo4j query
+    :return: The hex digest of the hash
+    """
+    properties = {
+        name: _get_property_value(kwargs if ref.set_in_kwargs else item, ref.name)
+        for name, ref in asdict(node_schema.properties).items()
+        if name != 'lastupdated'
+    }
+    extra_labels = node_schema.extra_node_labels.labels if node_schema.extra_node_labels else []
+    labels = [node_schema.label] + sorted(extra_labels)
+    serialized = json.dumps([properties, labels], sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
 def load(
         neo4j_session: neo4j.Session,
         node_schema: CartographyNodeSchema,
@@ -243,6 +300,8 @@ def load(
     """
     Main entrypoint for intel modules to write data to the graph. Ensures that indexes exist for the datatypes loaded
     to the graph and then performs the load operation.
+    If change detection is on (see `enable_change_detection()`), only the properties of the nodes that changed since
+    they were last loaded are written.
     :param neo4j_session: The Neo4j session
     :param node_schema: The CartographyNodeSchema object to create indexes for and generate a query.
     :param dict_list: The data to load to the graph represented as a list of dicts.
@@ -253,5 +312,11 @@ def load(
         # If there is no data to load, save some time.
         return
     ensure_indexes(neo4j_session, node_schema)
-    ingestion_query = build_ingestion_query(node_schema)
+    ingestion_query = build_ingestion_query(node_schema, change_detection=_change_detection_enabled)
+    if _change_detection_enabled:
+        # Copy the dicts rather than adding the hash to the caller's data.
+        dict_list = [
+            {**item, PROPERTIES_HASH_FIELD: get_node_properties_hash(node_schema, item, **kwargs)}
+            for item in dict_list
+        ]
     load_graph_data(neo4j_session, ingestion_query, dict_list, **kwargs)
@@ -43,6 +43,9 @@ class Config:
     :param azure_client_secret: Client Secret for connecting in a Service Principal Authentication approach. Optional.
     :type aws_requested_syncs: str
     :param aws_requested_syncs: Comma-separated list of AWS resources to sync. Optional.
+    :type aws_s3_cache_dir: str
+    :param aws_s3_cache_dir: Directory for the local S3 bucket region cache. If set, the regions of buckets that were
+        not recreated since the previous sync are read from the cache instead of the S3 API. Optional.
     :type analysis_job_directory: str
     :param analysis_job_directory: Path to a directory tree containing analysis jobs to run. Optional.
     :type oci_sync_all_profiles: bool
@@ -55,6 +58,12 @@ class Config:
     :param okta_saml_role_regex: The regex used to map okta groups to AWS roles. Optional.
     :type github_config: str
     :param github_config: Base64 encoded config object for GitHub ingestion. Optional.
+    :type github_cache_dir: str
+    :param github_cache_dir: Directory for the local GitHub repo cache. If set, collaborators of repos that did not
+        change since the previous sync are read from the cache instead of the GitHub API. Optional.
+    :type github_cache_max_age: float
+    :param github_cache_max_age: Age in hours after which cached GitHub repo collaborators are fetched again, which is
+        when collaborator permission changes are picked up. Optional.
     :type digitalocean_token: str
     :param digitalocean_token: DigitalOcean access token. Optional.
     :type permission_relationships_file: str
@@ -77,6 +86,14 @@ class Config:
     :param statsd_host: If statsd_enabled is True, send metrics to this host. Optional.
     :type: statsd_port: int
     :param statsd_port: If statsd_enabled is True, send metrics to this port on statsd_host. Optional.
+    :type profile_output_dir: str
+    :param profile_output_dir: If set, profile the sync and write the profile reports to this directory. Optional.
+    :type neo4j_slow_query_log_size: int
+    :param neo4j_slow_query_log_size: If set, time every Neo4j query and log this number of slowest queries at the end
+        of the sync. Optional.
+    :type neo4j_change_detection: bool
+    :param neo4j_change_detection: If True, only write the properties of nodes loaded through node schemas when they
+        changed since the last sync. Optional.
     :type: k8s_kubeconfig: str
     :param k8s_kubeconfig: Path to kubeconfig file for kubernetes cluster(s). Optional
     :type: pagerduty_api_key: str
@@ -140,12 +157,15 @@ class Config:
         azure_client_id=None,
         azure_client_secret=None,
         aws_requested_syncs=None,
+        aws_s3_cache_dir=None,
         analysis_job_directory=None,
         oci_sync_all_profiles=None,
         okta_org_id=None,
         okta_api_key=None,
         okta_saml_role_regex=None,
         github_config=None,
+        github_cache_dir=None,
+        github_cache_max_age=None,
         digitalocean_token=None,
         permission_relationships_file=None,
         jamf_base_uri=None,
@@ -159,6 +179,9 @@ class Config:
         statsd_prefix=None,
         statsd_host=None,
         statsd_port=None,
+        profile_output_dir=None,
+        neo4j_slow_query_log_size=None,
+        neo4j_change_detection=False,
         pagerduty_api_key=None,
         pagerduty_request_timeout=None,
         nist_cve_url=None,
@@ -201,12 +224,15 @@ class Config:
         self.azure_client_id = azure_client_id
         self.azure_client_secret = azure_client_secret
         self.aws_requested_syncs = aws_requested_syncs
+        self.aws_s3_cache_dir = aws_s3_cache_dir
         self.analysis_job_directory = analysis_job_directory
         self.oci_sync_all_profiles = oci_sync_all_profiles
         self.okta_org_id = okta_org_id
         self.okta_api_key = okta_api_key
         self.okta_saml_role_regex = okta_saml_role_regex
         self.github_config = github_config
+        self.github_cache_dir = github_cache_dir
+        self.github_cache_max_age = github_cache_max_age
         self.digitalocean_token = digitalocean_token
         self.permission_relationships_file = permission_relationships_file
         self.jamf_base_uri = jamf_base_uri
@@ -220,6 +246,9 @@ class Config:
         self.statsd_prefix = statsd_prefix
         self.statsd_host = statsd_host
         self.statsd_port = statsd_port
+        self.profile_output_dir = profile_output_dir
+        self.neo4j_slow_query_log_size = neo4j_slow_query_log_size
+        self.neo4j_change_detection = neo4j_change_detection
         self.pagerduty_api_key = pagerduty_api_key
         self.pagerduty_request_timeout = pagerduty_request_timeout
         self.nist_cve_url = nist_cve_url
@@ -64,6 +64,7 @@ CREATE INDEX IF NOT EXISTS FOR (n:AWSVpc) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:AccountAccessKey) ON (n.accesskeyid);
 CREATE INDEX IF NOT EXISTS FOR (n:AccountAccessKey) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:AutoScalingGroup) ON (n.arn);
+CREATE INDEX IF NOT EXISTS FOR (n:AutoScalingGroup) ON (n.exposed_internet);
 CREATE INDEX IF NOT EXISTS FOR (n:AutoScalingGroup) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:CrowdstrikeHost) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:CrowdstrikeHost) ON (n.instance_id);
@@ -86,6 +87,7 @@ CREATE INDEX IF NOT EXISTS FOR (n:DOProject) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:DOProject) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:EBSSnapshot) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:EBSSnapshot) ON (n.lastupdated);
+CREATE INDEX IF NOT EXISTS FOR (n:EC2Instance) ON (n.exposed_internet);
 CREATE INDEX IF NOT EXISTS FOR (n:EC2KeyPair) ON (n.keyfingerprint);
 CREATE INDEX IF NOT EXISTS FOR (n:EC2ReservedInstance) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:EC2ReservedInstance) ON (n.lastupdated);
@@ -136,12 +138,16 @@ CREATE INDEX IF NOT EXISTS FOR (n:GCPDNSZone) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:GCPDNSZone) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:GCPRecordSet) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:GCPRecordSet) ON (n.lastupdated);
+CREATE INDEX IF NOT EXISTS FOR (n:GCPFirewall) ON (n.id);
+CREATE INDEX IF NOT EXISTS FOR (n:GCPFirewall) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:GCPFolder) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:GCPFolder) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:GCPForwardingRule) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:GCPForwardingRule) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:GCPInstance) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:GCPInstance) ON (n.lastupdated);
+CREATE INDEX IF NOT EXISTS FOR (n:GCPIpRule) ON (n.id);
+CREATE INDEX IF NOT EXISTS FOR (n:GCPIpRule) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:GCPNetworkInterface) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:GCPNetworkInterface) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:GCPNetworkTag) ON (n.id);
@@ -195,9 +201,11 @@ CREATE INDEX IF NOT EXISTS FOR (n:LaunchConfiguration) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:LaunchConfiguration) ON (n.name);
 CREATE INDEX IF NOT EXISTS FOR (n:LaunchConfiguration) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:LoadBalancer) ON (n.dnsname);
+CREATE INDEX IF NOT EXISTS FOR (n:LoadBalancer) ON (n.exposed_internet);
 CREATE INDEX IF NOT EXISTS FOR (n:LoadBalancer) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:LoadBalancer) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:LoadBalancerV2) ON (n.dnsname);
+CREATE INDEX IF NOT EXISTS FOR (n:LoadBalancerV2) ON (n.exposed_internet);
 CREATE INDEX IF NOT EXISTS FOR (n:LoadBalancerV2) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:LoadBalancerV2) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:NameServer) ON (n.id);
@@ -18,6 +18,10 @@ from cartography.models.core.relationships import TargetNodeMatcher
 
 logger = logging.getLogger(__name__)
 
+# Node property that stores the hash of the properties last written to the node when change detection is on, and the
+# key of the data dicts that holds the hash of their properties. See `build_ingestion_query()`.
+PROPERTIES_HASH_FIELD = 'properties_hash'
+
 
 def _build_node_properties_statement(
         node_property_map: Dict[str, PropertyRef],
@@ -361,6 +365,7 @@ def filter_selected_relationships(
 def build_ingestion_query(
         node_schema: CartographyNodeSchema,
         selected_relationships: Optional[Set[CartographyRelSchema]] = None,
+        change_detection: bool = False,
 ) -> str:
     """
     Generates a Neo4j query from the given CartographyNodeSchema to ingest the specified nodes and relationships so that
@@ -372,6 +377,10 @@ def build_ingestion_query(
     If selected_relationships is None (default), then we create a query using all RelSchema specified in
     node_schema.sub_resource_relationship + node_schema.other_relationships.
     If selected_relationships is the empty set, we create a query with no relationship attachments at all.
+    :param change_detection: If True, generates a query that expects each dict in $DictList to carry a hash of its node
+    properties in the `properties_hash` field (see cartography.client.core.tx.get_node_properties_hash()). The node
+    properties are then only written when the hash differs from the one stored on the node; otherwise only
+    `lastupdated` is set. Defaults to False.
     :return: An optimized Neo4j query that can be used to ingest nodes and relationships.
     Important notes:
     - The resulting query uses the UNWIND + MERGE pattern (see
@@ -401,18 +410,60 @@ def build_ingestion_query(
     if selected_relationships or selected_relationships == set():
         sub_resource_rel, other_rels = filter_selected_relationships(node_schema, selected_relationships)
 
+    if change_detection:
+        set_node_properties_statement = _build_changed_node_properties_statement(
+            node_props_as_dict,
+            node_schema.extra_node_labels,
+        )
+    else:
+        set_node_properties_statement = _build_node_properties_statement(
+            node_props_as_dict,
+            node_schema.extra_node_labels,
+        )
+
     ingest_query = query_template.safe_substitute(
         node_label=node_schema.label,
         dict_id_field=node_props.id,
-        set_node_properties_statement=_build_node_properties_statement(
-            node_props_as_dict,
-            node_schema.extra_node_labels,
-        ),
+        set_node_properties_statement=set_node_properties_statement,
         attach_relationships_statement=_build_attach_relationships_statement(sub_resource_rel, other_rels),
     )
     return ingest_query
 
 
+def _build_changed_node_properties_statement(
+        node_property_map: Dict[str, PropertyRef],
+        extra_node_labels: Optional[ExtraNodeLabels] = None,
+) -> str:
+    """
+    Generate Neo4j clauses that always set `lastupdated` on the node, so that unchanged nodes are not removed by cleanup
+    jobs, and only set the other node properties and labels when the properties hash of the item differs from the one
+    stored on the node, which is then updated.
+    :param node_property_map: Mapping of node attribute names as str to PropertyRef objects
+    :param extra_node_labels: Optional ExtraNodeLabels object to set on the node as string
+    :return: The resulting Neo4j SET and FOREACH clauses
+    """
+    set_node_properties_statement = _build_node_properties_statement(
+        {name: ref for name, ref in node_property_map.items() if name != 'lastupdated'},
+        extra_node_labels,
+    )
+    if set_node_properties_statement:
+        set_node_properties_statement += ','
+
+    changed_template = Template(
+        """i.lastupdated = $lastupdated
+            FOREACH (_ IN CASE WHEN coalesce(i.$hash_field, '') <> item.$hash_field THEN [1] ELSE [] END |
+                SET
+                $set_node_properties_statement
+                i.$hash_field = item.$hash_field
+            )""",
+    )
+    return changed_template.safe_substitute(
+        lastupdated=node_property_map['lastupdated'],
+        hash_field=PROPERTIES_HASH_FIELD,
+        set_node_properties_statement=set_node_properties_statement,
+    )
+
+
 def build_create_index_queries(node_schema: CartographyNodeSchema) -> List[str]:
     """
     Generate queries to create indexes for the given CartographyNodeSchema and all node types attached to it via its
@@ -9,6 +9,8 @@ from typing import Union
 
 import neo4j
 
+from cartography.profiler import profile_span
+from cartography.profiler import record_neo4j_transaction
 from cartography.stats import get_stats_client
 
 
@@ -70,10 +72,11 @@ class GraphStatement:
         """
         Run the statement. This will execute the query against the graph.
         """
-        if self.iterative:
-            self._run_iterative(session)
-        else:
-            session.write_transaction(self._run_noniterative)
+        with profile_span('statement', f"{self.parent_job_name} #{self.parent_job_sequence_num}"):
+            if self.iterative:
+                self._run_iterative(session)
+            else:
+                session.write_transaction(self._run_noniterative)
 
         logger.info(f"Completed {self.parent_job_name} statement #{self.parent_job_sequence_num}")
 
@@ -97,6 +100,7 @@ class GraphStatement:
 
         # Ensure we consume the result inside the transaction
         summary: neo4j.ResultSummary = result.consume()
+        record_neo4j_transaction()
 
         # Handle stats
         stat_handler.incr('constraints_added', summary.counters.constraints_added)
@@ -11,14 +11,18 @@ import botocore.exceptions
 import neo4j
 
 from . import ec2
+from . import iam
 from . import organizations
 from .resources import RESOURCE_FUNCTIONS
 from cartography.config import Config
+from cartography.intel.aws.util.api_calls import log_api_call_summary
+from cartography.intel.aws.util.api_calls import register_api_call_hooks
 from cartography.intel.aws.util.common import parse_and_validate_aws_requested_syncs
+from cartography.intel.exposure import run_aws_ec2_exposure_analysis
+from cartography.profiler import profile_span
 from cartography.stats import get_stats_client
 from cartography.util import merge_module_sync_metadata
 from cartography.util import run_analysis_and_ensure_deps
-from cartography.util import run_analysis_job
 from cartography.util import run_cleanup_job
 from cartography.util import run_scoped_analysis_job
 from cartography.util import timeit
@@ -62,7 +66,8 @@ def _sync_one_account(
         if func_name in RESOURCE_FUNCTIONS:
             # Skip permission relationships and tags for now because they rely on data already being in the graph
             if func_name not in ['permission_relationships', 'resourcegroupstaggingapi']:
-                RESOURCE_FUNCTIONS[func_name](**sync_args)
+                with profile_span('aws_resource', func_name):
+                    RESOURCE_FUNCTIONS[func_name](**sync_args)
             else:
                 continue
         else:
@@ -70,11 +75,13 @@ def _sync_one_account(
 
     # MAP IAM permissions
     if 'permission_relationships' in aws_requested_syncs:
-        RESOURCE_FUNCTIONS['permission_relationships'](**sync_args)
+        with profile_span('aws_resource', 'permission_relationships'):
+            RESOURCE_FUNCTIONS['permission_relationships'](**sync_args)
 
     # AWS Tags - Must always be last.
     if 'resourcegroupstaggingapi' in aws_requested_syncs:
-        RESOURCE_FUNCTIONS['resourcegroupstaggingapi'](**sync_args)
+        with profile_span('aws_resource', 'resourcegroupstaggingapi'):
+            RESOURCE_FUNCTIONS['resourcegroupstaggingapi'](**sync_args)
 
     run_scoped_analysis_job(
         'aws_ec2_iaminstanceprofile.json',
@@ -82,7 +89,7 @@ def _sync_one_account(
         common_job_parameters,
     )
 
-    run_analysis_job(
+    run_scoped_analysis_job(
         'aws_lambda_ecr.json',
         neo4j_session,
         common_job_parameters,
@@ -163,6 +170,7 @@ def _sync_multiple_accounts(
             boto3_session = boto3.Session()
         else:
             boto3_session = boto3.Session(profile_name=profile_name)
+        register_api_call_hooks(boto3_session)
 
         _autodiscover_accounts(neo4j_session, boto3_session, account_id, sync_tag, common_job_parameters)
 
@@ -223,25 +231,33 @@ def _perform_aws_analysis(
         'ec2:load_balancer',
         'ec2:load_balancer_v2',
     }
+    if ec2_asset_exposure_requirements.issubset(requested_syncs_as_set):
+        run_aws_ec2_exposure_analysis(neo4j_session, common_job_parameters)
+    else:
+        logger.info(
+            f"Did not run the EC2 asset exposure analysis because it needs {ec2_asset_exposure_requirements} to be "
+            f"included as a requested sync. You specified: {requested_syncs_as_set}.",
+        )
+
     run_analysis_and_ensure_deps(
-        'aws_ec2_asset_exposure.json',
-        ec2_asset_exposure_requirements,
+        'aws_ec2_keypair_analysis.json',
+        {'ec2:keypair'},
         requested_syncs_as_set,
         common_job_parameters,
         neo4j_session,
     )
 
     run_analysis_and_ensure_deps(
-        'aws_ec2_keypair_analysis.json',
-        {'ec2:keypair'},
+        'aws_eks_asset_exposure.json',
+        {'eks'},
         requested_syncs_as_set,
         common_job_parameters,
         neo4j_session,
     )
 
     run_analysis_and_ensure_deps(
-        'aws_eks_asset_exposure.json',
-        {'eks'},
+        'aws_lambda_ecr_cross_account.json',
+        {'lambda_function', 'ecr'},
         requested_syncs_as_set,
         common_job_parameters,
         neo4j_session,
@@ -261,6 +277,7 @@ def start_aws_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
     common_job_parameters = {
         "UPDATE_TAG": config.update_tag,
         "permission_relationships_file": config.permission_relationships_file,
+        "aws_s3_cache_dir": config.aws_s3_cache_dir,
     }
     try:
         boto3_session = boto3.Session()
@@ -275,6 +292,7 @@ def start_aws_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
             e,
         )
         return
+    register_api_call_hooks(boto3_session)
 
     if config.aws_sync_all_profiles:
         aws_accounts = organizations.get_aws_accounts_from_botocore_config(boto3_session)
@@ -299,14 +317,20 @@ def start_aws_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
     if config.aws_requested_syncs:
         requested_syncs = parse_and_validate_aws_requested_syncs(config.aws_requested_syncs)
 
-    sync_successful = _sync_multiple_accounts(
-        neo4j_session,
-        aws_accounts,
-        config.update_tag,
-        common_job_parameters,
-        config.aws_best_effort_mode,
-        requested_syncs,
-    )
+    try:
+        sync_successful = _sync_multiple_accounts(
+            neo4j_session,
+            aws_accounts,
+            config.update_tag,
+            common_job_parameters,
+            config.aws_best_effort_mode,
+            requested_syncs,
+        )
+    finally:
+        # The managed policy statements are cached for the accounts of this run only.
+        iam.clear_managed_policy_cache()
+
+    log_api_call_summary()
 
     if sync_successful:
         _perform_aws_analysis(requested_syncs, neo4j_session, common_job_parameters)
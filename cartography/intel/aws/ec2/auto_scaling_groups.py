@@ -8,6 +8,8 @@ import neo4j
 from .util import get_botocore_config
 from cartography.client.core.tx import load
 from cartography.graph.job import GraphJob
+from cartography.intel.exposure import get_exposure_fingerprint
+from cartography.intel.exposure import record_exposure_changes
 from cartography.models.aws.ec2.auto_scaling_groups import AutoScalingGroupSchema
 from cartography.models.aws.ec2.auto_scaling_groups import EC2InstanceAutoScalingGroupSchema
 from cartography.models.aws.ec2.auto_scaling_groups import EC2SubnetAutoScalingGroupSchema
@@ -120,6 +122,18 @@ def transform_auto_scaling_groups(groups: list[dict[str, Any]]) -> AsgData:
     )
 
 
+def get_exposure_fingerprints(groups: list[dict[str, Any]]) -> dict[str, str]:
+    """
+    Return the fingerprints of the auto scaling group data that the internet exposure analysis reads, by group ARN.
+    """
+    return {
+        group['AutoScalingGroupARN']: get_exposure_fingerprint(
+            sorted(instance['InstanceId'] for instance in group.get('Instances', [])),
+        )
+        for group in groups
+    }
+
+
 @timeit
 def load_launch_configurations(
     neo4j_session: neo4j.Session, data: list[dict], region: str, current_aws_account_id: str, update_tag: int,
@@ -198,6 +212,7 @@ def sync_ec2_auto_scaling_groups(
         logger.debug("Syncing auto scaling groups for region '%s' in account '%s'.", region, current_aws_account_id)
         lc_data = get_launch_configurations(boto3_session, region)
         asg_data = get_ec2_auto_scaling_groups(boto3_session, region)
+        record_exposure_changes(neo4j_session, 'AutoScalingGroup', get_exposure_fingerprints(asg_data))
         lc_transformed = transform_launch_configurations(lc_data)
         asg_transformed = transform_auto_scaling_groups(asg_data)
         load_launch_configurations(neo4j_session, lc_transformed, region, current_aws_account_id, update_tag)
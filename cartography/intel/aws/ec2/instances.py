@@ -11,6 +11,8 @@ import neo4j
 from cartography.client.core.tx import load
 from cartography.graph.job import GraphJob
 from cartography.intel.aws.ec2.util import get_botocore_config
+from cartography.intel.exposure import get_exposure_fingerprint
+from cartography.intel.exposure import record_exposure_changes
 from cartography.models.aws.ec2.auto_scaling_groups import EC2InstanceAutoScalingGroupSchema
 from cartography.models.aws.ec2.instances import EC2InstanceSchema
 from cartography.models.aws.ec2.keypair_instance import EC2KeyPairInstanceSchema
@@ -156,6 +158,28 @@ def transform_ec2_instances(reservations: List[Dict[str, Any]], region: str, cur
     )
 
 
+def get_exposure_fingerprints(reservations: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Return the fingerprints of the instance data that the internet exposure analysis reads, by instance id: the public
+    IP address and the security groups of the instance and of its network interfaces.
+    """
+    fingerprints = {}
+    for reservation in reservations:
+        for instance in reservation['Instances']:
+            fingerprints[instance['InstanceId']] = get_exposure_fingerprint([
+                instance.get('PublicIpAddress'),
+                sorted(group['GroupId'] for group in instance.get('SecurityGroups', [])),
+                sorted(
+                    [
+                        network_interface['NetworkInterfaceId'],
+                        sorted(group['GroupId'] for group in network_interface.get('Groups', [])),
+                    ]
+                    for network_interface in instance.get('NetworkInterfaces', [])
+                ),
+            ])
+    return fingerprints
+
+
 @timeit
 def load_ec2_reservations(
         neo4j_session: neo4j.Session,
@@ -325,6 +349,7 @@ def sync_ec2_instances(
     for region in regions:
         logger.info("Syncing EC2 instances for region '%s' in account '%s'.", region, current_aws_account_id)
         reservations = get_ec2_instances(boto3_session, region)
+        record_exposure_changes(neo4j_session, 'EC2Instance', get_exposure_fingerprints(reservations))
         ec2_data = transform_ec2_instances(reservations, region, current_aws_account_id)
         load_ec2_instance_data(
             neo4j_session,
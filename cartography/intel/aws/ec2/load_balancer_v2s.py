@@ -7,6 +7,8 @@ import botocore
 import neo4j
 
 from .util import get_botocore_config
+from cartography.intel.exposure import get_exposure_fingerprint
+from cartography.intel.exposure import record_exposure_changes
 from cartography.util import aws_handle_regions
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
@@ -220,6 +222,24 @@ def cleanup_load_balancer_v2s(neo4j_session: neo4j.Session, common_job_parameter
     run_cleanup_job('aws_ingest_load_balancers_v2_cleanup.json', neo4j_session, common_job_parameters)
 
 
+def get_exposure_fingerprints(data: List[Dict]) -> Dict[str, str]:
+    """
+    Return the fingerprints of the load balancer data that the internet exposure analysis reads, by DNS name.
+    """
+    return {
+        lb['DNSName']: get_exposure_fingerprint([
+            lb.get('Scheme'),
+            sorted(lb.get('SecurityGroups', [])),
+            sorted(listener.get('Port') for listener in lb.get('Listeners', [])),
+            sorted(
+                [target_group.get('TargetType'), sorted(target_group.get('Targets', []))]
+                for target_group in lb.get('TargetGroups', [])
+            ),
+        ])
+        for lb in data
+    }
+
+
 @timeit
 def sync_load_balancer_v2s(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, regions: List[str], current_aws_account_id: str,
@@ -228,5 +248,6 @@ def sync_load_balancer_v2s(
     for region in regions:
         logger.info("Syncing EC2 load balancers v2 for region '%s' in account '%s'.", region, current_aws_account_id)
         data = get_loadbalancer_v2_data(boto3_session, region)
+        record_exposure_changes(neo4j_session, 'LoadBalancerV2', get_exposure_fingerprints(data))
         load_load_balancer_v2s(neo4j_session, data, region, current_aws_account_id, update_tag)
     cleanup_load_balancer_v2s(neo4j_session, common_job_parameters)
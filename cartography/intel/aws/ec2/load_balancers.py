@@ -6,6 +6,8 @@ import boto3
 import neo4j
 
 from .util import get_botocore_config
+from cartography.intel.exposure import get_exposure_fingerprint
+from cartography.intel.exposure import record_exposure_changes
 from cartography.util import aws_handle_regions
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
@@ -173,6 +175,22 @@ def load_load_balancers(
             load_load_balancer_listeners(neo4j_session, load_balancer_id, lb["ListenerDescriptions"], update_tag)
 
 
+def get_exposure_fingerprints(data: List[Dict]) -> Dict[str, str]:
+    """
+    Return the fingerprints of the load balancer data that the internet exposure analysis reads, by DNS name.
+    """
+    return {
+        lb['DNSName']: get_exposure_fingerprint([
+            lb.get('Scheme'),
+            lb.get('ListenerDescriptions', []),
+            lb.get('SecurityGroups', []),
+            lb.get('SourceSecurityGroup'),
+            sorted(instance['InstanceId'] for instance in lb.get('Instances', [])),
+        ])
+        for lb in data
+    }
+
+
 @timeit
 def cleanup_load_balancers(neo4j_session: neo4j.Session, common_job_parameters: Dict) -> None:
     run_cleanup_job('aws_ingest_load_balancers_cleanup.json', neo4j_session, common_job_parameters)
@@ -186,5 +204,6 @@ def sync_load_balancers(
     for region in regions:
         logger.info("Syncing EC2 load balancers for region '%s' in account '%s'.", region, current_aws_account_id)
         data = get_loadbalancer_data(boto3_session, region)
+        record_exposure_changes(neo4j_session, 'LoadBalancer', get_exposure_fingerprints(data))
         load_load_balancers(neo4j_session, data, region, current_aws_account_id, update_tag)
     cleanup_load_balancers(neo4j_session, common_job_parameters)
@@ -2,12 +2,16 @@ import logging
 from string import Template
 from typing import Dict
 from typing import List
+from typing import Tuple
 
 import boto3
 import neo4j
 
 from .util import get_botocore_config
+from cartography.client.core.tx import load_graph_data
 from cartography.graph.job import GraphJob
+from cartography.intel.exposure import get_exposure_fingerprint
+from cartography.intel.exposure import record_exposure_changes
 from cartography.models.aws.ec2.securitygroup_instance import EC2SecurityGroupInstanceSchema
 from cartography.util import aws_handle_regions
 from cartography.util import run_cleanup_job
@@ -27,79 +31,78 @@ def get_ec2_security_group_data(boto3_session: boto3.session.Session, region: st
     return security_groups
 
 
-@timeit
-def load_ec2_security_group_rule(neo4j_session: neo4j.Session, group: Dict, rule_type: str, update_tag: int) -> None:
-    INGEST_RULE_TEMPLATE = Template("""
-    MERGE (rule:$rule_label{ruleid: $RuleId})
-    ON CREATE SET rule :IpRule, rule.firstseen = timestamp(), rule.fromport = $FromPort, rule.toport = $ToPort,
-    rule.protocol = $Protocol
-    SET rule.lastupdated = $update_tag
-    WITH rule
-    MATCH (group:EC2SecurityGroup{groupid: $GroupId})
-    MERGE (group)<-[r:MEMBER_OF_EC2_SECURITY_GROUP]-(rule)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $update_tag;
-    """)
-
-    ingest_rule_group_pair = """
-    MERGE (group:EC2SecurityGroup{id: $GroupId})
-    ON CREATE SET group.firstseen = timestamp(), group.groupid = $GroupId
-    SET group.lastupdated = $update_tag
-    WITH group
-    MATCH (inbound:IpRule{ruleid: $RuleId})
-    MERGE (inbound)-[r:MEMBER_OF_EC2_SECURITY_GROUP]->(group)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $update_tag
+RULE_TYPE_LABELS = {"IpPermissions": "IpPermissionInbound", "IpPermissionsEgress": "IpPermissionEgress"}
+
+# NOTE Cypher query syntax is incompatible with Python string formatting, so we have to do this awkward
+# NOTE manual formatting instead.
+INGEST_RULES_TEMPLATE = Template("""
+UNWIND $$DictList AS rule_data
+MERGE (rule:$rule_label{ruleid: rule_data.RuleId})
+ON CREATE SET rule :IpRule, rule.firstseen = timestamp(), rule.fromport = rule_data.FromPort,
+rule.toport = rule_data.ToPort, rule.protocol = rule_data.Protocol
+SET rule.lastupdated = $$update_tag, rule.prefix_list_ids = rule_data.PrefixListIds
+WITH rule, rule_data
+MATCH (group:EC2SecurityGroup{groupid: rule_data.GroupId})
+MERGE (group)<-[r:MEMBER_OF_EC2_SECURITY_GROUP]-(rule)
+ON CREATE SET r.firstseen = timestamp()
+SET r.lastupdated = $$update_tag
+""")
+INGEST_RULES = {
+    rule_type: INGEST_RULES_TEMPLATE.substitute(rule_label=rule_label)
+    for rule_type, rule_label in RULE_TYPE_LABELS.items()
+}
+
+
+def transform_ec2_security_group_rules(data: List[Dict]) -> Tuple[Dict[str, List[Dict]], List[Dict]]:
+    """
+    Flatten the inbound and egress rules of the security groups, and the IPv4 and IPv6 ranges of the rules.
+    :param data: The security groups returned by get_ec2_security_group_data()
+    :return: A dict of rule type to the rules of this type, and the ranges with the id of their rule
     """
+    rules: Dict[str, List[Dict]] = {rule_type: [] for rule_type in RULE_TYPE_LABELS}
+    ranges: List[Dict] = []
+    for group in data:
+        group_id = group["GroupId"]
+        for rule_type in RULE_TYPE_LABELS:
+            for rule in group.get(rule_type) or []:
+                protocol = rule.get("IpProtocol", "all")
+                from_port = rule.get("FromPort")
+                to_port = rule.get("ToPort")
+                ruleid = f"{group_id}/{rule_type}/{from_port}{to_port}{protocol}"
+                rules[rule_type].append({
+                    "RuleId": ruleid,
+                    "GroupId": group_id,
+                    "FromPort": from_port,
+                    "ToPort": to_port,
+                    "Protocol": protocol,
+                    "PrefixListIds": [p["PrefixListId"] for p in rule.get("PrefixListIds", [])],
+                })
+                for ip_range in rule.get("IpRanges", []):
+                    ranges.append({"RangeId": ip_range["CidrIp"], "RuleId": ruleid})
+                for ip_range in rule.get("Ipv6Ranges", []):
+                    ranges.append({"RangeId": ip_range["CidrIpv6"], "RuleId": ruleid})
+    return rules, ranges
+
 
-    ingest_range = """
-    MERGE (range:IpRange{id: $RangeId})
-    ON CREATE SET range.firstseen = timestamp(), range.range = $RangeId
+@timeit
+def load_ec2_security_group_rules(
+    neo4j_session: neo4j.Session, rules: Dict[str, List[Dict]], ranges: List[Dict], update_tag: int,
+) -> None:
+    ingest_ranges = """
+    UNWIND $DictList AS range_data
+    MERGE (range:IpRange{id: range_data.RangeId})
+    ON CREATE SET range.firstseen = timestamp(), range.range = range_data.RangeId
     SET range.lastupdated = $update_tag
-    WITH range
-    MATCH (rule:IpRule{ruleid: $RuleId})
+    WITH range, range_data
+    MATCH (rule:IpRule{ruleid: range_data.RuleId})
     MERGE (rule)<-[r:MEMBER_OF_IP_RULE]-(range)
     ON CREATE SET r.firstseen = timestamp()
     SET r.lastupdated = $update_tag
     """
 
-    group_id = group["GroupId"]
-    rule_type_map = {"IpPermissions": "IpPermissionInbound", "IpPermissionsEgress": "IpPermissionEgress"}
-
-    if group.get(rule_type):
-        for rule in group[rule_type]:
-            protocol = rule.get("IpProtocol", "all")
-            from_port = rule.get("FromPort")
-            to_port = rule.get("ToPort")
-
-            ruleid = f"{group_id}/{rule_type}/{from_port}{to_port}{protocol}"
-            # NOTE Cypher query syntax is incompatible with Python string formatting, so we have to do this awkward
-            # NOTE manual formatting instead.
-            neo4j_session.run(
-                INGEST_RULE_TEMPLATE.safe_substitute(rule_label=rule_type_map[rule_type]),
-                RuleId=ruleid,
-                FromPort=from_port,
-                ToPort=to_port,
-                Protocol=protocol,
-                GroupId=group_id,
-                update_tag=update_tag,
-            )
-
-            neo4j_session.run(
-                ingest_rule_group_pair,
-                GroupId=group_id,
-                RuleId=ruleid,
-                update_tag=update_tag,
-            )
-
-            for ip_range in rule["IpRanges"]:
-                range_id = ip_range["CidrIp"]
-                neo4j_session.run(
-                    ingest_range,
-                    RangeId=range_id,
-                    RuleId=ruleid,
-                    update_tag=update_tag,
-                )
+    for rule_type, rule_data in rules.items():
+        load_graph_data(neo4j_session, INGEST_RULES[rule_type], rule_data, update_tag=update_tag)
+    load_graph_data(neo4j_session, ingest_ranges, ranges, update_tag=update_tag)
 
 
 @timeit
@@ -107,38 +110,43 @@ def load_ec2_security_groupinfo(
     neo4j_session: neo4j.Session, data: List[Dict], region: str,
     current_aws_account_id: str, update_tag: int,
 ) -> None:
-    ingest_security_group = """
-    MERGE (group:EC2SecurityGroup{id: $GroupId})
-    ON CREATE SET group.firstseen = timestamp(), group.groupid = $GroupId
-    SET group.name = $GroupName, group.description = $Description, group.region = $Region,
+    ingest_security_groups = """
+    UNWIND $DictList AS group_data
+    MERGE (group:EC2SecurityGroup{id: group_data.GroupId})
+    ON CREATE SET group.firstseen = timestamp(), group.groupid = group_data.GroupId
+    SET group.name = group_data.GroupName, group.description = group_data.Description, group.region = $Region,
     group.lastupdated = $update_tag
-    WITH group
+    WITH group, group_data
     MATCH (aa:AWSAccount{id: $AWS_ACCOUNT_ID})
     MERGE (aa)-[r:RESOURCE]->(group)
     ON CREATE SET r.firstseen = timestamp()
     SET r.lastupdated = $update_tag
-    WITH group
-    MATCH (vpc:AWSVpc{id: $VpcId})
+    WITH group, group_data
+    MATCH (vpc:AWSVpc{id: group_data.VpcId})
     MERGE (vpc)-[rg:MEMBER_OF_EC2_SECURITY_GROUP]->(group)
     ON CREATE SET rg.firstseen = timestamp()
     """
 
-    for group in data:
-        group_id = group["GroupId"]
-
-        neo4j_session.run(
-            ingest_security_group,
-            GroupId=group_id,
-            GroupName=group.get("GroupName"),
-            Description=group.get("Description"),
-            VpcId=group.get("VpcId", None),
-            Region=region,
-            AWS_ACCOUNT_ID=current_aws_account_id,
-            update_tag=update_tag,
-        )
+    groups = [
+        {
+            "GroupId": group["GroupId"],
+            "GroupName": group.get("GroupName"),
+            "Description": group.get("Description"),
+            "VpcId": group.get("VpcId"),
+        }
+        for group in data
+    ]
+    load_graph_data(
+        neo4j_session,
+        ingest_security_groups,
+        groups,
+        Region=region,
+        AWS_ACCOUNT_ID=current_aws_account_id,
+        update_tag=update_tag,
+    )
 
-        load_ec2_security_group_rule(neo4j_session, group, "IpPermissions", update_tag)
-        load_ec2_security_group_rule(neo4j_session, group, "IpPermissionsEgress", update_tag)
+    rules, ranges = transform_ec2_security_group_rules(data)
+    load_ec2_security_group_rules(neo4j_session, rules, ranges, update_tag)
 
 
 @timeit
@@ -151,6 +159,16 @@ def cleanup_ec2_security_groupinfo(neo4j_session: neo4j.Session, common_job_para
     GraphJob.from_node_schema(EC2SecurityGroupInstanceSchema(), common_job_parameters).run(neo4j_session)
 
 
+def get_exposure_fingerprints(data: List[Dict]) -> Dict[str, str]:
+    """
+    Return the fingerprints of the security group data that the internet exposure analysis reads, by group id.
+    """
+    return {
+        group['GroupId']: get_exposure_fingerprint([group.get('GroupName'), group.get('IpPermissions', [])])
+        for group in data
+    }
+
+
 @timeit
 def sync_ec2_security_groupinfo(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, regions: List[str], current_aws_account_id: str,
@@ -159,5 +177,6 @@ def sync_ec2_security_groupinfo(
     for region in regions:
         logger.info("Syncing EC2 security groups for region '%s' in account '%s'.", region, current_aws_account_id)
         data = get_ec2_security_group_data(boto3_session, region)
+        record_exposure_changes(neo4j_session, 'EC2SecurityGroup', get_exposure_fingerprints(data))
         load_ec2_security_groupinfo(neo4j_session, data, region, current_aws_account_id, update_tag)
     cleanup_ec2_security_groupinfo(neo4j_session, common_job_parameters)
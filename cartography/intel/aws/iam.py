@@ -1,16 +1,24 @@
 import enum
 import json
 import logging
+import threading
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Tuple
 
 import boto3
+import botocore.exceptions
 import neo4j
 
+from cartography.client.core.tx import load
+from cartography.intel.aws.permission_relationships import compile_statement
 from cartography.intel.aws.permission_relationships import parse_statement_node
 from cartography.intel.aws.permission_relationships import principal_allowed_on_resource
+from cartography.models.aws.iam.policy import AWSPolicySchema
+from cartography.models.aws.iam.policystatement import AWSPolicyStatementSchema
 from cartography.stats import get_stats_client
 from cartography.util import merge_module_sync_metadata
 from cartography.util import run_cleanup_job
@@ -22,6 +30,20 @@ stat_handler = get_stats_client(__name__)
 # Overview of IAM in AWS
 # https://aws.amazon.com/iam/
 
+# The entity types returned by get_account_authorization_details(), see
+# https://docs.aws.amazon.com/IAM/latest/APIReference/API_GetAccountAuthorizationDetails.html
+AUTHORIZATION_DETAILS_FILTERS = ['User', 'Group', 'Role', 'LocalManagedPolicy', 'AWSManagedPolicy']
+
+# The statements of managed policy versions, keyed by policy ARN and version ID. A policy version cannot be changed, so
+# entries stay valid for the whole run. AWS managed policies have the same ARN in every account, so each of their
+# versions is fetched once per run instead of once per attachment. A deleted policy can be recreated with the same ARN
+# and version ID, so the caches are cleared with clear_managed_policy_cache() when the AWS sync finishes.
+_managed_policy_statements: Dict[Tuple[str, str], Any] = {}
+# The transformed statements of the cached ones above, keyed by the id() of the cached statements. The cache keeps those
+# alive, so their ids are not reused. A value of None means that the statements have not been transformed yet.
+_transformed_managed_policy_statements: Dict[int, Optional[List[Dict]]] = {}
+_managed_policy_statements_lock = threading.Lock()
+
 
 class PolicyType(enum.Enum):
     managed = 'managed'
@@ -74,18 +96,80 @@ def get_group_policy_data(boto3_session: boto3.session.Session, group_list: List
     return policies
 
 
+def get_managed_policy_statements(policy_arn: str, version_id: str, get_statements: Callable[[], Any]) -> Any:
+    """
+    Get the statements of a managed policy version from the cache, or with get_statements() and cache them.
+    :param policy_arn: The ARN of the managed policy
+    :param version_id: The ID of the policy version
+    :param get_statements: Returns the statements of the policy version when they are not cached yet
+    :return: The statements of the policy version. They are shared by all callers and must not be modified.
+    """
+    key = (policy_arn, version_id)
+    with _managed_policy_statements_lock:
+        statements = _managed_policy_statements.get(key)
+    if statements is None:
+        statements = get_statements()
+        with _managed_policy_statements_lock:
+            statements = _managed_policy_statements.setdefault(key, statements)
+            _transformed_managed_policy_statements.setdefault(id(statements), None)
+    return statements
+
+
+def clear_managed_policy_cache() -> None:
+    """
+    Drop the cached statements of managed policy versions, and their transformed statements.
+    """
+    with _managed_policy_statements_lock:
+        _managed_policy_statements.clear()
+        _transformed_managed_policy_statements.clear()
+
+
 @timeit
-def get_group_managed_policy_data(boto3_session: boto3.session.Session, group_list: List[Dict]) -> Dict:
+def get_managed_policy_default_versions(boto3_session: boto3.session.Session) -> Dict[str, str]:
+    """
+    Get the default version IDs of the managed policies that are attached to a principal of the account.
+    :param boto3_session: The boto3 session
+    :return: A dict of policy ARN to default version ID
+    """
+    client = boto3_session.client('iam')
+    paginator = client.get_paginator('list_policies')
+    default_versions: Dict[str, str] = {}
+    for page in paginator.paginate(Scope='All', OnlyAttached=True):
+        for policy in page['Policies']:
+            default_versions[policy['Arn']] = policy['DefaultVersionId']
+    return default_versions
+
+
+def _get_attached_managed_policy_statements(
+    resource_client: Any, attached_policies: Any, default_versions: Dict[str, str],
+) -> Dict[str, Any]:
+    policies = {}
+    for p in attached_policies:
+        # Policies attached after the default versions were listed are looked up one by one.
+        version_id = default_versions.get(p.arn) or p.default_version_id
+        policies[p.arn] = get_managed_policy_statements(
+            p.arn,
+            version_id,
+            lambda: resource_client.PolicyVersion(p.arn, version_id).document["Statement"],
+        )
+    return policies
+
+
+@timeit
+def get_group_managed_policy_data(
+    boto3_session: boto3.session.Session, group_list: List[Dict], default_versions: Optional[Dict[str, str]] = None,
+) -> Dict:
     resource_client = boto3_session.resource('iam')
+    if default_versions is None:
+        default_versions = get_managed_policy_default_versions(boto3_session)
     policies = {}
     for group in group_list:
         name = group["GroupName"]
         group_arn = group["Arn"]
         resource_group = resource_client.Group(name)
-        policies[group_arn] = {
-            p.arn: p.default_version.document["Statement"]
-            for p in resource_group.attached_policies.all()
-        }
+        policies[group_arn] = _get_attached_managed_policy_statements(
+            resource_client, resource_group.attached_policies.all(), default_versions,
+        )
     return policies
 
 
@@ -107,18 +191,21 @@ def get_user_policy_data(boto3_session: boto3.session.Session, user_list: List[D
 
 
 @timeit
-def get_user_managed_policy_data(boto3_session: boto3.session.Session, user_list: List[Dict]) -> Dict:
+def get_user_managed_policy_data(
+    boto3_session: boto3.session.Session, user_list: List[Dict], default_versions: Optional[Dict[str, str]] = None,
+) -> Dict:
     resource_client = boto3_session.resource('iam')
+    if default_versions is None:
+        default_versions = get_managed_policy_default_versions(boto3_session)
     policies = {}
     for user in user_list:
         name = user["UserName"]
         user_arn = user["Arn"]
         resource_user = resource_client.User(name)
         try:
-            policies[user_arn] = {
-                p.arn: p.default_version.document["Statement"]
-                for p in resource_user.attached_policies.all()
-            }
+            policies[user_arn] = _get_attached_managed_policy_statements(
+                resource_client, resource_user.attached_policies.all(), default_versions,
+            )
         except resource_client.meta.client.exceptions.NoSuchEntityException:
             logger.warning(
                 f"Could not get policies for user {name} due to NoSuchEntityException; skipping.",
@@ -144,18 +231,21 @@ def get_role_policy_data(boto3_session: boto3.session.Session, role_list: List[D
 
 
 @timeit
-def get_role_managed_policy_data(boto3_session: boto3.session.Session, role_list: List[Dict]) -> Dict:
+def get_role_managed_policy_data(
+    boto3_session: boto3.session.Session, role_list: List[Dict], default_versions: Optional[Dict[str, str]] = None,
+) -> Dict:
     resource_client = boto3_session.resource('iam')
+    if default_versions is None:
+        default_versions = get_managed_policy_default_versions(boto3_session)
     policies = {}
     for role in role_list:
         name = role["RoleName"]
         role_arn = role["Arn"]
         resource_role = resource_client.Role(name)
         try:
-            policies[role_arn] = {
-                p.arn: p.default_version.document["Statement"]
-                for p in resource_role.attached_policies.all()
-            }
+            policies[role_arn] = _get_attached_managed_policy_statements(
+                resource_client, resource_role.attached_policies.all(), default_versions,
+            )
         except resource_client.meta.client.exceptions.NoSuchEntityException:
             logger.warning(
                 f"Could not get policies for role {name} due to NoSuchEntityException; skipping.",
@@ -164,27 +254,161 @@ def get_role_managed_policy_data(boto3_session: boto3.session.Session, role_list
 
 
 @timeit
-def get_role_tags(boto3_session: boto3.session.Session) -> List[Dict]:
+def get_role_tags(boto3_session: boto3.session.Session, current_aws_account_id: str = '') -> List[Dict]:
+    # list_roles does not return tags, but get_account_authorization_details does, so this takes a handful of calls
+    # instead of one per role.
+    authorization_details = _get_account_authorization_details_or_none(
+        boto3_session, current_aws_account_id, filters=['Role'],
+    )
+    if authorization_details is None:
+        return _get_role_tags_from_role_list(boto3_session)
+    role_tag_data: List[Dict] = []
+    for role in authorization_details['RoleDetailList']:
+        role_tags = role.get('Tags')
+        if not role_tags:
+            continue
+
+        tag_data = {
+            'ResourceARN': role['Arn'],
+            'Tags': role_tags,
+        }
+        role_tag_data.append(tag_data)
+
+    return role_tag_data
+
+
+def _get_role_tags_from_role_list(boto3_session: boto3.session.Session) -> List[Dict]:
     role_list = get_role_list_data(boto3_session)['Roles']
     resource_client = boto3_session.resource('iam')
     role_tag_data: List[Dict] = []
     for role in role_list:
-        name = role["RoleName"]
-        role_arn = role["Arn"]
-        resource_role = resource_client.Role(name)
+        resource_role = resource_client.Role(role['RoleName'])
         role_tags = resource_role.tags
         if not role_tags:
             continue
 
         tag_data = {
-            'ResourceARN': role_arn,
-            'Tags': resource_role.tags,
+            'ResourceARN': role['Arn'],
+            'Tags': role_tags,
         }
         role_tag_data.append(tag_data)
 
     return role_tag_data
 
 
+@timeit
+def get_account_authorization_details(
+    boto3_session: boto3.session.Session, filters: List[str] = AUTHORIZATION_DETAILS_FILTERS,
+) -> Dict[str, List[Dict]]:
+    """
+    Get a snapshot of the users, groups and roles of the account with their inline policies, attached managed
+    policies and group memberships, and of the managed policies attached to them with all of their versions.
+    :param boto3_session: The boto3 session
+    :param filters: The entity types to return, a subset of AUTHORIZATION_DETAILS_FILTERS
+    :return: The UserDetailList, GroupDetailList, RoleDetailList and Policies of all pages
+    """
+    client = boto3_session.client('iam')
+    paginator = client.get_paginator('get_account_authorization_details')
+    details: Dict[str, List[Dict]] = {
+        'UserDetailList': [],
+        'GroupDetailList': [],
+        'RoleDetailList': [],
+        'Policies': [],
+    }
+    for page in paginator.paginate(Filter=filters):
+        for key, items in details.items():
+            items.extend(page.get(key, []))
+    return details
+
+
+def _get_account_authorization_details_or_none(
+    boto3_session: boto3.session.Session, current_aws_account_id: str,
+    filters: List[str] = AUTHORIZATION_DETAILS_FILTERS,
+) -> Optional[Dict[str, List[Dict]]]:
+    try:
+        return get_account_authorization_details(boto3_session, filters=filters)
+    except botocore.exceptions.ClientError as e:
+        if e.response['Error']['Code'] not in ('AccessDenied', 'AccessDeniedException'):
+            raise
+        logger.warning(
+            "Not allowed to call iam:GetAccountAuthorizationDetails in account '%s'; falling back to one IAM call per "
+            "entity of types %s, which is much slower.",
+            current_aws_account_id,
+            ', '.join(filters),
+        )
+        return None
+
+
+def transform_authorization_details_inline_policies(principal_details: List[Dict], policy_list_key: str) -> Dict:
+    """
+    Transform the inline policies of the users, groups or roles returned by get_account_authorization_details() to
+    the shape returned by get_user_policy_data(), get_group_policy_data() and get_role_policy_data().
+    :param principal_details: The UserDetailList, GroupDetailList or RoleDetailList
+    :param policy_list_key: The key of the inline policies in each item: UserPolicyList, GroupPolicyList or
+    RolePolicyList
+    :return: A dict of principal ARN to a dict of policy name to policy statements
+    """
+    return {
+        principal['Arn']: {
+            policy['PolicyName']: policy['PolicyDocument']['Statement']
+            for policy in principal.get(policy_list_key, [])
+        }
+        for principal in principal_details
+    }
+
+
+def transform_authorization_details_managed_policies(
+    principal_details: List[Dict], managed_policies: List[Dict],
+) -> Dict:
+    """
+    Transform the managed policies attached to the users, groups or roles returned by
+    get_account_authorization_details() to the shape returned by get_user_managed_policy_data(),
+    get_group_managed_policy_data() and get_role_managed_policy_data().
+    :param principal_details: The UserDetailList, GroupDetailList or RoleDetailList
+    :param managed_policies: The Policies, with their versions
+    :return: A dict of principal ARN to a dict of policy ARN to the statements of the default policy version
+    """
+    default_statements: Dict[str, Any] = {}
+    for policy in managed_policies:
+        for version in policy.get('PolicyVersionList', []):
+            if version['IsDefaultVersion']:
+                # Go through the cache so that the statements of AWS managed policies are shared by all accounts.
+                default_statements[policy['Arn']] = get_managed_policy_statements(
+                    policy['Arn'], version['VersionId'], lambda: version['Document']['Statement'],
+                )
+
+    policies: Dict[str, Dict[str, Any]] = {}
+    for principal in principal_details:
+        policies[principal['Arn']] = {}
+        for attached_policy in principal.get('AttachedManagedPolicies', []):
+            policy_arn = attached_policy['PolicyArn']
+            if policy_arn not in default_statements:
+                logger.warning(
+                    f"Managed policy {policy_arn} attached to {principal['Arn']} was not returned by "
+                    "GetAccountAuthorizationDetails; skipping.",
+                )
+                continue
+            policies[principal['Arn']][policy_arn] = default_statements[policy_arn]
+    return policies
+
+
+def transform_authorization_details_group_memberships(user_details: List[Dict], group_details: List[Dict]) -> Dict:
+    """
+    Transform the group memberships of the users returned by get_account_authorization_details() to the shape taken
+    by load_group_memberships().
+    :param user_details: The UserDetailList
+    :param group_details: The GroupDetailList
+    :return: A dict of group ARN to a dict with the list of the users in the group
+    """
+    group_arns = {group['GroupName']: group['Arn'] for group in group_details}
+    memberships: Dict[str, Dict[str, List[Dict]]] = {arn: {'Users': []} for arn in group_arns.values()}
+    for user in user_details:
+        for group_name in user.get('GroupList', []):
+            if group_name in group_arns:
+                memberships[group_arns[group_name]]['Users'].append({'Arn': user['Arn']})
+    return memberships
+
+
 @timeit
 def get_user_list_data(boto3_session: boto3.session.Session) -> Dict:
     client = boto3_session.client('iam')
@@ -477,8 +701,15 @@ def sync_assumerole_relationships(
         AccountId=current_aws_account_id,
     )
     potential_matches = [(r["source_arn"], r["target_arn"]) for r in results]
+    # A principal trusted by several roles has its policies fetched and compiled once.
+    source_policies: Dict[str, Dict] = {}
     for source_arn, target_arn in potential_matches:
-        policies = get_policies_for_principal(neo4j_session, source_arn)
+        if source_arn not in source_policies:
+            source_policies[source_arn] = {
+                policy_id: compile_statement(statements)
+                for policy_id, statements in get_policies_for_principal(neo4j_session, source_arn).items()
+            }
+        policies = source_policies[source_arn]
         if principal_allowed_on_resource(policies, target_arn, ["sts:AssumeRole"]):
             neo4j_session.run(
                 ingest_policies_assume_role,
@@ -538,6 +769,9 @@ def _transform_policy_statements(statements: Any, policy_id: str) -> List[Dict]:
     count = 1
     if not isinstance(statements, list):
         statements = [statements]
+    # Transform copies, the statements of managed policies are cached and shared by all the principals they are
+    # attached to.
+    statements = [dict(stmt) for stmt in statements]
     for stmt in statements:
         if "Sid" in stmt and stmt["Sid"]:
             statement_id = stmt["Sid"]
@@ -559,15 +793,28 @@ def _transform_policy_statements(statements: Any, policy_id: str) -> List[Dict]:
     return statements
 
 
+def _transform_managed_policy_statements(statements: Any, policy_arn: str) -> List[Dict]:
+    key = id(statements)
+    with _managed_policy_statements_lock:
+        is_cached = key in _transformed_managed_policy_statements
+        transformed = _transformed_managed_policy_statements.get(key)
+    if transformed is None:
+        transformed = _transform_policy_statements(statements, policy_arn)
+        if is_cached:
+            with _managed_policy_statements_lock:
+                _transformed_managed_policy_statements[key] = transformed
+    return transformed
+
+
 def transform_policy_data(policy_map: Dict, policy_type: str) -> None:
     for principal_arn, policy_statement_map in policy_map.items():
         logger.debug(f"Transforming IAM {policy_type} policies for principal {principal_arn}")
         for policy_key, statements in policy_statement_map.items():
-            policy_id = transform_policy_id(
-                principal_arn,
-                policy_type,
-                policy_key,
-            ) if policy_type == PolicyType.inline.value else policy_key
+            if policy_type == PolicyType.managed.value:
+                # Each managed policy version is only transformed once, however many principals it is attached to.
+                policy_statement_map[policy_key] = _transform_managed_policy_statements(statements, policy_key)
+                continue
+            policy_id = transform_policy_id(principal_arn, policy_type, policy_key)
             policy_statement_map[policy_key] = _transform_policy_statements(statements, policy_id)
 
 
@@ -641,6 +888,40 @@ def load_policy_statements(
     ).consume()
 
 
+def transform_policy_data_for_load(
+    principal_policy_map: Dict[str, Dict[str, Any]], policy_type: str,
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Flatten the policies of the principals into the rows taken by AWSPolicySchema and AWSPolicyStatementSchema.
+    :param principal_policy_map: A dict of principal ARN to a dict of policy name or ARN to transformed statements
+    :param policy_type: The type of the policies, see PolicyType
+    :return: The policies, with the ARNs of the principals they are attached to, and the statements of each policy.
+    A managed policy attached to several principals has one row and its statements are only listed once.
+    """
+    policies: Dict[str, Dict[str, Any]] = {}
+    statements: List[Dict] = []
+    for principal_arn, policy_statement_map in principal_policy_map.items():
+        for policy_key, policy_statements in policy_statement_map.items():
+            policy_id = transform_policy_id(
+                principal_arn,
+                policy_type,
+                policy_key,
+            ) if policy_type == PolicyType.inline.value else policy_key
+            policy = policies.get(policy_id)
+            if policy is None:
+                policy = policies[policy_id] = {
+                    'id': policy_id,
+                    'name': policy_key if policy_type == PolicyType.inline.value else get_policy_name_from_arn(
+                        policy_key,
+                    ),
+                    'type': policy_type,
+                    'principal_arns': [],
+                }
+                statements.extend({**statement, 'POLICY_ID': policy_id} for statement in policy_statements)
+            policy['principal_arns'].append(principal_arn)
+    return list(policies.values()), statements
+
+
 @timeit
 def load_policy_data(
         neo4j_session: neo4j.Session,
@@ -648,31 +929,60 @@ def load_policy_data(
         policy_type: str,
         aws_update_tag: int,
 ) -> None:
-    for principal_arn, policy_statement_map in principal_policy_map.items():
-        logger.debug(f"Loading policies for principal {principal_arn}")
-        for policy_key, statements in policy_statement_map.items():
-            policy_name = policy_key if policy_type == PolicyType.inline.value else get_policy_name_from_arn(policy_key)
-            policy_id = transform_policy_id(
-                principal_arn,
-                policy_type,
-                policy_key,
-            ) if policy_type == PolicyType.inline.value else policy_key
-            load_policy(neo4j_session, policy_id, policy_name, policy_type, principal_arn, aws_update_tag)
-            load_policy_statements(neo4j_session, policy_id, policy_name, statements, aws_update_tag)
+    policies, statements = transform_policy_data_for_load(principal_policy_map, policy_type)
+    logger.debug(f"Loading {len(policies)} {policy_type} policies with {len(statements)} statements")
+    load(neo4j_session, AWSPolicySchema(), policies, lastupdated=aws_update_tag)
+    load(neo4j_session, AWSPolicyStatementSchema(), statements, lastupdated=aws_update_tag)
+
+
+def _load_principal_policies(
+    neo4j_session: neo4j.Session, policy_data: Dict, policy_type: str, aws_update_tag: int,
+) -> None:
+    transform_policy_data(policy_data, policy_type)
+    load_policy_data(neo4j_session, policy_data, policy_type, aws_update_tag)
+
+
+def _sync_principal_policies_from_authorization_details(
+    neo4j_session: neo4j.Session, principal_details: List[Dict], policy_list_key: str,
+    authorization_details: Dict[str, List[Dict]], aws_update_tag: int,
+) -> None:
+    _load_principal_policies(
+        neo4j_session,
+        transform_authorization_details_inline_policies(principal_details, policy_list_key),
+        PolicyType.inline.value,
+        aws_update_tag,
+    )
+    _load_principal_policies(
+        neo4j_session,
+        transform_authorization_details_managed_policies(principal_details, authorization_details['Policies']),
+        PolicyType.managed.value,
+        aws_update_tag,
+    )
 
 
 @timeit
 def sync_users(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, current_aws_account_id: str,
     aws_update_tag: int, common_job_parameters: Dict,
+    authorization_details: Optional[Dict[str, List[Dict]]] = None,
+    managed_policy_default_versions: Optional[Dict[str, str]] = None,
 ) -> None:
     logger.info("Syncing IAM users for account '%s'.", current_aws_account_id)
+    # The user details of get_account_authorization_details() lack PasswordLastUsed, so users are always listed.
     data = get_user_list_data(boto3_session)
     load_users(neo4j_session, data['Users'], current_aws_account_id, aws_update_tag)
 
-    sync_user_inline_policies(boto3_session, data, neo4j_session, aws_update_tag)
+    if authorization_details is not None:
+        _sync_principal_policies_from_authorization_details(
+            neo4j_session, authorization_details['UserDetailList'], 'UserPolicyList', authorization_details,
+            aws_update_tag,
+        )
+    else:
+        sync_user_inline_policies(boto3_session, data, neo4j_session, aws_update_tag)
 
-    sync_user_managed_policies(boto3_session, data, neo4j_session, aws_update_tag)
+        sync_user_managed_policies(
+            boto3_session, data, neo4j_session, aws_update_tag, managed_policy_default_versions,
+        )
 
     run_cleanup_job('aws_import_users_cleanup.json', neo4j_session, common_job_parameters)
 
@@ -680,11 +990,10 @@ def sync_users(
 @timeit
 def sync_user_managed_policies(
     boto3_session: boto3.session.Session, data: Dict, neo4j_session: neo4j.Session,
-    aws_update_tag: int,
+    aws_update_tag: int, default_versions: Optional[Dict[str, str]] = None,
 ) -> None:
-    managed_policy_data = get_user_managed_policy_data(boto3_session, data['Users'])
-    transform_policy_data(managed_policy_data, PolicyType.managed.value)
-    load_policy_data(neo4j_session, managed_policy_data, PolicyType.managed.value, aws_update_tag)
+    managed_policy_data = get_user_managed_policy_data(boto3_session, data['Users'], default_versions)
+    _load_principal_policies(neo4j_session, managed_policy_data, PolicyType.managed.value, aws_update_tag)
 
 
 @timeit
@@ -693,33 +1002,42 @@ def sync_user_inline_policies(
     aws_update_tag: int,
 ) -> None:
     policy_data = get_user_policy_data(boto3_session, data['Users'])
-    transform_policy_data(policy_data, PolicyType.inline.value)
-    load_policy_data(neo4j_session, policy_data, PolicyType.inline.value, aws_update_tag)
+    _load_principal_policies(neo4j_session, policy_data, PolicyType.inline.value, aws_update_tag)
 
 
 @timeit
 def sync_groups(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, current_aws_account_id: str,
     aws_update_tag: int, common_job_parameters: Dict,
+    authorization_details: Optional[Dict[str, List[Dict]]] = None,
+    managed_policy_default_versions: Optional[Dict[str, str]] = None,
 ) -> None:
     logger.info("Syncing IAM groups for account '%s'.", current_aws_account_id)
-    data = get_group_list_data(boto3_session)
-    load_groups(neo4j_session, data['Groups'], current_aws_account_id, aws_update_tag)
+    if authorization_details is not None:
+        group_details = authorization_details['GroupDetailList']
+        load_groups(neo4j_session, group_details, current_aws_account_id, aws_update_tag)
+        _sync_principal_policies_from_authorization_details(
+            neo4j_session, group_details, 'GroupPolicyList', authorization_details, aws_update_tag,
+        )
+    else:
+        data = get_group_list_data(boto3_session)
+        load_groups(neo4j_session, data['Groups'], current_aws_account_id, aws_update_tag)
 
-    sync_groups_inline_policies(boto3_session, data, neo4j_session, aws_update_tag)
+        sync_groups_inline_policies(boto3_session, data, neo4j_session, aws_update_tag)
 
-    sync_group_managed_policies(boto3_session, data, neo4j_session, aws_update_tag)
+        sync_group_managed_policies(
+            boto3_session, data, neo4j_session, aws_update_tag, managed_policy_default_versions,
+        )
 
     run_cleanup_job('aws_import_groups_cleanup.json', neo4j_session, common_job_parameters)
 
 
 def sync_group_managed_policies(
     boto3_session: boto3.session.Session, data: Dict, neo4j_session: neo4j.Session,
-    aws_update_tag: int,
+    aws_update_tag: int, default_versions: Optional[Dict[str, str]] = None,
 ) -> None:
-    managed_policy_data = get_group_managed_policy_data(boto3_session, data["Groups"])
-    transform_policy_data(managed_policy_data, PolicyType.managed.value)
-    load_policy_data(neo4j_session, managed_policy_data, PolicyType.managed.value, aws_update_tag)
+    managed_policy_data = get_group_managed_policy_data(boto3_session, data["Groups"], default_versions)
+    _load_principal_policies(neo4j_session, managed_policy_data, PolicyType.managed.value, aws_update_tag)
 
 
 def sync_groups_inline_policies(
@@ -727,34 +1045,44 @@ def sync_groups_inline_policies(
     aws_update_tag: int,
 ) -> None:
     policy_data = get_group_policy_data(boto3_session, data["Groups"])
-    transform_policy_data(policy_data, PolicyType.inline.value)
-    load_policy_data(neo4j_session, policy_data, PolicyType.inline.value, aws_update_tag)
+    _load_principal_policies(neo4j_session, policy_data, PolicyType.inline.value, aws_update_tag)
 
 
 @timeit
 def sync_roles(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, current_aws_account_id: str,
     aws_update_tag: int, common_job_parameters: Dict,
+    authorization_details: Optional[Dict[str, List[Dict]]] = None,
+    managed_policy_default_versions: Optional[Dict[str, str]] = None,
 ) -> None:
     logger.info("Syncing IAM roles for account '%s'.", current_aws_account_id)
-    data = get_role_list_data(boto3_session)
-    load_roles(neo4j_session, data['Roles'], current_aws_account_id, aws_update_tag)
+    if authorization_details is not None:
+        role_details = authorization_details['RoleDetailList']
+        load_roles(neo4j_session, role_details, current_aws_account_id, aws_update_tag)
+        _sync_principal_policies_from_authorization_details(
+            neo4j_session, role_details, 'RolePolicyList', authorization_details, aws_update_tag,
+        )
+    else:
+        data = get_role_list_data(boto3_session)
+        load_roles(neo4j_session, data['Roles'], current_aws_account_id, aws_update_tag)
 
-    sync_role_inline_policies(current_aws_account_id, boto3_session, data, neo4j_session, aws_update_tag)
+        sync_role_inline_policies(current_aws_account_id, boto3_session, data, neo4j_session, aws_update_tag)
 
-    sync_role_managed_policies(current_aws_account_id, boto3_session, data, neo4j_session, aws_update_tag)
+        sync_role_managed_policies(
+            current_aws_account_id, boto3_session, data, neo4j_session, aws_update_tag,
+            managed_policy_default_versions,
+        )
 
     run_cleanup_job('aws_import_roles_cleanup.json', neo4j_session, common_job_parameters)
 
 
 def sync_role_managed_policies(
     current_aws_account_id: str, boto3_session: boto3.session.Session, data: Dict,
-    neo4j_session: neo4j.Session, aws_update_tag: int,
+    neo4j_session: neo4j.Session, aws_update_tag: int, default_versions: Optional[Dict[str, str]] = None,
 ) -> None:
     logger.info("Syncing IAM role managed policies for account '%s'.", current_aws_account_id)
-    managed_policy_data = get_role_managed_policy_data(boto3_session, data["Roles"])
-    transform_policy_data(managed_policy_data, PolicyType.managed.value)
-    load_policy_data(neo4j_session, managed_policy_data, PolicyType.managed.value, aws_update_tag)
+    managed_policy_data = get_role_managed_policy_data(boto3_session, data["Roles"], default_versions)
+    _load_principal_policies(neo4j_session, managed_policy_data, PolicyType.managed.value, aws_update_tag)
 
 
 def sync_role_inline_policies(
@@ -763,20 +1091,27 @@ def sync_role_inline_policies(
 ) -> None:
     logger.info("Syncing IAM role inline policies for account '%s'.", current_aws_account_id)
     inline_policy_data = get_role_policy_data(boto3_session, data["Roles"])
-    transform_policy_data(inline_policy_data, PolicyType.inline.value)
-    load_policy_data(neo4j_session, inline_policy_data, PolicyType.inline.value, aws_update_tag)
+    _load_principal_policies(neo4j_session, inline_policy_data, PolicyType.inline.value, aws_update_tag)
 
 
 @timeit
 def sync_group_memberships(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session,
     current_aws_account_id: str, aws_update_tag: int, common_job_parameters: Dict,
+    authorization_details: Optional[Dict[str, List[Dict]]] = None,
 ) -> None:
     logger.info("Syncing IAM group membership for account '%s'.", current_aws_account_id)
-    query = "MATCH (group:AWSGroup)<-[:RESOURCE]-(:AWSAccount{id: $AWS_ACCOUNT_ID}) " \
-            "return group.name as name, group.arn as arn;"
-    groups = neo4j_session.run(query, AWS_ACCOUNT_ID=current_aws_account_id)
-    groups_membership = {group["arn"]: get_group_membership_data(boto3_session, group["name"]) for group in groups}
+    if authorization_details is not None:
+        groups_membership = transform_authorization_details_group_memberships(
+            authorization_details['UserDetailList'], authorization_details['GroupDetailList'],
+        )
+    else:
+        query = "MATCH (group:AWSGroup)<-[:RESOURCE]-(:AWSAccount{id: $AWS_ACCOUNT_ID}) " \
+                "return group.name as name, group.arn as arn;"
+        groups = neo4j_session.run(query, AWS_ACCOUNT_ID=current_aws_account_id)
+        groups_membership = {
+            group["arn"]: get_group_membership_data(boto3_session, group["name"]) for group in groups
+        }
     load_group_memberships(neo4j_session, groups_membership, aws_update_tag)
     run_cleanup_job(
         'aws_import_groups_membership_cleanup.json',
@@ -813,10 +1148,30 @@ def sync(
     logger.info("Syncing IAM for account '%s'.", current_aws_account_id)
     # This module only syncs IAM information that is in use.
     # As such only policies that are attached to a user, role or group are synced
-    sync_users(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
-    sync_groups(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
-    sync_roles(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
-    sync_group_memberships(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
+    # Users, groups, roles, their policies and group memberships are read from a single snapshot of the account's
+    # authorization details when allowed, instead of with several calls per principal.
+    authorization_details = _get_account_authorization_details_or_none(boto3_session, current_aws_account_id)
+    # Without the authorization details, the default versions of the attached managed policies are listed once for
+    # the users, groups and roles.
+    default_versions = None
+    if authorization_details is None:
+        default_versions = get_managed_policy_default_versions(boto3_session)
+    sync_users(
+        neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters,
+        authorization_details, default_versions,
+    )
+    sync_groups(
+        neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters,
+        authorization_details, default_versions,
+    )
+    sync_roles(
+        neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters,
+        authorization_details, default_versions,
+    )
+    sync_group_memberships(
+        neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters,
+        authorization_details,
+    )
     sync_assumerole_relationships(neo4j_session, current_aws_account_id, update_tag, common_job_parameters)
     sync_user_access_keys(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
     run_cleanup_job('aws_import_principals_cleanup.json', neo4j_session, common_job_parameters)
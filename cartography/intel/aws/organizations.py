@@ -5,6 +5,7 @@ import boto3
 import botocore.exceptions
 import neo4j
 
+from cartography.intel.aws.util.api_calls import register_api_call_hooks
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
@@ -60,6 +61,7 @@ def get_aws_accounts_from_botocore_config(boto3_session: boto3.session.Session)
                 e,
             )
             continue
+        register_api_call_hooks(profile_boto3_session)
         try:
             d[profile_name] = get_current_aws_account_id(profile_boto3_session)
         except (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError) as e:
@@ -257,13 +257,17 @@ def get_principals_for_account(neo4j_session: neo4j.Session, account_id: str) ->
         AccountId=account_id,
     )
     principals: Dict[Any, Any] = {}
+    # Managed policies have the same statements for every principal they are attached to, so compile them once.
+    compiled_policies: Dict[str, List[Any]] = {}
     for r in results:
         principal_arn = r["principal_arn"]
         policy_id = r["policy_id"]
         statements = r["statements"]
         if principal_arn not in principals:
             principals[principal_arn] = {}
-        principals[principal_arn][policy_id] = compile_statement(parse_statement_node(statements))
+        if policy_id not in compiled_policies:
+            compiled_policies[policy_id] = compile_statement(parse_statement_node(statements))
+        principals[principal_arn][policy_id] = compiled_policies[policy_id]
     return principals
 
 
@@ -118,7 +118,9 @@ TAG_RESOURCE_TYPE_MAPPINGS: Dict = {
 
 @timeit
 @aws_handle_regions
-def get_tags(boto3_session: boto3.session.Session, resource_type: str, region: str) -> List[Dict]:
+def get_tags(
+    boto3_session: boto3.session.Session, resource_type: str, region: str, current_aws_account_id: str = '',
+) -> List[Dict]:
     """
     Create boto3 client and retrieve tag data.
     """
@@ -126,7 +128,7 @@ def get_tags(boto3_session: boto3.session.Session, resource_type: str, region: s
     # resourcegroupstaggingapi does not support IAM roles and no ETA is provided
     # TODO: when resourcegroupstaggingapi supports iam:role, remove this condition block
     if resource_type == 'iam:role':
-        return get_role_tags(boto3_session)
+        return get_role_tags(boto3_session, current_aws_account_id)
 
     client = boto3_session.client('resourcegroupstaggingapi', region_name=region)
     paginator = client.get_paginator('get_resources')
@@ -231,10 +233,17 @@ def sync(
     common_job_parameters: Dict,
     tag_resource_type_mappings: Dict = TAG_RESOURCE_TYPE_MAPPINGS,
 ) -> None:
+    # IAM roles are global, so their tags are fetched once for the account rather than once per region.
+    role_tag_data = None
     for region in regions:
         logger.info(f"Syncing AWS tags for account {current_aws_account_id} and region {region}")
         for resource_type in tag_resource_type_mappings.keys():
-            tag_data = get_tags(boto3_session, resource_type, region)
+            if resource_type == 'iam:role':
+                if role_tag_data is None:
+                    role_tag_data = get_tags(boto3_session, resource_type, region, current_aws_account_id)
+                tag_data = role_tag_data
+            else:
+                tag_data = get_tags(boto3_session, resource_type, region)
             transform_tags(tag_data, resource_type)  # type: ignore
             logger.info(f"Loading {len(tag_data)} tags for resource type {resource_type}")
             load_tags(
@@ -2,11 +2,15 @@ import asyncio
 import hashlib
 import json
 import logging
+import os
+from itertools import islice
 from typing import Any
 from typing import Dict
 from typing import Generator
+from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import Set
 from typing import Tuple
 
 import boto3
@@ -28,24 +32,117 @@ logger = logging.getLogger(__name__)
 stat_handler = get_stats_client(__name__)
 
 
+# The number of buckets whose details are fetched at the same time.
+S3_BUCKET_DETAILS_CONCURRENCY = 50
+# The number of buckets whose details are parsed and loaded together.
+S3_DETAILS_BATCH_SIZE = 500
+# Part of the fingerprint of the details of each bucket. Bump it to reload the details of all buckets, e.g. when the way
+# they are parsed or loaded changes.
+S3_DETAILS_FINGERPRINT_VERSION = 1
+# The file in the S3 cache directory that keeps the region of each bucket between runs.
+S3_BUCKET_REGION_CACHE_FILENAME = 's3_bucket_regions.json'
+
+
 @timeit
-def get_s3_bucket_list(boto3_session: boto3.session.Session) -> List[Dict]:
+def get_s3_bucket_list(boto3_session: boto3.session.Session, cache_dir: Optional[str] = None) -> List[Dict]:
+    """
+    List the S3 buckets of the account along with their regions. The region of a bucket is taken from the
+    list_buckets() response when it is there, then from the local cache, and is otherwise looked up. Lookups run
+    concurrently.
+    :param boto3_session: The boto3 session
+    :param cache_dir: Optional directory for the local bucket region cache. Caching is disabled if None.
+    :return: The list_buckets() response, with the region of each bucket set in its 'Region' key
+    """
     client = boto3_session.client('s3')
     # NOTE no paginator available for this operation
     buckets = client.list_buckets()
+    cache_file = os.path.join(cache_dir, S3_BUCKET_REGION_CACHE_FILENAME) if cache_dir else None
+    cache = _read_bucket_region_cache(cache_file) if cache_file else {}
+
+    buckets_to_look_up = []
     for bucket in buckets['Buckets']:
-        try:
-            bucket['Region'] = client.get_bucket_location(Bucket=bucket['Name'])['LocationConstraint']
-        except ClientError as e:
-            if _is_common_exception(e, bucket):
-                bucket['Region'] = None
-                logger.warning("skipping bucket='{}' due to exception.".format(bucket['Name']))
-                continue
-            else:
-                raise
+        cached = cache.get(bucket['Name'])
+        if bucket.get('BucketRegion'):
+            bucket['Region'] = bucket['BucketRegion']
+        elif cached and cached['creation_date'] == str(bucket['CreationDate']):
+            # A bucket that is deleted and created again has a new creation date, and maybe a new region.
+            bucket['Region'] = cached['region']
+        else:
+            buckets_to_look_up.append(bucket)
+
+    logger.info(
+        f"Looking up the region of {len(buckets_to_look_up)} of {len(buckets['Buckets'])} S3 buckets.",
+    )
+    regions = to_synchronous(*[to_asynchronous(get_bucket_region, bucket, client) for bucket in buckets_to_look_up])
+    for bucket, region in zip(buckets_to_look_up, regions):
+        bucket['Region'] = region
+
+    if cache_file:
+        _write_bucket_region_cache(cache_file, cache, buckets['Buckets'])
     return buckets
 
 
+def get_bucket_region(bucket: Dict, client: botocore.client.BaseClient) -> Optional[str]:
+    """
+    Look up the region of the bucket. S3 sends it in the x-amz-bucket-region header of HeadBucket responses, including
+    error responses such as 301 and 403.
+    :return: The region, or None if it could not be retrieved
+    """
+    try:
+        response = client.head_bucket(Bucket=bucket['Name'])
+        region = response['ResponseMetadata'].get('HTTPHeaders', {}).get('x-amz-bucket-region')
+    except ClientError as e:
+        region = e.response.get('ResponseMetadata', {}).get('HTTPHeaders', {}).get('x-amz-bucket-region')
+    if region:
+        return region
+
+    # HeadBucket errors have no details, so fall back to GetBucketLocation to know whether to skip the bucket.
+    try:
+        location = client.get_bucket_location(Bucket=bucket['Name'])['LocationConstraint']
+    except ClientError as e:
+        if _is_common_exception(e, bucket):
+            logger.warning("skipping bucket='{}' due to exception.".format(bucket['Name']))
+            return None
+        else:
+            raise
+    # GetBucketLocation has no location constraint for us-east-1, and a legacy one for some eu-west-1 buckets.
+    return {None: 'us-east-1', 'EU': 'eu-west-1'}.get(location, location)
+
+
+def _read_bucket_region_cache(cache_file: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the local bucket region cache.
+    :param cache_file: Path of the cache file
+    :return: A dict of bucket name to cached entry. Empty if the cache does not exist or cannot be read.
+    """
+    if not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        logger.warning(f"Failed to read S3 bucket region cache {cache_file}; ignoring it.", exc_info=True)
+        return {}
+
+
+def _write_bucket_region_cache(cache_file: str, cache: Dict[str, Dict[str, Any]], buckets: List[Dict]) -> None:
+    """
+    Add the regions of the given buckets to the cache and write it. Buckets whose region could not be retrieved are
+    left out. Bucket names are global, so the same cache file is shared by all accounts.
+    :param cache_file: Path of the cache file
+    :param cache: The cache as returned by _read_bucket_region_cache()
+    :param buckets: The buckets, with their 'Region'
+    """
+    for bucket in buckets:
+        if bucket['Region']:
+            cache[bucket['Name']] = {'creation_date': str(bucket['CreationDate']), 'region': bucket['Region']}
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp_file = f'{cache_file}.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_file, cache_file)
+
+
 @timeit
 def get_s3_bucket_details(
         boto3_session: boto3.session.Session,
@@ -54,6 +151,10 @@ def get_s3_bucket_details(
     """
     Iterates over all S3 buckets. Yields bucket name (string), S3 bucket policies (JSON), ACLs (JSON),
     default encryption policy (JSON), Versioning (JSON), and Public Access Block (JSON)
+
+    The details of at most S3_BUCKET_DETAILS_CONCURRENCY buckets are fetched at the same time. The details of each
+    bucket are yielded as soon as they are fetched, in no particular order, and the next buckets are fetched while the
+    caller processes them.
     """
     # a local store for s3 clients so that we may re-use clients for an AWS region
     s3_regional_clients: Dict[Any, Any] = {}
@@ -61,9 +162,7 @@ def get_s3_bucket_details(
     BucketDetail = Tuple[str, Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any]]
 
     async def _get_bucket_detail(bucket: Dict[str, Any]) -> BucketDetail:
-        # Note: bucket['Region'] is sometimes None because
-        # client.get_bucket_location() does not return a location constraint for buckets
-        # in us-east-1 region
+        # Note: bucket['Region'] is None when the region of the bucket could not be retrieved
         client = s3_regional_clients.get(bucket['Region'])
         if not client:
             client = boto3_session.client('s3', bucket['Region'])
@@ -83,8 +182,17 @@ def get_s3_bucket_details(
         )
         return bucket['Name'], acl, policy, encryption, versioning, public_access_block
 
-    bucket_details = to_synchronous(*[_get_bucket_detail(bucket) for bucket in bucket_data['Buckets']])
-    yield from bucket_details
+    loop = asyncio.get_event_loop()
+    buckets = iter(bucket_data['Buckets'])
+    pending: Set[asyncio.Future] = set()
+    while True:
+        for bucket in islice(buckets, S3_BUCKET_DETAILS_CONCURRENCY - len(pending)):
+            pending.add(loop.create_task(_get_bucket_detail(bucket)))
+        if not pending:
+            return
+        done, pending = loop.run_until_complete(asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED))
+        for task in done:
+            yield task.result()
 
 
 @timeit
@@ -231,6 +339,11 @@ def _load_s3_acls(
     """
     Ingest S3 ACL into neo4j.
     """
+    _ingest_s3_acls(neo4j_session, acls, update_tag)
+    _run_s3_acl_analysis(neo4j_session, aws_account_id, list({acl['bucket'] for acl in acls}))
+
+
+def _ingest_s3_acls(neo4j_session: neo4j.Session, acls: List[Dict[str, Any]], update_tag: int) -> None:
     ingest_acls = """
     UNWIND $acls AS acl
     MERGE (a:S3Acl{id: acl.id})
@@ -249,12 +362,15 @@ def _load_s3_acls(
         UpdateTag=update_tag,
     )
 
+
+def _run_s3_acl_analysis(neo4j_session: neo4j.Session, aws_account_id: str, bucket_ids: List[str]) -> None:
     # implement the acl permission
     # https://docs.aws.amazon.com/AmazonS3/latest/dev/acl-overview.html#permissions
+    # NOTE the job appends to anonymous_actions, so it must run once for each bucket whose details were reset.
     run_analysis_job(
         'aws_s3acl_analysis.json',
         neo4j_session,
-        {'AWS_ID': aws_account_id},
+        {'AWS_ID': aws_account_id, 'BUCKET_IDS': bucket_ids},
     )
 
 
@@ -398,21 +514,102 @@ def _set_default_values(neo4j_session: neo4j.Session, aws_account_id: str) -> No
     )
 
 
+def get_s3_details_fingerprint(
+    acl: Optional[Dict], policy: Optional[Dict], encryption: Optional[Dict], versioning: Optional[Dict],
+    public_access_block: Optional[Dict],
+) -> str:
+    """
+    Return a hash of the detail documents of a bucket, which changes whenever any of them changes.
+    """
+    details = [S3_DETAILS_FINGERPRINT_VERSION, acl, policy, encryption, versioning, public_access_block]
+    return hashlib.sha256(json.dumps(details, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _get_s3_details_fingerprints(neo4j_session: neo4j.Session, aws_account_id: str) -> Dict[str, str]:
+    query = """
+    MATCH (:AWSAccount{id: $AWS_ID})-[:RESOURCE]->(s:S3Bucket)
+    WHERE s.details_fingerprint IS NOT NULL
+    RETURN s.id AS bucket, s.details_fingerprint AS fingerprint
+    """
+    return {r['bucket']: r['fingerprint'] for r in neo4j_session.run(query, AWS_ID=aws_account_id)}
+
+
 @timeit
 def load_s3_details(
-    neo4j_session: neo4j.Session, s3_details_iter: Generator[Any, Any, Any], aws_account_id: str,
+    neo4j_session: neo4j.Session, s3_details_iter: Iterable[Any], aws_account_id: str,
     update_tag: int,
 ) -> None:
     """
-    Create dictionaries for all bucket ACLs and all bucket policies so we can import them in a single query for each
+    Parse the details of the buckets as they are fetched, and load them in batches of S3_DETAILS_BATCH_SIZE buckets
+    so that the details of all the buckets are never held in memory at once.
+
+    The details of a bucket are only loaded if their fingerprint differs from the one stored on the bucket by the
+    previous sync. The S3Acls and S3PolicyStatements of the other buckets are marked as updated and kept as they are.
+    """
+    fingerprints = _get_s3_details_fingerprints(neo4j_session, aws_account_id)
+    details_batch: List[Tuple] = []
+    unchanged_buckets: List[str] = []
+    for bucket_details in s3_details_iter:
+        fingerprint = get_s3_details_fingerprint(*bucket_details[1:])
+        if fingerprints.get(bucket_details[0]) == fingerprint:
+            unchanged_buckets.append(bucket_details[0])
+            if len(unchanged_buckets) >= S3_DETAILS_BATCH_SIZE:
+                _touch_unchanged_s3_details(neo4j_session, unchanged_buckets, update_tag)
+                unchanged_buckets = []
+            continue
+        details_batch.append((*bucket_details, fingerprint))
+        if len(details_batch) >= S3_DETAILS_BATCH_SIZE:
+            _load_s3_details_batch(neo4j_session, details_batch, aws_account_id, update_tag)
+            details_batch = []
+    _load_s3_details_batch(neo4j_session, details_batch, aws_account_id, update_tag)
+    _touch_unchanged_s3_details(neo4j_session, unchanged_buckets, update_tag)
+
+    _set_default_values(neo4j_session, aws_account_id)
+
+
+@timeit
+def _touch_unchanged_s3_details(neo4j_session: neo4j.Session, buckets: List[str], update_tag: int) -> None:
+    if not buckets:
+        return
+    touch_details = """
+    UNWIND $Buckets AS bucket_name
+    MATCH (s:S3Bucket{id: bucket_name})
+    OPTIONAL MATCH (s)<-[acl_rel:APPLIES_TO]-(acl:S3Acl)
+    SET acl.lastupdated = $UpdateTag, acl_rel.lastupdated = $UpdateTag
+    WITH DISTINCT s
+    OPTIONAL MATCH (s)-[statement_rel:POLICY_STATEMENT]->(statement:S3PolicyStatement)
+    SET statement.lastupdated = $UpdateTag, statement_rel.lastupdated = $UpdateTag
     """
+    neo4j_session.run(
+        touch_details,
+        Buckets=buckets,
+        UpdateTag=update_tag,
+    ).consume()
+
+
+def _load_s3_details_batch(
+    neo4j_session: neo4j.Session, details_batch: List[Tuple], aws_account_id: str, update_tag: int,
+) -> None:
+    """
+    Create dictionaries for the ACLs and policies of a batch of buckets so we can import them in a single query for each
+    """
+    if not details_batch:
+        return
+    bucket_ids = [details[0] for details in details_batch]
+    # cleanup existing policy properties set on these S3 Buckets
+    run_cleanup_job(
+        'aws_s3_details.json',
+        neo4j_session,
+        {'UPDATE_TAG': update_tag, 'AWS_ID': aws_account_id, 'BUCKET_IDS': bucket_ids},
+    )
+
     acls: List[Dict] = []
     policies: List[Dict] = []
     statements = []
     encryption_configs: List[Dict] = []
     versioning_configs: List[Dict] = []
     public_access_block_configs: List[Dict] = []
-    for bucket, acl, policy, encryption, versioning, public_access_block in s3_details_iter:
+    for bucket, acl, policy, encryption, versioning, public_access_block, _ in details_batch:
         parsed_acls = parse_acl(acl, bucket, aws_account_id)
         if parsed_acls is not None:
             acls.extend(parsed_acls)
@@ -432,21 +629,30 @@ def load_s3_details(
         if parsed_public_access_block is not None:
             public_access_block_configs.append(parsed_public_access_block)
 
-    # cleanup existing policy properties set on S3 Buckets
-    run_cleanup_job(
-        'aws_s3_details.json',
-        neo4j_session,
-        {'UPDATE_TAG': update_tag, 'AWS_ID': aws_account_id},
-    )
-
-    _load_s3_acls(neo4j_session, acls, aws_account_id, update_tag)
-
+    _ingest_s3_acls(neo4j_session, acls, update_tag)
     _load_s3_policies(neo4j_session, policies, update_tag)
     _load_s3_policy_statements(neo4j_session, statements, update_tag)
     _load_s3_encryption(neo4j_session, encryption_configs, update_tag)
     _load_s3_versioning(neo4j_session, versioning_configs, update_tag)
     _load_s3_public_access_block(neo4j_session, public_access_block_configs, update_tag)
-    _set_default_values(neo4j_session, aws_account_id)
+    _run_s3_acl_analysis(neo4j_session, aws_account_id, bucket_ids)
+    _set_s3_details_fingerprints(
+        neo4j_session,
+        [{'bucket': details[0], 'fingerprint': details[-1]} for details in details_batch],
+    )
+
+
+def _set_s3_details_fingerprints(neo4j_session: neo4j.Session, fingerprints: List[Dict]) -> None:
+    # Set last, so that a bucket whose details failed to load is loaded again by the next sync.
+    set_fingerprints = """
+    UNWIND $Fingerprints AS fingerprint
+    MATCH (s:S3Bucket{id: fingerprint.bucket})
+    SET s.details_fingerprint = fingerprint.fingerprint
+    """
+    neo4j_session.run(
+        set_fingerprints,
+        Fingerprints=fingerprints,
+    ).consume()
 
 
 @timeit
@@ -741,7 +947,7 @@ def sync(
     update_tag: int, common_job_parameters: Dict,
 ) -> None:
     logger.info("Syncing S3 for account '%s'.", current_aws_account_id)
-    bucket_data = get_s3_bucket_list(boto3_session)
+    bucket_data = get_s3_bucket_list(boto3_session, common_job_parameters.get('aws_s3_cache_dir'))
 
     load_s3_buckets(neo4j_session, bucket_data, current_aws_account_id, update_tag)
     cleanup_s3_buckets(neo4j_session, common_job_parameters)
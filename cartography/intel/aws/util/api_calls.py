@@ -0,0 +1,235 @@
+"""
+Accounting of the AWS API calls made during the sync.
+
+`register_api_call_hooks()` installs botocore event handlers on a boto3 session. For every service, region and
+operation they count the calls, the retries and throttled attempts, the errors, the bytes sent and received, the time
+spent in calls and the time botocore waited before retrying. The numbers are sent to statsd as they are recorded,
+logged at the end of the AWS sync and added to the profile report.
+"""
+import logging
+import threading
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+from urllib.parse import urlencode
+
+import boto3
+
+from cartography.profiler import record_api_calls
+from cartography.profiler import record_backoff
+from cartography.profiler import register_report_section
+from cartography.stats import get_stats_client
+
+logger = logging.getLogger(__name__)
+stat_handler = get_stats_client('aws.api')
+
+# Error codes that botocore treats as throttling, see botocore.retries.standard.
+THROTTLING_ERROR_CODES = {
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'RequestThrottledException',
+    'TooManyRequestsException',
+    'ProvisionedThroughputExceededException',
+    'TransactionInProgressException',
+    'RequestLimitExceeded',
+    'BandwidthLimitExceeded',
+    'LimitExceededException',
+    'RequestThrottled',
+    'SlowDown',
+    'PriorRequestNotComplete',
+    'EC2ThrottledException',
+}
+
+# Keys under which the handlers keep the state of a call in its botocore request context.
+_OPERATION_KEY = 'cartography_operation'
+_START_KEY = 'cartography_call_start'
+_REQUEST_BYTES_KEY = 'cartography_request_bytes'
+_THROTTLES_KEY = 'cartography_throttles'
+_RETRY_CHECKED_KEY = 'cartography_retry_checked_at'
+_BACKOFF_KEY = 'cartography_backoff_seconds'
+
+
+@dataclass
+class AWSApiCallStats:
+    """
+    The numbers recorded for the calls to one operation of one service in one region.
+    """
+    service: str
+    region: str
+    operation: str
+    calls: int = 0
+    retries: int = 0
+    throttles: int = 0
+    errors: int = 0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    seconds: float = 0.0
+    backoff_seconds: float = 0.0
+
+
+_stats: Dict[Tuple[str, str, str], AWSApiCallStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _body_size(body: Any) -> int:
+    if isinstance(body, bytes):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+    if isinstance(body, dict):
+        # Query protocol bodies are form-encoded when the request is prepared.
+        return len(urlencode(body, doseq=True))
+    return 0
+
+
+def _error_code(response: Any) -> str:
+    if not response:
+        return ''
+    _, parsed = response
+    return parsed.get('Error', {}).get('Code', '') if isinstance(parsed, dict) else ''
+
+
+def _before_call(model: Any, context: Dict[str, Any], **kwargs: Any) -> None:
+    context[_OPERATION_KEY] = (model.service_model.service_name, model.name)
+    context[_START_KEY] = time.perf_counter()
+    context[_REQUEST_BYTES_KEY] = 0
+    context[_THROTTLES_KEY] = 0
+    context[_BACKOFF_KEY] = 0.0
+    record_api_calls()
+
+
+def _request_created(request: Any, **kwargs: Any) -> None:
+    context = request.context
+    context[_REQUEST_BYTES_KEY] = context.get(_REQUEST_BYTES_KEY, 0) + _body_size(request.body)
+    # A request created after a retry check is a retry, and the time in between was spent sleeping in backoff.
+    retry_checked_at = context.pop(_RETRY_CHECKED_KEY, None)
+    if retry_checked_at is not None:
+        context[_BACKOFF_KEY] = context.get(_BACKOFF_KEY, 0.0) + time.perf_counter() - retry_checked_at
+
+
+def _needs_retry(request_dict: Dict[str, Any], response: Any = None, **kwargs: Any) -> None:
+    context = request_dict['context']
+    if _error_code(response) in THROTTLING_ERROR_CODES:
+        context[_THROTTLES_KEY] = context.get(_THROTTLES_KEY, 0) + 1
+    context[_RETRY_CHECKED_KEY] = time.perf_counter()
+
+
+def _record(context: Dict[str, Any], retries: int, error: bool, response_bytes: int) -> None:
+    if _OPERATION_KEY not in context:
+        # The call was made before the handlers were installed.
+        return
+    service, operation = context[_OPERATION_KEY]
+    key = (service, context.get('client_region') or 'none', operation)
+    seconds = time.perf_counter() - context[_START_KEY]
+    request_bytes = context.get(_REQUEST_BYTES_KEY, 0)
+    throttles = context.get(_THROTTLES_KEY, 0)
+    backoff_seconds = context.get(_BACKOFF_KEY, 0.0)
+
+    with _stats_lock:
+        stats = _stats.get(key)
+        if stats is None:
+            stats = _stats[key] = AWSApiCallStats(*key)
+        stats.calls += 1
+        stats.retries += retries
+        stats.throttles += throttles
+        stats.errors += int(error)
+        stats.request_bytes += request_bytes
+        stats.response_bytes += response_bytes
+        stats.seconds += seconds
+        stats.backoff_seconds += backoff_seconds
+
+    if backoff_seconds:
+        record_backoff(backoff_seconds)
+    prefix = '.'.join(key)
+    stat_handler.incr(f'{prefix}.calls')
+    stat_handler.timing(f'{prefix}.duration', seconds * 1000)
+    stat_handler.incr(f'{prefix}.request_bytes', request_bytes)
+    stat_handler.incr(f'{prefix}.response_bytes', response_bytes)
+    if retries:
+        stat_handler.incr(f'{prefix}.retries', retries)
+    if throttles:
+        stat_handler.incr(f'{prefix}.throttles', throttles)
+    if error:
+        stat_handler.incr(f'{prefix}.errors')
+
+
+def _after_call(
+    http_response: Any,
+    parsed: Dict[str, Any],
+    model: Any,
+    context: Dict[str, Any],
+    **kwargs: Any,
+) -> None:
+    content_length = http_response.headers.get('content-length')
+    if content_length is not None:
+        response_bytes = int(content_length)
+    elif not model.has_streaming_output and http_response.raw is not None:
+        response_bytes = len(http_response.content)
+    else:
+        # Reading the content of a streaming response here would consume it.
+        response_bytes = 0
+    _record(
+        context,
+        retries=parsed.get('ResponseMetadata', {}).get('RetryAttempts', 0),
+        error=http_response.status_code >= 300,
+        response_bytes=response_bytes,
+    )
+
+
+def _after_call_error(context: Dict[str, Any], **kwargs: Any) -> None:
+    # Raised when no response was received, e.g. on connection errors once botocore has run out of retries.
+    _record(context, retries=0, error=True, response_bytes=0)
+
+
+def register_api_call_hooks(boto3_session: boto3.session.Session) -> None:
+    """
+    Install the API call accounting handlers on the session. Clients created from the session afterwards are
+    accounted for. Installing the handlers more than once on the same session has no further effect.
+    :param boto3_session: The boto3 session
+    """
+    events = boto3_session.events
+    # before-call is emitted until a handler returns a response, and handlers registered for more specific event names
+    # run first. Registering for the most specific names makes this handler run before any that short-circuit the call.
+    events.register('before-call.*.*', _before_call, unique_id='cartography-api-calls-before-call')
+    events.register('request-created', _request_created, unique_id='cartography-api-calls-request-created')
+    events.register('needs-retry', _needs_retry, unique_id='cartography-api-calls-needs-retry')
+    events.register('after-call', _after_call, unique_id='cartography-api-calls-after-call')
+    events.register('after-call-error', _after_call_error, unique_id='cartography-api-calls-after-call-error')
+
+
+def get_api_call_stats() -> List[AWSApiCallStats]:
+    """
+    Return the numbers recorded so far for each service, region and operation, by decreasing number of calls.
+    """
+    with _stats_lock:
+        stats = [AWSApiCallStats(**asdict(s)) for s in _stats.values()]
+    return sorted(stats, key=lambda s: (-s.calls, s.service, s.region, s.operation))
+
+
+def log_api_call_summary() -> None:
+    """
+    Log the number of calls, retries, throttled attempts and errors and the time spent of each service and region.
+    """
+    totals: Dict[Tuple[str, str], AWSApiCallStats] = {}
+    for stats in get_api_call_stats():
+        total = totals.setdefault((stats.service, stats.region), AWSApiCallStats(stats.service, stats.region, '*'))
+        total.calls += stats.calls
+        total.retries += stats.retries
+        total.throttles += stats.throttles
+        total.errors += stats.errors
+        total.seconds += stats.seconds
+        total.backoff_seconds += stats.backoff_seconds
+    for total in sorted(totals.values(), key=lambda t: -t.seconds):
+        logger.info(
+            f"AWS API calls to {total.service} in {total.region}: {total.calls} calls, {total.retries} retries, "
+            f"{total.throttles} throttled, {total.errors} errors, {total.seconds:.1f}s in calls, "
+            f"{total.backoff_seconds:.1f}s in backoff.",
+        )
+
+
+register_report_section('AWS API calls', lambda: [asdict(s) for s in get_api_call_stats()])
@@ -1,4 +1,10 @@
 import logging
+from collections import namedtuple
+from concurrent.futures import as_completed
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -11,6 +17,7 @@ from . import sql
 from . import storage
 from . import subscription
 from . import tenant
+from .util.common import close_cached_clients
 from .util.credentials import Authenticator
 from .util.credentials import Credentials
 from cartography.config import Config
@@ -18,15 +25,31 @@ from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Number of Azure subscriptions whose API calls are made concurrently.
+AZURE_MAX_CONCURRENT_SUBSCRIPTIONS = 4
 
-def _sync_one_subscription(
-    neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str, update_tag: int,
+SubscriptionData = namedtuple('SubscriptionData', 'compute cosmosdb sql storage')
+
+
+def _get_subscription_data(credentials: Credentials, subscription_id: str) -> SubscriptionData:
+    logger.info("Fetching Azure Subscription with ID '%s'", subscription_id)
+    return SubscriptionData(
+        compute=compute.get_subscription_data(credentials.arm_credentials, subscription_id),
+        cosmosdb=cosmosdb.get_subscription_data(credentials.arm_credentials, subscription_id),
+        sql=sql.get_subscription_data(credentials.arm_credentials, subscription_id),
+        storage=storage.get_subscription_data(credentials.arm_credentials, subscription_id),
+    )
+
+
+def _load_subscription_data(
+    neo4j_session: neo4j.Session, subscription_id: str, data: SubscriptionData, update_tag: int,
     common_job_parameters: Dict,
 ) -> None:
-    compute.sync(neo4j_session, credentials.arm_credentials, subscription_id, update_tag, common_job_parameters)
-    cosmosdb.sync(neo4j_session, credentials.arm_credentials, subscription_id, update_tag, common_job_parameters)
-    sql.sync(neo4j_session, credentials.arm_credentials, subscription_id, update_tag, common_job_parameters)
-    storage.sync(neo4j_session, credentials.arm_credentials, subscription_id, update_tag, common_job_parameters)
+    logger.info("Loading Azure Subscription with ID '%s'", subscription_id)
+    compute.load_subscription_data(neo4j_session, subscription_id, data.compute, update_tag, common_job_parameters)
+    cosmosdb.load_subscription_data(neo4j_session, subscription_id, data.cosmosdb, update_tag, common_job_parameters)
+    sql.load_subscription_data(neo4j_session, subscription_id, data.sql, update_tag, common_job_parameters)
+    storage.load_subscription_data(neo4j_session, subscription_id, data.storage, update_tag, common_job_parameters)
 
 
 def _sync_tenant(
@@ -45,13 +68,33 @@ def _sync_multiple_subscriptions(
 
     subscription.sync(neo4j_session, tenant_id, subscriptions, update_tag, common_job_parameters)
 
-    for sub in subscriptions:
-        logger.info("Syncing Azure Subscription with ID '%s'", sub['subscriptionId'])
-        common_job_parameters['AZURE_SUBSCRIPTION_ID'] = sub['subscriptionId']
+    # The API calls of up to AZURE_MAX_CONCURRENT_SUBSCRIPTIONS subscriptions run on a thread pool, while this thread
+    # loads each subscription's data to Neo4j as soon as it has been fetched.
+    pending: Dict[Future, str] = {}
 
-        _sync_one_subscription(neo4j_session, credentials, sub['subscriptionId'], update_tag, common_job_parameters)
+    def load(future: Future) -> None:
+        subscription_id = pending.pop(future)
+        _load_subscription_data(
+            neo4j_session, subscription_id, future.result(), update_tag,
+            {**common_job_parameters, 'AZURE_SUBSCRIPTION_ID': subscription_id},
+        )
 
-    del common_job_parameters["AZURE_SUBSCRIPTION_ID"]
+    with ThreadPoolExecutor(max_workers=AZURE_MAX_CONCURRENT_SUBSCRIPTIONS) as executor:
+        try:
+            for sub in subscriptions:
+                if len(pending) >= AZURE_MAX_CONCURRENT_SUBSCRIPTIONS:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        load(future)
+                pending[executor.submit(_get_subscription_data, credentials, sub['subscriptionId'])] = (
+                    sub['subscriptionId']
+                )
+            for future in as_completed(list(pending)):
+                load(future)
+        finally:
+            # Don't start any more subscriptions if we are bailing out early.
+            for future in pending:
+                future.cancel()
 
 
 @timeit
@@ -96,7 +139,10 @@ def start_azure_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
         )
         return
 
-    _sync_multiple_subscriptions(
-        neo4j_session, credentials, credentials.get_tenant_id(), subscriptions, config.update_tag,
-        common_job_parameters,
-    )
+    try:
+        _sync_multiple_subscriptions(
+            neo4j_session, credentials, credentials.get_tenant_id(), subscriptions, config.update_tag,
+            common_job_parameters,
+        )
+    finally:
+        close_cached_clients()
@@ -1,4 +1,5 @@
 import logging
+from collections import namedtuple
 from typing import Dict
 from typing import List
 
@@ -6,6 +7,7 @@ import neo4j
 from azure.core.exceptions import HttpResponseError
 from azure.mgmt.compute import ComputeManagementClient
 
+from .util.common import get_cached_client
 from .util.credentials import Credentials
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
@@ -14,8 +16,7 @@ logger = logging.getLogger(__name__)
 
 
 def get_client(credentials: Credentials, subscription_id: str) -> ComputeManagementClient:
-    client = ComputeManagementClient(credentials, subscription_id)
-    return client
+    return get_cached_client(ComputeManagementClient, credentials, subscription_id)
 
 
 def get_vm_list(credentials: Credentials, subscription_id: str) -> List[Dict]:
@@ -189,30 +190,33 @@ def cleanup_snapshot(neo4j_session: neo4j.Session, common_job_parameters: Dict)
     run_cleanup_job('azure_import_snapshots_cleanup.json', neo4j_session, common_job_parameters)
 
 
-def sync_virtual_machine(
-    neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str, update_tag: int,
-    common_job_parameters: Dict,
-) -> None:
-    vm_list = get_vm_list(credentials, subscription_id)
-    load_vms(neo4j_session, subscription_id, vm_list, update_tag)
-    cleanup_virtual_machine(neo4j_session, common_job_parameters)
+# All compute data of a subscription, as returned by `get_subscription_data()`.
+ComputeData = namedtuple('ComputeData', 'vms disks snapshots')
 
 
-def sync_disk(
-    neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str, update_tag: int,
-    common_job_parameters: Dict,
-) -> None:
-    disk_list = get_disks(credentials, subscription_id)
-    load_disks(neo4j_session, subscription_id, disk_list, update_tag)
-    cleanup_disks(neo4j_session, common_job_parameters)
+def get_subscription_data(credentials: Credentials, subscription_id: str) -> ComputeData:
+    """
+    Fetch the VMs, disks and snapshots of the subscription. This makes no Neo4j calls, so it can run on a worker thread.
+    """
+    return ComputeData(
+        vms=get_vm_list(credentials, subscription_id),
+        disks=get_disks(credentials, subscription_id),
+        snapshots=get_snapshots_list(credentials, subscription_id),
+    )
 
 
-def sync_snapshot(
-    neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str, update_tag: int,
+def load_subscription_data(
+    neo4j_session: neo4j.Session, subscription_id: str, data: ComputeData, update_tag: int,
     common_job_parameters: Dict,
 ) -> None:
-    snapshots = get_snapshots_list(credentials, subscription_id)
-    load_snapshots(neo4j_session, subscription_id, snapshots, update_tag)
+    """
+    Ingest the output of `get_subscription_data()` into neo4j and clean up stale compute data of the subscription.
+    """
+    load_vms(neo4j_session, subscription_id, data.vms, update_tag)
+    cleanup_virtual_machine(neo4j_session, common_job_parameters)
+    load_disks(neo4j_session, subscription_id, data.disks, update_tag)
+    cleanup_disks(neo4j_session, common_job_parameters)
+    load_snapshots(neo4j_session, subscription_id, data.snapshots, update_tag)
     cleanup_snapshot(neo4j_session, common_job_parameters)
 
 
@@ -222,7 +226,5 @@ def sync(
     common_job_parameters: Dict,
 ) -> None:
     logger.info("Syncing VM for subscription '%s'.", subscription_id)
-
-    sync_virtual_machine(neo4j_session, credentials, subscription_id, update_tag, common_job_parameters)
-    sync_disk(neo4j_session, credentials, subscription_id, update_tag, common_job_parameters)
-    sync_snapshot(neo4j_session, credentials, subscription_id, update_tag, common_job_parameters)
+    data = get_subscription_data(credentials, subscription_id)
+    load_subscription_data(neo4j_session, subscription_id, data, update_tag, common_job_parameters)
@@ -1,8 +1,8 @@
 import logging
 import uuid
+from collections import namedtuple
 from typing import Any
 from typing import Dict
-from typing import Generator
 from typing import List
 from typing import Tuple
 
@@ -12,7 +12,23 @@ from azure.core.exceptions import HttpResponseError
 from azure.core.exceptions import ResourceNotFoundError
 from azure.mgmt.cosmosdb import CosmosDBManagementClient
 
+from .util.common import get_cached_client
+from .util.common import map_concurrently
 from .util.credentials import Credentials
+from cartography.client.core.tx import load
+from cartography.models.azure.cosmosdb import AzureCDBPrivateEndpointConnectionSchema
+from cartography.models.azure.cosmosdb import AzureCosmosDBAccountFailoverPolicySchema
+from cartography.models.azure.cosmosdb import AzureCosmosDBAccountSchema
+from cartography.models.azure.cosmosdb import AzureCosmosDBCassandraKeyspaceSchema
+from cartography.models.azure.cosmosdb import AzureCosmosDBCassandraTableSchema
+from cartography.models.azure.cosmosdb import AzureCosmosDBCorsPolicySchema
+from cartography.models.azure.cosmosdb import AzureCosmosDBLocationSchema
+from cartography.models.azure.cosmosdb import AzureCosmosDBMongoDBCollectionSchema
+from cartography.models.azure.cosmosdb import AzureCosmosDBMongoDBDatabaseSchema
+from cartography.models.azure.cosmosdb import AzureCosmosDBSqlContainerSchema
+from cartography.models.azure.cosmosdb import AzureCosmosDBSqlDatabaseSchema
+from cartography.models.azure.cosmosdb import AzureCosmosDBTableResourceSchema
+from cartography.models.azure.cosmosdb import AzureCosmosDBVirtualNetworkRuleSchema
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
@@ -24,8 +40,7 @@ def get_client(credentials: Credentials, subscription_id: str) -> CosmosDBManage
     """
     Getting the CosmosDB client
     """
-    client = CosmosDBManagementClient(credentials, subscription_id)
-    return client
+    return get_cached_client(CosmosDBManagementClient, credentials, subscription_id)
 
 
 @timeit
@@ -80,45 +95,12 @@ def load_database_account_data(
     """
     Ingest data of all database accounts into neo4j.
     """
-    ingest_database_account = """
-    UNWIND $database_accounts_list AS da
-    MERGE (d:AzureCosmosDBAccount{id: da.id})
-    ON CREATE SET d.firstseen = timestamp(),
-    d.type = da.type, d.resourcegroup = da.resourceGroup,
-    d.location = da.location
-    SET d.lastupdated = $azure_update_tag,
-    d.kind = da.kind,
-    d.name = da.name,
-    d.ipranges = da.ipruleslist,
-    d.capabilities = da.list_of_capabilities,
-    d.documentendpoint = da.document_endpoint,
-    d.virtualnetworkfilterenabled = da.is_virtual_network_filter_enabled,
-    d.enableautomaticfailover = da.enable_automatic_failover,
-    d.provisioningstate = da.provisioning_state,
-    d.multiplewritelocations = da.enable_multiple_write_locations,
-    d.accountoffertype = da.database_account_offer_type,
-    d.publicnetworkaccess = da.public_network_access,
-    d.enablecassandraconnector = da.enable_cassandra_connector,
-    d.connectoroffer = da.connector_offer,
-    d.disablekeybasedmetadatawriteaccess = da.disable_key_based_metadata_write_access,
-    d.keyvaulturi = da.key_vault_key_uri,
-    d.enablefreetier = da.enable_free_tier,
-    d.enableanalyticalstorage = da.enable_analytical_storage,
-    d.defaultconsistencylevel = da.consistency_policy.default_consistency_level,
-    d.maxstalenessprefix = da.consistency_policy.max_staleness_prefix,
-    d.maxintervalinseconds = da.consistency_policy.max_interval_in_seconds
-    WITH d
-    MATCH (owner:AzureSubscription{id: $AZURE_SUBSCRIPTION_ID})
-    MERGE (owner)-[r:RESOURCE]->(d)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_database_account,
-        database_accounts_list=database_account_list,
+    load(
+        neo4j_session,
+        AzureCosmosDBAccountSchema(),
+        database_account_list,
+        lastupdated=azure_update_tag,
         AZURE_SUBSCRIPTION_ID=subscription_id,
-        azure_update_tag=azure_update_tag,
     )
 
 
@@ -129,123 +111,72 @@ def sync_database_account_data_resources(
     """
     This function calls the load functions for the resources that are present as a part of the database account
     response (like cors policy, failover policy, private endpoint connections, virtual network rules and locations).
+    Each kind of resource is gathered across all the database accounts of the subscription and written in one batch.
     """
-    for database_account in database_account_list:
-        _load_cosmosdb_cors_policy(neo4j_session, database_account, azure_update_tag)
-        _load_cosmosdb_failover_policies(neo4j_session, database_account, azure_update_tag)
-        _load_cosmosdb_private_endpoint_connections(neo4j_session, database_account, azure_update_tag)
-        _load_cosmosdb_virtual_network_rules(neo4j_session, database_account, azure_update_tag)
-        _load_database_account_write_locations(neo4j_session, database_account, azure_update_tag)
-        _load_database_account_read_locations(neo4j_session, database_account, azure_update_tag)
-        _load_database_account_associated_locations(neo4j_session, database_account, azure_update_tag)
+    _load_cosmosdb_cors_policy(neo4j_session, database_account_list, azure_update_tag)
+    _load_cosmosdb_failover_policies(neo4j_session, database_account_list, azure_update_tag)
+    _load_cosmosdb_private_endpoint_connections(neo4j_session, database_account_list, azure_update_tag)
+    _load_cosmosdb_virtual_network_rules(neo4j_session, database_account_list, azure_update_tag)
+    _load_database_account_write_locations(neo4j_session, database_account_list, azure_update_tag)
+    _load_database_account_read_locations(neo4j_session, database_account_list, azure_update_tag)
+    _load_database_account_associated_locations(neo4j_session, database_account_list, azure_update_tag)
+
+
+def _flatten_account_resources(database_account_list: List[Dict], key: str, account_id_key: str) -> List[Dict]:
+    """
+    Collect the resources listed under `key` in each database account response, tagging each with the id of its
+    account under `account_id_key`.
+    """
+    return [
+        {**resource, account_id_key: database_account['id']}
+        for database_account in database_account_list
+        for resource in database_account.get(key) or []
+    ]
 
 
 @timeit
 def _load_database_account_write_locations(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
-    Ingest the details of location with write permission enabled.
-    """
-    if 'write_locations' in database_account and len(database_account['write_locations']) > 0:
-        database_account_id = database_account['id']
-        write_locations = database_account['write_locations']
-
-        ingest_write_location = """
-        UNWIND $write_locations_list as wl
-        MERGE (loc:AzureCosmosDBLocation{id: wl.id})
-        ON CREATE SET loc.firstseen = timestamp()
-        SET loc.lastupdated = $azure_update_tag,
-        loc.locationname = wl.location_name,
-        loc.documentendpoint = wl.document_endpoint,
-        loc.provisioningstate = wl.provisioning_state,
-        loc.failoverpriority = wl.failover_priority,
-        loc.iszoneredundant = wl.is_zone_redundant
-        WITH loc
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:CAN_WRITE_FROM]->(loc)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_write_location,
-            write_locations_list=write_locations,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
+    Ingest the details of locations with write permission enabled.
+    """
+    load(
+        neo4j_session,
+        AzureCosmosDBLocationSchema(),
+        _flatten_account_resources(database_account_list, 'write_locations', 'write_database_account_id'),
+        lastupdated=azure_update_tag,
+    )
 
 
 @timeit
 def _load_database_account_read_locations(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
-    Ingest the details of location with read permission enabled.
-    """
-    if 'read_locations' in database_account and len(database_account['read_locations']) > 0:
-        database_account_id = database_account['id']
-        read_locations = database_account['read_locations']
-
-        ingest_read_location = """
-        UNWIND $read_locations_list as rl
-        MERGE (loc:AzureCosmosDBLocation{id: rl.id})
-        ON CREATE SET loc.firstseen = timestamp()
-        SET loc.lastupdated = $azure_update_tag,
-        loc.locationname = rl.location_name,
-        loc.documentendpoint = rl.document_endpoint,
-        loc.provisioningstate = rl.provisioning_state,
-        loc.failoverpriority = rl.failover_priority,
-        loc.iszoneredundant = rl.is_zone_redundant
-        WITH loc
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:CAN_READ_FROM]->(loc)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_read_location,
-            read_locations_list=read_locations,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
+    Ingest the details of locations with read permission enabled.
+    """
+    load(
+        neo4j_session,
+        AzureCosmosDBLocationSchema(),
+        _flatten_account_resources(database_account_list, 'read_locations', 'read_database_account_id'),
+        lastupdated=azure_update_tag,
+    )
 
 
 @timeit
 def _load_database_account_associated_locations(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
-    Ingest the details of enabled location for the database account.
-    """
-    if 'locations' in database_account and len(database_account['locations']) > 0:
-        database_account_id = database_account['id']
-        associated_locations = database_account['locations']
-
-        ingest_associated_location = """
-        UNWIND $associated_locations_list as al
-        MERGE (loc:AzureCosmosDBLocation{id: al.id})
-        ON CREATE SET loc.firstseen = timestamp()
-        SET loc.lastupdated = $azure_update_tag,
-        loc.locationname = al.location_name,
-        loc.documentendpoint = al.document_endpoint,
-        loc.provisioningstate = al.provisioning_state,
-        loc.failoverpriority = al.failover_priority,
-        loc.iszoneredundant = al.is_zone_redundant
-        WITH loc
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:ASSOCIATED_WITH]->(loc)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_associated_location,
-            associated_locations_list=associated_locations,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
+    Ingest the details of enabled locations for the database accounts.
+    """
+    load(
+        neo4j_session,
+        AzureCosmosDBLocationSchema(),
+        _flatten_account_resources(database_account_list, 'locations', 'associated_database_account_id'),
+        lastupdated=azure_update_tag,
+    )
 
 
 @timeit
@@ -262,169 +193,87 @@ def transform_cosmosdb_cors_policy(database_account: Dict) -> Dict:
 
 @timeit
 def _load_cosmosdb_cors_policy(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
-    Ingest the details of the Cors Policy of the database account.
-    """
-    if 'cors' in database_account and len(database_account['cors']) > 0:
-        database_account = transform_cosmosdb_cors_policy(database_account)
-        database_account_id = database_account['id']
-        cors_policies = database_account['cors']
-
-        ingest_cors_policy = """
-        UNWIND $cors_policies_list AS cp
-        MERGE (corspolicy:AzureCosmosDBCorsPolicy{id: cp.cors_policy_unique_id})
-        ON CREATE SET corspolicy.firstseen = timestamp(),
-        corspolicy.allowedorigins = cp.allowed_origins
-        SET corspolicy.lastupdated = $azure_update_tag,
-        corspolicy.allowedmethods = cp.allowed_methods,
-        corspolicy.allowedheaders = cp.allowed_headers,
-        corspolicy.exposedheaders = cp.exposed_headers,
-        corspolicy.maxageinseconds = cp.max_age_in_seconds
-        WITH corspolicy
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:CONTAINS]->(corspolicy)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_cors_policy,
-            cors_policies_list=cors_policies,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
+    Ingest the details of the Cors Policy of the database accounts.
+    """
+    for database_account in database_account_list:
+        if database_account.get('cors'):
+            transform_cosmosdb_cors_policy(database_account)
+
+    load(
+        neo4j_session,
+        AzureCosmosDBCorsPolicySchema(),
+        _flatten_account_resources(database_account_list, 'cors', 'database_account_id'),
+        lastupdated=azure_update_tag,
+    )
 
 
 @timeit
 def _load_cosmosdb_failover_policies(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
-    Ingest the details of the Failover Policies of the database account.
-    """
-    if 'failover_policies' in database_account and len(database_account['failover_policies']) > 0:
-        database_account_id = database_account['id']
-        failover_policies = database_account['failover_policies']
-
-        ingest_failover_policies = """
-        UNWIND $failover_policies_list AS fp
-        MERGE (fpolicy:AzureCosmosDBAccountFailoverPolicy{id: fp.id})
-        ON CREATE SET fpolicy.firstseen = timestamp()
-        SET fpolicy.lastupdated = $azure_update_tag,
-        fpolicy.locationname = fp.location_name,
-        fpolicy.failoverpriority = fp.failover_priority
-        WITH fpolicy
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:CONTAINS]->(fpolicy)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_failover_policies,
-            failover_policies_list=failover_policies,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
+    Ingest the details of the Failover Policies of the database accounts.
+    """
+    load(
+        neo4j_session,
+        AzureCosmosDBAccountFailoverPolicySchema(),
+        _flatten_account_resources(database_account_list, 'failover_policies', 'database_account_id'),
+        lastupdated=azure_update_tag,
+    )
 
 
 @timeit
 def _load_cosmosdb_private_endpoint_connections(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
-    Ingest the details of the Private Endpoint Connections of the database account.
-    """
-    if 'private_endpoint_connections' in database_account and len(
-            database_account['private_endpoint_connections'],
-    ) > 0:
-        database_account_id = database_account['id']
-        private_endpoint_connections = database_account['private_endpoint_connections']
-
-        ingest_private_endpoint_connections = """
-        UNWIND $private_endpoint_connections_list AS connection
-        MERGE (pec:AzureCDBPrivateEndpointConnection{id: connection.id})
-        ON CREATE SET pec.firstseen = timestamp()
-        SET pec.lastupdated = $azure_update_tag,
-        pec.name = connection.name,
-        pec.privateendpointid = connection.private_endpoint.id,
-        pec.status = connection.private_link_service_connection_state.status,
-        pec.actionrequired = connection.private_link_service_connection_state.actions_required
-        WITH pec
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:CONFIGURED_WITH]->(pec)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_private_endpoint_connections,
-            private_endpoint_connections_list=private_endpoint_connections,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
+    Ingest the details of the Private Endpoint Connections of the database accounts.
+    """
+    load(
+        neo4j_session,
+        AzureCDBPrivateEndpointConnectionSchema(),
+        _flatten_account_resources(database_account_list, 'private_endpoint_connections', 'database_account_id'),
+        lastupdated=azure_update_tag,
+    )
 
 
 @timeit
 def _load_cosmosdb_virtual_network_rules(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
-    Ingest the details of the Virtual Network Rules of the database account.
-    """
-    if 'virtual_network_rules' in database_account and len(database_account['virtual_network_rules']) > 0:
-        database_account_id = database_account['id']
-        virtual_network_rules = database_account['virtual_network_rules']
-
-        ingest_virtual_network_rules = """
-        UNWIND $virtual_network_rules_list AS vnr
-        MERGE (rules:AzureCosmosDBVirtualNetworkRule{id: vnr.id})
-        ON CREATE SET rules.firstseen = timestamp()
-        SET rules.lastupdated = $azure_update_tag,
-        rules.ignoremissingvnetserviceendpoint = vnr.ignore_missing_v_net_service_endpoint
-        WITH rules
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:CONFIGURED_WITH]->(rules)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_virtual_network_rules,
-            virtual_network_rules_list=virtual_network_rules,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
-
-
-@timeit
-def sync_database_account_details(
-        neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str,
-        database_account_list: List[Dict], sync_tag: int, common_job_parameters: Dict,
-) -> None:
-    details = get_database_account_details(credentials, subscription_id, database_account_list)
-    load_database_account_details(neo4j_session, credentials, subscription_id, details, sync_tag, common_job_parameters)
+    Ingest the details of the Virtual Network Rules of the database accounts.
+    """
+    load(
+        neo4j_session,
+        AzureCosmosDBVirtualNetworkRuleSchema(),
+        _flatten_account_resources(database_account_list, 'virtual_network_rules', 'database_account_id'),
+        lastupdated=azure_update_tag,
+    )
 
 
 @timeit
 def get_database_account_details(
         credentials: Credentials, subscription_id: str, database_account_list: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any, Any, Any, Any, Any, Any]]:
     """
-    Iterate over the database accounts and return the list of SQL and MongoDB databases, Cassandra keyspaces and
-    table resources associated with each database account.
+    Return the list of SQL and MongoDB databases, Cassandra keyspaces and table resources associated with each
+    database account, fetching several database accounts concurrently.
     """
-    for database_account in database_account_list:
+    def get_details(database_account: Dict) -> Tuple[Any, Any, Any, Any, Any, Any, Any]:
         sql_databases = get_sql_databases(credentials, subscription_id, database_account)
         cassandra_keyspaces = get_cassandra_keyspaces(credentials, subscription_id, database_account)
         mongodb_databases = get_mongodb_databases(credentials, subscription_id, database_account)
         table_resources = get_table_resources(credentials, subscription_id, database_account)
-        yield database_account['id'], database_account['name'], database_account[
+        return database_account['id'], database_account['name'], database_account[
             'resourceGroup'
         ], sql_databases, cassandra_keyspaces, mongodb_databases, table_resources
 
+    return map_concurrently(get_details, database_account_list)
+
 
 @timeit
 def get_sql_databases(credentials: Credentials, subscription_id: str, database_account: Dict) -> List[Dict]:
@@ -561,12 +410,11 @@ def transform_database_account_resources(
 
 
 @timeit
-def load_database_account_details(
-        neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str,
-        details: List[Tuple[Any, Any, Any, Any, Any, Any, Any]], update_tag: int, common_job_parameters: Dict,
-) -> None:
+def transform_database_account_details(
+        details: List[Tuple[Any, Any, Any, Any, Any, Any, Any]],
+) -> Dict[str, List[Dict]]:
     """
-    Create dictionaries for SQL Databases, Cassandra Keyspaces, MongoDB Databases and table resources.
+    Create lists of SQL Databases, Cassandra Keyspaces, MongoDB Databases and table resources.
     """
     sql_databases: List[Dict] = []
     cassandra_keyspaces: List[Dict] = []
@@ -590,28 +438,31 @@ def load_database_account_details(
             t = transform_database_account_resources(account_id, name, resourceGroup, table)
             table_resources.extend(t)
 
+    return {
+        'sql_databases': sql_databases,
+        'cassandra_keyspaces': cassandra_keyspaces,
+        'mongodb_databases': mongodb_databases,
+        'table_resources': table_resources,
+    }
+
+
+@timeit
+def load_database_account_details(
+        neo4j_session: neo4j.Session, account_resources: Dict[str, List[Dict]], update_tag: int,
+        common_job_parameters: Dict,
+) -> None:
+    """
+    Ingest the output of `transform_database_account_details()` into neo4j.
+    """
     # Loading the table resources
-    _load_table_resources(neo4j_session, table_resources, update_tag)
+    _load_table_resources(neo4j_session, account_resources['table_resources'], update_tag)
     # Cleanup of table resources (done here because table resource doesn't have any other child resources in it)
     cleanup_table_resources(neo4j_session, common_job_parameters)
 
     # Loading SQL databases, Cassandra Keyspaces and MongoDB databases
-    _load_sql_databases(neo4j_session, sql_databases, update_tag)
-    _load_cassandra_keyspaces(neo4j_session, cassandra_keyspaces, update_tag)
-    _load_mongodb_databases(neo4j_session, mongodb_databases, update_tag)
-
-    sync_sql_database_details(
-        neo4j_session, credentials, subscription_id, sql_databases, update_tag,
-        common_job_parameters,
-    )
-    sync_cassandra_keyspace_details(
-        neo4j_session, credentials, subscription_id, cassandra_keyspaces, update_tag,
-        common_job_parameters,
-    )
-    sync_mongodb_database_details(
-        neo4j_session, credentials, subscription_id, mongodb_databases, update_tag,
-        common_job_parameters,
-    )
+    _load_sql_databases(neo4j_session, account_resources['sql_databases'], update_tag)
+    _load_cassandra_keyspaces(neo4j_session, account_resources['cassandra_keyspaces'], update_tag)
+    _load_mongodb_databases(neo4j_session, account_resources['mongodb_databases'], update_tag)
 
 
 @timeit
@@ -619,26 +470,11 @@ def _load_sql_databases(neo4j_session: neo4j.Session, sql_databases: List[Dict],
     """
     Ingest SQL Databases into neo4j.
     """
-    ingest_sql_databases = """
-    UNWIND $sql_databases_list AS database
-    MERGE (sdb:AzureCosmosDBSqlDatabase{id: database.id})
-    ON CREATE SET sdb.firstseen = timestamp(), sdb.type = database.type,
-    sdb.location = database.location
-    SET sdb.name = database.name,
-    sdb.throughput = database.options.throughput,
-    sdb.maxthroughput = database.options.autoscale_setting.max_throughput,
-    sdb.lastupdated = $azure_update_tag
-    WITH sdb, database
-    MATCH (d:AzureCosmosDBAccount{id: database.database_account_id})
-    MERGE (d)-[r:CONTAINS]->(sdb)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_sql_databases,
-        sql_databases_list=sql_databases,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureCosmosDBSqlDatabaseSchema(),
+        sql_databases,
+        lastupdated=update_tag,
     )
 
 
@@ -647,26 +483,11 @@ def _load_cassandra_keyspaces(neo4j_session: neo4j.Session, cassandra_keyspaces:
     """
     Ingest Cassandra keyspaces into neo4j.
     """
-    ingest_cassandra_keyspaces = """
-    UNWIND $cassandra_keyspaces_list AS keyspace
-    MERGE (ck:AzureCosmosDBCassandraKeyspace{id: keyspace.id})
-    ON CREATE SET ck.firstseen = timestamp(), ck.type = keyspace.type,
-    ck.location = keyspace.location
-    SET ck.name = keyspace.name,
-    ck.lastupdated = $azure_update_tag,
-    ck.throughput = keyspace.options.throughput,
-    ck.maxthroughput = keyspace.options.autoscale_setting.max_throughput
-    WITH ck, keyspace
-    MATCH (d:AzureCosmosDBAccount{id: keyspace.database_account_id})
-    MERGE (d)-[r:CONTAINS]->(ck)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_cassandra_keyspaces,
-        cassandra_keyspaces_list=cassandra_keyspaces,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureCosmosDBCassandraKeyspaceSchema(),
+        cassandra_keyspaces,
+        lastupdated=update_tag,
     )
 
 
@@ -675,26 +496,11 @@ def _load_mongodb_databases(neo4j_session: neo4j.Session, mongodb_databases: Lis
     """
     Ingest MongoDB databases into neo4j.
     """
-    ingest_mongodb_databases = """
-    UNWIND $mongodb_databases_list AS database
-    MERGE (mdb:AzureCosmosDBMongoDBDatabase{id: database.id})
-    ON CREATE SET mdb.firstseen = timestamp(), mdb.type = database.type,
-    mdb.location = database.location
-    SET mdb.name = database.name,
-    mdb.throughput = database.options.throughput,
-    mdb.maxthroughput = database.options.autoscale_setting.max_throughput,
-    mdb.lastupdated = $azure_update_tag
-    WITH mdb, database
-    MATCH (d:AzureCosmosDBAccount{id: database.database_account_id})
-    MERGE (d)-[r:CONTAINS]->(mdb)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_mongodb_databases,
-        mongodb_databases_list=mongodb_databases,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureCosmosDBMongoDBDatabaseSchema(),
+        mongodb_databases,
+        lastupdated=update_tag,
     )
 
 
@@ -703,49 +509,25 @@ def _load_table_resources(neo4j_session: neo4j.Session, table_resources: List[Di
     """
     Ingest Table resources into neo4j.
     """
-    ingest_tables = """
-    UNWIND $table_resources_list AS table
-    MERGE (tr:AzureCosmosDBTableResource{id: table.id})
-    ON CREATE SET tr.firstseen = timestamp(), tr.type = table.type,
-    tr.location = table.location
-    SET tr.name = table.name,
-    tr.lastupdated = $azure_update_tag,
-    tr.throughput = table.options.throughput,
-    tr.maxthroughput = table.options.autoscale_setting.max_throughput
-    WITH tr, table
-    MATCH (d:AzureCosmosDBAccount{id: table.database_account_id})
-    MERGE (d)-[r:CONTAINS]->(tr)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_tables,
-        table_resources_list=table_resources,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureCosmosDBTableResourceSchema(),
+        table_resources,
+        lastupdated=update_tag,
     )
 
 
-@timeit
-def sync_sql_database_details(
-        neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str, sql_databases: List[Dict],
-        update_tag: int, common_job_parameters: Dict,
-) -> None:
-    sql_database_details = get_sql_database_details(credentials, subscription_id, sql_databases)
-    load_sql_database_details(neo4j_session, sql_database_details, update_tag)
-    cleanup_sql_database_details(neo4j_session, common_job_parameters)
-
-
 @timeit
 def get_sql_database_details(
         credentials: Credentials, subscription_id: str, sql_databases: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any]]:
     """
-    Iterate over the SQL databases to retrieve the SQL containers in them.
+    Retrieve the SQL containers in each SQL database, fetching several databases concurrently.
     """
-    for database in sql_databases:
-        containers = get_sql_containers(credentials, subscription_id, database)
-        yield database['id'], containers
+    return map_concurrently(
+        lambda database: (database['id'], get_sql_containers(credentials, subscription_id, database)),
+        sql_databases,
+    )
 
 
 @timeit
@@ -800,55 +582,25 @@ def _load_sql_containers(neo4j_session: neo4j.Session, containers: List[Dict], u
     """
     Ingest SQL Container details into neo4j.
     """
-    ingest_containers = """
-    UNWIND $sql_containers_list AS container
-    MERGE (c:AzureCosmosDBSqlContainer{id: container.id})
-    ON CREATE SET c.firstseen = timestamp(), c.type = container.type,
-    c.location = container.location
-    SET c.name = container.name,
-    c.lastupdated = $azure_update_tag,
-    c.throughput = container.options.throughput,
-    c.maxthroughput = container.options.autoscale_setting.max_throughput,
-    c.container = container.resource.id,
-    c.defaultttl = container.resource.default_ttl,
-    c.analyticalttl = container.resource.analytical_storage_ttl,
-    c.isautomaticindexingpolicy = container.resource.indexing_policy.automatic,
-    c.indexingmode = container.resource.indexing_policy.indexing_mode,
-    c.conflictresolutionpolicymode = container.resource.conflict_resolution_policy.mode
-    WITH c, container
-    MATCH (sdb:AzureCosmosDBSqlDatabase{id: container.database_id})
-    MERGE (sdb)-[r:CONTAINS]->(c)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_containers,
-        sql_containers_list=containers,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureCosmosDBSqlContainerSchema(),
+        containers,
+        lastupdated=update_tag,
     )
 
 
-@timeit
-def sync_cassandra_keyspace_details(
-        neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str, cassandra_keyspaces: List[Dict],
-        update_tag: int, common_job_parameters: Dict,
-) -> None:
-    cassandra_keyspace_details = get_cassandra_keyspace_details(credentials, subscription_id, cassandra_keyspaces)
-    load_cassandra_keyspace_details(neo4j_session, cassandra_keyspace_details, update_tag)
-    cleanup_cassandra_keyspace_details(neo4j_session, common_job_parameters)
-
-
 @timeit
 def get_cassandra_keyspace_details(
         credentials: Credentials, subscription_id: str, cassandra_keyspaces: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any]]:
     """
-    Iterate through the Cassandra keyspaces to get the list of tables in each keyspace.
+    Get the list of tables in each Cassandra keyspace, fetching several keyspaces concurrently.
     """
-    for keyspace in cassandra_keyspaces:
-        cassandra_tables = get_cassandra_tables(credentials, subscription_id, keyspace)
-        yield keyspace['id'], cassandra_tables
+    return map_concurrently(
+        lambda keyspace: (keyspace['id'], get_cassandra_tables(credentials, subscription_id, keyspace)),
+        cassandra_keyspaces,
+    )
 
 
 @timeit
@@ -905,52 +657,25 @@ def _load_cassandra_tables(neo4j_session: neo4j.Session, cassandra_tables: List[
     """
     Ingest Cassandra Tables into neo4j.
     """
-    ingest_cassandra_tables = """
-    UNWIND $cassandra_tables_list AS table
-    MERGE (ct:AzureCosmosDBCassandraTable{id: table.id})
-    ON CREATE SET ct.firstseen = timestamp(), ct.type = table.type,
-    ct.location = table.location
-    SET ct.name = table.name,
-    ct.lastupdated = $azure_update_tag,
-    ct.throughput = table.options.throughput,
-    ct.maxthroughput = table.options.autoscale_setting.max_throughput,
-    ct.container = table.resource.id,
-    ct.defaultttl = table.resource.default_ttl,
-    ct.analyticalttl = table.resource.analytical_storage_ttl
-    WITH ct, table
-    MATCH (ck:AzureCosmosDBCassandraKeyspace{id: table.keyspace_id})
-    MERGE (ck)-[r:CONTAINS]->(ct)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_cassandra_tables,
-        cassandra_tables_list=cassandra_tables,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureCosmosDBCassandraTableSchema(),
+        cassandra_tables,
+        lastupdated=update_tag,
     )
 
 
-@timeit
-def sync_mongodb_database_details(
-        neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str, mongodb_databases: List[Dict],
-        update_tag: int, common_job_parameters: Dict,
-) -> None:
-    mongodb_databases_details = get_mongodb_databases_details(credentials, subscription_id, mongodb_databases)
-    load_mongodb_databases_details(neo4j_session, mongodb_databases_details, update_tag)
-    cleanup_mongodb_database_details(neo4j_session, common_job_parameters)
-
-
 @timeit
 def get_mongodb_databases_details(
         credentials: Credentials, subscription_id: str, mongodb_databases: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any]]:
     """
-    Iterate through the MongoDB Databases to get the list of collections in each mongoDB database.
+    Get the list of collections in each MongoDB database, fetching several databases concurrently.
     """
-    for database in mongodb_databases:
-        collections = get_mongodb_collections(credentials, subscription_id, database)
-        yield database['id'], collections
+    return map_concurrently(
+        lambda database: (database['id'], get_mongodb_collections(credentials, subscription_id, database)),
+        mongodb_databases,
+    )
 
 
 @timeit
@@ -1007,28 +732,11 @@ def _load_collections(neo4j_session: neo4j.Session, collections: List[Dict], upd
     """
     Ingest MongoDB Collections into neo4j.
     """
-    ingest_collections = """
-    UNWIND $mongodb_collections_list AS collection
-    MERGE (col:AzureCosmosDBMongoDBCollection{id: collection.id})
-    ON CREATE SET col.firstseen = timestamp(), col.type = collection.type,
-    col.location = collection.location
-    SET col.name = collection.name,
-    col.lastupdated = $azure_update_tag,
-    col.throughput = collection.options.throughput,
-    col.maxthroughput = collection.options.autoscale_setting.max_throughput,
-    col.collectionname = collection.resource.id,
-    col.analyticalttl = collection.resource.analytical_storage_ttl
-    WITH col, collection
-    MATCH (mdb:AzureCosmosDBMongoDBDatabase{id: collection.database_id})
-    MERGE (mdb)-[r:CONTAINS]->(col)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_collections,
-        mongodb_collections_list=collections,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureCosmosDBMongoDBCollectionSchema(),
+        collections,
+        lastupdated=update_tag,
     )
 
 
@@ -1057,18 +765,66 @@ def cleanup_table_resources(neo4j_session: neo4j.Session, common_job_parameters:
     run_cleanup_job('azure_cosmosdb_table_resources_cleanup.json', neo4j_session, common_job_parameters)
 
 
+# All data of a subscription's database accounts, as returned by `get_subscription_data()`.
+CosmosDBData = namedtuple(
+    'CosmosDBData',
+    'database_accounts account_resources sql_database_details cassandra_keyspace_details mongodb_databases_details',
+)
+
+
+@timeit
+def get_subscription_data(credentials: Credentials, subscription_id: str) -> CosmosDBData:
+    """
+    Fetch the database accounts of the subscription along with their databases, keyspaces and table resources and the
+    children of those. This makes no Neo4j calls, so it can run on a worker thread.
+    """
+    database_account_list = get_database_account_list(credentials, subscription_id)
+    database_account_list = transform_database_account_data(database_account_list)
+    account_resources = transform_database_account_details(
+        get_database_account_details(credentials, subscription_id, database_account_list),
+    )
+    return CosmosDBData(
+        database_accounts=database_account_list,
+        account_resources=account_resources,
+        sql_database_details=get_sql_database_details(
+            credentials, subscription_id, account_resources['sql_databases'],
+        ),
+        cassandra_keyspace_details=get_cassandra_keyspace_details(
+            credentials, subscription_id, account_resources['cassandra_keyspaces'],
+        ),
+        mongodb_databases_details=get_mongodb_databases_details(
+            credentials, subscription_id, account_resources['mongodb_databases'],
+        ),
+    )
+
+
+@timeit
+def load_subscription_data(
+        neo4j_session: neo4j.Session, subscription_id: str, data: CosmosDBData, sync_tag: int,
+        common_job_parameters: Dict,
+) -> None:
+    """
+    Ingest the output of `get_subscription_data()` into neo4j and clean up stale CosmosDB data of the subscription.
+    """
+    load_database_account_data(neo4j_session, subscription_id, data.database_accounts, sync_tag)
+    sync_database_account_data_resources(neo4j_session, subscription_id, data.database_accounts, sync_tag)
+    load_database_account_details(neo4j_session, data.account_resources, sync_tag, common_job_parameters)
+
+    load_sql_database_details(neo4j_session, data.sql_database_details, sync_tag)
+    cleanup_sql_database_details(neo4j_session, common_job_parameters)
+    load_cassandra_keyspace_details(neo4j_session, data.cassandra_keyspace_details, sync_tag)
+    cleanup_cassandra_keyspace_details(neo4j_session, common_job_parameters)
+    load_mongodb_databases_details(neo4j_session, data.mongodb_databases_details, sync_tag)
+    cleanup_mongodb_database_details(neo4j_session, common_job_parameters)
+
+    cleanup_azure_database_accounts(neo4j_session, common_job_parameters)
+
+
 @timeit
 def sync(
         neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str,
         sync_tag: int, common_job_parameters: Dict,
 ) -> None:
     logger.info("Syncing Azure CosmosDB for subscription '%s'.", subscription_id)
-    database_account_list = get_database_account_list(credentials, subscription_id)
-    database_account_list = transform_database_account_data(database_account_list)
-    load_database_account_data(neo4j_session, subscription_id, database_account_list, sync_tag)
-    sync_database_account_data_resources(neo4j_session, subscription_id, database_account_list, sync_tag)
-    sync_database_account_details(
-        neo4j_session, credentials, subscription_id, database_account_list, sync_tag,
-        common_job_parameters,
-    )
-    cleanup_azure_database_accounts(neo4j_session, common_job_parameters)
+    data = get_subscription_data(credentials, subscription_id)
+    load_subscription_data(neo4j_session, subscription_id, data, sync_tag, common_job_parameters)
@@ -1,7 +1,7 @@
 import logging
+from collections import namedtuple
 from typing import Any
 from typing import Dict
-from typing import Generator
 from typing import List
 from typing import Tuple
 
@@ -14,7 +14,21 @@ from azure.mgmt.sql.models import SecurityAlertPolicyName
 from azure.mgmt.sql.models import TransparentDataEncryptionName
 from msrestazure.azure_exceptions import CloudError
 
+from .util.common import get_cached_client
+from .util.common import map_concurrently
 from .util.credentials import Credentials
+from cartography.client.core.tx import load
+from cartography.models.azure.sql import AzureDatabaseThreatDetectionPolicySchema
+from cartography.models.azure.sql import AzureElasticPoolSchema
+from cartography.models.azure.sql import AzureFailoverGroupSchema
+from cartography.models.azure.sql import AzureRecoverableDatabaseSchema
+from cartography.models.azure.sql import AzureReplicationLinkSchema
+from cartography.models.azure.sql import AzureRestorableDroppedDatabaseSchema
+from cartography.models.azure.sql import AzureRestorePointSchema
+from cartography.models.azure.sql import AzureSQLDatabaseSchema
+from cartography.models.azure.sql import AzureServerADAdministratorSchema
+from cartography.models.azure.sql import AzureServerDNSAliasSchema
+from cartography.models.azure.sql import AzureTransparentDataEncryptionSchema
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
@@ -26,8 +40,7 @@ def get_client(credentials: Credentials, subscription_id: str) -> SqlManagementC
     """
     Getting the Azure SQL client
     """
-    client = SqlManagementClient(credentials, subscription_id)
-    return client
+    return get_cached_client(SqlManagementClient, credentials, subscription_id)
 
 
 @timeit
@@ -90,23 +103,14 @@ def load_server_data(
     )
 
 
-@timeit
-def sync_server_details(
-        neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str,
-        server_list: List[Dict], sync_tag: int,
-) -> None:
-    details = get_server_details(credentials, subscription_id, server_list)
-    load_server_details(neo4j_session, credentials, subscription_id, details, sync_tag)  # type: ignore
-
-
 @timeit
 def get_server_details(
         credentials: Credentials, subscription_id: str, server_list: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any, Any, Any, Any, Any, Any, Any, Any, Any]]:
     """
-    Iterate over each servers to get its resource details.
+    Get the resource details of each server, fetching several servers concurrently.
     """
-    for server in server_list:
+    def get_details(server: Dict) -> Tuple[Any, Any, Any, Any, Any, Any, Any, Any, Any, Any]:
         dns_alias = get_dns_aliases(credentials, subscription_id, server)
         ad_admins = get_ad_admins(credentials, subscription_id, server)
         r_databases = get_recoverable_databases(credentials, subscription_id, server)
@@ -114,10 +118,12 @@ def get_server_details(
         fgs = get_failover_groups(credentials, subscription_id, server)
         elastic_pools = get_elastic_pools(credentials, subscription_id, server)
         databases = get_databases(credentials, subscription_id, server)
-        yield server['id'], server['name'], server[
+        return server['id'], server['name'], server[
             'resourceGroup'
         ], dns_alias, ad_admins, r_databases, rd_databases, fgs, elastic_pools, databases
 
+    return map_concurrently(get_details, server_list)
+
 
 @timeit
 def get_dns_aliases(credentials: Credentials, subscription_id: str, server: Dict) -> List[Dict]:
@@ -311,12 +317,11 @@ def get_databases(credentials: Credentials, subscription_id: str, server: Dict)
 
 
 @timeit
-def load_server_details(
-        neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str,
-        details: List[Tuple[Any, Any, Any, Any, Any, Any, Any, Any, Any, Any]], update_tag: int,
-) -> None:
+def transform_server_details(
+        details: List[Tuple[Any, Any, Any, Any, Any, Any, Any, Any, Any, Any]],
+) -> Dict[str, List[Dict]]:
     """
-    Create dictionaries for every resource in the server so we can import them in a single query
+    Create lists of every resource in the servers so we can import them in a single query
     """
     dns_aliases = []
     ad_admins = []
@@ -370,15 +375,29 @@ def load_server_details(
                 db['resource_group_name'] = rg
                 databases.append(db)
 
-    _load_server_dns_aliases(neo4j_session, dns_aliases, update_tag)
-    _load_server_ad_admins(neo4j_session, ad_admins, update_tag)
-    _load_recoverable_databases(neo4j_session, recoverable_databases, update_tag)
-    _load_restorable_dropped_databases(neo4j_session, restorable_dropped_databases, update_tag)
-    _load_failover_groups(neo4j_session, failover_groups, update_tag)
-    _load_elastic_pools(neo4j_session, elastic_pools, update_tag)
-    _load_databases(neo4j_session, databases, update_tag)
+    return {
+        'dns_aliases': dns_aliases,
+        'ad_admins': ad_admins,
+        'recoverable_databases': recoverable_databases,
+        'restorable_dropped_databases': restorable_dropped_databases,
+        'failover_groups': failover_groups,
+        'elastic_pools': elastic_pools,
+        'databases': databases,
+    }
 
-    sync_database_details(neo4j_session, credentials, subscription_id, databases, update_tag)
+
+@timeit
+def load_server_details(neo4j_session: neo4j.Session, server_resources: Dict[str, List[Dict]], update_tag: int) -> None:
+    """
+    Ingest the output of `transform_server_details()` into neo4j.
+    """
+    _load_server_dns_aliases(neo4j_session, server_resources['dns_aliases'], update_tag)
+    _load_server_ad_admins(neo4j_session, server_resources['ad_admins'], update_tag)
+    _load_recoverable_databases(neo4j_session, server_resources['recoverable_databases'], update_tag)
+    _load_restorable_dropped_databases(neo4j_session, server_resources['restorable_dropped_databases'], update_tag)
+    _load_failover_groups(neo4j_session, server_resources['failover_groups'], update_tag)
+    _load_elastic_pools(neo4j_session, server_resources['elastic_pools'], update_tag)
+    _load_databases(neo4j_session, server_resources['databases'], update_tag)
 
 
 @timeit
@@ -388,24 +407,11 @@ def _load_server_dns_aliases(
     """
     Ingest the DNS Alias details into neo4j.
     """
-    ingest_dns_aliases = """
-    UNWIND $dns_aliases_list as dns_alias
-    MERGE (alias:AzureServerDNSAlias{id: dns_alias.id})
-    ON CREATE SET alias.firstseen = timestamp()
-    SET alias.name = dns_alias.name,
-    alias.dnsrecord = dns_alias.azure_dns_record,
-    alias.lastupdated = $azure_update_tag
-    WITH alias, dns_alias
-    MATCH (s:AzureSQLServer{id: dns_alias.server_id})
-    MERGE (s)-[r:USED_BY]->(alias)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_dns_aliases,
-        dns_aliases_list=dns_aliases,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureServerDNSAliasSchema(),
+        dns_aliases,
+        lastupdated=update_tag,
     )
 
 
@@ -416,25 +422,11 @@ def _load_server_ad_admins(
     """
     Ingest the Server AD Administrators details into neo4j.
     """
-    ingest_ad_admins = """
-    UNWIND $ad_admins_list as ad_admin
-    MERGE (a:AzureServerADAdministrator{id: ad_admin.id})
-    ON CREATE SET a.firstseen = timestamp()
-    SET a.name = ad_admin.name,
-    a.administratortype = ad_admin.administrator_type,
-    a.login = ad_admin.login,
-    a.lastupdated = $azure_update_tag
-    WITH a, ad_admin
-    MATCH (s:AzureSQLServer{id: ad_admin.server_id})
-    MERGE (s)-[r:ADMINISTERED_BY]->(a)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_ad_admins,
-        ad_admins_list=ad_admins,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureServerADAdministratorSchema(),
+        ad_admins,
+        lastupdated=update_tag,
     )
 
 
@@ -445,26 +437,11 @@ def _load_recoverable_databases(
     """
     Ingest the recoverable database details into neo4j.
     """
-    ingest_recoverable_databases = """
-    UNWIND $recoverable_databases_list as rec_db
-    MERGE (rd:AzureRecoverableDatabase{id: rec_db.id})
-    ON CREATE SET rd.firstseen = timestamp()
-    SET rd.name = rec_db.name,
-    rd.edition = rec_db.edition,
-    rd.servicelevelobjective = rec_db.service_level_objective,
-    rd.lastbackupdate = rec_db.last_available_backup_date,
-    rd.lastupdated = $azure_update_tag
-    WITH rd, rec_db
-    MATCH (s:AzureSQLServer{id: rec_db.server_id})
-    MERGE (s)-[r:RESOURCE]->(rd)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_recoverable_databases,
-        recoverable_databases_list=recoverable_databases,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureRecoverableDatabaseSchema(),
+        recoverable_databases,
+        lastupdated=update_tag,
     )
 
 
@@ -475,30 +452,11 @@ def _load_restorable_dropped_databases(
     """
     Ingest the restorable dropped database details into neo4j.
     """
-    ingest_restorable_dropped_databases = """
-    UNWIND $restorable_dropped_databases_list as res_dropped_db
-    MERGE (rdd:AzureRestorableDroppedDatabase{id: res_dropped_db.id})
-    ON CREATE SET rdd.firstseen = timestamp(), rdd.location = res_dropped_db.location
-    SET rdd.name = res_dropped_db.name,
-    rdd.databasename = res_dropped_db.database_name,
-    rdd.creationdate = res_dropped_db.creation_date,
-    rdd.deletiondate = res_dropped_db.deletion_date,
-    rdd.restoredate = res_dropped_db.earliest_restore_date,
-    rdd.edition = res_dropped_db.edition,
-    rdd.servicelevelobjective = res_dropped_db.service_level_objective,
-    rdd.maxsizebytes = res_dropped_db.max_size_bytes,
-    rdd.lastupdated = $azure_update_tag
-    WITH rdd, res_dropped_db
-    MATCH (s:AzureSQLServer{id: res_dropped_db.server_id})
-    MERGE (s)-[r:RESOURCE]->(rdd)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_restorable_dropped_databases,
-        restorable_dropped_databases_list=restorable_dropped_databases,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureRestorableDroppedDatabaseSchema(),
+        restorable_dropped_databases,
+        lastupdated=update_tag,
     )
 
 
@@ -509,25 +467,11 @@ def _load_failover_groups(
     """
     Ingest the failover groups details into neo4j.
     """
-    ingest_failover_groups = """
-    UNWIND $failover_groups_list as fg
-    MERGE (f:AzureFailoverGroup{id: fg.id})
-    ON CREATE SET f.firstseen = timestamp(), f.location = fg.location
-    SET f.name = fg.name,
-    f.replicationrole = fg.replication_role,
-    f.replicationstate = fg.replication_state,
-    f.lastupdated = $azure_update_tag
-    WITH f, fg
-    MATCH (s:AzureSQLServer{id: fg.server_id})
-    MERGE (s)-[r:RESOURCE]->(f)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_failover_groups,
-        failover_groups_list=failover_groups,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureFailoverGroupSchema(),
+        failover_groups,
+        lastupdated=update_tag,
     )
 
 
@@ -538,29 +482,11 @@ def _load_elastic_pools(
     """
     Ingest the elastic pool details into neo4j.
     """
-    ingest_elastic_pools = """
-    UNWIND $elastic_pools_list as ep
-    MERGE (e:AzureElasticPool{id: ep.id})
-    ON CREATE SET e.firstseen = timestamp(), e.location = ep.location
-    SET e.name = ep.name,
-    e.kind = ep.kind,
-    e.creationdate = ep.creation_date,
-    e.state = ep.state,
-    e.maxsizebytes = ep.max_size_bytes,
-    e.licensetype = ep.license_type,
-    e.zoneredundant = ep.zone_redundant,
-    e.lastupdated = $azure_update_tag
-    WITH e, ep
-    MATCH (s:AzureSQLServer{id: ep.server_id})
-    MERGE (s)-[r:RESOURCE]->(e)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_elastic_pools,
-        elastic_pools_list=elastic_pools,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureElasticPoolSchema(),
+        elastic_pools,
+        lastupdated=update_tag,
     )
 
 
@@ -571,63 +497,32 @@ def _load_databases(
     """
     Ingest the database details into neo4j.
     """
-    ingest_databases = """
-    UNWIND $databases_list as az_database
-    MERGE (d:AzureSQLDatabase{id: az_database.id})
-    ON CREATE SET d.firstseen = timestamp(), d.location = az_database.location
-    SET d.name = az_database.name,
-    d.kind = az_database.kind,
-    d.creationdate = az_database.creation_date,
-    d.databaseid = az_database.database_id,
-    d.maxsizebytes = az_database.max_size_bytes,
-    d.licensetype = az_database.license_type,
-    d.secondarylocation = az_database.default_secondary_location,
-    d.elasticpoolid = az_database.elastic_pool_id,
-    d.collation = az_database.collation,
-    d.failovergroupid = az_database.failover_group_id,
-    d.zoneredundant = az_database.zone_redundant,
-    d.restorabledroppeddbid = az_database.restorable_dropped_database_id,
-    d.recoverabledbid = az_database.recoverable_database_id,
-    d.lastupdated = $azure_update_tag
-    WITH d, az_database
-    MATCH (s:AzureSQLServer{id: az_database.server_id})
-    MERGE (s)-[r:RESOURCE]->(d)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_databases,
-        databases_list=databases,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureSQLDatabaseSchema(),
+        databases,
+        lastupdated=update_tag,
     )
 
 
-@timeit
-def sync_database_details(
-        neo4j_session: neo4j.Session, credentials: Credentials,
-        subscription_id: str, databases: List[Dict], update_tag: int,
-) -> None:
-    db_details = get_database_details(credentials, subscription_id, databases)
-    load_database_details(neo4j_session, db_details, update_tag)  # type: ignore
-
-
 @timeit
 def get_database_details(
         credentials: Credentials, subscription_id: str, databases: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any, Any, Any, Any]]:
     """
-    Iterate over the databases to get the details of resources in it.
+    Get the details of the resources in each database, fetching several databases concurrently.
     """
-    for database in databases:
+    def get_details(database: Dict) -> Tuple[Any, Any, Any, Any, Any]:
         replication_links = get_replication_links(credentials, subscription_id, database)
         db_threat_detection_policies = get_db_threat_detection_policies(credentials, subscription_id, database)
         restore_points = get_restore_points(credentials, subscription_id, database)
         transparent_data_encryptions = get_transparent_data_encryptions(credentials, subscription_id, database)
-        yield database[
+        return database[
             'id'
         ], replication_links, db_threat_detection_policies, restore_points, transparent_data_encryptions
 
+    return map_concurrently(get_details, databases)
+
 
 @timeit
 def get_replication_links(credentials: Credentials, subscription_id: str, database: Dict) -> List[Dict]:
@@ -787,34 +682,11 @@ def _load_replication_links(
     """
     Ingest replication links into neo4j.
     """
-    ingest_replication_links = """
-    UNWIND $replication_links_list as replication_link
-    MERGE (rl:AzureReplicationLink{id: replication_link.id})
-    ON CREATE SET rl.firstseen = timestamp(),
-    rl.location = replication_link.location
-    SET rl.name = replication_link.name,
-    rl.partnerdatabase = replication_link.partner_database,
-    rl.partnerlocation = replication_link.partner_location,
-    rl.partnerrole = replication_link.partner_role,
-    rl.partnerserver = replication_link.partner_server,
-    rl.mode = replication_link.replication_mode,
-    rl.state = replication_link.replication_state,
-    rl.percentcomplete = replication_link.percent_complete,
-    rl.role = replication_link.role,
-    rl.starttime = replication_link.start_time,
-    rl.terminationallowed = replication_link.is_termination_allowed,
-    rl.lastupdated = $azure_update_tag
-    WITH rl, replication_link
-    MATCH (d:AzureSQLDatabase{id: replication_link.database_id})
-    MERGE (d)-[r:CONTAINS]->(rl)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_replication_links,
-        replication_links_list=replication_links,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureReplicationLinkSchema(),
+        replication_links,
+        lastupdated=update_tag,
     )
 
 
@@ -825,33 +697,11 @@ def _load_db_threat_detection_policies(
     """
     Ingest threat detection policy into neo4j.
     """
-    ingest_threat_detection_policies = """
-    UNWIND $threat_detection_policies_list as tdp
-    MERGE (policy:AzureDatabaseThreatDetectionPolicy{id: tdp.id})
-    ON CREATE SET policy.firstseen = timestamp(),
-    policy.location = tdp.location
-    SET policy.name = tdp.name,
-    policy.location = tdp.location,
-    policy.kind = tdp.kind,
-    policy.emailadmins = tdp.email_account_admins,
-    policy.emailaddresses = tdp.email_addresses,
-    policy.retentiondays = tdp.retention_days,
-    policy.state = tdp.state,
-    policy.storageendpoint = tdp.storage_endpoint,
-    policy.useserverdefault = tdp.use_server_default,
-    policy.disabledalerts = tdp.disabled_alerts,
-    policy.lastupdated = $azure_update_tag
-    WITH policy, tdp
-    MATCH (d:AzureSQLDatabase{id: tdp.database_id})
-    MERGE (d)-[r:CONTAINS]->(policy)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_threat_detection_policies,
-        threat_detection_policies_list=threat_detection_policies,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureDatabaseThreatDetectionPolicySchema(),
+        threat_detection_policies,
+        lastupdated=update_tag,
     )
 
 
@@ -862,27 +712,11 @@ def _load_restore_points(
     """
     Ingest restore points into neo4j.
     """
-    ingest_restore_points = """
-    UNWIND $restore_points_list as rp
-    MERGE (point:AzureRestorePoint{id: rp.id})
-    ON CREATE SET point.firstseen = timestamp(),
-    point.location = rp.location
-    SET point.name = rp.name,
-    point.restoredate = rp.earliest_restore_date,
-    point.restorepointtype = rp.restore_point_type,
-    point.creationdate = rp.restore_point_creation_date,
-    point.lastupdated = $azure_update_tag
-    WITH point, rp
-    MATCH (d:AzureSQLDatabase{id: rp.database_id})
-    MERGE (d)-[r:CONTAINS]->(point)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_restore_points,
-        restore_points_list=restore_points,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureRestorePointSchema(),
+        restore_points,
+        lastupdated=update_tag,
     )
 
 
@@ -893,25 +727,11 @@ def _load_transparent_data_encryptions(
     """
     Ingest transparent data encryptions into neo4j.
     """
-    ingest_data_encryptions = """
-    UNWIND $transparent_data_encryptions_list as e
-    MERGE (tae:AzureTransparentDataEncryption{id: e.id})
-    ON CREATE SET tae.firstseen = timestamp(),
-    tae.location = e.location
-    SET tae.name = e.name,
-    tae.status = e.status,
-    tae.lastupdated = $azure_update_tag
-    WITH tae, e
-    MATCH (d:AzureSQLDatabase{id: e.database_id})
-    MERGE (d)-[r:CONTAINS]->(tae)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $azure_update_tag
-    """
-
-    neo4j_session.run(
-        ingest_data_encryptions,
-        transparent_data_encryptions_list=encryptions_list,
-        azure_update_tag=update_tag,
+    load(
+        neo4j_session,
+        AzureTransparentDataEncryptionSchema(),
+        encryptions_list,
+        lastupdated=update_tag,
     )
 
 
@@ -922,13 +742,44 @@ def cleanup_azure_sql_servers(
     run_cleanup_job('azure_sql_server_cleanup.json', neo4j_session, common_job_parameters)
 
 
+# All data of a subscription's SQL servers, as returned by `get_subscription_data()`.
+SqlData = namedtuple('SqlData', 'servers server_resources database_details')
+
+
+@timeit
+def get_subscription_data(credentials: Credentials, subscription_id: str) -> SqlData:
+    """
+    Fetch the SQL servers of the subscription along with their resources and the details of their databases. This
+    makes no Neo4j calls, so it can run on a worker thread.
+    """
+    server_list = get_server_list(credentials, subscription_id)
+    server_resources = transform_server_details(get_server_details(credentials, subscription_id, server_list))
+    return SqlData(
+        servers=server_list,
+        server_resources=server_resources,
+        database_details=get_database_details(credentials, subscription_id, server_resources['databases']),
+    )
+
+
+@timeit
+def load_subscription_data(
+        neo4j_session: neo4j.Session, subscription_id: str, data: SqlData, sync_tag: int,
+        common_job_parameters: Dict,
+) -> None:
+    """
+    Ingest the output of `get_subscription_data()` into neo4j and clean up stale SQL data of the subscription.
+    """
+    load_server_data(neo4j_session, subscription_id, data.servers, sync_tag)
+    load_server_details(neo4j_session, data.server_resources, sync_tag)
+    load_database_details(neo4j_session, data.database_details, sync_tag)
+    cleanup_azure_sql_servers(neo4j_session, common_job_parameters)
+
+
 @timeit
 def sync(
         neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str,
         sync_tag: int, common_job_parameters: Dict,
 ) -> None:
     logger.info("Syncing Azure SQL for subscription '%s'.", subscription_id)
-    server_list = get_server_list(credentials, subscription_id)
-    load_server_data(neo4j_session, subscription_id, server_list, sync_tag)
-    sync_server_details(neo4j_session, credentials, subscription_id, server_list, sync_tag)
-    cleanup_azure_sql_servers(neo4j_session, common_job_parameters)
+    data = get_subscription_data(credentials, subscription_id)
+    load_subscription_data(neo4j_session, subscription_id, data, sync_tag, common_job_parameters)
@@ -1,7 +1,7 @@
 import logging
+from collections import namedtuple
 from typing import Any
 from typing import Dict
-from typing import Generator
 from typing import List
 from typing import Tuple
 
@@ -11,6 +11,8 @@ from azure.core.exceptions import HttpResponseError
 from azure.core.exceptions import ResourceNotFoundError
 from azure.mgmt.storage import StorageManagementClient
 
+from .util.common import get_cached_client
+from .util.common import map_concurrently
 from .util.credentials import Credentials
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
@@ -23,8 +25,7 @@ def get_client(credentials: Credentials, subscription_id: str) -> StorageManagem
     """
     Getting the Azure Storage client
     """
-    client = StorageManagementClient(credentials, subscription_id)
-    return client
+    return get_cached_client(StorageManagementClient, credentials, subscription_id)
 
 
 @timeit
@@ -94,31 +95,24 @@ def load_storage_account_data(
     )
 
 
-@timeit
-def sync_storage_account_details(
-        neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str,
-        storage_account_list: List[Dict], sync_tag: int,
-) -> None:
-    details = get_storage_account_details(credentials, subscription_id, storage_account_list)
-    load_storage_account_details(neo4j_session, credentials, subscription_id, details, sync_tag)
-
-
 @timeit
 def get_storage_account_details(
         credentials: Credentials, subscription_id: str, storage_account_list: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any, Any, Any, Any, Any, Any]]:
     """
-    Iterates over all Storage Accounts to get the different storage services.
+    Gets the different storage services of all Storage Accounts, fetching several accounts concurrently.
     """
-    for storage_account in storage_account_list:
+    def get_services(storage_account: Dict) -> Tuple[Any, Any, Any, Any, Any, Any, Any]:
         queue_services = get_queue_services(credentials, subscription_id, storage_account)
         table_services = get_table_services(credentials, subscription_id, storage_account)
         file_services = get_file_services(credentials, subscription_id, storage_account)
         blob_services = get_blob_services(credentials, subscription_id, storage_account)
-        yield storage_account['id'], storage_account['name'], storage_account[
+        return storage_account['id'], storage_account['name'], storage_account[
             'resourceGroup'
         ], queue_services, table_services, file_services, blob_services
 
+    return map_concurrently(get_services, storage_account_list)
+
 
 @timeit
 def get_queue_services(credentials: Credentials, subscription_id: str, storage_account: Dict) -> List[Dict]:
@@ -222,12 +216,11 @@ def get_blob_services(credentials: Credentials, subscription_id: str, storage_ac
 
 
 @timeit
-def load_storage_account_details(
-        neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str,
-        details: List[Tuple[Any, Any, Any, Any, Any, Any, Any]], update_tag: int,
-) -> None:
+def transform_storage_account_details(
+        details: List[Tuple[Any, Any, Any, Any, Any, Any, Any]],
+) -> Tuple[List[Dict], List[Dict], List[Dict], List[Dict]]:
     """
-    Create dictionaries for every Azure storage service so we can import them in a single query
+    Create lists of every Azure storage service so we can import them in a single query
     """
     queue_services: List[Dict] = []
     table_services: List[Dict] = []
@@ -263,16 +256,22 @@ def load_storage_account_details(
                 service['resource_group_name'] = resourceGroup
             blob_services.extend(blob_service)
 
+    return queue_services, table_services, file_services, blob_services
+
+
+@timeit
+def load_storage_account_details(
+        neo4j_session: neo4j.Session, queue_services: List[Dict], table_services: List[Dict],
+        file_services: List[Dict], blob_services: List[Dict], update_tag: int,
+) -> None:
+    """
+    Ingest the storage services of all storage accounts into neo4j.
+    """
     _load_queue_services(neo4j_session, queue_services, update_tag)
     _load_table_services(neo4j_session, table_services, update_tag)
     _load_file_services(neo4j_session, file_services, update_tag)
     _load_blob_services(neo4j_session, blob_services, update_tag)
 
-    sync_queue_services_details(neo4j_session, credentials, subscription_id, queue_services, update_tag)
-    sync_table_services_details(neo4j_session, credentials, subscription_id, table_services, update_tag)
-    sync_file_services_details(neo4j_session, credentials, subscription_id, file_services, update_tag)
-    sync_blob_services_details(neo4j_session, credentials, subscription_id, blob_services, update_tag)
-
 
 @timeit
 def _load_queue_services(
@@ -382,25 +381,17 @@ def _load_blob_services(
     )
 
 
-@timeit
-def sync_queue_services_details(
-        neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str,
-        queue_services: List[Dict], update_tag: int,
-) -> None:
-    queue_services_details = get_queue_services_details(credentials, subscription_id, queue_services)
-    load_queue_services_details(neo4j_session, queue_services_details, update_tag)
-
-
 @timeit
 def get_queue_services_details(
         credentials: Credentials, subscription_id: str, queue_services: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any]]:
     """
-    Returning the queues with their respective queue service id.
+    Returning the queues with their respective queue service id, fetching several queue services concurrently.
     """
-    for queue_service in queue_services:
-        queues = get_queues(credentials, subscription_id, queue_service)
-        yield queue_service['id'], queues
+    return map_concurrently(
+        lambda queue_service: (queue_service['id'], get_queues(credentials, subscription_id, queue_service)),
+        queue_services,
+    )
 
 
 @timeit
@@ -475,25 +466,17 @@ def _load_queues(neo4j_session: neo4j.Session, queues: List[Dict], update_tag: i
     )
 
 
-@timeit
-def sync_table_services_details(
-        neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str,
-        table_services: List[Dict], update_tag: int,
-) -> None:
-    table_services_details = get_table_services_details(credentials, subscription_id, table_services)
-    load_table_services_details(neo4j_session, table_services_details, update_tag)
-
-
 @timeit
 def get_table_services_details(
         credentials: Credentials, subscription_id: str, table_services: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any]]:
     """
-    Returning the tables with their respective table service id.
+    Returning the tables with their respective table service id, fetching several table services concurrently.
     """
-    for table_service in table_services:
-        tables = get_tables(credentials, subscription_id, table_service)
-        yield table_service['id'], tables
+    return map_concurrently(
+        lambda table_service: (table_service['id'], get_tables(credentials, subscription_id, table_service)),
+        table_services,
+    )
 
 
 @timeit
@@ -569,25 +552,17 @@ def _load_tables(neo4j_session: neo4j.Session, tables: List[Dict], update_tag: i
     )
 
 
-@timeit
-def sync_file_services_details(
-        neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str,
-        file_services: List[Dict], update_tag: int,
-) -> None:
-    file_services_details = get_file_services_details(credentials, subscription_id, file_services)
-    load_file_services_details(neo4j_session, file_services_details, update_tag)
-
-
 @timeit
 def get_file_services_details(
         credentials: Credentials, subscription_id: str, file_services: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any]]:
     """
-    Returning the shares with their respective file service id.
+    Returning the shares with their respective file service id, fetching several file services concurrently.
     """
-    for file_service in file_services:
-        shares = get_shares(credentials, subscription_id, file_service)
-        yield file_service['id'], shares
+    return map_concurrently(
+        lambda file_service: (file_service['id'], get_shares(credentials, subscription_id, file_service)),
+        file_services,
+    )
 
 
 @timeit
@@ -673,25 +648,17 @@ def _load_shares(neo4j_session: neo4j.Session, shares: List[Dict], update_tag: i
     )
 
 
-@timeit
-def sync_blob_services_details(
-        neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str,
-        blob_services: List[Dict], update_tag: int,
-) -> None:
-    blob_services_details = get_blob_services_details(credentials, subscription_id, blob_services)
-    load_blob_services_details(neo4j_session, blob_services_details, update_tag)
-
-
 @timeit
 def get_blob_services_details(
         credentials: Credentials, subscription_id: str, blob_services: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any]]:
     """
-    Returning the blob containers with their respective blob service id.
+    Returning the blob containers with their respective blob service id, fetching several blob services concurrently.
     """
-    for blob_service in blob_services:
-        blob_containers = get_blob_containers(credentials, subscription_id, blob_service)
-        yield blob_service['id'], blob_containers
+    return map_concurrently(
+        lambda blob_service: (blob_service['id'], get_blob_containers(credentials, subscription_id, blob_service)),
+        blob_services,
+    )
 
 
 @timeit
@@ -788,13 +755,60 @@ def cleanup_azure_storage_accounts(
     run_cleanup_job('azure_storage_account_cleanup.json', neo4j_session, common_job_parameters)
 
 
+# All data of a subscription's storage accounts, as returned by `get_subscription_data()`.
+StorageData = namedtuple(
+    'StorageData',
+    'storage_accounts queue_services table_services file_services blob_services '
+    'queue_services_details table_services_details file_services_details blob_services_details',
+)
+
+
+@timeit
+def get_subscription_data(credentials: Credentials, subscription_id: str) -> StorageData:
+    """
+    Fetch the storage accounts of the subscription along with their services and the children of those. This makes no
+    Neo4j calls, so it can run on a worker thread.
+    """
+    storage_account_list = get_storage_account_list(credentials, subscription_id)
+    details = get_storage_account_details(credentials, subscription_id, storage_account_list)
+    queue_services, table_services, file_services, blob_services = transform_storage_account_details(details)
+    return StorageData(
+        storage_accounts=storage_account_list,
+        queue_services=queue_services,
+        table_services=table_services,
+        file_services=file_services,
+        blob_services=blob_services,
+        queue_services_details=get_queue_services_details(credentials, subscription_id, queue_services),
+        table_services_details=get_table_services_details(credentials, subscription_id, table_services),
+        file_services_details=get_file_services_details(credentials, subscription_id, file_services),
+        blob_services_details=get_blob_services_details(credentials, subscription_id, blob_services),
+    )
+
+
+@timeit
+def load_subscription_data(
+        neo4j_session: neo4j.Session, subscription_id: str, data: StorageData, sync_tag: int,
+        common_job_parameters: Dict,
+) -> None:
+    """
+    Ingest the output of `get_subscription_data()` into neo4j and clean up stale storage data of the subscription.
+    """
+    load_storage_account_data(neo4j_session, subscription_id, data.storage_accounts, sync_tag)
+    load_storage_account_details(
+        neo4j_session, data.queue_services, data.table_services, data.file_services, data.blob_services, sync_tag,
+    )
+    load_queue_services_details(neo4j_session, data.queue_services_details, sync_tag)
+    load_table_services_details(neo4j_session, data.table_services_details, sync_tag)
+    load_file_services_details(neo4j_session, data.file_services_details, sync_tag)
+    load_blob_services_details(neo4j_session, data.blob_services_details, sync_tag)
+    cleanup_azure_storage_accounts(neo4j_session, common_job_parameters)
+
+
 @timeit
 def sync(
         neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str,
         sync_tag: int, common_job_parameters: Dict,
 ) -> None:
     logger.info("Syncing Azure Storage for subscription '%s'.", subscription_id)
-    storage_account_list = get_storage_account_list(credentials, subscription_id)
-    load_storage_account_data(neo4j_session, subscription_id, storage_account_list, sync_tag)
-    sync_storage_account_details(neo4j_session, credentials, subscription_id, storage_account_list, sync_tag)
-    cleanup_azure_storage_accounts(neo4j_session, common_job_parameters)
+    data = get_subscription_data(credentials, subscription_id)
+    load_subscription_data(neo4j_session, subscription_id, data, sync_tag, common_job_parameters)
@@ -0,0 +1,60 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+from typing import TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Number of threads used to fetch the child resources of the storage accounts, SQL servers, CosmosDB accounts, etc. of
+# a single subscription.
+AZURE_MAX_DETAIL_WORKERS = 8
+
+_clients: Dict[Tuple[Callable, Any, str], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_cached_client(client_class: Callable[[Any, str], T], credentials: Any, subscription_id: str) -> T:
+    """
+    Return the management client of the given class for the subscription, creating it on first use. Azure SDK clients
+    are thread safe, so one client per subscription and service is shared by all callers until the Azure sync finishes
+    and calls `close_cached_clients()`.
+    :param client_class: The management client class, e.g. StorageManagementClient
+    :param credentials: The Azure Resource Manager credentials
+    :param subscription_id: The subscription ID
+    :return: The management client
+    """
+    key = (client_class, credentials, subscription_id)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = client_class(credentials, subscription_id)
+        return _clients[key]
+
+
+def close_cached_clients() -> None:
+    """
+    Close the management clients created by `get_cached_client()` and drop them, along with the credentials they hold.
+    """
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        close = getattr(client, 'close', None)
+        if close:
+            close()
+
+
+def map_concurrently(func: Callable[[R], T], items: Iterable[R]) -> List[T]:
+    """
+    Call `func` on each item on a pool of AZURE_MAX_DETAIL_WORKERS threads.
+    :param func: The function to call. It must not make any Neo4j calls.
+    :param items: The items to call `func` on
+    :return: The results, in the same order as `items`
+    """
+    with ThreadPoolExecutor(max_workers=AZURE_MAX_DETAIL_WORKERS) as executor:
+        return list(executor.map(func, items))
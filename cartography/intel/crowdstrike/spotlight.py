@@ -1,5 +1,11 @@
 import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque
 from typing import Dict
+from typing import Iterator
 from typing import List
 
 import neo4j
@@ -10,6 +16,12 @@ from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Number of concurrent getVulnerabilities calls.
+SPOTLIGHT_MAX_WORKERS = 4
+# Maximum number of detail pages fetched but not yet loaded. Bounds memory use when Neo4j writes are slower than the
+# API.
+SPOTLIGHT_MAX_PENDING_PAGES = 2 * SPOTLIGHT_MAX_WORKERS
+
 
 @timeit
 def sync_vulnerabilities(
@@ -17,11 +29,29 @@ def sync_vulnerabilities(
     update_tag: int,
     authorization: OAuth2,
 ) -> None:
+    """
+    Page through the open spotlight vulnerability ids and fetch the details of each page on a thread pool while the
+    previous pages are loaded, so that API latency overlaps with Neo4j writes. Pages are loaded in order and at most
+    SPOTLIGHT_MAX_PENDING_PAGES are held in memory at a time.
+    """
     client = Spotlight_Vulnerabilities(auth_object=authorization)
-    all_ids = get_spotlight_vulnerability_ids(client)
-    for ids in all_ids:
-        vulnerability_data = get_spotlight_vulnerabilities(client, ids)
-        load_vulnerability_data(neo4j_session, vulnerability_data, update_tag)
+    # falconpy clients keep per-request state and are not documented as thread safe, so each worker thread fetches with
+    # its own client. The clients share `authorization`, which only holds the OAuth2 token.
+    thread_clients = threading.local()
+
+    def fetch(ids: List[str]) -> List[Dict]:
+        if not hasattr(thread_clients, "client"):
+            thread_clients.client = Spotlight_Vulnerabilities(auth_object=authorization)
+        return get_spotlight_vulnerabilities(thread_clients.client, ids)
+
+    pending: Deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=SPOTLIGHT_MAX_WORKERS) as executor:
+        for ids in iter_spotlight_vulnerability_ids(client):
+            if len(pending) >= SPOTLIGHT_MAX_PENDING_PAGES:
+                load_vulnerability_data(neo4j_session, pending.popleft().result(), update_tag)
+            pending.append(executor.submit(fetch, ids))
+        while pending:
+            load_vulnerability_data(neo4j_session, pending.popleft().result(), update_tag)
 
 
 def load_vulnerability_data(
@@ -111,16 +141,18 @@ def _load_cves(neo4j_session: neo4j.Session, data: List[Dict], update_tag: int)
     )
 
 
-def get_spotlight_vulnerability_ids(client: Spotlight_Vulnerabilities) -> List[List[str]]:
-    ids = []
+def iter_spotlight_vulnerability_ids(client: Spotlight_Vulnerabilities) -> Iterator[List[str]]:
+    """
+    Yield pages of open spotlight vulnerability ids as they are returned by queryVulnerabilities.
+    """
     parameters = {"filter": 'status:!"closed"', "limit": 400}
     response = client.queryVulnerabilities(parameters=parameters)
     body = response.get("body", {})
     resources = body.get("resources", [])
     if not resources:
         logger.warning("No vulnerability IDs in spotlight queryVulnerabilities.")
-        return []
-    ids.append(resources)
+        return
+    yield resources
     after = body.get("meta", {}).get("pagination", {}).get("after")
     while after:
         parameters["after"] = after
@@ -129,9 +161,8 @@ def get_spotlight_vulnerability_ids(client: Spotlight_Vulnerabilities) -> List[L
         resources = body.get("resources", [])
         if not resources:
             break
-        ids.append(resources)
+        yield resources
         after = body.get("meta", {}).get("pagination", {}).get("after")
-    return ids
 
 
 def get_spotlight_vulnerabilities(
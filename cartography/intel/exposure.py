@@ -0,0 +1,277 @@
+"""
+Incremental internet exposure analysis.
+
+The internet exposure of an asset only changes when the asset or the network objects in front of it change. As the
+sync modules load these objects, they call `record_exposure_changes()` with a fingerprint of the data that the exposure
+analysis reads for each of them. The fingerprints are compared with the ones stored on the nodes by the last exposure
+analysis, and the nodes whose fingerprint differs make up the change set of the sync. The exposure analysis then only
+recomputes the exposure of the assets that the change set can affect, and stores the new fingerprints once it is done.
+If a change set was not recorded in this run, e.g. because one of the sync modules did not run, or if it is too large,
+the full analysis job is run instead.
+"""
+import hashlib
+import json
+import logging
+import threading
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Set
+
+import neo4j
+
+from cartography.client.core.tx import load_graph_data
+from cartography.client.core.tx import read_list_of_dicts_tx
+from cartography.client.core.tx import read_list_of_values_tx
+from cartography.util import batch
+from cartography.util import run_analysis_job
+from cartography.util import timeit
+
+logger = logging.getLogger(__name__)
+
+# Node property holding the fingerprint of the data that the last exposure analysis saw.
+EXPOSURE_FINGERPRINT_FIELD = 'exposure_fingerprint'
+
+# Above this number of changed or affected nodes, the full analysis job is cheaper than the incremental one.
+EXPOSURE_INCREMENTAL_MAX_NODES = 10000
+
+# The node labels whose changes the AWS EC2 and the GCP Compute exposure analyses need.
+AWS_EC2_EXPOSURE_LABELS = ('EC2SecurityGroup', 'EC2Instance', 'LoadBalancer', 'LoadBalancerV2', 'AutoScalingGroup')
+GCP_COMPUTE_EXPOSURE_LABELS = ('GCPVpc', 'GCPInstance')
+
+# The new fingerprints of the changed nodes by node id, for each node label whose changes were recorded in this run.
+_changes: Dict[str, Dict[str, str]] = {}
+_changes_lock = threading.Lock()
+
+_AWS_AFFECTED_LOAD_BALANCERS = """
+UNWIND $SecurityGroupIds AS group_id
+MATCH (:EC2SecurityGroup{id: group_id})<-[:SOURCE_SECURITY_GROUP]-(elb:LoadBalancer)
+RETURN elb.id AS id
+UNION
+MATCH (elb:LoadBalancer{exposed_internet: true})
+RETURN elb.id AS id
+"""
+
+_AWS_AFFECTED_LOAD_BALANCER_V2S = """
+UNWIND $SecurityGroupIds AS group_id
+MATCH (:EC2SecurityGroup{id: group_id})<-[:MEMBER_OF_EC2_SECURITY_GROUP]-(elbv2:LoadBalancerV2)
+RETURN elbv2.id AS id
+UNION
+MATCH (elbv2:LoadBalancerV2{exposed_internet: true})
+RETURN elbv2.id AS id
+"""
+
+_AWS_AFFECTED_INSTANCES = """
+UNWIND $SecurityGroupIds AS group_id
+MATCH (:EC2SecurityGroup{id: group_id})<-[:MEMBER_OF_EC2_SECURITY_GROUP|NETWORK_INTERFACE*..2]-(instance:EC2Instance)
+RETURN instance.id AS id
+UNION
+UNWIND $LoadBalancerIds AS elb_id
+MATCH (:LoadBalancer{id: elb_id})-[:EXPOSE]->(instance:EC2Instance)
+RETURN instance.id AS id
+UNION
+UNWIND $LoadBalancerV2Ids AS elbv2_id
+MATCH (:LoadBalancerV2{id: elbv2_id})-[:EXPOSE]->(instance:EC2Instance)
+RETURN instance.id AS id
+UNION
+MATCH (instance:EC2Instance{exposed_internet: true})
+RETURN instance.id AS id
+"""
+
+_AWS_AFFECTED_AUTO_SCALING_GROUPS = """
+UNWIND $InstanceIds AS instance_id
+MATCH (:EC2Instance{id: instance_id})-[:MEMBER_AUTO_SCALE_GROUP]->(asg:AutoScalingGroup)
+RETURN asg.id AS id
+UNION
+MATCH (asg:AutoScalingGroup{exposed_internet: true})
+RETURN asg.id AS id
+"""
+
+_GCP_AFFECTED_INSTANCES = """
+UNWIND $VpcIds AS vpc_id
+MATCH (:GCPVpc{id: vpc_id})<-[:MEMBER_OF_GCP_VPC]-(instance:GCPInstance)
+RETURN DISTINCT instance.id AS id
+"""
+
+
+def get_exposure_fingerprint(data: Any) -> str:
+    """
+    Return a stable hash of the given JSON-serializable data.
+    """
+    serialized = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+@timeit
+def record_exposure_changes(neo4j_session: neo4j.Session, label: str, fingerprints: Dict[str, str]) -> None:
+    """
+    Add the nodes whose fingerprint differs from the one stored by the last exposure analysis to the change set of
+    this run. Sync modules call this for each batch of nodes they load, including empty ones, since recording no
+    changes for a label tells the exposure analysis that the label was synced.
+    :param neo4j_session: The Neo4j session
+    :param label: The label of the nodes
+    :param fingerprints: The fingerprints of the nodes about to be loaded, by node id
+    """
+    query = f"""
+    UNWIND $Ids AS id
+    MATCH (n:{label}{{id: id}})
+    RETURN n.id AS id, n.{EXPOSURE_FINGERPRINT_FIELD} AS fingerprint
+    """
+    stored: Dict[str, Optional[str]] = {}
+    for ids in batch(fingerprints.keys()):
+        for row in neo4j_session.read_transaction(read_list_of_dicts_tx, query, Ids=ids):
+            stored[row['id']] = row['fingerprint']
+    changed = {
+        node_id: fingerprint for node_id, fingerprint in fingerprints.items() if stored.get(node_id) != fingerprint
+    }
+    with _changes_lock:
+        _changes.setdefault(label, {}).update(changed)
+
+
+def get_exposure_changes(labels: Iterable[str]) -> Optional[Dict[str, Dict[str, str]]]:
+    """
+    Return the change set recorded in this run for the given labels, or None if the changes of one of them were not
+    recorded.
+    """
+    with _changes_lock:
+        if not all(label in _changes for label in labels):
+            return None
+        return {label: dict(_changes[label]) for label in labels}
+
+
+def _save_exposure_fingerprints(neo4j_session: neo4j.Session, labels: Iterable[str]) -> None:
+    """
+    Store the fingerprints of the recorded changes of the given labels on the nodes, now that their exposure is up to
+    date, and clear the change set of these labels.
+    """
+    with _changes_lock:
+        changes = {label: _changes.pop(label, {}) for label in labels}
+    for label, fingerprints in changes.items():
+        query = f"""
+        UNWIND $DictList AS change
+        MATCH (n:{label}{{id: change.id}})
+        SET n.{EXPOSURE_FINGERPRINT_FIELD} = change.fingerprint
+        """
+        load_graph_data(
+            neo4j_session,
+            query,
+            [{'id': node_id, 'fingerprint': fingerprint} for node_id, fingerprint in fingerprints.items()],
+        )
+
+
+def _read_ids(neo4j_session: neo4j.Session, query: str, **kwargs: Any) -> Set[str]:
+    return {str(node_id) for node_id in neo4j_session.read_transaction(read_list_of_values_tx, query, **kwargs)}
+
+
+def get_aws_ec2_affected_assets(
+    neo4j_session: neo4j.Session, changes: Dict[str, Dict[str, str]],
+) -> Dict[str, Set[str]]:
+    """
+    Return the ids of the load balancers, EC2 instances and auto scaling groups whose exposure the given changes can
+    affect. Deleted security groups and load balancers are not in the change set, but they can only take exposure
+    away, so the assets that are currently exposed are always rechecked.
+    """
+    group_ids = list(changes['EC2SecurityGroup'])
+    elb_ids = set(changes['LoadBalancer']) | _read_ids(
+        neo4j_session, _AWS_AFFECTED_LOAD_BALANCERS, SecurityGroupIds=group_ids,
+    )
+    elbv2_ids = set(changes['LoadBalancerV2']) | _read_ids(
+        neo4j_session, _AWS_AFFECTED_LOAD_BALANCER_V2S, SecurityGroupIds=group_ids,
+    )
+    instance_ids = set(changes['EC2Instance']) | _read_ids(
+        neo4j_session,
+        _AWS_AFFECTED_INSTANCES,
+        SecurityGroupIds=group_ids,
+        LoadBalancerIds=list(elb_ids),
+        LoadBalancerV2Ids=list(elbv2_ids),
+    )
+    asg_ids = set(changes['AutoScalingGroup']) | _read_ids(
+        neo4j_session, _AWS_AFFECTED_AUTO_SCALING_GROUPS, InstanceIds=list(instance_ids),
+    )
+    return {
+        'LOAD_BALANCER_IDS': elb_ids,
+        'LOAD_BALANCER_V2_IDS': elbv2_ids,
+        'INSTANCE_IDS': instance_ids,
+        'AUTO_SCALING_GROUP_IDS': asg_ids,
+    }
+
+
+def get_gcp_compute_affected_assets(
+    neo4j_session: neo4j.Session, changes: Dict[str, Dict[str, str]],
+) -> Dict[str, Set[str]]:
+    """
+    Return the ids of the GCP instances whose exposure the given changes can affect: the changed instances and all
+    instances in the VPCs whose firewalls changed.
+    """
+    instance_ids = set(changes['GCPInstance']) | _read_ids(
+        neo4j_session, _GCP_AFFECTED_INSTANCES, VpcIds=list(changes['GCPVpc']),
+    )
+    return {'INSTANCE_IDS': instance_ids}
+
+
+def _run_exposure_analysis(
+    neo4j_session: neo4j.Session,
+    full_job: str,
+    incremental_job: str,
+    labels: Iterable[str],
+    get_affected_assets: Callable[[neo4j.Session, Dict[str, Dict[str, str]]], Dict[str, Set[str]]],
+    common_job_parameters: Dict[str, Any],
+) -> None:
+    changes = get_exposure_changes(labels)
+    affected: Optional[Dict[str, Set[str]]] = None
+    if changes is None:
+        logger.info(f"Running the full {full_job} because the changes of {labels} were not all recorded in this run.")
+    elif sum(len(fingerprints) for fingerprints in changes.values()) > EXPOSURE_INCREMENTAL_MAX_NODES:
+        logger.info(f"Running the full {full_job} because too many nodes changed.")
+    else:
+        affected = get_affected_assets(neo4j_session, changes)
+        if sum(len(ids) for ids in affected.values()) > EXPOSURE_INCREMENTAL_MAX_NODES:
+            logger.info(f"Running the full {full_job} because too many assets are affected by the changes.")
+            affected = None
+
+    if affected is None:
+        run_analysis_job(full_job, neo4j_session, common_job_parameters)
+    else:
+        logger.info(
+            f"Running {incremental_job} on " + ', '.join(f'{len(ids)} {name}' for name, ids in affected.items()) + '.',
+        )
+        run_analysis_job(
+            incremental_job,
+            neo4j_session,
+            {**common_job_parameters, **{name: list(ids) for name, ids in affected.items()}},
+        )
+    _save_exposure_fingerprints(neo4j_session, labels)
+
+
+@timeit
+def run_aws_ec2_exposure_analysis(neo4j_session: neo4j.Session, common_job_parameters: Dict[str, Any]) -> None:
+    """
+    Compute the internet exposure of the EC2 instances, load balancers and auto scaling groups of all synced AWS
+    accounts, incrementally from the change set of this run when possible.
+    """
+    _run_exposure_analysis(
+        neo4j_session,
+        'aws_ec2_asset_exposure.json',
+        'aws_ec2_asset_exposure_incremental.json',
+        AWS_EC2_EXPOSURE_LABELS,
+        get_aws_ec2_affected_assets,
+        common_job_parameters,
+    )
+
+
+@timeit
+def run_gcp_compute_exposure_analysis(neo4j_session: neo4j.Session, common_job_parameters: Dict[str, Any]) -> None:
+    """
+    Compute the internet exposure of the GCP instances of all synced projects, incrementally from the change set of
+    this run when possible.
+    """
+    _run_exposure_analysis(
+        neo4j_session,
+        'gcp_compute_asset_inet_exposure.json',
+        'gcp_compute_asset_inet_exposure_incremental.json',
+        GCP_COMPUTE_EXPOSURE_LABELS,
+        get_gcp_compute_affected_assets,
+        common_job_parameters,
+    )
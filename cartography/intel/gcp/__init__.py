@@ -1,10 +1,19 @@
 import json
 import logging
+import threading
 from collections import namedtuple
+from concurrent.futures import as_completed
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Set
+from typing import Tuple
 
 import googleapiclient.discovery
 import neo4j
@@ -14,6 +23,8 @@ from google.auth.exceptions import DefaultCredentialsError
 from googleapiclient.discovery import Resource
 
 from cartography.config import Config
+from cartography.intel import google_discovery
+from cartography.intel.exposure import run_gcp_compute_exposure_analysis
 from cartography.intel.gcp import compute
 from cartography.intel.gcp import crm
 from cartography.intel.gcp import dns
@@ -37,6 +48,12 @@ service_names = Services(
     iam='iam.googleapis.com',
 )
 
+# Number of GCP projects whose API calls are made concurrently.
+GCP_MAX_CONCURRENT_PROJECTS = 10
+
+# A step of loading a project's data: a load function and the arguments it takes after the Neo4j session.
+_ProjectLoad = Tuple[Callable[..., None], Tuple[Any, ...]]
+
 
 def _get_crm_resource_v1(credentials: GoogleCredentials) -> Resource:
     """
@@ -45,9 +62,7 @@ def _get_crm_resource_v1(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A CRM v1 resource object
     """
-    # cache_discovery=False to suppress extra warnings.
-    # See https://github.com/googleapis/google-api-python-client/issues/299#issuecomment-268915510 and related issues
-    return googleapiclient.discovery.build('cloudresourcemanager', 'v1', credentials=credentials, cache_discovery=False)
+    return google_discovery.get_resource('cloudresourcemanager', 'v1', credentials)
 
 
 def _get_crm_resource_v2(credentials: GoogleCredentials) -> Resource:
@@ -57,7 +72,7 @@ def _get_crm_resource_v2(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A CRM v2 resource object
     """
-    return googleapiclient.discovery.build('cloudresourcemanager', 'v2', credentials=credentials, cache_discovery=False)
+    return google_discovery.get_resource('cloudresourcemanager', 'v2', credentials)
 
 
 def _get_compute_resource(credentials: GoogleCredentials) -> Resource:
@@ -67,7 +82,7 @@ def _get_compute_resource(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A Compute resource object
     """
-    return googleapiclient.discovery.build('compute', 'v1', credentials=credentials, cache_discovery=False)
+    return google_discovery.get_resource('compute', 'v1', credentials)
 
 
 def _get_storage_resource(credentials: GoogleCredentials) -> Resource:
@@ -79,7 +94,7 @@ def _get_storage_resource(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A Storage resource object
     """
-    return googleapiclient.discovery.build('storage', 'v1', credentials=credentials, cache_discovery=False)
+    return google_discovery.get_resource('storage', 'v1', credentials)
 
 
 def _get_container_resource(credentials: GoogleCredentials) -> Resource:
@@ -90,7 +105,7 @@ def _get_container_resource(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A Container resource object
     """
-    return googleapiclient.discovery.build('container', 'v1', credentials=credentials, cache_discovery=False)
+    return google_discovery.get_resource('container', 'v1', credentials)
 
 
 def _get_dns_resource(credentials: GoogleCredentials) -> Resource:
@@ -101,7 +116,7 @@ def _get_dns_resource(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A DNS resource object
     """
-    return googleapiclient.discovery.build('dns', 'v1', credentials=credentials, cache_discovery=False)
+    return google_discovery.get_resource('dns', 'v1', credentials)
 
 
 def _get_serviceusage_resource(credentials: GoogleCredentials) -> Resource:
@@ -112,14 +127,14 @@ def _get_serviceusage_resource(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A serviceusage resource object
     """
-    return googleapiclient.discovery.build('serviceusage', 'v1', credentials=credentials, cache_discovery=False)
+    return google_discovery.get_resource('serviceusage', 'v1', credentials)
 
 
 def _get_iam_resource(credentials: GoogleCredentials) -> Resource:
     """
     Instantiates a Google IAM resource object to call the IAM API.
     """
-    return googleapiclient.discovery.build('iam', 'v1', credentials=credentials, cache_discovery=False)
+    return google_discovery.get_resource('iam', 'v1', credentials)
 
 
 def _initialize_resources(credentials: GoogleCredentials) -> Resource:
@@ -171,161 +186,140 @@ def _services_enabled_on_project(serviceusage: Resource, project_id: str) -> Set
         return set()
 
 
-def _sync_single_project_compute(
-    neo4j_session: neo4j.Session, resources: Resource, project_id: str, gcp_update_tag: int,
-    common_job_parameters: Dict,
-) -> None:
+def _initialize_project_resources(credentials: GoogleCredentials) -> Resources:
     """
-    Handles graph sync for a single GCP project on Compute resources.
-    :param neo4j_session: The Neo4j session
-    :param resources: namedtuple of the GCP resource objects
-    :param project_id: The project ID number to sync.  See  the `projectId` field in
-    https://cloud.google.com/resource-manager/reference/rest/v1/projects
-    :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
-    :param common_job_parameters: Other parameters sent to Neo4j
-    :return: Nothing
+    Create namedtuple of the resource objects needed to sync the services of a single project.
+    :param credentials: The GoogleCredentials object
+    :return: namedtuple of resource objects; the CRM ones are not needed per project and left as None
     """
-    # Determine the resources available on the project.
-    enabled_services = _services_enabled_on_project(resources.serviceusage, project_id)
-    compute_cred = _get_compute_resource(get_gcp_credentials())
-    if service_names.compute in enabled_services:
-        compute.sync(neo4j_session, compute_cred, project_id, gcp_update_tag, common_job_parameters)
+    return Resources(
+        crm_v1=None,
+        crm_v2=None,
+        serviceusage=_get_serviceusage_resource(credentials),
+        compute=_get_compute_resource(credentials),
+        container=_get_container_resource(credentials),
+        dns=_get_dns_resource(credentials),
+        storage=_get_storage_resource(credentials),
+        iam=_get_iam_resource(credentials),
+    )
 
 
-def _sync_single_project_storage(
-    neo4j_session: neo4j.Session, resources: Resource, project_id: str, gcp_update_tag: int,
-    common_job_parameters: Dict,
-) -> None:
+@timeit
+def _get_project_loads(resources: Resources, project_id: str, gcp_update_tag: int) -> List[_ProjectLoad]:
     """
-    Handles graph sync for a single GCP project on Storage resources.
-    :param neo4j_session: The Neo4j session
-    :param resources: namedtuple of the GCP resource objects
+    Fetch the data of every enabled service of a single GCP project. This makes no Neo4j calls, so it can run on a
+    worker thread; the returned load steps are run on the thread that owns the Neo4j session.
+    :param resources: namedtuple of the GCP resource objects, as returned by `_initialize_project_resources()`
     :param project_id: The project ID number to sync.  See  the `projectId` field in
     https://cloud.google.com/resource-manager/reference/rest/v1/projects
     :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
-    :param common_job_parameters: Other parameters sent to Neo4j
-    :return: Nothing
+    :return: List of (load function, arguments after the Neo4j session) tuples, in the order they must be run
     """
-    # Determine the resources available on the project.
     enabled_services = _services_enabled_on_project(resources.serviceusage, project_id)
-    storage_cred = _get_storage_resource(get_gcp_credentials())
-    if service_names.storage in enabled_services:
-        storage.sync_gcp_buckets(neo4j_session, storage_cred, project_id, gcp_update_tag, common_job_parameters)
+    loads: List[_ProjectLoad] = []
 
+    if service_names.compute in enabled_services:
+        logger.info("Syncing GCP project %s for Compute.", project_id)
+        compute_data = compute.get_project_compute_data(project_id, resources.compute)
+        if compute_data is not None:
+            loads.append((compute.load_project_compute_data, (compute_data, gcp_update_tag)))
 
-def _sync_single_project_gke(
-    neo4j_session: neo4j.Session, resources: Resource, project_id: str, gcp_update_tag: int,
-    common_job_parameters: Dict,
-) -> None:
-    """
-    Handles graph sync for a single GCP project GKE resources.
-    :param neo4j_session: The Neo4j session
-    :param resources: namedtuple of the GCP resource objects
-    :param project_id: The project ID number to sync.  See  the `projectId` field in
-    https://cloud.google.com/resource-manager/reference/rest/v1/projects
-    :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
-    :param common_job_parameters: Other parameters sent to Neo4j
-    :return: Nothing
-    """
-    # Determine the resources available on the project.
-    enabled_services = _services_enabled_on_project(resources.serviceusage, project_id)
-    container_cred = _get_container_resource(get_gcp_credentials())
-    if service_names.gke in enabled_services:
-        gke.sync_gke_clusters(neo4j_session, container_cred, project_id, gcp_update_tag, common_job_parameters)
+    if service_names.storage in enabled_services:
+        logger.info("Syncing GCP project %s for Storage", project_id)
+        buckets = storage.transform_gcp_buckets(storage.get_gcp_buckets(resources.storage, project_id))
+        loads.append((storage.load_gcp_buckets, (buckets, gcp_update_tag)))
 
+    if service_names.gke in enabled_services:
+        logger.info("Syncing GCP project %s for GKE", project_id)
+        gke_res = gke.get_gke_clusters(resources.container, project_id)
+        loads.append((gke.load_gke_clusters, (gke_res, project_id, gcp_update_tag)))
 
-def _sync_single_project_dns(
-    neo4j_session: neo4j.Session, resources: Resource, project_id: str, gcp_update_tag: int,
-    common_job_parameters: Dict,
-) -> None:
-    """
-    Handles graph sync for a single GCP project DNS resources.
-    :param neo4j_session: The Neo4j session
-    :param resources: namedtuple of the GCP resource objects
-    :param project_id: The project ID number to sync.  See  the `projectId` field in
-    https://cloud.google.com/resource-manager/reference/rest/v1/projects
-    :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
-    :param common_job_parameters: Other parameters sent to Neo4j
-    :return: Nothing
-    """
-    # Determine the resources available on the project.
-    enabled_services = _services_enabled_on_project(resources.serviceusage, project_id)
-    dns_cred = _get_dns_resource(get_gcp_credentials())
     if service_names.dns in enabled_services:
-        dns.sync(neo4j_session, dns_cred, project_id, gcp_update_tag, common_job_parameters)
+        logger.info("Syncing GCP project %s for DNS", project_id)
+        dns_zones = dns.get_dns_zones(resources.dns, project_id)
+        dns_rrs = dns.get_dns_rrs(resources.dns, dns_zones, project_id)
+        loads.append((dns.load_dns_zones, (dns_zones, project_id, gcp_update_tag)))
+        loads.append((dns.load_rrs, (dns_rrs, project_id, gcp_update_tag)))
 
+    if service_names.iam in enabled_services:
+        logger.info("Syncing GCP project %s for IAM", project_id)
+        service_accounts = iam.get_gcp_service_accounts(resources.iam, project_id)
+        roles = iam.get_gcp_roles(resources.iam, project_id)
+        loads.append((iam.load_gcp_service_accounts, (service_accounts, project_id, gcp_update_tag)))
+        loads.append((iam.load_gcp_roles, (roles, project_id, gcp_update_tag)))
 
-def _sync_single_project_iam(
-    neo4j_session: neo4j.Session,
-    resources: Resource,
-    project_id: str,
-    gcp_update_tag: int,
-    common_job_parameters: Dict,
-) -> None:
+    return loads
+
+
+@timeit
+def _cleanup_projects(neo4j_session: neo4j.Session, common_job_parameters: Dict) -> None:
     """
-    Handles graph sync for a single GCP project's IAM resources.
+    Run the cleanup jobs of every GCP service synced per project. None of these are scoped to a single project, so
+    they are run once after all projects have been loaded.
     :param neo4j_session: The Neo4j session
-    :param resources: namedtuple of the GCP resource objects
-    :param project_id: The project ID number to sync.  See  the `projectId` field in
-    https://cloud.google.com/resource-manager/reference/rest/v1/projects
-    :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
     :param common_job_parameters: Other parameters sent to Neo4j
     :return: Nothing
     """
-    # Determine if IAM service is enabled
-    enabled_services = _services_enabled_on_project(resources.serviceusage, project_id)
-    iam_cred = _get_iam_resource(get_gcp_credentials())
-    if service_names.iam in enabled_services:
-        iam.sync(neo4j_session, iam_cred, project_id, gcp_update_tag, common_job_parameters)
+    # TODO scope the cleanup to the current project - https://github.com/lyft/cartography/issues/381
+    compute.cleanup(neo4j_session, common_job_parameters)
+    storage.cleanup_gcp_buckets(neo4j_session, common_job_parameters)
+    gke.cleanup_gke_clusters(neo4j_session, common_job_parameters)
+    dns.cleanup_dns_records(neo4j_session, common_job_parameters)
+    iam.cleanup(neo4j_session, common_job_parameters)
 
 
 def _sync_multiple_projects(
-    neo4j_session: neo4j.Session, resources: Resource, projects: List[Dict],
-    gcp_update_tag: int, common_job_parameters: Dict,
+    neo4j_session: neo4j.Session, projects: List[Dict], gcp_update_tag: int, common_job_parameters: Dict,
+    credentials: GoogleCredentials,
 ) -> None:
     """
-    Handles graph sync for multiple GCP projects.
+    Handles graph sync for multiple GCP projects. Each project is one unit of work which fetches the data of all of the
+    project's enabled services. Up to GCP_MAX_CONCURRENT_PROJECTS units run at a time on a thread pool, and this thread
+    loads each unit's data to Neo4j as soon as it completes. The cleanup jobs run once after all projects are loaded.
     :param neo4j_session: The Neo4j session
-    :param resources: namedtuple of the GCP resource objects
     :param: projects: A list of projects. At minimum, this list should contain a list of dicts with the key "projectId"
      defined; so it would look like this: [{"projectId": "my-project-id-12345"}].
     This is the returned data from `crm.get_gcp_projects()`.
     See https://cloud.google.com/resource-manager/reference/rest/v1/projects.
     :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
     :param common_job_parameters: Other parameters sent to Neo4j
+    :param credentials: The GoogleCredentials object used to create the resource objects of each worker thread
     :return: Nothing
     """
     logger.info("Syncing %d GCP projects.", len(projects))
     crm.sync_gcp_projects(neo4j_session, projects, gcp_update_tag, common_job_parameters)
-    # Compute data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for Compute.", project_id)
-        _sync_single_project_compute(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
-
-    # Storage data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for Storage", project_id)
-        _sync_single_project_storage(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
-
-    # GKE data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for GKE", project_id)
-        _sync_single_project_gke(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
 
-    # DNS data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for DNS", project_id)
-        _sync_single_project_dns(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
-
-    # IAM data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for IAM", project_id)
-        _sync_single_project_iam(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
+    thread_local = threading.local()
+
+    def get_project_loads(project_id: str) -> List[_ProjectLoad]:
+        # googleapiclient resources share a single httplib2.Http which is not thread safe, so give each worker its own.
+        if not hasattr(thread_local, 'resources'):
+            thread_local.resources = _initialize_project_resources(credentials)
+        return _get_project_loads(thread_local.resources, project_id, gcp_update_tag)
+
+    def load_project(future: Future) -> None:
+        for load_func, args in future.result():
+            load_func(neo4j_session, *args)
+
+    # At most GCP_MAX_CONCURRENT_PROJECTS projects' data is held in memory at a time.
+    pending: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=GCP_MAX_CONCURRENT_PROJECTS) as executor:
+        try:
+            for project in projects:
+                if len(pending) >= GCP_MAX_CONCURRENT_PROJECTS:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        load_project(future)
+                pending.add(executor.submit(get_project_loads, project['projectId']))
+            for future in as_completed(pending):
+                pending.discard(future)
+                load_project(future)
+        finally:
+            # Don't start any more projects if we are bailing out early.
+            for future in pending:
+                future.cancel()
+
+    _cleanup_projects(neo4j_session, common_job_parameters)
 
 
 @timeit
@@ -381,14 +375,12 @@ def start_gcp_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
 
     projects = crm.get_gcp_projects(resources.crm_v1)
 
-    _sync_multiple_projects(neo4j_session, resources, projects, config.update_tag, common_job_parameters)
-
-    run_analysis_job(
-        'gcp_compute_asset_inet_exposure.json',
-        neo4j_session,
-        common_job_parameters,
+    _sync_multiple_projects(
+        neo4j_session, projects, config.update_tag, common_job_parameters, credentials,
     )
 
+    run_gcp_compute_exposure_analysis(neo4j_session, common_job_parameters)
+
     run_analysis_job(
         'gcp_gke_asset_exposure.json',
         neo4j_session,
@@ -9,16 +9,26 @@ from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Set
+from typing import Tuple
 
 import neo4j
 from googleapiclient.discovery import HttpError
 from googleapiclient.discovery import Resource
 
+from cartography.intel.exposure import get_exposure_fingerprint
+from cartography.intel.exposure import record_exposure_changes
+from cartography.util import batch
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 InstanceUriPrefix = namedtuple('InstanceUriPrefix', 'zone_name project_id')
+# The transformed Compute data of a single project, ready to be loaded to Neo4j.
+ProjectComputeData = namedtuple('ProjectComputeData', 'vpcs firewalls subnets instances forwarding_rules')
+# The deduplicated rows written by _attach_firewall_rules(), as returned by _flatten_firewall_rules().
+FirewallRuleRows = namedtuple('FirewallRuleRows', 'allow_rules deny_rules ranges memberships')
+# Number of rows written per UNWIND transaction when loading firewalls and their rules.
+GCP_FIREWALL_LOAD_BATCH_SIZE = 10000
 
 
 def _get_error_reason(http_error: HttpError) -> str:
@@ -179,6 +189,77 @@ def get_gcp_firewall_ingress_rules(project_id: str, compute: Resource) -> Resour
     return req.execute()
 
 
+def _get_aggregated_list_items(collection: Resource, project_id: str, items_key: str) -> Dict[str, List[Dict]]:
+    """
+    Page through the `aggregatedList` endpoint of a Compute collection, which returns the resources of every zone or
+    region of a project in a single paginated call.
+    See https://cloud.google.com/compute/docs/reference/rest/v1/instances/aggregatedList.
+    :param collection: A Compute collection such as `compute.instances()`
+    :param project_id: The project ID
+    :param items_key: The key holding the resources in each scoped list, e.g. `instances`
+    :return: Dict mapping each scope of the form `zones/{zone}` or `regions/{region}` to the resources in it
+    """
+    items_by_scope: Dict[str, List[Dict]] = {}
+    req = collection.aggregatedList(project=project_id)
+    while req is not None:
+        res = req.execute()
+        for scope, scoped_list in res.get('items', {}).items():
+            # Scopes without any resources only carry a `warning` and are left out.
+            if items_key in scoped_list:
+                items_by_scope.setdefault(scope, []).extend(scoped_list[items_key])
+        req = collection.aggregatedList_next(previous_request=req, previous_response=res)
+    return items_by_scope
+
+
+@timeit
+def get_gcp_instance_responses_aggregated(project_id: str, compute: Resource) -> List[Resource]:
+    """
+    Return list of GCP instance response objects for all zones of the given project, using the aggregatedList endpoint
+    instead of one `instances().list` call per zone.
+    :param project_id: The project ID
+    :param compute: The compute resource object
+    :return: A list of response objects of the form {id: str, items: []} where each item in `items` is a GCP instance.
+    This is the same shape as the return data of get_gcp_instance_responses().
+    """
+    instances_by_zone = _get_aggregated_list_items(compute.instances(), project_id, 'instances')
+    return [
+        {'id': f'projects/{project_id}/{zone}/instances', 'items': instances}
+        for zone, instances in instances_by_zone.items()
+    ]
+
+
+@timeit
+def get_gcp_subnets_aggregated(project_id: str, compute: Resource) -> List[Resource]:
+    """
+    Return subnet response objects for all regions of the given project, using the aggregatedList endpoint.
+    :param project_id: The project ID
+    :param compute: The compute resource object created by googleapiclient.discovery.build()
+    :return: A list of response objects, one per region, each shaped like the return data of get_gcp_subnets()
+    """
+    subnets_by_region = _get_aggregated_list_items(compute.subnetworks(), project_id, 'subnetworks')
+    return [
+        {'id': f'projects/{project_id}/{region}/subnetworks', 'items': subnets}
+        for region, subnets in subnets_by_region.items()
+    ]
+
+
+@timeit
+def get_gcp_regional_forwarding_rules_aggregated(project_id: str, compute: Resource) -> List[Resource]:
+    """
+    Return regional forwarding rule response objects for all regions of the given project, using the aggregatedList
+    endpoint.
+    :param project_id: The project ID
+    :param compute: The compute resource object created by googleapiclient.discovery.build()
+    :return: A list of response objects, one per region, each shaped like the return data of
+    get_gcp_regional_forwarding_rules()
+    """
+    rules_by_region = _get_aggregated_list_items(compute.forwardingRules(), project_id, 'forwardingRules')
+    return [
+        {'id': f'projects/{project_id}/{region}/forwardingRules', 'items': rules}
+        for region, rules in rules_by_region.items()
+    ]
+
+
 @timeit
 def transform_gcp_instances(response_objects: List[Dict]) -> List[Dict]:
     """
@@ -898,6 +979,14 @@ def _attach_gcp_vpc(neo4j_session: neo4j.Session, instance_id: str, gcp_update_t
     )
 
 
+def _run_batched(neo4j_session: neo4j.Session, query: str, rows: List[Dict], gcp_update_tag: int) -> None:
+    """
+    Run `query` on `rows` in batches of GCP_FIREWALL_LOAD_BATCH_SIZE. The query reads the batch from $Rows.
+    """
+    for rows_batch in batch(rows, size=GCP_FIREWALL_LOAD_BATCH_SIZE):
+        neo4j_session.run(query, Rows=rows_batch, gcp_update_tag=gcp_update_tag)
+
+
 @timeit
 def load_gcp_ingress_firewalls(neo4j_session: neo4j.Session, fw_list: List[Resource], gcp_update_tag: int) -> None:
     """
@@ -906,129 +995,166 @@ def load_gcp_ingress_firewalls(neo4j_session: neo4j.Session, fw_list: List[Resou
     :return: Nothing
     """
     query = """
-    MERGE (fw:GCPFirewall{id:$FwPartialUri})
+    UNWIND $Rows AS f
+    MERGE (fw:GCPFirewall{id:f.id})
     ON CREATE SET fw.firstseen = timestamp(),
-    fw.partial_uri = $FwPartialUri
-    SET fw.direction = $Direction,
-    fw.disabled = $Disabled,
-    fw.name = $Name,
-    fw.priority = $Priority,
-    fw.self_link = $SelfLink,
-    fw.has_target_service_accounts = $HasTargetServiceAccounts,
+    fw.partial_uri = f.id
+    SET fw.direction = f.direction,
+    fw.disabled = f.disabled,
+    fw.name = f.name,
+    fw.priority = f.priority,
+    fw.self_link = f.selfLink,
+    fw.has_target_service_accounts = f.has_target_service_accounts,
     fw.lastupdated = $gcp_update_tag
 
-    MERGE (vpc:GCPVpc{id:$VpcPartialUri})
+    MERGE (vpc:GCPVpc{id:f.vpc_partial_uri})
     ON CREATE SET vpc.firstseen = timestamp(),
-    vpc.partial_uri = $VpcPartialUri
+    vpc.partial_uri = f.vpc_partial_uri
     SET vpc.lastupdated = $gcp_update_tag
 
     MERGE (vpc)-[r:RESOURCE]->(fw)
     ON CREATE SET r.firstseen = timestamp()
     SET r.lastupdated = $gcp_update_tag
     """
+    _run_batched(
+        neo4j_session,
+        query,
+        [
+            {
+                'id': fw['id'],
+                'direction': fw['direction'],
+                'disabled': fw['disabled'],
+                'name': fw['name'],
+                'priority': fw['priority'],
+                'selfLink': fw['selfLink'],
+                'vpc_partial_uri': fw['vpc_partial_uri'],
+                'has_target_service_accounts': fw['has_target_service_accounts'],
+            } for fw in fw_list
+        ],
+        gcp_update_tag,
+    )
+    _attach_firewall_rules(neo4j_session, fw_list, gcp_update_tag)
+    _attach_target_tags(neo4j_session, fw_list, gcp_update_tag)
+
+
+def _flatten_firewall_rules(fw_list: List[Resource]) -> FirewallRuleRows:
+    """
+    Expand the transformed allow and deny lists of the firewalls into rows for bulk loading: one per rule, one per
+    distinct source IP range and one per (range, rule) pair. Duplicates are dropped here so that each node and
+    relationship is written once.
+    :param fw_list: The transformed list of firewalls
+    :return: The allow rules, deny rules, IP ranges and range memberships to load
+    """
+    rules: Dict[str, Dict[str, Dict]] = {'transformed_allow_list': {}, 'transformed_deny_list': {}}
+    ranges: Set[str] = set()
+    memberships: Set[Tuple[str, str]] = set()
     for fw in fw_list:
-        neo4j_session.run(
-            query,
-            FwPartialUri=fw['id'],
-            Direction=fw['direction'],
-            Disabled=fw['disabled'],
-            Name=fw['name'],
-            Priority=fw['priority'],
-            SelfLink=fw['selfLink'],
-            VpcPartialUri=fw['vpc_partial_uri'],
-            HasTargetServiceAccounts=fw['has_target_service_accounts'],
-            gcp_update_tag=gcp_update_tag,
-        )
-        _attach_firewall_rules(neo4j_session, fw, gcp_update_tag)
-        _attach_target_tags(neo4j_session, fw, gcp_update_tag)
+        # It is possible for sourceRanges to not be specified for this rule
+        # If sourceRanges is not specified then the rule must specify sourceTags.
+        # Since an IP range cannot have a tag applied to it, it is ok if we don't ingest this rule.
+        source_ranges = fw.get('sourceRanges', [])
+        if not source_ranges:
+            continue
+        ranges.update(source_ranges)
+        for list_type, rules_by_id in rules.items():
+            for rule in fw[list_type]:
+                rules_by_id[rule['ruleid']] = {
+                    'ruleid': rule['ruleid'],
+                    'protocol': rule['protocol'],
+                    'fromport': rule.get('fromport'),
+                    'toport': rule.get('toport'),
+                    'fw_id': fw['id'],
+                }
+                memberships.update((ip_range, rule['ruleid']) for ip_range in source_ranges)
+    return FirewallRuleRows(
+        allow_rules=list(rules['transformed_allow_list'].values()),
+        deny_rules=list(rules['transformed_deny_list'].values()),
+        ranges=[{'range': ip_range} for ip_range in sorted(ranges)],
+        memberships=[{'range': ip_range, 'ruleid': rule_id} for ip_range, rule_id in sorted(memberships)],
+    )
 
 
 @timeit
-def _attach_firewall_rules(neo4j_session: neo4j.Session, fw: Resource, gcp_update_tag: int) -> None:
+def _attach_firewall_rules(neo4j_session: neo4j.Session, fw_list: List[Resource], gcp_update_tag: int) -> None:
     """
-    Attach the allow_rules to the Firewall object
+    Attach the allow and deny rules and their source IP ranges to the Firewall objects
     :param neo4j_session: The Neo4j session
-    :param fw: The Firewall object
+    :param fw_list: The transformed list of firewalls
     :param gcp_update_tag: The timestamp
     :return: Nothing
     """
-    template = Template("""
-    MATCH (fw:GCPFirewall{id:$FwPartialUri})
+    rule_template = Template("""
+    UNWIND $Rows AS r
+    MATCH (fw:GCPFirewall{id:r.fw_id})
 
-    MERGE (rule:IpRule:IpPermissionInbound:GCPIpRule{id:$RuleId})
+    MERGE (rule:IpRule:IpPermissionInbound:GCPIpRule{id:r.ruleid})
     ON CREATE SET rule.firstseen = timestamp(),
-    rule.ruleid = $RuleId
-    SET rule.protocol = $Protocol,
-    rule.fromport = $FromPort,
-    rule.toport = $ToPort,
+    rule.ruleid = r.ruleid
+    SET rule.protocol = r.protocol,
+    rule.fromport = r.fromport,
+    rule.toport = r.toport,
     rule.lastupdated = $gcp_update_tag
 
-    MERGE (rng:IpRange{id:$Range})
+    MERGE (fw)<-[rel:$fw_rule_relationship_label]-(rule)
+    ON CREATE SET rel.firstseen = timestamp()
+    SET rel.lastupdated = $gcp_update_tag
+    """)
+    range_query = """
+    UNWIND $Rows AS r
+    MERGE (rng:IpRange{id:r.range})
     ON CREATE SET rng.firstseen = timestamp(),
-    rng.range = $Range
+    rng.range = r.range
     SET rng.lastupdated = $gcp_update_tag
-
+    """
+    membership_query = """
+    UNWIND $Rows AS r
+    MATCH (rng:IpRange{id:r.range}), (rule:GCPIpRule{id:r.ruleid})
     MERGE (rng)-[m:MEMBER_OF_IP_RULE]->(rule)
     ON CREATE SET m.firstseen = timestamp()
     SET m.lastupdated = $gcp_update_tag
-
-    MERGE (fw)<-[r:$fw_rule_relationship_label]-(rule)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $gcp_update_tag
-    """)
-    for list_type in 'transformed_allow_list', 'transformed_deny_list':
-        if list_type == 'transformed_allow_list':
-            label = "ALLOWED_BY"
-        else:
-            label = "DENIED_BY"
-        for rule in fw[list_type]:
-            # It is possible for sourceRanges to not be specified for this rule
-            # If sourceRanges is not specified then the rule must specify sourceTags.
-            # Since an IP range cannot have a tag applied to it, it is ok if we don't ingest this rule.
-            for ip_range in fw.get('sourceRanges', []):
-                neo4j_session.run(
-                    template.safe_substitute(fw_rule_relationship_label=label),
-                    FwPartialUri=fw['id'],
-                    RuleId=rule['ruleid'],
-                    Protocol=rule['protocol'],
-                    FromPort=rule.get('fromport'),
-                    ToPort=rule.get('toport'),
-                    Range=ip_range,
-                    gcp_update_tag=gcp_update_tag,
-                )
+    """
+    rows = _flatten_firewall_rules(fw_list)
+    _run_batched(
+        neo4j_session, rule_template.safe_substitute(fw_rule_relationship_label='ALLOWED_BY'), rows.allow_rules,
+        gcp_update_tag,
+    )
+    _run_batched(
+        neo4j_session, rule_template.safe_substitute(fw_rule_relationship_label='DENIED_BY'), rows.deny_rules,
+        gcp_update_tag,
+    )
+    _run_batched(neo4j_session, range_query, rows.ranges, gcp_update_tag)
+    _run_batched(neo4j_session, membership_query, rows.memberships, gcp_update_tag)
 
 
 @timeit
-def _attach_target_tags(neo4j_session: neo4j.Session, fw: Resource, gcp_update_tag: int) -> None:
+def _attach_target_tags(neo4j_session: neo4j.Session, fw_list: List[Resource], gcp_update_tag: int) -> None:
     """
-    Attach target tags to the firewall object
+    Attach target tags to the firewall objects
     :param neo4j_session: The neo4j session
-    :param fw: The firewall object
+    :param fw_list: The transformed list of firewalls
     :param gcp_update_tag: The timestamp
     :return: Nothing
     """
     query = """
-    MATCH (fw:GCPFirewall{id:$FwPartialUri})
+    UNWIND $Rows AS r
+    MATCH (fw:GCPFirewall{id:r.fw_id})
 
-    MERGE (t:GCPNetworkTag{id:$TagId})
+    MERGE (t:GCPNetworkTag{id:r.tag_id})
     ON CREATE SET t.firstseen = timestamp(),
-    t.tag_id = $TagId,
-    t.value = $TagValue
+    t.tag_id = r.tag_id,
+    t.value = r.tag
     SET t.lastupdated = $gcp_update_tag
 
     MERGE (fw)-[h:TARGET_TAG]->(t)
     ON CREATE SET h.firstseen = timestamp()
     SET h.lastupdated = $gcp_update_tag
     """
-    for tag in fw.get('targetTags', []):
-        tag_id = _create_gcp_network_tag_id(fw['vpc_partial_uri'], tag)
-        neo4j_session.run(
-            query,
-            FwPartialUri=fw['id'],
-            TagId=tag_id,
-            TagValue=tag,
-            gcp_update_tag=gcp_update_tag,
-        )
+    rows = [
+        {'fw_id': fw['id'], 'tag_id': _create_gcp_network_tag_id(fw['vpc_partial_uri'], tag), 'tag': tag}
+        for fw in fw_list
+        for tag in fw.get('targetTags', [])
+    ]
+    _run_batched(neo4j_session, query, rows, gcp_update_tag)
 
 
 @timeit
@@ -1208,6 +1334,110 @@ def _zones_to_regions(zones: List[str]) -> List[Set]:
     return list(regions)     # type: ignore
 
 
+@timeit
+def get_project_compute_data(project_id: str, compute: Resource) -> Optional[ProjectComputeData]:
+    """
+    Fetch and transform all Compute objects of the given project. Instances, subnets and regional forwarding rules are
+    fetched with the aggregatedList endpoints, so the number of API calls does not grow with the number of zones and
+    regions. This makes no Neo4j calls, so it can run on a worker thread.
+    :param project_id: The project ID number to sync.  See  the `projectId` field in
+    https://cloud.google.com/resource-manager/reference/rest/v1/projects
+    :param compute: The GCP Compute resource object
+    :return: The transformed data, or None if the Compute API is not available on the project.
+    """
+    # Only pull additional assets for this project if the Compute API is enabled
+    if get_zones_in_project(project_id, compute, max_results=1) is None:
+        return None
+
+    subnets: List[Dict] = []
+    for subnet_res in get_gcp_subnets_aggregated(project_id, compute):
+        subnets.extend(transform_gcp_subnets(subnet_res))
+
+    forwarding_rules = transform_gcp_forwarding_rules(get_gcp_global_forwarding_rules(project_id, compute))
+    for fwd_response in get_gcp_regional_forwarding_rules_aggregated(project_id, compute):
+        forwarding_rules.extend(transform_gcp_forwarding_rules(fwd_response))
+
+    return ProjectComputeData(
+        vpcs=transform_gcp_vpcs(get_gcp_vpcs(project_id, compute)),
+        firewalls=transform_gcp_firewall(get_gcp_firewall_ingress_rules(project_id, compute)),
+        subnets=subnets,
+        instances=transform_gcp_instances(get_gcp_instance_responses_aggregated(project_id, compute)),
+        forwarding_rules=forwarding_rules,
+    )
+
+
+def get_vpc_exposure_fingerprints(vpcs: List[Dict], firewalls: List[Dict]) -> Dict[str, str]:
+    """
+    Return the fingerprints of the firewall data that the internet exposure analysis reads, by VPC partial URI. The
+    firewalls of a VPC are fingerprinted together so that deleting one of them changes the fingerprint of its VPC.
+    :param vpcs: The transformed VPCs of a project
+    :param firewalls: The transformed firewalls of the project
+    :return: The fingerprint of each VPC
+    """
+    vpc_firewalls: Dict[str, List[Dict]] = {vpc['partial_uri']: [] for vpc in vpcs}
+    for fw in firewalls:
+        vpc_firewalls.setdefault(fw['vpc_partial_uri'], []).append({
+            key: fw.get(key) for key in (
+                'id', 'direction', 'disabled', 'priority', 'targetTags', 'targetServiceAccounts', 'sourceRanges',
+                'allowed', 'denied',
+            )
+        })
+    return {
+        vpc_id: get_exposure_fingerprint(sorted(fws, key=lambda fw: fw['id']))
+        for vpc_id, fws in vpc_firewalls.items()
+    }
+
+
+def get_instance_exposure_fingerprints(instances: List[Dict]) -> Dict[str, str]:
+    """
+    Return the fingerprints of the instance data that the internet exposure analysis reads, by instance partial URI:
+    the network tags and the network interfaces of the instance.
+    :param instances: The transformed instances of a project
+    :return: The fingerprint of each instance
+    """
+    return {
+        instance['partial_uri']: get_exposure_fingerprint([
+            instance.get('tags', {}).get('items', []),
+            instance.get('networkInterfaces', []),
+        ])
+        for instance in instances
+    }
+
+
+@timeit
+def load_project_compute_data(neo4j_session: neo4j.Session, data: ProjectComputeData, gcp_update_tag: int) -> None:
+    """
+    Load the output of `get_project_compute_data()` to Neo4j.
+    :param neo4j_session: The Neo4j session
+    :param data: The transformed Compute data of a project
+    :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
+    :return: Nothing
+    """
+    record_exposure_changes(neo4j_session, 'GCPVpc', get_vpc_exposure_fingerprints(data.vpcs, data.firewalls))
+    record_exposure_changes(neo4j_session, 'GCPInstance', get_instance_exposure_fingerprints(data.instances))
+    load_gcp_vpcs(neo4j_session, data.vpcs, gcp_update_tag)
+    load_gcp_ingress_firewalls(neo4j_session, data.firewalls, gcp_update_tag)
+    load_gcp_subnets(neo4j_session, data.subnets, gcp_update_tag)
+    load_gcp_instances(neo4j_session, data.instances, gcp_update_tag)
+    load_gcp_forwarding_rules(neo4j_session, data.forwarding_rules, gcp_update_tag)
+
+
+@timeit
+def cleanup(neo4j_session: neo4j.Session, common_job_parameters: Dict) -> None:
+    """
+    Delete out-of-date GCP Compute nodes and relationships of all projects.
+    :param neo4j_session: The Neo4j session
+    :param common_job_parameters: dict of other job parameters to pass to Neo4j
+    :return: Nothing
+    """
+    # TODO scope the cleanup to the current project - https://github.com/lyft/cartography/issues/381
+    cleanup_gcp_vpcs(neo4j_session, common_job_parameters)
+    cleanup_gcp_firewall_rules(neo4j_session, common_job_parameters)
+    cleanup_gcp_subnets(neo4j_session, common_job_parameters)
+    cleanup_gcp_instances(neo4j_session, common_job_parameters)
+    cleanup_gcp_forwarding_rules(neo4j_session, common_job_parameters)
+
+
 def sync(
     neo4j_session: neo4j.Session, compute: Resource, project_id: str, gcp_update_tag: int,
     common_job_parameters: dict,
@@ -1216,7 +1446,6 @@ def sync(
     Sync all objects that we need the GCP Compute resource object for.
     :param neo4j_session: The Neo4j session object
     :param compute: The GCP Compute resource object
-    :param project_id: The project ID number to sync.
     :param project_id: The project ID number to sync.  See  the `projectId` field in
     https://cloud.google.com/resource-manager/reference/rest/v1/projects
     :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
@@ -1224,14 +1453,8 @@ def sync(
     :return: Nothing
     """
     logger.info("Syncing Compute objects for project %s.", project_id)
-    zones = get_zones_in_project(project_id, compute)
-    # Only pull additional assets for this project if the Compute API is enabled
-    if zones is None:
+    data = get_project_compute_data(project_id, compute)
+    if data is None:
         return
-    else:
-        regions = _zones_to_regions(zones)
-        sync_gcp_vpcs(neo4j_session, compute, project_id, gcp_update_tag, common_job_parameters)
-        sync_gcp_firewall_rules(neo4j_session, compute, project_id, gcp_update_tag, common_job_parameters)
-        sync_gcp_subnets(neo4j_session, compute, project_id, regions, gcp_update_tag, common_job_parameters)
-        sync_gcp_instances(neo4j_session, compute, project_id, zones, gcp_update_tag, common_job_parameters)
-        sync_gcp_forwarding_rules(neo4j_session, compute, project_id, regions, gcp_update_tag, common_job_parameters)
+    load_project_compute_data(neo4j_session, data, gcp_update_tag)
+    cleanup(neo4j_session, common_job_parameters)
@@ -30,6 +30,9 @@ def start_github_ingestion(neo4j_session: neo4j.Session, config: Config) -> None
     common_job_parameters = {
         "UPDATE_TAG": config.update_tag,
     }
+    cache_max_age = config.github_cache_max_age
+    if cache_max_age is None:
+        cache_max_age = cartography.intel.github.repos.DEFAULT_REPO_CACHE_MAX_AGE_HOURS
     # run sync for the provided github tokens
     for auth_data in auth_tokens['organization']:
         try:
@@ -46,6 +49,8 @@ def start_github_ingestion(neo4j_session: neo4j.Session, config: Config) -> None
                 auth_data['token'],
                 auth_data['url'],
                 auth_data['name'],
+                config.github_cache_dir,
+                cache_max_age,
             )
             cartography.intel.github.teams.sync_github_teams(
                 neo4j_session,
@@ -1,11 +1,15 @@
 import configparser
+import json
 import logging
+import os
+import time
 from collections import namedtuple
 from string import Template
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from urllib.parse import urlparse
 
 import neo4j
 from packaging.requirements import InvalidRequirement
@@ -21,6 +25,10 @@ from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Collaborator permission changes do not change the cache key of a repo, so cached collaborators are re-fetched once
+# they are older than this many hours.
+DEFAULT_REPO_CACHE_MAX_AGE_HOURS = 24
+
 
 # Representation of a user's permission level and affiliation to a GitHub repo. See:
 # - Permission: https://docs.github.com/en/graphql/reference/enums#repositorypermission
@@ -57,6 +65,7 @@ GITHUB_ORG_REPOS_PAGINATED_GRAPHQL = """
                     createdAt
                     description
                     updatedAt
+                    pushedAt
                     homepageUrl
                     languages(first: 25){
                         totalCount
@@ -731,12 +740,132 @@ def load_python_requirements(neo4j_session: neo4j.Session, update_tag: int, requ
     )
 
 
+def _get_repo_cache_key(repo: Dict) -> str:
+    """
+    Return a string that changes whenever the given repo may have changed since it was last cached.
+    `updatedAt` and `pushedAt` cover metadata and content changes. Collaborator additions and removals do not bump
+    either timestamp, so the collaborator counts returned by the org repos query are included as well. Permission
+    changes, and swapping one collaborator for another, change none of these; see DEFAULT_REPO_CACHE_MAX_AGE_HOURS.
+    :param repo: A repository node from GitHub; see tests.data.github.repos.GET_REPOS for data shape.
+    :return: The cache key for the repo.
+    """
+    return '|'.join([
+        str(repo.get('updatedAt')),
+        str(repo.get('pushedAt')),
+        str((repo.get('directCollaborators') or {}).get('totalCount')),
+        str((repo.get('outsideCollaborators') or {}).get('totalCount')),
+    ])
+
+
+def _get_repo_cache_file(cache_path: str, api_url: str, organization: str) -> str:
+    """
+    Return the path of the repo cache file for the given organization. The API host is part of the file name since
+    the same organization name can exist on both a public and an enterprise GitHub instance.
+    """
+    host = urlparse(api_url).netloc or 'github'
+    return os.path.join(cache_path, f'{host}_{organization}.json')
+
+
+def _read_repo_cache(cache_file: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the local repo cache for an organization.
+    :param cache_file: Path of the cache file as returned by _get_repo_cache_file().
+    :return: A dict of repo URL to cached entry. Empty if the cache does not exist or cannot be read.
+    """
+    if not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file) as f:
+            return json.load(f)  # type: ignore
+    except (OSError, ValueError):
+        logger.warning(f"Failed to read GitHub repo cache {cache_file}; ignoring it.", exc_info=True)
+        return {}
+
+
+def _write_repo_cache(
+        cache_file: str,
+        repos_json: List[Dict],
+        direct_collaborators: dict[str, List[UserAffiliationAndRepoPermission]],
+        outside_collaborators: dict[str, List[UserAffiliationAndRepoPermission]],
+        cached_at: Dict[str, float],
+) -> None:
+    """
+    Write the local repo cache for an organization. Only repos whose collaborators were fully retrieved for both
+    affiliations are cached; everything else will be fetched again on the next run.
+    :param cache_file: Path of the cache file as returned by _get_repo_cache_file().
+    :param repos_json: The list of individual repository nodes from GitHub.
+    :param direct_collaborators: dict of repo URL to list of direct collaborators.
+    :param outside_collaborators: dict of repo URL to list of outside collaborators.
+    :param cached_at: dict of repo URL to the time its cache entry was written, for the repos whose collaborators
+    were reused from the cache, so that these entries still expire. The other repos are cached as of now.
+    :return: Nothing.
+    """
+    now = time.time()
+    cache = {}
+    for repo in repos_json:
+        repo_url = repo['url']
+        if repo_url not in direct_collaborators or repo_url not in outside_collaborators:
+            continue
+        cache[repo_url] = {
+            'key': _get_repo_cache_key(repo),
+            'cached_at': cached_at.get(repo_url, now),
+            'direct_collaborators': [list(c) for c in direct_collaborators[repo_url]],
+            'outside_collaborators': [list(c) for c in outside_collaborators[repo_url]],
+        }
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp_file = f'{cache_file}.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_file, cache_file)
+
+
+def _split_cached_repos(
+        repos_json: List[Dict],
+        cache: Dict[str, Dict[str, Any]],
+        max_age_hours: float = DEFAULT_REPO_CACHE_MAX_AGE_HOURS,
+) -> tuple[
+    List[Dict],
+    dict[str, List[UserAffiliationAndRepoPermission]],
+    dict[str, List[UserAffiliationAndRepoPermission]],
+]:
+    """
+    Split the given repos into those that changed since they were cached, or whose cache entry is older than
+    `max_age_hours`, and those that did not.
+    :param repos_json: The list of individual repository nodes from GitHub.
+    :param cache: A dict of repo URL to cached entry as returned by _read_repo_cache().
+    :param max_age_hours: The age in hours above which cached collaborators are fetched again.
+    :return: A tuple of (repos that need their collaborators fetched, cached direct collaborators of unchanged repos,
+    cached outside collaborators of unchanged repos).
+    """
+    oldest_cached_at = time.time() - max_age_hours * 3600
+    changed_repos: List[Dict] = []
+    cached_direct: dict[str, List[UserAffiliationAndRepoPermission]] = {}
+    cached_outside: dict[str, List[UserAffiliationAndRepoPermission]] = {}
+    for repo in repos_json:
+        entry = cache.get(repo['url'])
+        if (
+            not entry or entry.get('key') != _get_repo_cache_key(repo) or
+            entry.get('cached_at', 0) < oldest_cached_at
+        ):
+            changed_repos.append(repo)
+            continue
+        cached_direct[repo['url']] = [
+            UserAffiliationAndRepoPermission(*c) for c in entry['direct_collaborators']
+        ]
+        cached_outside[repo['url']] = [
+            UserAffiliationAndRepoPermission(*c) for c in entry['outside_collaborators']
+        ]
+    return changed_repos, cached_direct, cached_outside
+
+
 def sync(
         neo4j_session: neo4j.Session,
         common_job_parameters: Dict[str, Any],
         github_api_key: str,
         github_url: str,
         organization: str,
+        cache_path: Optional[str] = None,
+        cache_max_age_hours: float = DEFAULT_REPO_CACHE_MAX_AGE_HOURS,
 ) -> None:
     """
     Performs the sequential tasks to collect, transform, and sync github data
@@ -745,22 +874,51 @@ def sync(
     :param github_api_key: The API key to access the GitHub v4 API
     :param github_url: The URL for the GitHub v4 endpoint to use
     :param organization: The organization to query GitHub for
+    :param cache_path: Optional directory for the local repo cache. If set, collaborators of repos that have not
+    changed since the previous run are read from the cache instead of the GitHub API.
+    :param cache_max_age_hours: Cached collaborators older than this many hours are fetched again, which is when
+    collaborator permission changes are picked up.
     :return: Nothing
     """
     logger.info("Syncing GitHub repos")
     repos_json = get(github_api_key, github_url, organization)
+    repos_to_fetch = repos_json
     direct_collabs: dict[str, list[UserAffiliationAndRepoPermission]] = {}
     outside_collabs: dict[str, list[UserAffiliationAndRepoPermission]] = {}
+    cached_direct_collabs: dict[str, list[UserAffiliationAndRepoPermission]] = {}
+    cached_outside_collabs: dict[str, list[UserAffiliationAndRepoPermission]] = {}
+    cache: Dict[str, Dict[str, Any]] = {}
+    cache_file = _get_repo_cache_file(cache_path, github_url, organization) if cache_path else None
+    if cache_file:
+        cache = _read_repo_cache(cache_file)
+        repos_to_fetch, cached_direct_collabs, cached_outside_collabs = _split_cached_repos(
+            repos_json, cache, cache_max_age_hours,
+        )
+        logger.info(
+            f"Reusing cached collaborators for {len(repos_json) - len(repos_to_fetch)} unchanged repos "
+            f"in org {organization}; fetching {len(repos_to_fetch)}.",
+        )
     try:
         direct_collabs = _get_repo_collaborators_for_multiple_repos(
-            repos_json, "DIRECT", organization, github_url, github_api_key,
+            repos_to_fetch, "DIRECT", organization, github_url, github_api_key,
         )
         outside_collabs = _get_repo_collaborators_for_multiple_repos(
-            repos_json, "OUTSIDE", organization, github_url, github_api_key,
+            repos_to_fetch, "OUTSIDE", organization, github_url, github_api_key,
         )
     except TypeError:
         # due to permission errors or transient network error or some other nonsense
         logger.warning('Unable to list repo collaborators due to permission errors; continuing on.', exc_info=True)
+    direct_collabs.update(cached_direct_collabs)
+    outside_collabs.update(cached_outside_collabs)
+    if cache_file:
+        # Write the cache before transform() as it mutates the collaborator user dicts in place.
+        _write_repo_cache(
+            cache_file,
+            repos_json,
+            direct_collabs,
+            outside_collabs,
+            {repo_url: cache[repo_url].get('cached_at', 0) for repo_url in cached_direct_collabs},
+        )
     repo_data = transform(repos_json, direct_collabs, outside_collabs)
     load(neo4j_session, common_job_parameters, repo_data)
     run_cleanup_job('github_repos_cleanup.json', neo4j_session, common_job_parameters)
@@ -0,0 +1,138 @@
+import logging
+import os
+import tempfile
+import threading
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+import googleapiclient.discovery
+import googleapiclient.discovery_cache
+from googleapiclient.discovery import Resource
+from googleapiclient.errors import HttpError
+from googleapiclient.errors import UnknownApiNameOrVersion
+from googleapiclient.http import build_http
+from googleapiclient.http import HttpRequest
+from googleapiclient.version import __version__ as GOOGLEAPICLIENT_VERSION
+
+from cartography.profiler import record_api_calls
+
+logger = logging.getLogger(__name__)
+
+# Directory holding the discovery documents that are not bundled with google-api-python-client and had to be fetched.
+# Documents are stored under a subdirectory named after the library version, so upgrading the library starts a fresh
+# cache instead of building clients from documents it was not released with.
+DISCOVERY_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'cartography',
+    'google-discovery',
+)
+
+_documents: Dict[Tuple[str, str], str] = {}
+_documents_lock = threading.Lock()
+
+# Resource objects wrap an httplib2.Http, which is not thread safe, so each thread gets its own set of them.
+_thread_local = threading.local()
+
+
+class _CountingHttpRequest(HttpRequest):
+    """
+    An HttpRequest that counts each request it executes in the sync profile, if profiling is enabled.
+    """
+
+    def execute(self, *args: Any, **kwargs: Any) -> Any:
+        record_api_calls()
+        return super().execute(*args, **kwargs)
+
+
+def _cache_path(service_name: str, version: str) -> str:
+    return os.path.join(DISCOVERY_CACHE_DIR, GOOGLEAPICLIENT_VERSION, f'{service_name}.{version}.json')
+
+
+def _read_cached_document(service_name: str, version: str) -> Optional[str]:
+    try:
+        with open(_cache_path(service_name, version)) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_cached_document(service_name: str, version: str, document: str) -> None:
+    path = _cache_path(service_name, version)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so that concurrent runs never read a partially written document.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'w') as f:
+            f.write(document)
+        os.replace(tmp_path, path)
+    except OSError:
+        logger.warning(f"Could not write the discovery document cache file {path}.", exc_info=True)
+
+
+def _fetch_document(service_name: str, version: str) -> str:
+    http = build_http()
+    for uri in (googleapiclient.discovery.DISCOVERY_URI, googleapiclient.discovery.V2_DISCOVERY_URI):
+        url = uri.format(api=service_name, apiVersion=version)
+        try:
+            _, content = HttpRequest(http, HttpRequest.null_postproc, url).execute(num_retries=1)
+        except HttpError as e:
+            if e.resp.status == 404:
+                continue
+            raise
+        return content.decode('utf-8') if isinstance(content, bytes) else content
+    raise UnknownApiNameOrVersion(f"name: {service_name}  version: {version}")
+
+
+def get_discovery_document(service_name: str, version: str) -> str:
+    """
+    Return the discovery document of the given Google API. Documents are looked up in memory, then in the ones bundled
+    with google-api-python-client, then in the on-disk cache at DISCOVERY_CACHE_DIR, and are only fetched from Google
+    if none of these has them. Fetched documents are saved to the on-disk cache.
+    :param service_name: The name of the API, e.g. 'compute'
+    :param version: The version of the API, e.g. 'v1'
+    :return: The discovery document as a JSON string
+    """
+    key = (service_name, version)
+    with _documents_lock:
+        document = _documents.get(key)
+    if document is not None:
+        return document
+
+    document = googleapiclient.discovery_cache.get_static_doc(service_name, version)
+    if document is None:
+        document = _read_cached_document(service_name, version)
+    if document is None:
+        logger.info(f"Fetching the discovery document of Google API {service_name} {version}.")
+        document = _fetch_document(service_name, version)
+        _write_cached_document(service_name, version, document)
+
+    with _documents_lock:
+        return _documents.setdefault(key, document)
+
+
+def get_resource(service_name: str, version: str, credentials: Any) -> Resource:
+    """
+    Return a resource object to call the given Google API with the given credentials. The resource is built from the
+    cached discovery document once per thread, API and credentials, and is shared by all callers on that thread.
+    :param service_name: The name of the API, e.g. 'compute'
+    :param version: The version of the API, e.g. 'v1'
+    :param credentials: The Google credentials object
+    :return: The resource object
+    """
+    resources = getattr(_thread_local, 'resources', None)
+    if resources is None:
+        resources = _thread_local.resources = {}
+    # Credentials objects are compared by identity, so a resource is only reused for the very same credentials.
+    key = (service_name, version, id(credentials))
+    cached = resources.get(key)
+    if cached is not None and cached[0] is credentials:
+        return cached[1]
+    resource = googleapiclient.discovery.build_from_document(
+        get_discovery_document(service_name, version),
+        credentials=credentials,
+        requestBuilder=_CountingHttpRequest,
+    )
+    resources[key] = (credentials, resource)
+    return resource
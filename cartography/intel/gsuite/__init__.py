@@ -4,7 +4,6 @@ import logging
 import os
 from collections import namedtuple
 
-import googleapiclient.discovery
 import neo4j
 from google.auth import default
 from google.auth.exceptions import DefaultCredentialsError
@@ -16,6 +15,7 @@ from google.oauth2.service_account import Credentials as ServiceAccountCredentia
 from googleapiclient.discovery import Resource
 
 from cartography.config import Config
+from cartography.intel import google_discovery
 from cartography.intel.gsuite import api
 from cartography.util import timeit
 
@@ -38,7 +38,7 @@ def _get_admin_resource(credentials: OAuth2Credentials | ServiceAccountCredentia
     :param credentials: The credentials object
     :return: An admin api resource object
     """
-    return googleapiclient.discovery.build('admin', 'directory_v1', credentials=credentials, cache_discovery=False)
+    return google_discovery.get_resource('admin', 'directory_v1', credentials)
 
 
 def _initialize_resources(credentials: OAuth2Credentials | ServiceAccountCredentials) -> Resources:
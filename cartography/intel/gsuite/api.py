@@ -1,11 +1,16 @@
 import logging
+import time
+from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 import neo4j
 from googleapiclient.discovery import Resource
 from googleapiclient.errors import HttpError
 
+from cartography.util import batch
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
@@ -14,6 +19,9 @@ logger = logging.getLogger(__name__)
 
 
 GOOGLE_API_NUM_RETRIES = 5
+# Number of members().list calls sent in a single batch HTTP request. The Admin SDK accepts up to 1000, but every call
+# in a batch still counts against the per-user QPS quota, so keep batches modest.
+GOOGLE_API_BATCH_SIZE = 100
 
 
 @timeit
@@ -116,6 +124,80 @@ def get_members_for_group(admin: Resource, group_email: str) -> List[Dict]:
     return members
 
 
+def _is_retryable_http_error(exc: Exception) -> bool:
+    """
+    Return True if the given error from a batched call is transient and the call should be retried.
+    These are the same statuses that `request.execute(num_retries=...)` retries on.
+    """
+    return isinstance(exc, HttpError) and (exc.resp.status == 429 or exc.resp.status >= 500)
+
+
+def _execute_members_batch(
+    admin: Resource,
+    pending: List[Tuple[str, Optional[str]]],
+    members: Dict[str, List[Dict]],
+    attempts: Dict[str, int],
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    Send one batch HTTP request listing a page of members for each of the given groups.
+
+    :param admin: apiclient discovery resource object
+    :param pending: List of (group email, page token) to request. A page token of None requests the first page.
+    :param members: Out-param mapping group email to the members retrieved so far.
+    :param attempts: Out-param mapping group email to the number of failed attempts so far.
+    :return: List of (group email, page token) that still need to be requested, i.e. next pages and retries.
+    """
+    remaining: List[Tuple[str, Optional[str]]] = []
+
+    def callback(request_id: str, response: Dict[str, Any], exception: Optional[Exception]) -> None:
+        group_email, page_token = pending[int(request_id)]
+        if exception is not None:
+            if _is_retryable_http_error(exception) and attempts[group_email] < GOOGLE_API_NUM_RETRIES:
+                attempts[group_email] += 1
+                remaining.append((group_email, page_token))
+                return
+            raise exception
+        members[group_email].extend(response.get('members', []))
+        if response.get('nextPageToken'):
+            remaining.append((group_email, response['nextPageToken']))
+
+    batch_request = admin.new_batch_http_request(callback=callback)
+    for i, (group_email, page_token) in enumerate(pending):
+        batch_request.add(
+            admin.members().list(groupKey=group_email, maxResults=500, pageToken=page_token),
+            request_id=str(i),
+        )
+    batch_request.execute()
+    return remaining
+
+
+@timeit
+def get_members_for_groups(admin: Resource, group_emails: List[str]) -> Dict[str, List[Dict]]:
+    """ Get all members for the given google groups
+
+    Instead of one members().list call per group and page, the calls are sent GOOGLE_API_BATCH_SIZE at a time using
+    the batch HTTP endpoint. See https://developers.google.com/admin-sdk/directory/v1/guides/batch
+
+    :param admin: apiclient discovery resource object
+    :param group_emails: A list of strings representing the email addresses of the groups
+
+    :return: Dict mapping each group email to its list of dictionaries representing Users or Groups.
+    """
+    members: Dict[str, List[Dict]] = {group_email: [] for group_email in group_emails}
+    attempts: Dict[str, int] = {group_email: 0 for group_email in group_emails}
+    pending: List[Tuple[str, Optional[str]]] = [(group_email, None) for group_email in group_emails]
+    while pending:
+        remaining: List[Tuple[str, Optional[str]]] = []
+        for pending_batch in batch(pending, size=GOOGLE_API_BATCH_SIZE):
+            remaining.extend(_execute_members_batch(admin, pending_batch, members, attempts))
+        retries = [attempts[group_email] for group_email, _ in remaining if attempts[group_email] > 0]
+        if retries:
+            # Same exponential backoff as googleapiclient's own retries, based on the most retried call.
+            time.sleep(2 ** max(retries))
+        pending = remaining
+    return members
+
+
 @timeit
 def get_all_users(admin: Resource) -> List[Dict]:
     """
@@ -201,32 +283,53 @@ def load_gsuite_users(neo4j_session: neo4j.Session, users: List[Dict], gsuite_up
 
 
 @timeit
-def load_gsuite_members(neo4j_session: neo4j.Session, group: Dict, members: List[Dict], gsuite_update_tag: int) -> None:
+def transform_members(groups: List[Dict], members_by_group: Dict[str, List[Dict]]) -> List[Dict]:
+    """ Flattens group members into a list of membership edges
+
+    :param groups: list of group dictionaries as returned by transform_groups()
+    :param members_by_group: Dict mapping group email to its members, as returned by get_members_for_groups()
+    :return: list of dictionaries with the `group_id` and `member_id` of each membership
+    """
+    memberships: List[Dict] = []
+    for group in groups:
+        for member in members_by_group.get(group['email'], []):
+            memberships.append({'group_id': group.get('id'), 'member_id': member.get('id')})
+    return memberships
+
+
+@timeit
+def load_gsuite_memberships(neo4j_session: neo4j.Session, memberships: List[Dict], gsuite_update_tag: int) -> None:
     ingestion_qry = """
         UNWIND $MemberData as member
-        MATCH (user:GSuiteUser {id: member.id}),(group:GSuiteGroup {id: $GroupID })
+        MATCH (user:GSuiteUser {id: member.member_id}),(group:GSuiteGroup {id: member.group_id})
         MERGE (user)-[r:MEMBER_GSUITE_GROUP]->(group)
         ON CREATE SET
         r.firstseen = $UpdateTag
         SET
         r.lastupdated = $UpdateTag
     """
-    neo4j_session.run(
-        ingestion_qry,
-        MemberData=members,
-        GroupID=group.get("id"),
-        UpdateTag=gsuite_update_tag,
-    )
     membership_qry = """
         UNWIND $MemberData as member
-        MATCH(group_1: GSuiteGroup{id: member.id}), (group_2:GSuiteGroup {id: $GroupID})
+        MATCH(group_1: GSuiteGroup{id: member.member_id}), (group_2:GSuiteGroup {id: member.group_id})
         MERGE (group_1)-[r:MEMBER_GSUITE_GROUP]->(group_2)
         ON CREATE SET
         r.firstseen = $UpdateTag
         SET
         r.lastupdated = $UpdateTag
     """
-    neo4j_session.run(membership_qry, MemberData=members, GroupID=group.get("id"), UpdateTag=gsuite_update_tag)
+    logger.info(f'Ingesting {len(memberships)} gsuite group memberships')
+    for memberships_batch in batch(memberships):
+        neo4j_session.run(ingestion_qry, MemberData=memberships_batch, UpdateTag=gsuite_update_tag)
+        neo4j_session.run(membership_qry, MemberData=memberships_batch, UpdateTag=gsuite_update_tag)
+
+
+@timeit
+def load_gsuite_members(neo4j_session: neo4j.Session, group: Dict, members: List[Dict], gsuite_update_tag: int) -> None:
+    load_gsuite_memberships(
+        neo4j_session,
+        transform_members([group], {group['email']: members}),
+        gsuite_update_tag,
+    )
 
 
 @timeit
@@ -294,6 +397,6 @@ def sync_gsuite_groups(
 def sync_gsuite_members(
     groups: List[Dict], neo4j_session: neo4j.Session, admin: Resource, gsuite_update_tag: int,
 ) -> None:
-    for group in groups:
-        members = get_members_for_group(admin, group['email'])
-        load_gsuite_members(neo4j_session, group, members, gsuite_update_tag)
+    members_by_group = get_members_for_groups(admin, [group['email'] for group in groups])
+    memberships = transform_members(groups, members_by_group)
+    load_gsuite_memberships(neo4j_session, memberships, gsuite_update_tag)
@@ -1,18 +1,132 @@
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
 
 from neo4j import Session
 
 from cartography.config import Config
-from cartography.intel.kubernetes.namespaces import sync_namespaces
-from cartography.intel.kubernetes.pods import sync_pods
-from cartography.intel.kubernetes.secrets import sync_secrets
-from cartography.intel.kubernetes.services import sync_services
+from cartography.intel.kubernetes.namespaces import get_namespaces
+from cartography.intel.kubernetes.namespaces import load_namespaces
+from cartography.intel.kubernetes.namespaces import merge_cluster_sync_metadata
+from cartography.intel.kubernetes.pods import get_pod_labels
+from cartography.intel.kubernetes.pods import get_pods_paginated
+from cartography.intel.kubernetes.pods import load_pods
+from cartography.intel.kubernetes.secrets import get_secrets_paginated
+from cartography.intel.kubernetes.secrets import load_secrets
+from cartography.intel.kubernetes.services import get_services
+from cartography.intel.kubernetes.services import load_services
 from cartography.intel.kubernetes.util import get_k8s_clients
+from cartography.intel.kubernetes.util import K8S_MAX_CLUSTER_WORKERS
+from cartography.intel.kubernetes.util import K8sClient
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of fetched pages waiting to be loaded. Bounds memory use when Neo4j writes are slower than the
+# Kubernetes API.
+_MAX_PENDING_LOADS = 2 * K8S_MAX_CLUSTER_WORKERS
+
+# A unit of work for the loader thread: a function taking the Neo4j session, or an exception raised by a producer, or
+# None once a producer has finished.
+_LoadItem = Optional[Callable[[Session], None] | Tuple[str, BaseException]]
+
+
+class _ProducerCancelled(Exception):
+    pass
+
+
+def _put(load_queue: "queue.Queue[_LoadItem]", item: _LoadItem, cancelled: threading.Event) -> None:
+    while True:
+        if cancelled.is_set():
+            raise _ProducerCancelled()
+        try:
+            load_queue.put(item, timeout=1)
+            return
+        except queue.Full:
+            continue
+
+
+def _load_page(
+    load_func: Callable[[Session, List[Dict], int], None], data: List[Dict], update_tag: int, session: Session,
+) -> None:
+    load_func(session, data, update_tag)
+
+
+def _produce_cluster(
+    client: K8sClient,
+    update_tag: int,
+    load_queue: "queue.Queue[_LoadItem]",
+    cancelled: threading.Event,
+) -> None:
+    """
+    Fetch the data of one cluster and queue the writes for it, in the order they must be loaded: namespaces first, then
+    pods, then services which attach to pods, then secrets.
+    """
+    logger.info(f"Syncing data for k8s cluster {client.name}...")
+    try:
+        cluster, namespaces = get_namespaces(client)
+
+        def load_cluster(session: Session) -> None:
+            load_namespaces(session, cluster, namespaces, update_tag)
+            merge_cluster_sync_metadata(session, cluster, update_tag)
+
+        _put(load_queue, load_cluster, cancelled)
+
+        # Only the labels of the pods are kept for matching services, keyed by pod id since a listing restarted after
+        # its continue token expired returns some pods again.
+        pod_labels: Dict[str, Dict] = {}
+        for pods_page in get_pods_paginated(client, cluster):
+            _put(load_queue, partial(_load_page, load_pods, pods_page, update_tag), cancelled)
+            pod_labels.update((pod["uid"], pod) for pod in get_pod_labels(pods_page))
+
+        services = get_services(client, cluster, list(pod_labels.values()))
+        _put(load_queue, partial(_load_page, load_services, services, update_tag), cancelled)
+
+        for secrets_page in get_secrets_paginated(client, cluster):
+            _put(load_queue, partial(_load_page, load_secrets, secrets_page, update_tag), cancelled)
+    except _ProducerCancelled:
+        return
+    except Exception as e:
+        _put(load_queue, (client.name, e), cancelled)
+        return
+    _put(load_queue, None, cancelled)
+
+
+def sync_clusters(session: Session, clients: List[K8sClient], update_tag: int) -> None:
+    """
+    Sync the given clusters concurrently. The Kubernetes API calls for up to K8S_MAX_CLUSTER_WORKERS clusters run on
+    a thread pool and stream pages of transformed data to this thread, which does all Neo4j writes on `session`.
+    """
+    load_queue: "queue.Queue[_LoadItem]" = queue.Queue(maxsize=_MAX_PENDING_LOADS)
+    cancelled = threading.Event()
+    with ThreadPoolExecutor(max_workers=K8S_MAX_CLUSTER_WORKERS) as executor:
+        for client in clients:
+            executor.submit(_produce_cluster, client, update_tag, load_queue, cancelled)
+        try:
+            remaining = len(clients)
+            while remaining:
+                item: Any = load_queue.get()
+                if item is None:
+                    remaining -= 1
+                elif isinstance(item, tuple):
+                    cluster_name, exc = item
+                    logger.error(f"Failed to sync data for k8s cluster {cluster_name}...", exc_info=exc)
+                    raise exc
+                else:
+                    item(session)
+        finally:
+            # Stop the remaining producers if we are bailing out early.
+            cancelled.set()
+
 
 @timeit
 def start_k8s_ingestion(session: Session, config: Config) -> None:
@@ -22,16 +136,7 @@ def start_k8s_ingestion(session: Session, config: Config) -> None:
         logger.error("kubeconfig not found.")
         return
 
-    for client in get_k8s_clients(config.k8s_kubeconfig):
-        logger.info(f"Syncing data for k8s cluster {client.name}...")
-        try:
-            cluster = sync_namespaces(session, client, config.update_tag)
-            pods = sync_pods(session, client, config.update_tag, cluster)
-            sync_services(session, client, config.update_tag, cluster, pods)
-            sync_secrets(session, client, config.update_tag, cluster)
-        except Exception:
-            logger.exception(f"Failed to sync data for k8s cluster {client.name}...")
-            raise
+    sync_clusters(session, get_k8s_clients(config.k8s_kubeconfig), config.update_tag)
 
     run_cleanup_job(
         "kubernetes_import_cleanup.json",
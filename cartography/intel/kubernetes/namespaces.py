@@ -19,6 +19,11 @@ stat_handler = get_stats_client(__name__)
 def sync_namespaces(session: Session, client: K8sClient, update_tag: int) -> Dict:
     cluster, namespaces = get_namespaces(client)
     load_namespaces(session, cluster, namespaces, update_tag)
+    merge_cluster_sync_metadata(session, cluster, update_tag)
+    return cluster
+
+
+def merge_cluster_sync_metadata(session: Session, cluster: Dict, update_tag: int) -> None:
     merge_module_sync_metadata(
         session,
         group_type='KubernetesCluster',
@@ -27,7 +32,6 @@ def sync_namespaces(session: Session, client: K8sClient, update_tag: int) -> Dic
         update_tag=update_tag,
         stat_handler=stat_handler,
     )
-    return cluster
 
 
 @timeit
@@ -1,11 +1,15 @@
 import logging
 from typing import Dict
+from typing import Iterator
 from typing import List
 
+from kubernetes.client import V1Pod
 from neo4j import Session
 
 from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import K8S_PAGE_SIZE
 from cartography.intel.kubernetes.util import K8sClient
+from cartography.intel.kubernetes.util import list_paginated
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
@@ -15,58 +19,78 @@ logger = logging.getLogger(__name__)
 def sync_pods(
     session: Session, client: K8sClient, update_tag: int, cluster: Dict,
 ) -> List[Dict]:
-    pods = get_pods(client, cluster)
-    load_pods(session, pods, update_tag)
+    pods = list()
+    for pods_page in get_pods_paginated(client, cluster):
+        load_pods(session, pods_page, update_tag)
+        pods.extend(pods_page)
     return pods
 
 
 @timeit
 def get_pods(client: K8sClient, cluster: Dict) -> List[Dict]:
     pods = list()
-    for pod in client.core.list_pod_for_all_namespaces().items:
-        containers = {}
-        for container in pod.spec.containers:
-            containers[container.name] = {
-                "name": container.name,
-                "image": container.image,
-                "uid": f"{pod.metadata.uid}-{container.name}",
-            }
-        if pod.status and pod.status.container_statuses:
-            for status in pod.status.container_statuses:
-                if status.name in containers:
-                    _state = 'waiting'
-                    if status.state.running:
-                        _state = 'running'
-                    elif status.state.terminated:
-                        _state = 'terminated'
-                    try:
-                        image_sha = status.image_id.split("@")[1]
-                    except IndexError:
-                        image_sha = None
-                    containers[status.name]["status"] = {
-                        "image_id": status.image_id,
-                        "image_sha": image_sha,
-                        "ready": status.ready,
-                        "started": status.started,
-                        "state": _state,
-                    }
-        pods.append(
-            {
-                "uid": pod.metadata.uid,
-                "name": pod.metadata.name,
-                "status_phase": pod.status.phase,
-                "creation_timestamp": get_epoch(pod.metadata.creation_timestamp),
-                "deletion_timestamp": get_epoch(pod.metadata.deletion_timestamp),
-                "namespace": pod.metadata.namespace,
-                "node": pod.spec.node_name,
-                "cluster_uid": cluster["uid"],
-                "labels": pod.metadata.labels,
-                "containers": list(containers.values()),
-            },
-        )
+    for pods_page in get_pods_paginated(client, cluster):
+        pods.extend(pods_page)
     return pods
 
 
+def get_pods_paginated(client: K8sClient, cluster: Dict, page_size: int = K8S_PAGE_SIZE) -> Iterator[List[Dict]]:
+    """
+    Yield the pods of the cluster, transformed, one page of `page_size` pods at a time.
+    """
+    for page in list_paginated(client.core.list_pod_for_all_namespaces, page_size):
+        yield [_transform_pod(pod, cluster) for pod in page]
+
+
+def get_pod_labels(pods: List[Dict]) -> List[Dict]:
+    """
+    Keep only the fields that `get_services` matches service selectors against. Pods without labels are dropped since no
+    service selects them.
+    """
+    return [{"uid": pod["uid"], "labels": pod["labels"]} for pod in pods if pod.get("labels")]
+
+
+def _transform_pod(pod: V1Pod, cluster: Dict) -> Dict:
+    containers = {}
+    for container in pod.spec.containers:
+        containers[container.name] = {
+            "name": container.name,
+            "image": container.image,
+            "uid": f"{pod.metadata.uid}-{container.name}",
+        }
+    if pod.status and pod.status.container_statuses:
+        for status in pod.status.container_statuses:
+            if status.name in containers:
+                _state = 'waiting'
+                if status.state.running:
+                    _state = 'running'
+                elif status.state.terminated:
+                    _state = 'terminated'
+                try:
+                    image_sha = status.image_id.split("@")[1]
+                except IndexError:
+                    image_sha = None
+                containers[status.name]["status"] = {
+                    "image_id": status.image_id,
+                    "image_sha": image_sha,
+                    "ready": status.ready,
+                    "started": status.started,
+                    "state": _state,
+                }
+    return {
+        "uid": pod.metadata.uid,
+        "name": pod.metadata.name,
+        "status_phase": pod.status.phase,
+        "creation_timestamp": get_epoch(pod.metadata.creation_timestamp),
+        "deletion_timestamp": get_epoch(pod.metadata.deletion_timestamp),
+        "namespace": pod.metadata.namespace,
+        "node": pod.spec.node_name,
+        "cluster_uid": cluster["uid"],
+        "labels": pod.metadata.labels,
+        "containers": list(containers.values()),
+    }
+
+
 def load_pods(session: Session, data: List[Dict], update_tag: int) -> None:
     ingestion_cypher_query = """
     UNWIND $pods as k8pod
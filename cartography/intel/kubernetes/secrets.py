@@ -1,11 +1,14 @@
 import logging
 from typing import Dict
+from typing import Iterator
 from typing import List
 
 from neo4j import Session
 
 from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import K8S_PAGE_SIZE
 from cartography.intel.kubernetes.util import K8sClient
+from cartography.intel.kubernetes.util import list_paginated
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
@@ -18,26 +21,41 @@ def sync_secrets(
     update_tag: int,
     cluster: Dict,
 ) -> List[Dict]:
-    secrets = get_secrets(client, cluster)
-    load_secrets(session, secrets, update_tag)
+    secrets = list()
+    for secrets_page in get_secrets_paginated(client, cluster):
+        load_secrets(session, secrets_page, update_tag)
+        secrets.extend(secrets_page)
     return secrets
 
 
 @timeit
 def get_secrets(client: K8sClient, cluster: Dict) -> List[Dict]:
-    return [
-        {
-            "uid": secret.metadata.uid,
-            "name": secret.metadata.name,
-            "creation_timestamp": get_epoch(secret.metadata.creation_timestamp),
-            "deletion_timestamp": get_epoch(secret.metadata.deletion_timestamp),
-            "namespace": secret.metadata.namespace,
-            "cluster_uid": cluster["uid"],
-            "labels": secret.metadata.labels,
-            "type": secret.type,
-        }
-        for secret in client.core.list_secret_for_all_namespaces().items
-    ]
+    secrets = list()
+    for secrets_page in get_secrets_paginated(client, cluster):
+        secrets.extend(secrets_page)
+    return secrets
+
+
+def get_secrets_paginated(
+    client: K8sClient, cluster: Dict, page_size: int = K8S_PAGE_SIZE,
+) -> Iterator[List[Dict]]:
+    """
+    Yield the secrets of the cluster, transformed, one page of `page_size` secrets at a time.
+    """
+    for page in list_paginated(client.core.list_secret_for_all_namespaces, page_size):
+        yield [
+            {
+                "uid": secret.metadata.uid,
+                "name": secret.metadata.name,
+                "creation_timestamp": get_epoch(secret.metadata.creation_timestamp),
+                "deletion_timestamp": get_epoch(secret.metadata.deletion_timestamp),
+                "namespace": secret.metadata.namespace,
+                "cluster_uid": cluster["uid"],
+                "labels": secret.metadata.labels,
+                "type": secret.type,
+            }
+            for secret in page
+        ]
 
 
 def load_secrets(session: Session, data: List[Dict], update_tag: int) -> None:
@@ -1,4 +1,8 @@
+import logging
 from datetime import datetime
+from typing import Any
+from typing import Callable
+from typing import Iterator
 from typing import List
 from typing import Union
 
@@ -6,6 +10,18 @@ from kubernetes import config
 from kubernetes.client import ApiClient
 from kubernetes.client import CoreV1Api
 from kubernetes.client import NetworkingV1Api
+from kubernetes.client.exceptions import ApiException
+
+logger = logging.getLogger(__name__)
+
+
+# Number of items requested per list call. This is the page size recommended by the Kubernetes API docs; see
+# https://kubernetes.io/docs/reference/using-api/api-concepts/#retrieving-large-results-sets-in-chunks
+K8S_PAGE_SIZE = 500
+# Number of clusters synced concurrently.
+K8S_MAX_CLUSTER_WORKERS = 8
+# Number of times a paginated listing is restarted from the first page after its continue token expired.
+K8S_MAX_LIST_RESTARTS = 3
 
 
 class KubernetesContextNotFound(Exception):
@@ -49,3 +65,34 @@ def get_epoch(date: datetime) -> Union[int, None]:
     if date:
         return int(date.strftime("%s"))
     return None
+
+
+def list_paginated(list_func: Callable[..., Any], page_size: int = K8S_PAGE_SIZE) -> Iterator[List[Any]]:
+    """
+    Call a Kubernetes list function, e.g. `CoreV1Api.list_pod_for_all_namespaces`, in chunks of `page_size` items using
+    the `limit` and `continue` parameters, and yield the items of each chunk. This avoids holding a single response for
+    the whole cluster in memory.
+
+    The API server expires a continue token after a few minutes and then answers with a 410 Gone. In that case the
+    listing is restarted from the first page, up to K8S_MAX_LIST_RESTARTS times, so callers can see an item more than
+    once and must load pages idempotently.
+    """
+    _continue = None
+    restarts = 0
+    while True:
+        try:
+            response = list_func(limit=page_size, _continue=_continue)
+        except ApiException as e:
+            if e.status != 410 or not _continue or restarts >= K8S_MAX_LIST_RESTARTS:
+                raise
+            restarts += 1
+            logger.warning(
+                f"Continue token of {getattr(list_func, '__name__', list_func)} expired, restarting the listing "
+                f"({restarts}/{K8S_MAX_LIST_RESTARTS}).",
+            )
+            _continue = None
+            continue
+        yield response.items
+        _continue = response.metadata._continue
+        if not _continue:
+            return
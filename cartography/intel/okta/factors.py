@@ -1,14 +1,20 @@
 # Okta intel module - Factors
 import logging
+from functools import partial
 from typing import Dict
 from typing import List
+from typing import Optional
 
 import neo4j
 from okta import FactorsClient
 from okta.framework.OktaError import OktaError
+from okta.framework.Utils import Utils
 from okta.models.factor.Factor import Factor
 
 from cartography.intel.okta.sync_state import OktaSyncState
+from cartography.intel.okta.utils import fetch_concurrently
+from cartography.intel.okta.utils import OktaRateLimiter
+from cartography.util import DEFAULT_BATCH_SIZE
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
@@ -33,16 +39,27 @@ def _create_factor_client(okta_org: str, okta_api_key: str) -> FactorsClient:
 
 
 @timeit
-def _get_factor_for_user_id(factor_client: FactorsClient, user_id: str) -> List[Factor]:
+def _get_factor_for_user_id(
+    factor_client: FactorsClient, user_id: str, rate_limiter: Optional[OktaRateLimiter] = None,
+) -> List[Factor]:
     """
     Get factor for user from the Okta server
     :param factor_client: factor client
     :param user_id: user to fetch the data from
+    :param rate_limiter: rate limit state shared with concurrent calls, if any
     :return: Array of user factor information
     """
 
     try:
-        factor_results = factor_client.get_lifecycle_factors(user_id)
+        if rate_limiter:
+            rate_limiter.wait()
+        # Equivalent to factor_client.get_lifecycle_factors(user_id), but keeps the response so that we can read its
+        # rate limit headers.
+        # https://github.com/okta/okta-sdk-python/blob/master/okta/FactorsClient.py
+        response = factor_client.get_path(f'/{user_id}/factors')
+        if rate_limiter:
+            rate_limiter.update(response)
+        factor_results = Utils.deserialize(response.text, Factor)
     except OktaError as okta_error:
         logger.debug(
             f"Unable to get factor for user id {user_id} with "
@@ -93,20 +110,18 @@ def transform_okta_user_factor(okta_factor_info: Factor) -> Dict:
 
 
 @timeit
-def _load_user_factors(neo4j_session: neo4j.Session, user_id: str, factors: List[Dict], okta_update_tag: int) -> None:
+def _load_user_factors(neo4j_session: neo4j.Session, factors: List[Dict], okta_update_tag: int) -> None:
     """
     Add user factors into the graph
     :param neo4j_session: session with the Neo4j server
-    :param user_id: user to map factors to
-    :param factors: factors to add
+    :param factors: factors to add, each with the `user_id` of the user to map it to
     :param okta_update_tag: The timestamp value to set our new Neo4j resources with
     :return: Nothing
     """
 
     ingest = """
-    MATCH (user:OktaUser{id: $USER_ID})
-    WITH user
     UNWIND $FACTOR_LIST as factor_data
+    MATCH (user:OktaUser{id: factor_data.user_id})
     MERGE (new_factor:OktaUserFactor{id: factor_data.id})
     ON CREATE SET new_factor.firstseen = timestamp()
     SET new_factor.factor_type = factor_data.factor_type,
@@ -123,7 +138,6 @@ def _load_user_factors(neo4j_session: neo4j.Session, user_id: str, factors: List
 
     neo4j_session.run(
         ingest,
-        USER_ID=user_id,
         FACTOR_LIST=factors,
         okta_update_tag=okta_update_tag,
     )
@@ -149,7 +163,17 @@ def sync_users_factors(
     factor_client = _create_factor_client(okta_org_id, okta_api_key)
 
     if sync_state.users:
-        for user_id in sync_state.users:
-            factor_data = _get_factor_for_user_id(factor_client, user_id)
-            user_factors = transform_okta_user_factor_list(factor_data)
-            _load_user_factors(neo4j_session, user_id, user_factors, okta_update_tag)
+        rate_limiter = OktaRateLimiter()
+        user_factors: List[Dict] = []
+        for user_id, factor_data in fetch_concurrently(
+            partial(_get_factor_for_user_id, factor_client, rate_limiter=rate_limiter),
+            sync_state.users,
+        ):
+            for factor in transform_okta_user_factor_list(factor_data):
+                factor['user_id'] = user_id
+                user_factors.append(factor)
+            if len(user_factors) >= DEFAULT_BATCH_SIZE:
+                _load_user_factors(neo4j_session, user_factors, okta_update_tag)
+                user_factors = []
+        if user_factors:
+            _load_user_factors(neo4j_session, user_factors, okta_update_tag)
@@ -1,8 +1,10 @@
 # Okta intel module - Roles
 import json
 import logging
+from functools import partial
 from typing import Dict
 from typing import List
+from typing import Optional
 
 import neo4j
 from okta.framework.ApiClient import ApiClient
@@ -10,40 +12,59 @@ from okta.framework.ApiClient import ApiClient
 from cartography.intel.okta.sync_state import OktaSyncState
 from cartography.intel.okta.utils import check_rate_limit
 from cartography.intel.okta.utils import create_api_client
+from cartography.intel.okta.utils import fetch_concurrently
+from cartography.intel.okta.utils import OktaRateLimiter
+from cartography.util import DEFAULT_BATCH_SIZE
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
 
 @timeit
-def _get_user_roles(api_client: ApiClient, user_id: str, okta_org_id: str) -> str:
+def _get_user_roles(
+    api_client: ApiClient, user_id: str, okta_org_id: str, rate_limiter: Optional[OktaRateLimiter] = None,
+) -> str:
     """
     Get user roles from Okta
     :param api_client: api client
     :param user_id: user to fetch roles from
     :param okta_org_id: okta organization id
+    :param rate_limiter: rate limit state shared with concurrent calls, if any
     :return: user roles data
     """
 
     # https://developer.okta.com/docs/reference/api/roles/#list-roles
+    if rate_limiter:
+        rate_limiter.wait()
     response = api_client.get_path(f'/{user_id}/roles')
-    check_rate_limit(response)
+    if rate_limiter:
+        rate_limiter.update(response)
+    else:
+        check_rate_limit(response)
     return response.text
 
 
 @timeit
-def _get_group_roles(api_client: ApiClient, group_id: str, okta_org_id: str) -> str:
+def _get_group_roles(
+    api_client: ApiClient, group_id: str, okta_org_id: str, rate_limiter: Optional[OktaRateLimiter] = None,
+) -> str:
     """
     Get user roles from Okta
     :param api_client: api client
     :param group_id: user to fetch roles from
     :param okta_org_id: okta organization id
+    :param rate_limiter: rate limit state shared with concurrent calls, if any
     :return: group roles data
     """
 
     # https://developer.okta.com/docs/reference/api/roles/#list-roles-assigned-to-group
+    if rate_limiter:
+        rate_limiter.wait()
     response = api_client.get_path(f'/{group_id}/roles')
-    check_rate_limit(response)
+    if rate_limiter:
+        rate_limiter.update(response)
+    else:
+        check_rate_limit(response)
     return response.text
 
 
@@ -94,11 +115,17 @@ def transform_group_roles_data(data: str, okta_org_id: str) -> List[Dict]:
 
 
 @timeit
-def _load_user_role(neo4j_session: neo4j.Session, user_id: str, roles_data: List[Dict], okta_update_tag: int) -> None:
+def _load_user_role(neo4j_session: neo4j.Session, roles_data: List[Dict], okta_update_tag: int) -> None:
+    """
+    Add user roles into the graph
+    :param neo4j_session: session with the Neo4j server
+    :param roles_data: roles to add, each with the `user_id` of the user to map it to
+    :param okta_update_tag: The timestamp value to set our new Neo4j resources with
+    :return: Nothing
+    """
     ingest = """
-    MATCH (user:OktaUser{id: $USER_ID})<-[:RESOURCE]-(org:OktaOrganization)
-    WITH user,org
     UNWIND $ROLES_DATA as role_data
+    MATCH (user:OktaUser{id: role_data.user_id})<-[:RESOURCE]-(org:OktaOrganization)
     MERGE (role_node:OktaAdministrationRole{id: role_data.type})
     ON CREATE SET role_node.type = role_data.type, role_node.firstseen = timestamp()
     SET role_node.label = role_data.label, role_node.lastupdated = $okta_update_tag
@@ -114,21 +141,23 @@ def _load_user_role(neo4j_session: neo4j.Session, user_id: str, roles_data: List
 
     neo4j_session.run(
         ingest,
-        USER_ID=user_id,
         ROLES_DATA=roles_data,
         okta_update_tag=okta_update_tag,
     )
 
 
 @timeit
-def _load_group_role(
-    neo4j_session: neo4j.Session, group_id: str, roles_data: List[Dict],
-    okta_update_tag: int,
-) -> None:
+def _load_group_role(neo4j_session: neo4j.Session, roles_data: List[Dict], okta_update_tag: int) -> None:
+    """
+    Add group roles into the graph
+    :param neo4j_session: session with the Neo4j server
+    :param roles_data: roles to add, each with the `group_id` of the group to map it to
+    :param okta_update_tag: The timestamp value to set our new Neo4j resources with
+    :return: Nothing
+    """
     ingest = """
-    MATCH (group:OktaGroup{id: $GROUP_ID})<-[:RESOURCE]-(org:OktaOrganization)
-    WITH group,org
     UNWIND $ROLES_DATA as role_data
+    MATCH (group:OktaGroup{id: role_data.group_id})<-[:RESOURCE]-(org:OktaOrganization)
     MERGE (role_node:OktaAdministrationRole{id: role_data.type})
     ON CREATE SET role_node.type = role_data.type, role_node.firstseen = timestamp()
     SET role_node.label = role_data.label, role_node.lastupdated = $okta_update_tag
@@ -144,7 +173,6 @@ def _load_group_role(
 
     neo4j_session.run(
         ingest,
-        GROUP_ID=group_id,
         ROLES_DATA=roles_data,
         okta_update_tag=okta_update_tag,
     )
@@ -152,7 +180,7 @@ def _load_group_role(
 
 @timeit
 def sync_roles(
-    neo4j_session: str, okta_org_id: str, okta_update_tag: int, okta_api_key: str,
+    neo4j_session: neo4j.Session, okta_org_id: str, okta_update_tag: int, okta_api_key: str,
     sync_state: OktaSyncState,
 ) -> None:
     """
@@ -170,16 +198,34 @@ def sync_roles(
     # get API client
     api_client = create_api_client(okta_org_id, "/api/v1/users", okta_api_key)
 
+    rate_limiter = OktaRateLimiter()
+
     if sync_state.users:
-        for user_id in sync_state.users:
-            user_roles_data = _get_user_roles(api_client, user_id, okta_org_id)
-            user_roles = transform_user_roles_data(user_roles_data, okta_org_id)
-            if len(user_roles) > 0:
-                _load_user_role(neo4j_session, user_id, user_roles, okta_update_tag)
+        user_roles: List[Dict] = []
+        for user_id, user_roles_data in fetch_concurrently(
+            partial(_get_user_roles, api_client, okta_org_id=okta_org_id, rate_limiter=rate_limiter),
+            sync_state.users,
+        ):
+            for role in transform_user_roles_data(user_roles_data, okta_org_id):
+                role['user_id'] = user_id
+                user_roles.append(role)
+            if len(user_roles) >= DEFAULT_BATCH_SIZE:
+                _load_user_role(neo4j_session, user_roles, okta_update_tag)
+                user_roles = []
+        if user_roles:
+            _load_user_role(neo4j_session, user_roles, okta_update_tag)
 
     if sync_state.groups:
-        for group_id in sync_state.groups:
-            group_roles_data = _get_group_roles(api_client, group_id, okta_org_id)
-            group_roles = transform_group_roles_data(group_roles_data, okta_org_id)
-            if len(group_roles) > 0:
-                _load_group_role(neo4j_session, group_id, group_roles, okta_update_tag)
+        group_roles: List[Dict] = []
+        for group_id, group_roles_data in fetch_concurrently(
+            partial(_get_group_roles, api_client, okta_org_id=okta_org_id, rate_limiter=rate_limiter),
+            sync_state.groups,
+        ):
+            for role in transform_group_roles_data(group_roles_data, okta_org_id):
+                role['group_id'] = group_id
+                group_roles.append(role)
+            if len(group_roles) >= DEFAULT_BATCH_SIZE:
+                _load_group_role(neo4j_session, group_roles, okta_update_tag)
+                group_roles = []
+        if group_roles:
+            _load_group_role(neo4j_session, group_roles, okta_update_tag)
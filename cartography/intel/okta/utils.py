@@ -1,6 +1,13 @@
 # Okta intel module - utility functions
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Tuple
+from typing import TypeVar
 
 from okta.framework import PagedResults
 from okta.framework.ApiClient import ApiClient
@@ -8,6 +15,12 @@ from requests import Response
 
 logger = logging.getLogger(__name__)
 
+# Number of concurrent per-entity Okta API calls. Okta also enforces a per-org concurrency limit (75 for most org
+# types), so keep this well below that to leave room for other API clients.
+OKTA_MAX_WORKERS = 10
+
+R = TypeVar('R')
+
 
 def is_last_page(response: PagedResults) -> bool:
     """
@@ -36,13 +49,13 @@ def create_api_client(okta_org: str, path_name: str, api_key: str) -> ApiClient:
     return api_client
 
 
-def check_rate_limit(response: Response) -> None:
+def _get_rate_limit_sleep_seconds(response: Response, rate_limit_threshold: float = 0.1) -> int:
     """
-    Checks if we are about to hit the rate limit and waits until reset if so
+    Return how long to wait before making further calls, based on the rate limit headers of the given response
     :param response: server response
+    :param rate_limit_threshold: fraction of the rate limit below which we wait for the limit to reset
+    :return: seconds to wait, 0 if we are not close to the rate limit
     """
-    rate_limit_threshold = 0.1
-
     remaining = response.headers.get('x-rate-limit-remaining')
     limit = response.headers.get('x-rate-limit-limit')
     reset_time = response.headers.get('x-rate-limit-reset')
@@ -52,11 +65,77 @@ def check_rate_limit(response: Response) -> None:
             sleep_time_seconds = int(reset_time) - int(time.time())
             if sleep_time_seconds <= 0:
                 # A negative sleep time does not make sense so treat it the same as a 0 sleep time
-                return
+                return 0
             if sleep_time_seconds > 60:
                 raise ValueError(
                     f"Okta API limit exceeded. Sleep time of {sleep_time_seconds} would exceed one minute. Crashing "
                     f"Okta sync to avoid blocking.",
                 )
-            logger.warning(f"Okta rate limit threshold reached. Waiting {sleep_time_seconds} seconds.")
-            time.sleep(sleep_time_seconds)
+            return sleep_time_seconds
+    return 0
+
+
+def check_rate_limit(response: Response) -> None:
+    """
+    Checks if we are about to hit the rate limit and waits until reset if so
+    :param response: server response
+    """
+    sleep_time_seconds = _get_rate_limit_sleep_seconds(response)
+    if sleep_time_seconds > 0:
+        logger.warning(f"Okta rate limit threshold reached. Waiting {sleep_time_seconds} seconds.")
+        time.sleep(sleep_time_seconds)
+
+
+class OktaRateLimiter:
+    """
+    Rate limit state shared by threads making concurrent calls to the same Okta endpoint. Every thread reports the
+    `X-Rate-Limit-*` headers of its responses with `update()` and calls `wait()` before its next request, so that once
+    any of them sees the remaining budget drop below the threshold, all of them pause until the limit resets instead
+    of only the thread that happened to notice.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def update(self, response: Response) -> None:
+        """
+        Record the rate limit state of the given response
+        :param response: server response
+        """
+        sleep_time_seconds = _get_rate_limit_sleep_seconds(response)
+        if sleep_time_seconds > 0:
+            with self._lock:
+                self._resume_at = max(self._resume_at, time.time() + sleep_time_seconds)
+
+    def wait(self) -> None:
+        """
+        Block until it is safe to make another call
+        """
+        with self._lock:
+            delay = self._resume_at - time.time()
+        if delay > 0:
+            logger.warning(f"Okta rate limit threshold reached. Waiting {delay:.0f} seconds.")
+            time.sleep(delay)
+
+
+def fetch_concurrently(
+    fetch_func: Callable[[str], R],
+    entity_ids: Iterable[str],
+    max_workers: int = OKTA_MAX_WORKERS,
+) -> Iterator[Tuple[str, R]]:
+    """
+    Call `fetch_func` for each of the given entity ids on a bounded thread pool
+    :param fetch_func: function taking an entity id and returning the data for it. To be rate limit aware it should
+    share an OktaRateLimiter with the other calls.
+    :param entity_ids: ids of the users, groups, etc. to fetch data for
+    :param max_workers: maximum number of concurrent calls
+    :return: iterator of (entity id, result) tuples, in the order of `entity_ids`
+    """
+    entity_ids = list(entity_ids)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        yield from zip(entity_ids, executor.map(fetch_func, entity_ids))
+    finally:
+        # Don't leave queued calls running if the caller stops early, e.g. because a fetch raised.
+        executor.shutdown(wait=True, cancel_futures=True)
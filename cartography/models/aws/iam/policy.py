@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+
+from cartography.models.core.common import PropertyRef
+from cartography.models.core.nodes import CartographyNodeProperties
+from cartography.models.core.nodes import CartographyNodeSchema
+from cartography.models.core.relationships import CartographyRelProperties
+from cartography.models.core.relationships import CartographyRelSchema
+from cartography.models.core.relationships import LinkDirection
+from cartography.models.core.relationships import make_target_node_matcher
+from cartography.models.core.relationships import OtherRelationships
+from cartography.models.core.relationships import TargetNodeMatcher
+
+
+@dataclass(frozen=True)
+class AWSPolicyNodeProperties(CartographyNodeProperties):
+    """
+    Schema describing an AWSPolicy. The id of a managed policy is its ARN, the id of an inline policy is built from
+    the ARN of its principal and its name.
+    """
+    id: PropertyRef = PropertyRef('id')
+    name: PropertyRef = PropertyRef('name')
+    type: PropertyRef = PropertyRef('type')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class AWSPolicyToAWSPrincipalRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class AWSPolicyToAWSPrincipal(CartographyRelSchema):
+    target_node_label: str = 'AWSPrincipal'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'arn': PropertyRef('principal_arns', one_to_many=True)},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "POLICY"
+    properties: AWSPolicyToAWSPrincipalRelProperties = AWSPolicyToAWSPrincipalRelProperties()
+
+
+@dataclass(frozen=True)
+class AWSPolicySchema(CartographyNodeSchema):
+    """
+    AWS managed policies are attached to principals of several accounts, so policies have no sub resource and are
+    cleaned up through the principals they are attached to.
+    """
+    label: str = 'AWSPolicy'
+    properties: AWSPolicyNodeProperties = AWSPolicyNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([
+        AWSPolicyToAWSPrincipal(),
+    ])
@@ -0,0 +1,379 @@
+from dataclasses import dataclass
+
+from cartography.models.core.common import PropertyRef
+from cartography.models.core.nodes import CartographyNodeProperties
+from cartography.models.core.nodes import CartographyNodeSchema
+from cartography.models.core.relationships import CartographyRelProperties
+from cartography.models.core.relationships import CartographyRelSchema
+from cartography.models.core.relationships import LinkDirection
+from cartography.models.core.relationships import make_target_node_matcher
+from cartography.models.core.relationships import OtherRelationships
+from cartography.models.core.relationships import TargetNodeMatcher
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+###
+# (:AzureSubscription)-[:RESOURCE]->(:AzureCosmosDBAccount)
+###
+@dataclass(frozen=True)
+class AzureCosmosDBAccountNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    type: PropertyRef = PropertyRef('type')
+    resourcegroup: PropertyRef = PropertyRef('resourceGroup')
+    location: PropertyRef = PropertyRef('location')
+    kind: PropertyRef = PropertyRef('kind')
+    name: PropertyRef = PropertyRef('name')
+    ipranges: PropertyRef = PropertyRef('ipruleslist')
+    capabilities: PropertyRef = PropertyRef('list_of_capabilities')
+    documentendpoint: PropertyRef = PropertyRef('document_endpoint')
+    virtualnetworkfilterenabled: PropertyRef = PropertyRef('is_virtual_network_filter_enabled')
+    enableautomaticfailover: PropertyRef = PropertyRef('enable_automatic_failover')
+    provisioningstate: PropertyRef = PropertyRef('provisioning_state')
+    multiplewritelocations: PropertyRef = PropertyRef('enable_multiple_write_locations')
+    accountoffertype: PropertyRef = PropertyRef('database_account_offer_type')
+    publicnetworkaccess: PropertyRef = PropertyRef('public_network_access')
+    enablecassandraconnector: PropertyRef = PropertyRef('enable_cassandra_connector')
+    connectoroffer: PropertyRef = PropertyRef('connector_offer')
+    disablekeybasedmetadatawriteaccess: PropertyRef = PropertyRef('disable_key_based_metadata_write_access')
+    keyvaulturi: PropertyRef = PropertyRef('key_vault_key_uri')
+    enablefreetier: PropertyRef = PropertyRef('enable_free_tier')
+    enableanalyticalstorage: PropertyRef = PropertyRef('enable_analytical_storage')
+    defaultconsistencylevel: PropertyRef = PropertyRef('consistency_policy.default_consistency_level')
+    maxstalenessprefix: PropertyRef = PropertyRef('consistency_policy.max_staleness_prefix')
+    maxintervalinseconds: PropertyRef = PropertyRef('consistency_policy.max_interval_in_seconds')
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBAccountToSubscriptionRel(CartographyRelSchema):
+    target_node_label: str = 'AzureSubscription'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('AZURE_SUBSCRIPTION_ID', set_in_kwargs=True)},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "RESOURCE"
+    properties: AzureCosmosDBRelProperties = AzureCosmosDBRelProperties()
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBAccountSchema(CartographyNodeSchema):
+    label: str = 'AzureCosmosDBAccount'
+    properties: AzureCosmosDBAccountNodeProperties = AzureCosmosDBAccountNodeProperties()
+    sub_resource_relationship: AzureCosmosDBAccountToSubscriptionRel = AzureCosmosDBAccountToSubscriptionRel()
+
+
+###
+# (:AzureCosmosDBAccount)-[:CAN_WRITE_FROM|CAN_READ_FROM|ASSOCIATED_WITH]->(:AzureCosmosDBLocation)
+# A location can be listed in several of the write, read and associated location lists of an account, so each row
+# carries the account id under the key of the list it came from and only gets that relationship.
+###
+@dataclass(frozen=True)
+class AzureCosmosDBLocationNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    locationname: PropertyRef = PropertyRef('location_name')
+    documentendpoint: PropertyRef = PropertyRef('document_endpoint')
+    provisioningstate: PropertyRef = PropertyRef('provisioning_state')
+    failoverpriority: PropertyRef = PropertyRef('failover_priority')
+    iszoneredundant: PropertyRef = PropertyRef('is_zone_redundant')
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBAccountCanWriteFromLocationRel(CartographyRelSchema):
+    target_node_label: str = 'AzureCosmosDBAccount'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('write_database_account_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "CAN_WRITE_FROM"
+    properties: AzureCosmosDBRelProperties = AzureCosmosDBRelProperties()
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBAccountCanReadFromLocationRel(CartographyRelSchema):
+    target_node_label: str = 'AzureCosmosDBAccount'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('read_database_account_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "CAN_READ_FROM"
+    properties: AzureCosmosDBRelProperties = AzureCosmosDBRelProperties()
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBAccountAssociatedWithLocationRel(CartographyRelSchema):
+    target_node_label: str = 'AzureCosmosDBAccount'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('associated_database_account_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "ASSOCIATED_WITH"
+    properties: AzureCosmosDBRelProperties = AzureCosmosDBRelProperties()
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBLocationSchema(CartographyNodeSchema):
+    label: str = 'AzureCosmosDBLocation'
+    properties: AzureCosmosDBLocationNodeProperties = AzureCosmosDBLocationNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships(
+        [
+            AzureCosmosDBAccountCanWriteFromLocationRel(),
+            AzureCosmosDBAccountCanReadFromLocationRel(),
+            AzureCosmosDBAccountAssociatedWithLocationRel(),
+        ],
+    )
+
+
+###
+# Relationships from a database account to the resources listed in its response and to its databases
+###
+@dataclass(frozen=True)
+class AzureCosmosDBAccountContainsRel(CartographyRelSchema):
+    target_node_label: str = 'AzureCosmosDBAccount'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('database_account_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "CONTAINS"
+    properties: AzureCosmosDBRelProperties = AzureCosmosDBRelProperties()
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBAccountConfiguredWithRel(CartographyRelSchema):
+    target_node_label: str = 'AzureCosmosDBAccount'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('database_account_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "CONFIGURED_WITH"
+    properties: AzureCosmosDBRelProperties = AzureCosmosDBRelProperties()
+
+
+###
+# (:AzureCosmosDBAccount)-[:CONTAINS]->(:AzureCosmosDBCorsPolicy)
+###
+@dataclass(frozen=True)
+class AzureCosmosDBCorsPolicyNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('cors_policy_unique_id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    allowedorigins: PropertyRef = PropertyRef('allowed_origins')
+    allowedmethods: PropertyRef = PropertyRef('allowed_methods')
+    allowedheaders: PropertyRef = PropertyRef('allowed_headers')
+    exposedheaders: PropertyRef = PropertyRef('exposed_headers')
+    maxageinseconds: PropertyRef = PropertyRef('max_age_in_seconds')
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBCorsPolicySchema(CartographyNodeSchema):
+    label: str = 'AzureCosmosDBCorsPolicy'
+    properties: AzureCosmosDBCorsPolicyNodeProperties = AzureCosmosDBCorsPolicyNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureCosmosDBAccountContainsRel()])
+
+
+###
+# (:AzureCosmosDBAccount)-[:CONTAINS]->(:AzureCosmosDBAccountFailoverPolicy)
+###
+@dataclass(frozen=True)
+class AzureCosmosDBAccountFailoverPolicyNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    locationname: PropertyRef = PropertyRef('location_name')
+    failoverpriority: PropertyRef = PropertyRef('failover_priority')
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBAccountFailoverPolicySchema(CartographyNodeSchema):
+    label: str = 'AzureCosmosDBAccountFailoverPolicy'
+    properties: AzureCosmosDBAccountFailoverPolicyNodeProperties = AzureCosmosDBAccountFailoverPolicyNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureCosmosDBAccountContainsRel()])
+
+
+###
+# (:AzureCosmosDBAccount)-[:CONFIGURED_WITH]->(:AzureCDBPrivateEndpointConnection)
+###
+@dataclass(frozen=True)
+class AzureCDBPrivateEndpointConnectionNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    name: PropertyRef = PropertyRef('name')
+    privateendpointid: PropertyRef = PropertyRef('private_endpoint.id')
+    status: PropertyRef = PropertyRef('private_link_service_connection_state.status')
+    actionrequired: PropertyRef = PropertyRef('private_link_service_connection_state.actions_required')
+
+
+@dataclass(frozen=True)
+class AzureCDBPrivateEndpointConnectionSchema(CartographyNodeSchema):
+    label: str = 'AzureCDBPrivateEndpointConnection'
+    properties: AzureCDBPrivateEndpointConnectionNodeProperties = AzureCDBPrivateEndpointConnectionNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureCosmosDBAccountConfiguredWithRel()])
+
+
+###
+# (:AzureCosmosDBAccount)-[:CONFIGURED_WITH]->(:AzureCosmosDBVirtualNetworkRule)
+###
+@dataclass(frozen=True)
+class AzureCosmosDBVirtualNetworkRuleNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    ignoremissingvnetserviceendpoint: PropertyRef = PropertyRef('ignore_missing_v_net_service_endpoint')
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBVirtualNetworkRuleSchema(CartographyNodeSchema):
+    label: str = 'AzureCosmosDBVirtualNetworkRule'
+    properties: AzureCosmosDBVirtualNetworkRuleNodeProperties = AzureCosmosDBVirtualNetworkRuleNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureCosmosDBAccountConfiguredWithRel()])
+
+
+###
+# (:AzureCosmosDBAccount)-[:CONTAINS]->
+#     (:AzureCosmosDBSqlDatabase|AzureCosmosDBCassandraKeyspace|AzureCosmosDBMongoDBDatabase|AzureCosmosDBTableResource)
+###
+@dataclass(frozen=True)
+class AzureCosmosDBAccountResourceNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    type: PropertyRef = PropertyRef('type')
+    location: PropertyRef = PropertyRef('location')
+    name: PropertyRef = PropertyRef('name')
+    throughput: PropertyRef = PropertyRef('options.throughput')
+    maxthroughput: PropertyRef = PropertyRef('options.autoscale_setting.max_throughput')
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBSqlDatabaseSchema(CartographyNodeSchema):
+    label: str = 'AzureCosmosDBSqlDatabase'
+    properties: AzureCosmosDBAccountResourceNodeProperties = AzureCosmosDBAccountResourceNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureCosmosDBAccountContainsRel()])
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBCassandraKeyspaceSchema(CartographyNodeSchema):
+    label: str = 'AzureCosmosDBCassandraKeyspace'
+    properties: AzureCosmosDBAccountResourceNodeProperties = AzureCosmosDBAccountResourceNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureCosmosDBAccountContainsRel()])
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBMongoDBDatabaseSchema(CartographyNodeSchema):
+    label: str = 'AzureCosmosDBMongoDBDatabase'
+    properties: AzureCosmosDBAccountResourceNodeProperties = AzureCosmosDBAccountResourceNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureCosmosDBAccountContainsRel()])
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBTableResourceSchema(CartographyNodeSchema):
+    label: str = 'AzureCosmosDBTableResource'
+    properties: AzureCosmosDBAccountResourceNodeProperties = AzureCosmosDBAccountResourceNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureCosmosDBAccountContainsRel()])
+
+
+###
+# (:AzureCosmosDBSqlDatabase)-[:CONTAINS]->(:AzureCosmosDBSqlContainer)
+###
+@dataclass(frozen=True)
+class AzureCosmosDBSqlContainerNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    type: PropertyRef = PropertyRef('type')
+    location: PropertyRef = PropertyRef('location')
+    name: PropertyRef = PropertyRef('name')
+    throughput: PropertyRef = PropertyRef('options.throughput')
+    maxthroughput: PropertyRef = PropertyRef('options.autoscale_setting.max_throughput')
+    container: PropertyRef = PropertyRef('resource.id')
+    defaultttl: PropertyRef = PropertyRef('resource.default_ttl')
+    analyticalttl: PropertyRef = PropertyRef('resource.analytical_storage_ttl')
+    isautomaticindexingpolicy: PropertyRef = PropertyRef('resource.indexing_policy.automatic')
+    indexingmode: PropertyRef = PropertyRef('resource.indexing_policy.indexing_mode')
+    conflictresolutionpolicymode: PropertyRef = PropertyRef('resource.conflict_resolution_policy.mode')
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBSqlDatabaseToSqlContainerRel(CartographyRelSchema):
+    target_node_label: str = 'AzureCosmosDBSqlDatabase'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('database_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "CONTAINS"
+    properties: AzureCosmosDBRelProperties = AzureCosmosDBRelProperties()
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBSqlContainerSchema(CartographyNodeSchema):
+    label: str = 'AzureCosmosDBSqlContainer'
+    properties: AzureCosmosDBSqlContainerNodeProperties = AzureCosmosDBSqlContainerNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureCosmosDBSqlDatabaseToSqlContainerRel()])
+
+
+###
+# (:AzureCosmosDBCassandraKeyspace)-[:CONTAINS]->(:AzureCosmosDBCassandraTable)
+###
+@dataclass(frozen=True)
+class AzureCosmosDBCassandraTableNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    type: PropertyRef = PropertyRef('type')
+    location: PropertyRef = PropertyRef('location')
+    name: PropertyRef = PropertyRef('name')
+    throughput: PropertyRef = PropertyRef('options.throughput')
+    maxthroughput: PropertyRef = PropertyRef('options.autoscale_setting.max_throughput')
+    container: PropertyRef = PropertyRef('resource.id')
+    defaultttl: PropertyRef = PropertyRef('resource.default_ttl')
+    analyticalttl: PropertyRef = PropertyRef('resource.analytical_storage_ttl')
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBCassandraKeyspaceToTableRel(CartographyRelSchema):
+    target_node_label: str = 'AzureCosmosDBCassandraKeyspace'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('keyspace_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "CONTAINS"
+    properties: AzureCosmosDBRelProperties = AzureCosmosDBRelProperties()
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBCassandraTableSchema(CartographyNodeSchema):
+    label: str = 'AzureCosmosDBCassandraTable'
+    properties: AzureCosmosDBCassandraTableNodeProperties = AzureCosmosDBCassandraTableNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureCosmosDBCassandraKeyspaceToTableRel()])
+
+
+###
+# (:AzureCosmosDBMongoDBDatabase)-[:CONTAINS]->(:AzureCosmosDBMongoDBCollection)
+###
+@dataclass(frozen=True)
+class AzureCosmosDBMongoDBCollectionNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    type: PropertyRef = PropertyRef('type')
+    location: PropertyRef = PropertyRef('location')
+    name: PropertyRef = PropertyRef('name')
+    throughput: PropertyRef = PropertyRef('options.throughput')
+    maxthroughput: PropertyRef = PropertyRef('options.autoscale_setting.max_throughput')
+    collectionname: PropertyRef = PropertyRef('resource.id')
+    analyticalttl: PropertyRef = PropertyRef('resource.analytical_storage_ttl')
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBMongoDBDatabaseToCollectionRel(CartographyRelSchema):
+    target_node_label: str = 'AzureCosmosDBMongoDBDatabase'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('database_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "CONTAINS"
+    properties: AzureCosmosDBRelProperties = AzureCosmosDBRelProperties()
+
+
+@dataclass(frozen=True)
+class AzureCosmosDBMongoDBCollectionSchema(CartographyNodeSchema):
+    label: str = 'AzureCosmosDBMongoDBCollection'
+    properties: AzureCosmosDBMongoDBCollectionNodeProperties = AzureCosmosDBMongoDBCollectionNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureCosmosDBMongoDBDatabaseToCollectionRel()])
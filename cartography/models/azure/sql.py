@@ -0,0 +1,306 @@
+from dataclasses import dataclass
+
+from cartography.models.core.common import PropertyRef
+from cartography.models.core.nodes import CartographyNodeProperties
+from cartography.models.core.nodes import CartographyNodeSchema
+from cartography.models.core.relationships import CartographyRelProperties
+from cartography.models.core.relationships import CartographyRelSchema
+from cartography.models.core.relationships import LinkDirection
+from cartography.models.core.relationships import make_target_node_matcher
+from cartography.models.core.relationships import OtherRelationships
+from cartography.models.core.relationships import TargetNodeMatcher
+
+
+@dataclass(frozen=True)
+class AzureSQLRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+###
+# Relationships from a SQL server to its child resources
+###
+@dataclass(frozen=True)
+class AzureSQLServerUsedByRel(CartographyRelSchema):
+    target_node_label: str = 'AzureSQLServer'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('server_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "USED_BY"
+    properties: AzureSQLRelProperties = AzureSQLRelProperties()
+
+
+@dataclass(frozen=True)
+class AzureSQLServerAdministeredByRel(CartographyRelSchema):
+    target_node_label: str = 'AzureSQLServer'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('server_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "ADMINISTERED_BY"
+    properties: AzureSQLRelProperties = AzureSQLRelProperties()
+
+
+@dataclass(frozen=True)
+class AzureSQLServerResourceRel(CartographyRelSchema):
+    target_node_label: str = 'AzureSQLServer'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('server_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "RESOURCE"
+    properties: AzureSQLRelProperties = AzureSQLRelProperties()
+
+
+###
+# (:AzureSQLServer)-[:USED_BY]->(:AzureServerDNSAlias)
+###
+@dataclass(frozen=True)
+class AzureServerDNSAliasNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    name: PropertyRef = PropertyRef('name')
+    dnsrecord: PropertyRef = PropertyRef('azure_dns_record')
+
+
+@dataclass(frozen=True)
+class AzureServerDNSAliasSchema(CartographyNodeSchema):
+    label: str = 'AzureServerDNSAlias'
+    properties: AzureServerDNSAliasNodeProperties = AzureServerDNSAliasNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureSQLServerUsedByRel()])
+
+
+###
+# (:AzureSQLServer)-[:ADMINISTERED_BY]->(:AzureServerADAdministrator)
+###
+@dataclass(frozen=True)
+class AzureServerADAdministratorNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    name: PropertyRef = PropertyRef('name')
+    administratortype: PropertyRef = PropertyRef('administrator_type')
+    login: PropertyRef = PropertyRef('login')
+
+
+@dataclass(frozen=True)
+class AzureServerADAdministratorSchema(CartographyNodeSchema):
+    label: str = 'AzureServerADAdministrator'
+    properties: AzureServerADAdministratorNodeProperties = AzureServerADAdministratorNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureSQLServerAdministeredByRel()])
+
+
+###
+# (:AzureSQLServer)-[:RESOURCE]->(:AzureRecoverableDatabase)
+###
+@dataclass(frozen=True)
+class AzureRecoverableDatabaseNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    name: PropertyRef = PropertyRef('name')
+    edition: PropertyRef = PropertyRef('edition')
+    servicelevelobjective: PropertyRef = PropertyRef('service_level_objective')
+    lastbackupdate: PropertyRef = PropertyRef('last_available_backup_date')
+
+
+@dataclass(frozen=True)
+class AzureRecoverableDatabaseSchema(CartographyNodeSchema):
+    label: str = 'AzureRecoverableDatabase'
+    properties: AzureRecoverableDatabaseNodeProperties = AzureRecoverableDatabaseNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureSQLServerResourceRel()])
+
+
+###
+# (:AzureSQLServer)-[:RESOURCE]->(:AzureRestorableDroppedDatabase)
+###
+@dataclass(frozen=True)
+class AzureRestorableDroppedDatabaseNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    location: PropertyRef = PropertyRef('location')
+    name: PropertyRef = PropertyRef('name')
+    databasename: PropertyRef = PropertyRef('database_name')
+    creationdate: PropertyRef = PropertyRef('creation_date')
+    deletiondate: PropertyRef = PropertyRef('deletion_date')
+    restoredate: PropertyRef = PropertyRef('earliest_restore_date')
+    edition: PropertyRef = PropertyRef('edition')
+    servicelevelobjective: PropertyRef = PropertyRef('service_level_objective')
+    maxsizebytes: PropertyRef = PropertyRef('max_size_bytes')
+
+
+@dataclass(frozen=True)
+class AzureRestorableDroppedDatabaseSchema(CartographyNodeSchema):
+    label: str = 'AzureRestorableDroppedDatabase'
+    properties: AzureRestorableDroppedDatabaseNodeProperties = AzureRestorableDroppedDatabaseNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureSQLServerResourceRel()])
+
+
+###
+# (:AzureSQLServer)-[:RESOURCE]->(:AzureFailoverGroup)
+###
+@dataclass(frozen=True)
+class AzureFailoverGroupNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    location: PropertyRef = PropertyRef('location')
+    name: PropertyRef = PropertyRef('name')
+    replicationrole: PropertyRef = PropertyRef('replication_role')
+    replicationstate: PropertyRef = PropertyRef('replication_state')
+
+
+@dataclass(frozen=True)
+class AzureFailoverGroupSchema(CartographyNodeSchema):
+    label: str = 'AzureFailoverGroup'
+    properties: AzureFailoverGroupNodeProperties = AzureFailoverGroupNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureSQLServerResourceRel()])
+
+
+###
+# (:AzureSQLServer)-[:RESOURCE]->(:AzureElasticPool)
+###
+@dataclass(frozen=True)
+class AzureElasticPoolNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    location: PropertyRef = PropertyRef('location')
+    name: PropertyRef = PropertyRef('name')
+    kind: PropertyRef = PropertyRef('kind')
+    creationdate: PropertyRef = PropertyRef('creation_date')
+    state: PropertyRef = PropertyRef('state')
+    maxsizebytes: PropertyRef = PropertyRef('max_size_bytes')
+    licensetype: PropertyRef = PropertyRef('license_type')
+    zoneredundant: PropertyRef = PropertyRef('zone_redundant')
+
+
+@dataclass(frozen=True)
+class AzureElasticPoolSchema(CartographyNodeSchema):
+    label: str = 'AzureElasticPool'
+    properties: AzureElasticPoolNodeProperties = AzureElasticPoolNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureSQLServerResourceRel()])
+
+
+###
+# (:AzureSQLServer)-[:RESOURCE]->(:AzureSQLDatabase)
+###
+@dataclass(frozen=True)
+class AzureSQLDatabaseNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    location: PropertyRef = PropertyRef('location')
+    name: PropertyRef = PropertyRef('name')
+    kind: PropertyRef = PropertyRef('kind')
+    creationdate: PropertyRef = PropertyRef('creation_date')
+    databaseid: PropertyRef = PropertyRef('database_id')
+    maxsizebytes: PropertyRef = PropertyRef('max_size_bytes')
+    licensetype: PropertyRef = PropertyRef('license_type')
+    secondarylocation: PropertyRef = PropertyRef('default_secondary_location')
+    elasticpoolid: PropertyRef = PropertyRef('elastic_pool_id')
+    collation: PropertyRef = PropertyRef('collation')
+    failovergroupid: PropertyRef = PropertyRef('failover_group_id')
+    zoneredundant: PropertyRef = PropertyRef('zone_redundant')
+    restorabledroppeddbid: PropertyRef = PropertyRef('restorable_dropped_database_id')
+    recoverabledbid: PropertyRef = PropertyRef('recoverable_database_id')
+
+
+@dataclass(frozen=True)
+class AzureSQLDatabaseSchema(CartographyNodeSchema):
+    label: str = 'AzureSQLDatabase'
+    properties: AzureSQLDatabaseNodeProperties = AzureSQLDatabaseNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureSQLServerResourceRel()])
+
+
+###
+# (:AzureSQLDatabase)-[:CONTAINS]->(
+#     :AzureReplicationLink|AzureDatabaseThreatDetectionPolicy|AzureRestorePoint|AzureTransparentDataEncryption
+# )
+###
+@dataclass(frozen=True)
+class AzureSQLDatabaseContainsRel(CartographyRelSchema):
+    target_node_label: str = 'AzureSQLDatabase'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('database_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "CONTAINS"
+    properties: AzureSQLRelProperties = AzureSQLRelProperties()
+
+
+@dataclass(frozen=True)
+class AzureReplicationLinkNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    location: PropertyRef = PropertyRef('location')
+    name: PropertyRef = PropertyRef('name')
+    partnerdatabase: PropertyRef = PropertyRef('partner_database')
+    partnerlocation: PropertyRef = PropertyRef('partner_location')
+    partnerrole: PropertyRef = PropertyRef('partner_role')
+    partnerserver: PropertyRef = PropertyRef('partner_server')
+    mode: PropertyRef = PropertyRef('replication_mode')
+    state: PropertyRef = PropertyRef('replication_state')
+    percentcomplete: PropertyRef = PropertyRef('percent_complete')
+    role: PropertyRef = PropertyRef('role')
+    starttime: PropertyRef = PropertyRef('start_time')
+    terminationallowed: PropertyRef = PropertyRef('is_termination_allowed')
+
+
+@dataclass(frozen=True)
+class AzureReplicationLinkSchema(CartographyNodeSchema):
+    label: str = 'AzureReplicationLink'
+    properties: AzureReplicationLinkNodeProperties = AzureReplicationLinkNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureSQLDatabaseContainsRel()])
+
+
+@dataclass(frozen=True)
+class AzureDatabaseThreatDetectionPolicyNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    location: PropertyRef = PropertyRef('location')
+    name: PropertyRef = PropertyRef('name')
+    kind: PropertyRef = PropertyRef('kind')
+    emailadmins: PropertyRef = PropertyRef('email_account_admins')
+    emailaddresses: PropertyRef = PropertyRef('email_addresses')
+    retentiondays: PropertyRef = PropertyRef('retention_days')
+    state: PropertyRef = PropertyRef('state')
+    storageendpoint: PropertyRef = PropertyRef('storage_endpoint')
+    useserverdefault: PropertyRef = PropertyRef('use_server_default')
+    disabledalerts: PropertyRef = PropertyRef('disabled_alerts')
+
+
+@dataclass(frozen=True)
+class AzureDatabaseThreatDetectionPolicySchema(CartographyNodeSchema):
+    label: str = 'AzureDatabaseThreatDetectionPolicy'
+    properties: AzureDatabaseThreatDetectionPolicyNodeProperties = AzureDatabaseThreatDetectionPolicyNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureSQLDatabaseContainsRel()])
+
+
+@dataclass(frozen=True)
+class AzureRestorePointNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    location: PropertyRef = PropertyRef('location')
+    name: PropertyRef = PropertyRef('name')
+    restoredate: PropertyRef = PropertyRef('earliest_restore_date')
+    restorepointtype: PropertyRef = PropertyRef('restore_point_type')
+    creationdate: PropertyRef = PropertyRef('restore_point_creation_date')
+
+
+@dataclass(frozen=True)
+class AzureRestorePointSchema(CartographyNodeSchema):
+    label: str = 'AzureRestorePoint'
+    properties: AzureRestorePointNodeProperties = AzureRestorePointNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureSQLDatabaseContainsRel()])
+
+
+@dataclass(frozen=True)
+class AzureTransparentDataEncryptionNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    location: PropertyRef = PropertyRef('location')
+    name: PropertyRef = PropertyRef('name')
+    status: PropertyRef = PropertyRef('status')
+
+
+@dataclass(frozen=True)
+class AzureTransparentDataEncryptionSchema(CartographyNodeSchema):
+    label: str = 'AzureTransparentDataEncryption'
+    properties: AzureTransparentDataEncryptionNodeProperties = AzureTransparentDataEncryptionNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships([AzureSQLDatabaseContainsRel()])
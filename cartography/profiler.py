@@ -0,0 +1,350 @@
+"""
+Opt-in, in-process profiler for cartography syncs.
+
+When enabled (see `--profile-output-dir`), sync stages, AWS resource functions, graph job statements and functions
+decorated with `cartography.util.timeit` are recorded as spans. For every distinct stack of spans the profiler keeps
+the number of calls, the wall time, the number of API calls, the time spent in retry backoff, the number of Neo4j
+write transactions, the rows written and the peak RSS of the process. At the end of the run `write_reports()` writes:
+
+- profile.json: the raw numbers for each stack and a per-span summary
+- profile.html: the per-span summary as a sortable table
+- profile.folded: the self time of each stack in the folded format read by flamegraph.pl and speedscope
+
+Counters are process-wide, so the API calls and transactions of a span include those made by worker threads while the
+span was open. Other modules can add their own tables to the reports with `register_report_section()`.
+"""
+import html
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+PROFILE_JSON_FILENAME = 'profile.json'
+PROFILE_HTML_FILENAME = 'profile.html'
+PROFILE_FOLDED_FILENAME = 'profile.folded'
+
+# A frame of a stack: the span kind, e.g. 'stage', and its name, e.g. 'aws'.
+_Frame = Tuple[str, str]
+
+
+def _peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+@dataclass
+class _Counters:
+    api_calls: int = 0
+    backoff_seconds: float = 0.0
+    neo4j_transactions: int = 0
+    rows_written: int = 0
+
+
+@dataclass
+class StackStats:
+    """
+    The numbers recorded for one stack of spans.
+    """
+    calls: int = 0
+    wall_seconds: float = 0.0
+    self_seconds: float = 0.0
+    api_calls: int = 0
+    backoff_seconds: float = 0.0
+    neo4j_transactions: int = 0
+    rows_written: int = 0
+    peak_rss_bytes: int = 0
+
+
+class _OpenSpan:
+    def __init__(self, frame: _Frame, counters: _Counters):
+        self.frame = frame
+        self.start = time.perf_counter()
+        self.start_counters = counters
+        self.children_seconds = 0.0
+
+
+class Profiler:
+    """
+    Collects the spans and counters of a sync. Use the module-level functions rather than instantiating this directly.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counters = _Counters()
+        self._stacks: Dict[Tuple[_Frame, ...], StackStats] = {}
+        self._start = time.perf_counter()
+
+    def _stack(self) -> List[_OpenSpan]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _snapshot(self) -> _Counters:
+        with self._lock:
+            return _Counters(**asdict(self._counters))
+
+    @contextmanager
+    def span(self, kind: str, name: str) -> Iterator[None]:
+        stack = self._stack()
+        span = _OpenSpan((kind, name), self._snapshot())
+        stack.append(span)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - span.start
+            if stack:
+                stack[-1].children_seconds += elapsed
+            path = tuple(s.frame for s in stack) + (span.frame,)
+            peak_rss = _peak_rss_bytes()
+            with self._lock:
+                stats = self._stacks.setdefault(path, StackStats())
+                stats.calls += 1
+                stats.wall_seconds += elapsed
+                stats.self_seconds += max(elapsed - span.children_seconds, 0.0)
+                stats.api_calls += self._counters.api_calls - span.start_counters.api_calls
+                stats.backoff_seconds += self._counters.backoff_seconds - span.start_counters.backoff_seconds
+                stats.neo4j_transactions += (
+                    self._counters.neo4j_transactions - span.start_counters.neo4j_transactions
+                )
+                stats.rows_written += self._counters.rows_written - span.start_counters.rows_written
+                stats.peak_rss_bytes = max(stats.peak_rss_bytes, peak_rss)
+
+    def record_api_calls(self, count: int = 1) -> None:
+        with self._lock:
+            self._counters.api_calls += count
+
+    def record_backoff(self, seconds: float) -> None:
+        with self._lock:
+            self._counters.backoff_seconds += seconds
+
+    def record_neo4j_transaction(self, rows_written: int = 0) -> None:
+        with self._lock:
+            self._counters.neo4j_transactions += 1
+            self._counters.rows_written += rows_written
+
+    def get_stacks(self) -> Dict[Tuple[_Frame, ...], StackStats]:
+        with self._lock:
+            return {path: StackStats(**asdict(stats)) for path, stats in self._stacks.items()}
+
+    def get_summary(self) -> List[Dict]:
+        """
+        Sum up the numbers of each span over all the stacks it appears in, slowest first. Spans nested in a span of
+        the same kind and name are not counted twice.
+        """
+        summary: Dict[_Frame, StackStats] = {}
+        for path, stats in self.get_stacks().items():
+            frame = path[-1]
+            total = summary.setdefault(frame, StackStats())
+            total.calls += stats.calls
+            total.self_seconds += stats.self_seconds
+            total.peak_rss_bytes = max(total.peak_rss_bytes, stats.peak_rss_bytes)
+            if frame not in path[:-1]:
+                total.wall_seconds += stats.wall_seconds
+                total.api_calls += stats.api_calls
+                total.backoff_seconds += stats.backoff_seconds
+                total.neo4j_transactions += stats.neo4j_transactions
+                total.rows_written += stats.rows_written
+        return sorted(
+            ({'kind': kind, 'name': name, **asdict(stats)} for (kind, name), stats in summary.items()),
+            key=lambda entry: entry['wall_seconds'],
+            reverse=True,
+        )
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            totals = asdict(self._counters)
+        return {
+            'wall_seconds': time.perf_counter() - self._start,
+            'peak_rss_bytes': _peak_rss_bytes(),
+            'totals': totals,
+            'summary': self.get_summary(),
+            'sections': {name: get_section() for name, get_section in _report_sections.items()},
+            'stacks': [
+                {'stack': [f'{kind}:{name}' for kind, name in path], **asdict(stats)}
+                for path, stats in sorted(self.get_stacks().items(), key=lambda item: item[0])
+            ],
+        }
+
+    def to_folded(self) -> str:
+        """
+        Return the self time of each stack in microseconds, one `frame;frame;frame value` line per stack.
+        """
+        lines = []
+        for path, stats in sorted(self.get_stacks().items(), key=lambda item: item[0]):
+            frames = ';'.join(f'{kind}:{name}'.replace(';', ',') for kind, name in path)
+            lines.append(f'{frames} {int(stats.self_seconds * 1_000_000)}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _html_table(table_id: str, entries: List[Dict[str, Any]]) -> str:
+        if not entries:
+            return '<p>No data.</p>'
+        columns = list(entries[0].keys())
+        rows = '\n'.join(
+            '<tr>' + ''.join(
+                f'<td>{html.escape(f"{entry[c]:.3f}" if isinstance(entry[c], float) else str(entry[c]))}</td>'
+                for c in columns
+            ) + '</tr>'
+            for entry in entries
+        )
+        header = ''.join(
+            f'<th onclick="sortBy(\'{table_id}\', {i})">{html.escape(c)}</th>' for i, c in enumerate(columns)
+        )
+        return f"""<table id="{table_id}">
+<thead><tr>{header}</tr></thead>
+<tbody>
+{rows}
+</tbody>
+</table>"""
+
+    def to_html(self, report: Dict) -> str:
+        sections = ''.join(
+            f'\n<h2>{html.escape(name)}</h2>\n{self._html_table(f"section-{i}", entries)}'
+            for i, (name, entries) in enumerate(report['sections'].items())
+        )
+        totals = ', '.join(f'{k}: {v}' for k, v in report['totals'].items())
+        return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>cartography sync profile</title>
+<style>
+body {{ font-family: sans-serif; }}
+table {{ border-collapse: collapse; }}
+th, td {{ border: 1px solid #ccc; padding: 2px 6px; text-align: right; }}
+th {{ cursor: pointer; background: #eee; }}
+td:nth-child(1), td:nth-child(2) {{ text-align: left; }}
+</style>
+</head>
+<body>
+<h1>cartography sync profile</h1>
+<p>Wall time: {report['wall_seconds']:.1f}s. Peak RSS: {report['peak_rss_bytes']} bytes. {html.escape(totals)}.</p>
+{self._html_table('summary', report['summary'])}{sections}
+<script>
+function sortBy(table, column) {{
+  const body = document.querySelector(`#${{table}} tbody`);
+  const rows = Array.from(body.rows);
+  rows.sort((a, b) => {{
+    const x = a.cells[column].textContent, y = b.cells[column].textContent;
+    const numeric = !isNaN(parseFloat(x)) && !isNaN(parseFloat(y));
+    return numeric ? parseFloat(y) - parseFloat(x) : x.localeCompare(y);
+  }});
+  rows.forEach(row => body.appendChild(row));
+}}
+</script>
+</body>
+</html>
+"""
+
+    def write_reports(self, output_dir: str) -> None:
+        os.makedirs(output_dir, exist_ok=True)
+        report = self.as_dict()
+        with open(os.path.join(output_dir, PROFILE_JSON_FILENAME), 'w') as f:
+            json.dump(report, f, indent=2)
+        with open(os.path.join(output_dir, PROFILE_HTML_FILENAME), 'w') as f:
+            f.write(self.to_html(report))
+        with open(os.path.join(output_dir, PROFILE_FOLDED_FILENAME), 'w') as f:
+            f.write(self.to_folded())
+        logger.info(f"Wrote the sync profile to {output_dir}.")
+
+
+# Global profiler, set when cartography.config.profile_output_dir is set.
+_profiler: Optional[Profiler] = None
+
+# Extra tables of the reports, by title.
+_report_sections: Dict[str, Callable[[], List[Dict[str, Any]]]] = {}
+
+
+def enable_profiling() -> Profiler:
+    """
+    Start profiling this process, discarding anything recorded before.
+    """
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def disable_profiling() -> None:
+    global _profiler
+    _profiler = None
+
+
+def get_profiler() -> Optional[Profiler]:
+    return _profiler
+
+
+def register_report_section(title: str, get_entries: Callable[[], List[Dict[str, Any]]]) -> None:
+    """
+    Add a table to the profile reports. `get_entries` is called when the reports are written and must return the rows
+    of the table as dicts with the same keys.
+    :param title: The title of the table
+    :param get_entries: Returns the rows of the table
+    """
+    _report_sections[title] = get_entries
+
+
+@contextmanager
+def profile_span(kind: str, name: str) -> Iterator[None]:
+    """
+    Record the enclosed block as a span of the given kind and name. This is a no-op if profiling is disabled.
+    :param kind: The kind of span, e.g. 'stage', 'aws_resource', 'statement' or 'function'
+    :param name: The name of the span within its kind
+    """
+    profiler = _profiler
+    if profiler is None:
+        yield
+        return
+    with profiler.span(kind, name):
+        yield
+
+
+def record_api_calls(count: int = 1) -> None:
+    """
+    Count calls to a provider API. This is a no-op if profiling is disabled.
+    """
+    profiler = _profiler
+    if profiler is not None:
+        profiler.record_api_calls(count)
+
+
+def record_backoff(seconds: float) -> None:
+    """
+    Count time spent waiting before retrying a throttled or failed call. This is a no-op if profiling is disabled.
+    """
+    profiler = _profiler
+    if profiler is not None:
+        profiler.record_backoff(seconds)
+
+
+def record_neo4j_transaction(rows_written: int = 0) -> None:
+    """
+    Count a Neo4j write transaction and the rows it wrote. This is a no-op if profiling is disabled.
+    """
+    profiler = _profiler
+    if profiler is not None:
+        profiler.record_neo4j_transaction(rows_written)
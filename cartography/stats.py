@@ -70,6 +70,18 @@ class ScopedStatsClient:
             return self._root._client.timer(stat, rate)
         return None
 
+    def timing(self, stat: str, delta: float, rate: float = 1.0) -> None:
+        """
+        This method uses statsd to report a single timing. statsd aggregates the timings of a stat into a histogram.
+        :param stat: the name of the timer metric stat (string) to report
+        :param delta: the duration to report, in milliseconds
+        :param rate: a sample rate, a float between 0 and 1. Will only send data this percentage of the time.
+        """
+        if self.is_enabled():
+            if self._scope_prefix:
+                stat = f"{self._scope_prefix}.{stat}"
+            self._root._client.timing(stat, delta, rate)
+
     def gauge(self, stat: str, value: int, rate: float = 1.0, delta: bool = False):
         """
         This method uses statsd to report a gauge value.
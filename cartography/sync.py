@@ -3,6 +3,7 @@ import logging
 import time
 from collections import OrderedDict
 from typing import Callable
+from typing import cast
 from typing import List
 from typing import Tuple
 from typing import Union
@@ -31,7 +32,13 @@ import cartography.intel.okta
 import cartography.intel.semgrep
 import cartography.intel.snipeit
 import cartography.intel.msft365
+from cartography.client.core.session import InstrumentedSession
+from cartography.client.core.session import QueryLog
+from cartography.client.core.tx import enable_change_detection
 from cartography.config import Config
+from cartography.profiler import enable_profiling
+from cartography.profiler import get_profiler
+from cartography.profiler import profile_span
 from cartography.stats import set_stats_client
 from cartography.util import STATUS_FAILURE
 from cartography.util import STATUS_SUCCESS
@@ -108,11 +115,18 @@ class Sync:
         :param config: Configuration for the sync run.
         """
         logger.info("Starting sync with update tag '%d'", config.update_tag)
-        with neo4j_driver.session(database=config.neo4j_database) as neo4j_session:
+        slow_query_log_size = getattr(config, 'neo4j_slow_query_log_size', None)
+        query_log = QueryLog(slow_query_log_size) if slow_query_log_size else None
+        enable_change_detection(bool(getattr(config, 'neo4j_change_detection', False)))
+        with neo4j_driver.session(database=config.neo4j_database) as session:
+            neo4j_session = session
+            if query_log is not None:
+                neo4j_session = cast(neo4j.Session, InstrumentedSession(session, query_log))
             for stage_name, stage_func in self._stages.items():
                 logger.info("Starting sync stage '%s'", stage_name)
                 try:
-                    stage_func(neo4j_session, config)
+                    with profile_span('stage', stage_name):
+                        stage_func(neo4j_session, config)
                 except (KeyboardInterrupt, SystemExit):
                     logger.warning("Sync interrupted during stage '%s'.", stage_name)
                     raise
@@ -120,6 +134,8 @@ class Sync:
                     logger.exception("Unhandled exception during sync stage '%s'", stage_name)
                     raise  # TODO this should be configurable
                 logger.info("Finishing sync stage '%s'", stage_name)
+        if query_log is not None:
+            query_log.log_slow_queries()
         logger.info("Finishing sync with update tag '%d'", config.update_tag)
         return STATUS_SUCCESS
 
@@ -190,7 +206,16 @@ def run_with_config(sync: Sync, config: Union[Config, argparse.Namespace]) -> in
     default_update_tag = int(time.time())
     if not config.update_tag:
         config.update_tag = default_update_tag
-    return sync.run(neo4j_driver, config)
+    if not config.profile_output_dir:
+        return sync.run(neo4j_driver, config)
+    enable_profiling()
+    try:
+        return sync.run(neo4j_driver, config)
+    finally:
+        # Write the report even if the sync failed, since that is often when it is needed most.
+        profiler = get_profiler()
+        if profiler is not None:
+            profiler.write_reports(config.profile_output_dir)
 
 
 def build_default_sync() -> Sync:
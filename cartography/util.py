@@ -27,6 +27,8 @@ import neo4j
 
 from cartography.graph.job import GraphJob
 from cartography.graph.statement import get_job_shortname
+from cartography.profiler import get_profiler
+from cartography.profiler import record_backoff
 from cartography.stats import get_stats_client
 from cartography.stats import ScopedStatsClient
 
@@ -176,12 +178,11 @@ F = TypeVar('F', bound=Callable[..., Any])
 def timeit(method: F) -> F:
     """
     This decorator uses statsd to time the execution of the wrapped method and sends it to the statsd server.
-    This is only active if config.statsd_enabled is True.
+    This is only active if config.statsd_enabled is True. If profiling is enabled, the call is also recorded as a
+    profiler span.
     :param method: The function to measure execution
     """
-    # Allow access via `inspect` to the wrapped function. This is used in integration tests to standardize param names.
-    @wraps(method)
-    def timed(*args, **kwargs):  # type: ignore
+    def send_timing(*args: Any, **kwargs: Any) -> Any:
         stats_client = get_stats_client(method.__module__)
         if stats_client.is_enabled():
             timer = stats_client.timer(method.__name__)
@@ -193,6 +194,15 @@ def timeit(method: F) -> F:
             # statsd is disabled, so don't time anything
             return method(*args, **kwargs)
 
+    # Allow access via `inspect` to the wrapped function. This is used in integration tests to standardize param names.
+    @wraps(method)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        profiler = get_profiler()
+        if profiler is None:
+            return send_timing(*args, **kwargs)
+        with profiler.span('function', f'{method.__module__}.{method.__name__}'):
+            return send_timing(*args, **kwargs)
+
     return cast(F, timed)
 
 
@@ -236,6 +246,12 @@ def backoff_handler(details: Dict) -> None:
     Handler that will be executed on exception by backoff mechanism
     """
     logger.warning("Backing off {wait:0.1f} seconds after {tries} tries. Calling function {target}".format(**details))
+    target = details['target']
+    target_name = f"{getattr(target, '__module__', None)}.{getattr(target, '__name__', None)}"
+    stats_client = get_stats_client(f'backoff.{target_name}')
+    stats_client.incr('tries')
+    stats_client.timing('wait', details['wait'] * 1000)
+    record_backoff(details['wait'])
 
 
 # TODO Move this to cartography.intel.aws.util.common
@@ -409,7 +425,11 @@ def to_asynchronous(func: Callable[..., R], *args: Any, **kwargs: Any) -> Awaita
             raise
 
     # don't use @backoff as decorator, to preserve typing
-    wrapped = backoff.on_exception(backoff.expo, CartographyThrottlingException)(wrapper)
+    wrapped = backoff.on_exception(
+        backoff.expo,
+        CartographyThrottlingException,
+        on_backoff=backoff_handler,
+    )(wrapper)
     call = partial(wrapped, *args, **kwargs)
     return asyncio.get_event_loop().run_in_executor(None, call)
 
@@ -449,17 +469,3 @@ def load_relationship_data(session, schema, data, update_tag):
     """Mock implementation for loading relationship data into Neo4j."""
     logger.debug(f"Loading {len(data)} relationships for schema {schema.type}")
     # Replace with actual logic for loading relationships into Neo4j
-
-class GraphJob:
-    """Mock implementation of a cleanup job."""
-    def __init__(self, schema, parameters):
-        self.schema = schema
-        self.parameters = parameters
-
-    @classmethod
-    def from_node_schema(cls, schema, parameters):
-        return cls(schema, parameters)
-
-    def run(self, session):
-        logger.debug(f"Running cleanup job for schema {self.schema.label}")
-        # Replace with actual logic for running cleanup jobs
\ No newline at end of file
@@ -24,8 +24,16 @@ DESCRIBE_SGS = [
                         "CidrIp": "203.0.113.0/24",
                     },
                 ],
-                "Ipv6Ranges": [],
-                "PrefixListIds": [],
+                "Ipv6Ranges": [
+                    {
+                        "CidrIpv6": "2001:db8::/32",
+                    },
+                ],
+                "PrefixListIds": [
+                    {
+                        "PrefixListId": "pl-6ea54007",
+                    },
+                ],
                 "ToPort": 443,
                 "UserIdGroupPairs": [],
             },
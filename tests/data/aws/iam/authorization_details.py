@@ -0,0 +1,101 @@
+from datetime import datetime
+
+
+# A trimmed-down response of iam:GetAccountAuthorizationDetails, with all pages merged.
+GET_ACCOUNT_AUTHORIZATION_DETAILS = {
+    'UserDetailList': [
+        {
+            'Path': '/',
+            'UserName': 'user1',
+            'UserId': 'AIDAXJNIGTSXXX',
+            'Arn': 'arn:aws:iam::1234:user/user1',
+            'CreateDate': datetime(2022, 7, 27, 20, 24, 23),
+            'UserPolicyList': [
+                {
+                    'PolicyName': 'user1-inline',
+                    'PolicyDocument': {
+                        'Version': '2012-10-17',
+                        'Statement': [{'Effect': 'Allow', 'Action': 's3:GetObject', 'Resource': '*'}],
+                    },
+                },
+            ],
+            'GroupList': ['admins'],
+            'AttachedManagedPolicies': [
+                {'PolicyName': 'AmazonS3FullAccess', 'PolicyArn': 'arn:aws:iam::aws:policy/AmazonS3FullAccess'},
+            ],
+        },
+        {
+            'Path': '/',
+            'UserName': 'user2',
+            'UserId': 'AIDAXJNIGTSXXY',
+            'Arn': 'arn:aws:iam::1234:user/user2',
+            'CreateDate': datetime(2021, 1, 25, 18, 8, 53),
+            'UserPolicyList': [],
+            'GroupList': [],
+            'AttachedManagedPolicies': [],
+        },
+    ],
+    'GroupDetailList': [
+        {
+            'Path': '/',
+            'GroupName': 'admins',
+            'GroupId': 'AGPAXJNIGTSXXX',
+            'Arn': 'arn:aws:iam::1234:group/admins',
+            'CreateDate': datetime(2020, 3, 23, 20, 26, 23),
+            'GroupPolicyList': [],
+            'AttachedManagedPolicies': [
+                {'PolicyName': 'AdministratorAccess', 'PolicyArn': 'arn:aws:iam::aws:policy/AdministratorAccess'},
+            ],
+        },
+    ],
+    'RoleDetailList': [
+        {
+            'Path': '/',
+            'RoleName': 'role1',
+            'RoleId': 'AROAXJNIGTSXXX',
+            'Arn': 'arn:aws:iam::1234:role/role1',
+            'CreateDate': datetime(2020, 3, 23, 20, 26, 23),
+            'AssumeRolePolicyDocument': {
+                'Version': '2012-10-17',
+                'Statement': [
+                    {'Effect': 'Allow', 'Principal': {'Service': 'ec2.amazonaws.com'}, 'Action': 'sts:AssumeRole'},
+                ],
+            },
+            'InstanceProfileList': [],
+            'RolePolicyList': [],
+            'AttachedManagedPolicies': [
+                {'PolicyName': 'AmazonS3FullAccess', 'PolicyArn': 'arn:aws:iam::aws:policy/AmazonS3FullAccess'},
+            ],
+            'Tags': [{'Key': 'team', 'Value': 'security'}],
+        },
+    ],
+    'Policies': [
+        {
+            'PolicyName': 'AmazonS3FullAccess',
+            'PolicyId': 'ANPAIFIR6V6BVTRAHWINE',
+            'Arn': 'arn:aws:iam::aws:policy/AmazonS3FullAccess',
+            'Path': '/',
+            'DefaultVersionId': 'v2',
+            'AttachmentCount': 2,
+            'IsAttachable': True,
+            'PolicyVersionList': [
+                {
+                    'Document': {
+                        'Version': '2012-10-17',
+                        'Statement': [{'Effect': 'Allow', 'Action': 's3:*', 'Resource': '*'}],
+                    },
+                    'VersionId': 'v2',
+                    'IsDefaultVersion': True,
+                },
+                {
+                    'Document': {
+                        'Version': '2012-10-17',
+                        'Statement': [{'Effect': 'Allow', 'Action': 's3:Get*', 'Resource': '*'}],
+                    },
+                    'VersionId': 'v1',
+                    'IsDefaultVersion': False,
+                },
+            ],
+        },
+    ],
+}
@@ -16,6 +16,11 @@ def test_analysis_jobs_cypher_syntax(neo4j_session):
         'UPDATE_TAG': 'my_update_tag',
         'OKTA_ORG_ID': 'my_okta_org_id',
         'DEPLOYMENT_ID': 'my_deployment_id',
+        'BUCKET_IDS': [],
+        'INSTANCE_IDS': [],
+        'LOAD_BALANCER_IDS': [],
+        'LOAD_BALANCER_V2_IDS': [],
+        'AUTO_SCALING_GROUP_IDS': [],
     }
 
     for job_name in contents('cartography.data.jobs.analysis'):
@@ -43,6 +48,7 @@ def test_cleanup_jobs_cypher_syntax(neo4j_session):
         'OKTA_ORG_ID': None,
         'DO_ACCOUNT_ID': None,
         'AZURE_SUBSCRIPTION_ID': None,
+        'BUCKET_IDS': [],
     }
 
     for job_name in contents('cartography.data.jobs.cleanup'):
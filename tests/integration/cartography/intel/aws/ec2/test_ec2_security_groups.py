@@ -83,3 +83,29 @@ def test_load_security_groups_relationships(neo4j_session):
     }
 
     assert actual == expected_nodes
+
+
+def test_load_security_groups_ranges(neo4j_session):
+    data = tests.data.aws.ec2.security_groups.DESCRIBE_SGS
+    cartography.intel.aws.ec2.security_groups.load_ec2_security_groupinfo(
+        neo4j_session,
+        data,
+        TEST_REGION,
+        TEST_ACCOUNT_ID,
+        TEST_UPDATE_TAG,
+    )
+
+    # IPv4 and IPv6 ranges are attached to their rules
+    result = neo4j_session.run(
+        """
+        MATCH (range:IpRange)-[:MEMBER_OF_IP_RULE]->(r:IpPermissionInbound{ruleid: $RuleId})
+        RETURN range.id, r.prefix_list_ids
+        """,
+        RuleId='sg-028e2522c72719996/IpPermissions/443443tcp',
+    )
+    actual = {(r['range.id'], tuple(r['r.prefix_list_ids'])) for r in result}
+
+    assert actual == {
+        ('203.0.113.0/24', ('pl-6ea54007',)),
+        ('2001:db8::/32', ('pl-6ea54007',)),
+    }
@@ -212,7 +212,7 @@ def test_sync_one_account_all_sync_functions(
     # Check that the boilerplate functions get called as expected. Brittle, but a good sanity check.
     assert mock_autodiscover.call_count == 0
     assert mock_cleanup.call_count == 0
-    assert mock_analysis.call_count == 1
+    assert mock_analysis.call_count == 2
 
 
 @mock.patch('cartography.intel.aws.boto3.Session')
@@ -239,7 +239,7 @@ def test_sync_one_account_just_iam_rels_and_tags(
     # _sync_one_account() above did not specify regions, so we expect 1 call to _autodiscover_account_regions().
     assert mock_autodiscover.call_count == 1
     assert mock_cleanup.call_count == 0
-    assert mock_analysis.call_count == 1
+    assert mock_analysis.call_count == 2
 
 
 def test_standardize_aws_sync_kwargs():
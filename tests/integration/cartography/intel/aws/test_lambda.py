@@ -1,5 +1,8 @@
 import cartography.intel.aws.lambda_function
 import tests.data.aws.lambda_function
+from cartography.util import run_analysis_job
+from cartography.util import run_scoped_analysis_job
+from tests.integration.util import check_rels
 
 TEST_ACCOUNT_ID = '000000000000'
 TEST_REGION = 'us-west-2'
@@ -303,3 +306,40 @@ def test_load_lambda_layers_relationships(neo4j_session):
     }
 
     assert actual == expected_nodes
+
+
+def test_lambda_ecr_scoped_analysis(neo4j_session):
+    # Arrange: an image lambda in account 1 uses an image of account 2, which is synced after account 1.
+    neo4j_session.run(
+        """
+        MERGE (a1:AWSAccount{id: '111111111111'})
+        MERGE (a2:AWSAccount{id: '222222222222'})
+        MERGE (a1)-[:RESOURCE]->(l:AWSLambda{id: 'lambda-1'})
+        SET l.codesha256 = 'abc', l.packagetype = 'Image', l.lastupdated = $update_tag
+        MERGE (a2)-[:RESOURCE]->(:ECRRepository{id: 'repo'})-[:REPO_IMAGE]->(:ECRRepositoryImage{id: 'repo:1'})
+            -[:IMAGE]->(:ECRImage{id: 'sha256:abc', digest: 'sha256:abc'})
+        """,
+        update_tag=TEST_UPDATE_TAG,
+    )
+
+    # Act
+    run_scoped_analysis_job(
+        'aws_lambda_ecr.json',
+        neo4j_session,
+        {'UPDATE_TAG': TEST_UPDATE_TAG, 'AWS_ID': '111111111111'},
+    )
+    run_scoped_analysis_job(
+        'aws_lambda_ecr.json',
+        neo4j_session,
+        {'UPDATE_TAG': TEST_UPDATE_TAG, 'AWS_ID': '222222222222'},
+    )
+    run_analysis_job(
+        'aws_lambda_ecr_cross_account.json',
+        neo4j_session,
+        {'UPDATE_TAG': TEST_UPDATE_TAG},
+    )
+
+    # Assert
+    assert check_rels(neo4j_session, 'AWSLambda', 'id', 'ECRImage', 'id', 'HAS', rel_direction_right=True) == {
+        ('lambda-1', 'sha256:abc'),
+    }
@@ -1,7 +1,11 @@
 from cartography.intel.aws.s3 import _load_s3_acls
+from cartography.intel.aws.s3 import cleanup_s3_bucket_acl_and_policy
+from cartography.intel.aws.s3 import cleanup_s3_buckets
 from cartography.intel.aws.s3 import load_s3_buckets
+from cartography.intel.aws.s3 import load_s3_details
 from cartography.intel.aws.s3 import parse_acl
 from tests.data.aws.s3 import LIST_BUCKETS
+from tests.data.aws.s3 import LIST_STATEMENTS
 from tests.data.aws.s3 import OPEN_BUCKET_ACLS
 from tests.integration.cartography.intel.aws.iam.test_iam import _create_base_account
 from tests.integration.util import check_nodes
@@ -49,3 +53,49 @@ def test_load_s3_acls(neo4j_session):
         ('bucket-2', ['s3:GetBucketAcl', 's3:ListBucket', 's3:ListBucketMultipartUploads', 's3:ListBucketVersions']),
         ('bucket-3', ['s3:PutBucketAcl', 's3:PutObject']),
     ]
+
+
+def _get_anonymous_actions(neo4j_session):
+    actual = neo4j_session.run(
+        """
+        MATCH (r:S3Bucket) RETURN r.name, r.anonymous_actions;
+        """,
+    )
+    return sorted((n['r.name'], sorted(n['r.anonymous_actions'] or [])) for n in actual)
+
+
+def test_load_s3_details_keeps_unchanged_buckets(neo4j_session):
+    """
+    Ensure that loading the same bucket details again keeps the S3Acls, S3PolicyStatements and anonymous_actions of
+    the buckets, and marks them as updated so that the cleanup jobs do not delete them.
+    """
+    # Arrange
+    _create_base_account(neo4j_session)
+    neo4j_session.run("MATCH (n) WHERE n:S3Acl OR n:S3PolicyStatement DETACH DELETE n")
+    neo4j_session.run("MATCH (s:S3Bucket) REMOVE s.details_fingerprint, s.anonymous_access, s.anonymous_actions")
+    s3_details = [
+        (bucket_name, acl, LIST_STATEMENTS if bucket_name == 'bucket-2' else None, None, None, None)
+        for bucket_name, acl in OPEN_BUCKET_ACLS.items()
+    ]
+    load_s3_buckets(neo4j_session, LIST_BUCKETS, TEST_ACCOUNT_ID, TEST_UPDATE_TAG)
+    load_s3_details(neo4j_session, iter(s3_details), TEST_ACCOUNT_ID, TEST_UPDATE_TAG)
+    expected_acls = check_nodes(neo4j_session, 'S3Acl', ['id'])
+    expected_statements = check_nodes(neo4j_session, 'S3PolicyStatement', ['id'])
+    expected_actions = _get_anonymous_actions(neo4j_session)
+    assert expected_acls
+    assert len(expected_statements) == 3
+
+    # Act: load the same details in a later sync and clean up what that sync did not update
+    new_update_tag = TEST_UPDATE_TAG + 1
+    common_job_parameters = {'UPDATE_TAG': new_update_tag, 'AWS_ID': TEST_ACCOUNT_ID}
+    load_s3_buckets(neo4j_session, LIST_BUCKETS, TEST_ACCOUNT_ID, new_update_tag)
+    load_s3_details(neo4j_session, iter(s3_details), TEST_ACCOUNT_ID, new_update_tag)
+    cleanup_s3_buckets(neo4j_session, common_job_parameters)
+    cleanup_s3_bucket_acl_and_policy(neo4j_session, common_job_parameters)
+
+    # Assert
+    assert check_nodes(neo4j_session, 'S3Acl', ['id']) == expected_acls
+    assert check_nodes(neo4j_session, 'S3PolicyStatement', ['id']) == expected_statements
+    assert _get_anonymous_actions(neo4j_session) == expected_actions
+    assert check_nodes(neo4j_session, 'S3Acl', ['lastupdated']) == {(new_update_tag,)}
+    assert check_nodes(neo4j_session, 'S3PolicyStatement', ['lastupdated']) == {(new_update_tag,)}
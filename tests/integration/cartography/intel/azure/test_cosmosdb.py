@@ -86,12 +86,11 @@ def test_load_database_account_data_relationships(neo4j_session):
 
 
 def test_load_database_account_write_locations(neo4j_session):
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_database_account_write_locations(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_database_account_write_locations(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected_nodes = {
         "DA1-eastus",
@@ -118,12 +117,11 @@ def test_load_database_account_write_locations_relationships(neo4j_session):
         TEST_UPDATE_TAG,
     )
 
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_database_account_write_locations(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_database_account_write_locations(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected = {
         (
@@ -149,12 +147,11 @@ def test_load_database_account_write_locations_relationships(neo4j_session):
 
 
 def test_load_database_account_read_locations(neo4j_session):
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_database_account_read_locations(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_database_account_read_locations(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected_nodes = {
         "DA1-eastus",
@@ -181,12 +178,11 @@ def test_load_database_account_read_locations_relationships(neo4j_session):
         TEST_UPDATE_TAG,
     )
 
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_database_account_read_locations(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_database_account_read_locations(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected = {
         (
@@ -212,12 +208,11 @@ def test_load_database_account_read_locations_relationships(neo4j_session):
 
 
 def test_load_database_account_associated_locations(neo4j_session):
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_database_account_associated_locations(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_database_account_associated_locations(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected_nodes = {
         "DA1-eastus",
@@ -245,12 +240,11 @@ def test_load_database_account_associated_locations_relationships(neo4j_session)
         TEST_UPDATE_TAG,
     )
 
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_database_account_associated_locations(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_database_account_associated_locations(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected = {
         (
@@ -279,12 +273,11 @@ def test_load_database_account_associated_locations_relationships(neo4j_session)
 
 
 def test_load_cosmosdb_cors_policy(neo4j_session):
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_cosmosdb_cors_policy(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_cosmosdb_cors_policy(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected_nodes = {
         cors1_id, cors2_id,
@@ -310,12 +303,11 @@ def test_load_cosmosdb_cors_policy_relationships(neo4j_session):
         TEST_UPDATE_TAG,
     )
 
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_cosmosdb_cors_policy(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_cosmosdb_cors_policy(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected = {
         (
@@ -341,12 +333,11 @@ def test_load_cosmosdb_cors_policy_relationships(neo4j_session):
 
 
 def test_load_cosmosdb_failover_policies(neo4j_session):
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_cosmosdb_failover_policies(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_cosmosdb_failover_policies(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected_nodes = {
         "DA1-eastus", "DA2-eastus",
@@ -372,12 +363,11 @@ def test_load_cosmosdb_failover_policies_relationships(neo4j_session):
         TEST_UPDATE_TAG,
     )
 
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_cosmosdb_failover_policies(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_cosmosdb_failover_policies(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected = {
         (
@@ -403,12 +393,11 @@ def test_load_cosmosdb_failover_policies_relationships(neo4j_session):
 
 
 def test_load_cosmosdb_private_endpoint_connections(neo4j_session):
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_cosmosdb_private_endpoint_connections(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_cosmosdb_private_endpoint_connections(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected_nodes = {
         da1 + "/privateEndpointConnections/pe1",
@@ -435,12 +424,11 @@ def test_load_cosmosdb_private_endpoint_connections_relationships(neo4j_session)
         TEST_UPDATE_TAG,
     )
 
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_cosmosdb_private_endpoint_connections(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_cosmosdb_private_endpoint_connections(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected = {
         (
@@ -466,12 +454,11 @@ def test_load_cosmosdb_private_endpoint_connections_relationships(neo4j_session)
 
 
 def test_load_cosmosdb_virtual_network_rules(neo4j_session):
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_cosmosdb_virtual_network_rules(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_cosmosdb_virtual_network_rules(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected_nodes = {
         rg + "/providers/Microsoft.Network/virtualNetworks/vn1",
@@ -498,12 +485,11 @@ def test_load_cosmosdb_virtual_network_rules_relationships(neo4j_session):
         TEST_UPDATE_TAG,
     )
 
-    for database_account in DESCRIBE_DATABASE_ACCOUNTS:
-        cosmosdb._load_cosmosdb_virtual_network_rules(
-            neo4j_session,
-            database_account,
-            TEST_UPDATE_TAG,
-        )
+    cosmosdb._load_cosmosdb_virtual_network_rules(
+        neo4j_session,
+        DESCRIBE_DATABASE_ACCOUNTS,
+        TEST_UPDATE_TAG,
+    )
 
     expected = {
         (
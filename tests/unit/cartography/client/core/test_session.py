@@ -0,0 +1,101 @@
+from unittest import mock
+
+import pytest
+
+from cartography.client.core.session import fingerprint_query
+from cartography.client.core.session import InstrumentedSession
+from cartography.client.core.session import QueryLog
+
+
+def _mock_result(records, nodes_created=0):
+    result = mock.MagicMock()
+    result.keys.return_value = ['a']
+    result.__iter__.return_value = iter(records)
+    result.single.return_value = records[0] if records else None
+    summary = result.consume.return_value
+    summary.result_available_after = 10
+    summary.result_consumed_after = 5
+    for name in ('nodes_deleted', 'relationships_created', 'relationships_deleted', 'properties_set',
+                 'labels_added', 'labels_removed'):
+        setattr(summary.counters, name, 0)
+    summary.counters.nodes_created = nodes_created
+    return result
+
+
+def test_fingerprint_query_ignores_formatting_and_literals():
+    assert fingerprint_query("MATCH (n:A{id: 'x'})\n    RETURN n LIMIT 5") == \
+        fingerprint_query("MATCH (n:A{id: \"y\"}) RETURN n LIMIT 10  // comment")
+    assert fingerprint_query("MATCH (n:A) RETURN n") != fingerprint_query("MATCH (n:B) RETURN n")
+
+
+def test_instrumented_session_records_runs_and_transactions():
+    query_log = QueryLog(slow_query_log_size=1)
+    session = mock.MagicMock()
+    session.run.return_value = _mock_result([{'a': 1}, {'a': 2}], nodes_created=3)
+    session.write_transaction.side_effect = lambda func, *args, **kwargs: func(mock.MagicMock(), *args, **kwargs)
+    instrumented = InstrumentedSession(session, query_log)
+
+    result = instrumented.run("MATCH (n) RETURN n.a AS a", x=1)
+    assert result.single() == {'a': 1}
+    session.run.assert_called_once_with("MATCH (n) RETURN n.a AS a", None, x=1)
+
+    def _tx_func(tx, value):
+        tx._tx.run.return_value = _mock_result([])
+        return tx.run("CREATE (n:B{a: $value})", value=value).consume()
+    instrumented.write_transaction(_tx_func, 2)
+
+    stats = {s.query: s for s in query_log.get_stats()}
+    assert stats["MATCH (n) RETURN n.a AS a"].calls == 1
+    assert stats["MATCH (n) RETURN n.a AS a"].counters['nodes_created'] == 3
+    assert stats["MATCH (n) RETURN n.a AS a"].server_seconds == 0.015
+    assert stats["CREATE (n:B{a: $value})"].calls == 1
+    assert len(query_log.get_slow_queries()) == 1
+
+
+def test_query_log_keeps_slowest_queries():
+    query_log = QueryLog(slow_query_log_size=2)
+    for seconds in (1.0, 3.0, 2.0, 0.5):
+        query_log.record(f"RETURN {seconds}", seconds, None)
+
+    assert [q.seconds for q in query_log.get_slow_queries()] == [3.0, 2.0]
+    # All four queries normalize to the same text.
+    assert [s.calls for s in query_log.get_stats()] == [4]
+
+
+def test_instrumented_session_streams_records():
+    query_log = QueryLog(slow_query_log_size=1)
+    session = mock.MagicMock()
+    result = _mock_result([{'a': 1}, {'a': 2}])
+    session.run.return_value = result
+    instrumented = InstrumentedSession(session, query_log)
+
+    records = iter(instrumented.run("MATCH (n) RETURN n.a AS a"))
+    assert next(records) == {'a': 1}
+    # The query is only recorded once its result has been read to the end.
+    result.consume.assert_not_called()
+    assert query_log.get_stats() == []
+    assert list(records) == [{'a': 2}]
+    assert query_log.get_stats()[0].calls == 1
+    # Other parts of the neo4j.Result API are passed through.
+    assert instrumented.run("MATCH (n) RETURN n.a AS a").fetch is result.fetch
+
+
+def test_instrumented_session_records_unread_and_failed_queries():
+    query_log = QueryLog(slow_query_log_size=2)
+    session = mock.MagicMock()
+    write_result = _mock_result([], nodes_created=1)
+    write_result.keys.return_value = []
+    session.run.side_effect = [_mock_result([{'a': 1}]), write_result, RuntimeError('boom')]
+    instrumented = InstrumentedSession(session, query_log)
+
+    instrumented.run("MATCH (n) RETURN n.a AS a")
+    # A query without columns is recorded right away, with its counters, even if its result is never read.
+    instrumented.run("CREATE (:A)")
+    with pytest.raises(RuntimeError):
+        instrumented.run("CREATE (:B)")
+
+    stats = {s.query: s for s in query_log.get_stats()}
+    assert stats["MATCH (n) RETURN n.a AS a"].calls == 1
+    assert stats["MATCH (n) RETURN n.a AS a"].counters == {}
+    assert stats["CREATE (:A)"].counters['nodes_created'] == 1
+    assert stats["CREATE (:B)"].calls == 1
@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from unittest import mock
+
+from cartography.client.core import tx
+from cartography.models.core.common import PropertyRef
+from cartography.models.core.nodes import CartographyNodeProperties
+from cartography.models.core.nodes import CartographyNodeSchema
+from cartography.models.core.nodes import ExtraNodeLabels
+from tests.data.graph.querybuilder.sample_models.interesting_asset import InterestingAssetSchema
+from tests.data.graph.querybuilder.sample_models.simple_node import SimpleNodeSchema
+
+
+def test_get_node_properties_hash_ignores_lastupdated_and_unused_fields():
+    item = {'Id': 'a', 'property1': 'b', 'property2': 1, 'unused': 'x'}
+
+    properties_hash = tx.get_node_properties_hash(SimpleNodeSchema(), item, lastupdated=1)
+
+    assert properties_hash == tx.get_node_properties_hash(
+        SimpleNodeSchema(), {'property2': 1, 'property1': 'b', 'Id': 'a'}, lastupdated=2,
+    )
+    assert properties_hash != tx.get_node_properties_hash(SimpleNodeSchema(), {**item, 'property2': 2}, lastupdated=1)
+    # The extra node labels are part of the hash.
+    assert properties_hash != tx.get_node_properties_hash(InterestingAssetSchema(), item, lastupdated=1)
+
+
+@dataclass(frozen=True)
+class NestedNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('Id')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+    category: PropertyRef = PropertyRef('category.name')
+
+
+@dataclass(frozen=True)
+class NestedNodeSchema(CartographyNodeSchema):
+    label: str = 'NestedNode'
+    properties: NestedNodeProperties = NestedNodeProperties()
+
+
+def test_get_node_properties_hash_reads_nested_properties():
+    item = {'Id': 'a', 'category': {'name': 'laptop'}}
+
+    properties_hash = tx.get_node_properties_hash(NestedNodeSchema(), item)
+
+    assert properties_hash != tx.get_node_properties_hash(
+        NestedNodeSchema(), {'Id': 'a', 'category': {'name': 'phone'}},
+    )
+    assert properties_hash != tx.get_node_properties_hash(NestedNodeSchema(), {'Id': 'a', 'category': None})
+
+
+@dataclass(frozen=True)
+class SimpleNodeWithExtraLabelSchema(SimpleNodeSchema):
+    extra_node_labels: ExtraNodeLabels = ExtraNodeLabels(['Extra'])
+
+
+def test_get_node_properties_hash_changes_with_the_node_labels():
+    item = {'Id': 'a', 'property1': 'b', 'property2': 'c'}
+
+    # A label added to the schema changes the hash, so the label is set on the existing nodes.
+    assert tx.get_node_properties_hash(SimpleNodeSchema(), item) != tx.get_node_properties_hash(
+        SimpleNodeWithExtraLabelSchema(), item,
+    )
+
+
+@mock.patch.object(tx, 'load_graph_data')
+@mock.patch.object(tx, 'ensure_indexes')
+def test_load_with_change_detection(mock_ensure_indexes, mock_load_graph_data):
+    items = [{'Id': 'a', 'property1': 'b', 'property2': 'c'}]
+    tx.enable_change_detection()
+    try:
+        tx.load(mock.MagicMock(), SimpleNodeSchema(), items, lastupdated=1)
+    finally:
+        tx.enable_change_detection(False)
+
+    _, query, dict_list = mock_load_graph_data.call_args[0]
+    assert 'FOREACH' in query
+    assert dict_list == [{**items[0], 'properties_hash': tx.get_node_properties_hash(SimpleNodeSchema(), items[0])}]
+    # The caller's dicts are left untouched.
+    assert 'properties_hash' not in items[0]
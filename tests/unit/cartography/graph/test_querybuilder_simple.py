@@ -123,3 +123,41 @@ def test_build_ingestion_query_fuzzy_case_insensitive():
     actual_query = remove_leading_whitespace_and_empty_lines(query)
     expected_query = remove_leading_whitespace_and_empty_lines(expected)
     assert actual_query == expected_query
+
+
+def test_build_ingestion_query_with_change_detection():
+    """
+    Test that with change detection, the node properties are only set when the properties hash of the item changed.
+    """
+    # Act
+    query = build_ingestion_query(SimpleNodeWithSubResourceSchema(), change_detection=True)
+
+    expected = """
+        UNWIND $DictList AS item
+            MERGE (i:SimpleNode{id: item.Id})
+            ON CREATE SET i.firstseen = timestamp()
+            SET
+                i.lastupdated = $lastupdated
+            FOREACH (_ IN CASE WHEN coalesce(i.properties_hash, '') <> item.properties_hash THEN [1] ELSE [] END |
+                SET
+                i.property1 = item.property1,
+                i.property2 = item.property2,
+                i.properties_hash = item.properties_hash
+            )
+
+            WITH i, item
+            CALL {
+                WITH i, item
+                OPTIONAL MATCH (j:SubResource{id: $sub_resource_id})
+                WITH i, item, j WHERE j IS NOT NULL
+                MERGE (i)<-[r:RELATIONSHIP_LABEL]-(j)
+                ON CREATE SET r.firstseen = timestamp()
+                SET
+                    r.lastupdated = $lastupdated
+            }
+    """
+
+    # Assert: compare query outputs while ignoring leading whitespace.
+    actual_query = remove_leading_whitespace_and_empty_lines(query)
+    expected_query = remove_leading_whitespace_and_empty_lines(expected)
+    assert actual_query == expected_query
@@ -1,6 +1,12 @@
+import copy
+from unittest import mock
+
+import botocore.exceptions
+
 from cartography.intel.aws import iam
 from cartography.intel.aws.iam import PolicyType
 from cartography.intel.aws.iam import transform_policy_data
+from tests.data.aws.iam.authorization_details import GET_ACCOUNT_AUTHORIZATION_DETAILS
 
 SINGLE_STATEMENT = {
     "Resource": "*",
@@ -40,29 +46,26 @@ def test_get_account_from_arn():
 
 
 def test__get_role_tags_valid_tags(mocker):
-    mocker.patch(
-        'cartography.intel.aws.iam.get_role_list_data', return_value={
-            'Roles': [
+    mock_get_details = mocker.patch(
+        'cartography.intel.aws.iam.get_account_authorization_details', return_value={
+            'RoleDetailList': [
                 {
                     'RoleName': 'test-role',
                     'Arn': 'test-arn',
+                    'Tags': [
+                        {
+                            'Key': 'k1', 'Value': 'v1',
+                        },
+                    ],
                 },
             ],
         },
     )
-    mocker.patch('boto3.session.Session')
     mock_session = mocker.Mock()
-    mock_client = mocker.Mock()
-    mock_role = mocker.Mock()
-    mock_role.tags = [
-        {
-            'Key': 'k1', 'Value': 'v1',
-        },
-    ]
-    mock_client.Role.return_value = mock_role
-    mock_session.resource.return_value = mock_client
     result = iam.get_role_tags(mock_session)
 
+    mock_get_details.assert_called_once_with(mock_session, filters=['Role'])
+
     assert result == [{
         'ResourceARN': 'test-arn',
         'Tags': [
@@ -74,25 +77,43 @@ def test__get_role_tags_valid_tags(mocker):
     }]
 
 
+def test__get_role_tags_falls_back_to_list_roles_when_access_denied(mocker):
+    mocker.patch(
+        'cartography.intel.aws.iam.get_account_authorization_details',
+        side_effect=botocore.exceptions.ClientError(
+            {'Error': {'Code': 'AccessDenied'}}, 'GetAccountAuthorizationDetails',
+        ),
+    )
+    mocker.patch(
+        'cartography.intel.aws.iam.get_role_list_data',
+        return_value={'Roles': [{'RoleName': 'test-role', 'Arn': 'test-arn'}]},
+    )
+    mock_session = mocker.Mock()
+    mock_session.resource.return_value.Role.return_value.tags = [{'Key': 'k1', 'Value': 'v1'}]
+
+    result = iam.get_role_tags(mock_session, '1234')
+
+    mock_session.resource.return_value.Role.assert_called_once_with('test-role')
+    assert result == [{'ResourceARN': 'test-arn', 'Tags': [{'Key': 'k1', 'Value': 'v1'}]}]
+
+
 def test__get_role_tags_no_tags(mocker):
     mocker.patch(
-        'cartography.intel.aws.iam.get_role_list_data', return_value={
-            'Roles': [
+        'cartography.intel.aws.iam.get_account_authorization_details', return_value={
+            'RoleDetailList': [
                 {
                     'RoleName': 'test-role',
                     'Arn': 'test-arn',
+                    'Tags': [],
+                },
+                {
+                    'RoleName': 'test-role-2',
+                    'Arn': 'test-arn-2',
                 },
             ],
         },
     )
-    mocker.patch('boto3.session.Session')
     mock_session = mocker.Mock()
-    mock_client = mocker.Mock()
-    mock_role = mocker.Mock()
-    mock_role.tags = [
-    ]
-    mock_client.Role.return_value = mock_role
-    mock_session.resource.return_value = mock_client
     result = iam.get_role_tags(mock_session)
 
     assert result == []
@@ -116,3 +137,115 @@ def test_transform_policy_data_correctly_creates_lists_of_statements():
 
     # Assert that we correctly converted the statement to a list
     assert isinstance(pol_statement_map['some-arn']['pol-name'], list)
+
+
+@mock.patch.dict(iam._managed_policy_statements, clear=True)
+@mock.patch.dict(iam._transformed_managed_policy_statements, clear=True)
+def test_transform_authorization_details():
+    details = GET_ACCOUNT_AUTHORIZATION_DETAILS
+
+    inline = iam.transform_authorization_details_inline_policies(details['UserDetailList'], 'UserPolicyList')
+    assert inline == {
+        'arn:aws:iam::1234:user/user1': {
+            'user1-inline': [{'Effect': 'Allow', 'Action': 's3:GetObject', 'Resource': '*'}],
+        },
+        'arn:aws:iam::1234:user/user2': {},
+    }
+
+    # Only the default version of a managed policy is used. AdministratorAccess is left out because its versions are
+    # missing from the response.
+    managed = iam.transform_authorization_details_managed_policies(
+        details['UserDetailList'] + details['GroupDetailList'], details['Policies'],
+    )
+    assert managed == {
+        'arn:aws:iam::1234:user/user1': {
+            'arn:aws:iam::aws:policy/AmazonS3FullAccess': [{'Effect': 'Allow', 'Action': 's3:*', 'Resource': '*'}],
+        },
+        'arn:aws:iam::1234:user/user2': {},
+        'arn:aws:iam::1234:group/admins': {},
+    }
+
+    memberships = iam.transform_authorization_details_group_memberships(
+        details['UserDetailList'], details['GroupDetailList'],
+    )
+    assert memberships == {'arn:aws:iam::1234:group/admins': {'Users': [{'Arn': 'arn:aws:iam::1234:user/user1'}]}}
+
+
+@mock.patch.dict(iam._managed_policy_statements, clear=True)
+@mock.patch.dict(iam._transformed_managed_policy_statements, clear=True)
+@mock.patch.object(iam, 'load_policy_data')
+@mock.patch.object(iam, 'load_roles')
+@mock.patch.object(iam, 'run_cleanup_job')
+@mock.patch.object(iam, 'get_role_list_data')
+def test_sync_roles_uses_authorization_details(mock_get_roles, mock_cleanup, mock_load_roles, mock_load_policy_data):
+    neo4j_session = mock.MagicMock()
+    details = copy.deepcopy(GET_ACCOUNT_AUTHORIZATION_DETAILS)
+
+    iam.sync_roles(neo4j_session, mock.MagicMock(), '1234', 1, {}, details)
+
+    mock_get_roles.assert_not_called()
+    mock_load_roles.assert_called_once_with(neo4j_session, details['RoleDetailList'], '1234', 1)
+    inline_call, managed_call = mock_load_policy_data.call_args_list
+    assert inline_call.args[1] == {'arn:aws:iam::1234:role/role1': {}}
+    assert list(managed_call.args[1]['arn:aws:iam::1234:role/role1']) == ['arn:aws:iam::aws:policy/AmazonS3FullAccess']
+
+
+@mock.patch.dict(iam._managed_policy_statements, clear=True)
+@mock.patch.dict(iam._transformed_managed_policy_statements, clear=True)
+@mock.patch.object(iam, 'get_managed_policy_default_versions', return_value={'arn:aws:iam::aws:policy/ReadOnly': 'v3'})
+def test_managed_policy_statements_are_fetched_and_transformed_once(mock_default_versions):
+    policy = mock.MagicMock(arn='arn:aws:iam::aws:policy/ReadOnly')
+    resource_client = mock.MagicMock()
+    resource_client.User.return_value.attached_policies.all.return_value = [policy]
+    resource_client.PolicyVersion.return_value.document = {
+        'Statement': [{'Effect': 'Allow', 'Action': 's3:Get*', 'Resource': '*', 'Condition': {'Bool': {'x': 'y'}}}],
+    }
+    boto3_session = mock.MagicMock()
+    boto3_session.resource.return_value = resource_client
+    users = [{'UserName': 'user1', 'Arn': 'arn:user1'}, {'UserName': 'user2', 'Arn': 'arn:user2'}]
+
+    # Once for each of two accounts
+    for _ in range(2):
+        policy_data = iam.get_user_managed_policy_data(boto3_session, users)
+        iam.transform_policy_data(policy_data, PolicyType.managed.value)
+
+    resource_client.PolicyVersion.assert_called_once_with('arn:aws:iam::aws:policy/ReadOnly', 'v3')
+    statements = policy_data['arn:user1']['arn:aws:iam::aws:policy/ReadOnly']
+    assert statements is policy_data['arn:user2']['arn:aws:iam::aws:policy/ReadOnly']
+    assert statements == [{
+        'Effect': 'Allow',
+        'Action': ['s3:Get*'],
+        'Resource': ['*'],
+        'Condition': '[{"Bool": {"x": "y"}}]',
+        'id': 'arn:aws:iam::aws:policy/ReadOnly/statement/1',
+    }]
+    # The cached statements are left untouched.
+    assert iam._managed_policy_statements[('arn:aws:iam::aws:policy/ReadOnly', 'v3')][0]['Action'] == 's3:Get*'
+
+    iam.clear_managed_policy_cache()
+
+    assert iam._managed_policy_statements == {}
+    assert iam._transformed_managed_policy_statements == {}
+
+
+@mock.patch.object(iam, 'run_cleanup_job')
+@mock.patch.object(iam, 'merge_module_sync_metadata')
+@mock.patch.object(iam, 'sync_user_access_keys')
+@mock.patch.object(iam, 'sync_assumerole_relationships')
+@mock.patch.object(iam, 'sync_group_memberships')
+@mock.patch.object(iam, 'sync_user_inline_policies')
+@mock.patch.object(iam, 'sync_groups_inline_policies')
+@mock.patch.object(iam, 'sync_role_inline_policies')
+@mock.patch.object(iam, 'load_users')
+@mock.patch.object(iam, 'load_groups')
+@mock.patch.object(iam, 'load_roles')
+@mock.patch.object(iam, 'load_policy_data')
+@mock.patch.object(iam, 'get_user_list_data', return_value={'Users': []})
+@mock.patch.object(iam, 'get_group_list_data', return_value={'Groups': []})
+@mock.patch.object(iam, 'get_role_list_data', return_value={'Roles': []})
+@mock.patch.object(iam, 'get_managed_policy_default_versions', return_value={})
+@mock.patch.object(iam, '_get_account_authorization_details_or_none', return_value=None)
+def test_sync_lists_managed_policy_default_versions_once(mock_get_details, mock_default_versions, *args):
+    iam.sync(mock.MagicMock(), mock.MagicMock(), [], '1234', 1, {'UPDATE_TAG': 1, 'AWS_ID': '1234'})
+
+    mock_default_versions.assert_called_once()
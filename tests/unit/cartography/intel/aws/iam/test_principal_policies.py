@@ -1,19 +1,21 @@
 from unittest import mock
-from unittest.mock import call
 from unittest.mock import MagicMock
 
 import cartography.intel.aws.iam
 from cartography.intel.aws.iam import PolicyType
 from cartography.intel.aws.iam import sync_user_managed_policies
+from cartography.intel.aws.iam import transform_policy_data_for_load
+from cartography.models.aws.iam.policy import AWSPolicySchema
+from cartography.models.aws.iam.policystatement import AWSPolicyStatementSchema
 from tests.data.aws.iam.user_policies import GET_USER_LIST_DATA
 from tests.data.aws.iam.user_policies import GET_USER_MANAGED_POLS_SAMPLE
 
 AWS_UPDATE_TAG = 111111
 
 
-@mock.patch.object(cartography.intel.aws.iam, 'load_policy')
+@mock.patch.object(cartography.intel.aws.iam, 'load')
 @mock.patch.object(cartography.intel.aws.iam, 'get_user_managed_policy_data', return_value=GET_USER_MANAGED_POLS_SAMPLE)
-def test_sync_user_managed_policies(mock_get_user_pols: MagicMock, mock_load_pol: MagicMock):
+def test_sync_user_managed_policies(mock_get_user_pols: MagicMock, mock_load: MagicMock):
     # Arrange
     boto3_session = mock.MagicMock()
     neo4j_session = mock.MagicMock()
@@ -21,41 +23,54 @@ def test_sync_user_managed_policies(mock_get_user_pols: MagicMock, mock_load_pol
     # Act
     sync_user_managed_policies(boto3_session, GET_USER_LIST_DATA, neo4j_session, AWS_UPDATE_TAG)
 
-    # Assert that we attempt to create policies with expected values for ids.
-    mock_load_pol.assert_has_calls(
-        [
-            call(
-                neo4j_session,
-                'arn:aws:iam::1234:policy/user1-user-policy',
-                'user1-user-policy',
-                PolicyType.managed.value,
-                'arn:aws:iam::1234:user/user1',
-                AWS_UPDATE_TAG,
-            ),
-            call(
-                neo4j_session,
-                'arn:aws:iam::aws:policy/AmazonS3FullAccess',
-                'AmazonS3FullAccess',
-                PolicyType.managed.value,
-                'arn:aws:iam::1234:user/user1',
-                AWS_UPDATE_TAG,
-            ),
-            call(
-                neo4j_session,
-                'arn:aws:iam::aws:policy/AWSLambda_FullAccess',
-                'AWSLambda_FullAccess',
-                PolicyType.managed.value,
-                'arn:aws:iam::1234:user/user1',
-                AWS_UPDATE_TAG,
-            ),
-            call(
-                neo4j_session,
-                'arn:aws:iam::aws:policy/AdministratorAccess',
-                'AdministratorAccess',
-                PolicyType.managed.value,
-                'arn:aws:iam::1234:user/user3',
-                AWS_UPDATE_TAG,
-            ),
-        ],
-        any_order=False,
-    )
+    # Assert that we create policies with expected values for ids, in a single batch.
+    policies_call, statements_call = mock_load.call_args_list
+    assert isinstance(policies_call.args[1], AWSPolicySchema)
+    assert policies_call.args[2] == [
+        {
+            'id': 'arn:aws:iam::1234:policy/user1-user-policy',
+            'name': 'user1-user-policy',
+            'type': PolicyType.managed.value,
+            'principal_arns': ['arn:aws:iam::1234:user/user1'],
+        },
+        {
+            'id': 'arn:aws:iam::aws:policy/AmazonS3FullAccess',
+            'name': 'AmazonS3FullAccess',
+            'type': PolicyType.managed.value,
+            'principal_arns': ['arn:aws:iam::1234:user/user1'],
+        },
+        {
+            'id': 'arn:aws:iam::aws:policy/AWSLambda_FullAccess',
+            'name': 'AWSLambda_FullAccess',
+            'type': PolicyType.managed.value,
+            'principal_arns': ['arn:aws:iam::1234:user/user1'],
+        },
+        {
+            'id': 'arn:aws:iam::aws:policy/AdministratorAccess',
+            'name': 'AdministratorAccess',
+            'type': PolicyType.managed.value,
+            'principal_arns': ['arn:aws:iam::1234:user/user3'],
+        },
+    ]
+    assert policies_call.kwargs == {'lastupdated': AWS_UPDATE_TAG}
+    assert isinstance(statements_call.args[1], AWSPolicyStatementSchema)
+    assert statements_call.args[2][0]['id'] == 'arn:aws:iam::1234:policy/user1-user-policy/statement/VisualEditor0'
+    assert statements_call.args[2][0]['POLICY_ID'] == 'arn:aws:iam::1234:policy/user1-user-policy'
+
+
+def test_transform_policy_data_for_load_writes_shared_statements_once():
+    statements = [{'id': 'arn:aws:iam::aws:policy/ReadOnly/statement/1', 'Effect': 'Allow', 'Action': ['s3:Get*']}]
+    policy_map = {
+        'arn:aws:iam::1234:role/role1': {'arn:aws:iam::aws:policy/ReadOnly': statements},
+        'arn:aws:iam::1234:role/role2': {'arn:aws:iam::aws:policy/ReadOnly': statements},
+    }
+
+    policies, policy_statements = transform_policy_data_for_load(policy_map, PolicyType.managed.value)
+
+    assert policies == [{
+        'id': 'arn:aws:iam::aws:policy/ReadOnly',
+        'name': 'ReadOnly',
+        'type': PolicyType.managed.value,
+        'principal_arns': ['arn:aws:iam::1234:role/role1', 'arn:aws:iam::1234:role/role2'],
+    }]
+    assert policy_statements == [{**statements[0], 'POLICY_ID': 'arn:aws:iam::aws:policy/ReadOnly'}]
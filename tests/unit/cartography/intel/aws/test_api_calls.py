@@ -0,0 +1,71 @@
+from unittest import mock
+
+import boto3
+from botocore.stub import Stubber
+
+from cartography.intel.aws.util import api_calls
+
+
+def _get_stats(service, region, operation):
+    for stats in api_calls.get_api_call_stats():
+        if (stats.service, stats.region, stats.operation) == (service, region, operation):
+            return stats
+    return None
+
+
+@mock.patch.dict(api_calls._stats, clear=True)
+def test_register_api_call_hooks_counts_calls_per_operation():
+    boto3_session = boto3.Session(aws_access_key_id='a', aws_secret_access_key='b', region_name='us-east-1')
+    api_calls.register_api_call_hooks(boto3_session)
+    # Installing the hooks twice must not count calls twice.
+    api_calls.register_api_call_hooks(boto3_session)
+    client = boto3_session.client('sqs', region_name='eu-west-1')
+
+    with Stubber(client) as stubber:
+        stubber.add_response('list_queues', {'QueueUrls': []})
+        stubber.add_response('list_queues', {'QueueUrls': []})
+        stubber.add_client_error('get_queue_url', service_error_code='AWS.SimpleQueueService.NonExistentQueue')
+        client.list_queues()
+        client.list_queues()
+        try:
+            client.get_queue_url(QueueName='q')
+        except client.exceptions.ClientError:
+            pass
+
+    list_queues = _get_stats('sqs', 'eu-west-1', 'ListQueues')
+    assert list_queues.calls == 2
+    assert list_queues.errors == 0
+    get_queue_url = _get_stats('sqs', 'eu-west-1', 'GetQueueUrl')
+    assert get_queue_url.calls == 1
+    assert get_queue_url.errors == 1
+
+
+@mock.patch.dict(api_calls._stats, clear=True)
+def test_api_call_hooks_count_retries_and_throttles():
+    model = mock.MagicMock()
+    model.name = 'DescribeInstances'
+    model.service_model.service_name = 'ec2'
+    model.has_streaming_output = False
+    context = {'client_region': 'us-east-1'}
+    throttled = (mock.MagicMock(), {'Error': {'Code': 'RequestLimitExceeded'}})
+
+    api_calls._before_call(model=model, context=context)
+    request = mock.MagicMock(context=context, body={'Action': 'DescribeInstances'})
+    api_calls._request_created(request=request)
+    api_calls._needs_retry(request_dict={'context': context}, response=throttled)
+    api_calls._request_created(request=request)
+    http_response = mock.MagicMock(status_code=200, headers={'content-length': '42'})
+    api_calls._after_call(
+        http_response=http_response,
+        parsed={'ResponseMetadata': {'RetryAttempts': 1}},
+        model=model,
+        context=context,
+    )
+
+    stats = _get_stats('ec2', 'us-east-1', 'DescribeInstances')
+    assert stats.calls == 1
+    assert stats.retries == 1
+    assert stats.throttles == 1
+    assert stats.request_bytes == 2 * len('Action=DescribeInstances')
+    assert stats.response_bytes == 42
+    assert stats.backoff_seconds >= 0
@@ -1,5 +1,6 @@
 import copy
 from unittest.mock import MagicMock
+from unittest.mock import patch
 
 import cartography.intel.aws.resourcegroupstaggingapi as rgta
 import tests.data.aws.resourcegroupstaggingapi as test_data
@@ -70,3 +71,21 @@ def test_load_tags_empty_data():
 
     # Assert
     mock_neo4j_session.write_transaction.assert_not_called()
+
+
+@patch.object(rgta, 'cleanup')
+@patch.object(rgta, 'load_tags')
+@patch.object(rgta, 'get_role_tags', return_value=[])
+@patch.object(rgta, 'get_tags')
+def test_sync_fetches_role_tags_once_per_account(mock_get_tags, mock_get_role_tags, mock_load_tags, mock_cleanup):
+    mock_get_tags.side_effect = lambda boto3_session, resource_type, region, *args: (
+        rgta.get_role_tags(boto3_session, *args) if resource_type == 'iam:role' else []
+    )
+
+    rgta.sync(
+        MagicMock(), MagicMock(), ['us-east-1', 'us-west-2'], '1234', 1, {'UPDATE_TAG': 1},
+        {'iam:role': rgta.TAG_RESOURCE_TYPE_MAPPINGS['iam:role'], 'sqs': rgta.TAG_RESOURCE_TYPE_MAPPINGS['sqs']},
+    )
+
+    mock_get_role_tags.assert_called_once()
+    assert mock_load_tags.call_count == 4
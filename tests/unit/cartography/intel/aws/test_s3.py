@@ -0,0 +1,102 @@
+import datetime
+from unittest import mock
+
+from botocore.exceptions import ClientError
+
+from cartography.intel.aws import s3
+
+
+def _list_buckets_response():
+    return {
+        'Buckets': [
+            {'Name': 'listed', 'CreationDate': datetime.datetime(2020, 1, 1), 'BucketRegion': 'eu-west-1'},
+            {'Name': 'headed', 'CreationDate': datetime.datetime(2020, 1, 2)},
+            {'Name': 'forbidden', 'CreationDate': datetime.datetime(2020, 1, 3)},
+            {'Name': 'us-east-1', 'CreationDate': datetime.datetime(2020, 1, 4)},
+        ],
+    }
+
+
+def _head_bucket(Bucket):
+    if Bucket == 'headed':
+        return {'ResponseMetadata': {'HTTPHeaders': {'x-amz-bucket-region': 'ap-south-1'}}}
+    if Bucket == 'forbidden':
+        raise ClientError(
+            {'Error': {'Code': '403'}, 'ResponseMetadata': {'HTTPHeaders': {'x-amz-bucket-region': 'sa-east-1'}}},
+            'HeadBucket',
+        )
+    raise ClientError({'Error': {'Code': '400'}, 'ResponseMetadata': {'HTTPHeaders': {}}}, 'HeadBucket')
+
+
+def test_get_s3_bucket_list_looks_up_and_caches_regions(tmp_path):
+    client = mock.MagicMock()
+    client.list_buckets.side_effect = lambda: _list_buckets_response()
+    client.head_bucket.side_effect = _head_bucket
+    client.get_bucket_location.return_value = {'LocationConstraint': None}
+    boto3_session = mock.MagicMock()
+    boto3_session.client.return_value = client
+
+    buckets = s3.get_s3_bucket_list(boto3_session, str(tmp_path))
+
+    assert {b['Name']: b['Region'] for b in buckets['Buckets']} == {
+        'listed': 'eu-west-1',
+        'headed': 'ap-south-1',
+        'forbidden': 'sa-east-1',
+        'us-east-1': 'us-east-1',
+    }
+    assert client.head_bucket.call_count == 3
+    client.get_bucket_location.assert_called_once_with(Bucket='us-east-1')
+
+    # The second run reads the regions from the cache.
+    client.head_bucket.reset_mock()
+    buckets = s3.get_s3_bucket_list(boto3_session, str(tmp_path))
+
+    assert {b['Name']: b['Region'] for b in buckets['Buckets']}['headed'] == 'ap-south-1'
+    client.head_bucket.assert_not_called()
+
+
+@mock.patch.object(s3, 'S3_BUCKET_DETAILS_CONCURRENCY', 2)
+@mock.patch.object(s3, 'get_public_access_block', return_value=None)
+@mock.patch.object(s3, 'get_versioning', return_value=None)
+@mock.patch.object(s3, 'get_encryption', return_value=None)
+@mock.patch.object(s3, 'get_policy', return_value=None)
+@mock.patch.object(s3, 'get_acl')
+def test_get_s3_bucket_details_streams_all_buckets(mock_get_acl, *args):
+    mock_get_acl.side_effect = lambda bucket, client: {'Grants': bucket['Name']}
+    bucket_data = {'Buckets': [{'Name': f'bucket-{i}', 'Region': 'us-east-1'} for i in range(5)]}
+
+    details = list(s3.get_s3_bucket_details(mock.MagicMock(), bucket_data))
+
+    assert sorted(d[0] for d in details) == [f'bucket-{i}' for i in range(5)]
+    assert all(d[1] == {'Grants': d[0]} for d in details)
+
+
+@mock.patch.object(s3, 'S3_DETAILS_BATCH_SIZE', 2)
+@mock.patch.object(s3, '_set_default_values')
+@mock.patch.object(s3, '_touch_unchanged_s3_details')
+@mock.patch.object(s3, '_load_s3_details_batch')
+@mock.patch.object(s3, '_get_s3_details_fingerprints')
+def test_load_s3_details_loads_changed_buckets_in_batches(
+    mock_get_fingerprints, mock_load_batch, mock_touch, mock_defaults,
+):
+    neo4j_session = mock.MagicMock()
+    details = [(f'bucket-{i}', {'Grants': []}, None, None, None, None) for i in range(6)]
+    unchanged_fingerprint = s3.get_s3_details_fingerprint({'Grants': []}, None, None, None, None)
+    mock_get_fingerprints.return_value = {
+        'bucket-0': unchanged_fingerprint,
+        'bucket-1': 'stale',
+    }
+
+    s3.load_s3_details(neo4j_session, iter(details), '1234', 1)
+
+    loaded = [[d[0] for d in c.args[1]] for c in mock_load_batch.call_args_list]
+    assert loaded == [['bucket-1', 'bucket-2'], ['bucket-3', 'bucket-4'], ['bucket-5']]
+    assert mock_load_batch.call_args_list[0].args[1][0][-1] == unchanged_fingerprint
+    mock_touch.assert_called_once_with(neo4j_session, ['bucket-0'], 1)
+    mock_defaults.assert_called_once_with(neo4j_session, '1234')
+
+
+def test_get_s3_details_fingerprint_changes_with_details():
+    fingerprint = s3.get_s3_details_fingerprint({'Grants': []}, None, None, {'Status': 'Enabled'}, None)
+    assert fingerprint == s3.get_s3_details_fingerprint({'Grants': []}, None, None, {'Status': 'Enabled'}, None)
+    assert fingerprint != s3.get_s3_details_fingerprint({'Grants': []}, None, None, {'Status': 'Suspended'}, None)
@@ -0,0 +1,65 @@
+from unittest import mock
+
+import cartography.intel.azure
+from cartography.intel.azure.util.common import close_cached_clients
+from cartography.intel.azure.util.common import get_cached_client
+from cartography.intel.azure.util.common import map_concurrently
+
+
+def test_get_cached_client_one_client_per_subscription_and_class():
+    client_class = mock.MagicMock(side_effect=lambda credentials, subscription_id: object())
+    other_class = mock.MagicMock(side_effect=lambda credentials, subscription_id: object())
+    credentials = object()
+
+    client = get_cached_client(client_class, credentials, 'sub-1')
+
+    assert get_cached_client(client_class, credentials, 'sub-1') is client
+    assert get_cached_client(client_class, credentials, 'sub-2') is not client
+    assert get_cached_client(other_class, credentials, 'sub-1') is not client
+    assert client_class.call_count == 2
+
+    close_cached_clients()
+
+    # Clients are created again once the cache is cleared.
+    assert get_cached_client(client_class, credentials, 'sub-1') is not client
+    close_cached_clients()
+
+
+def test_close_cached_clients_closes_clients():
+    client_class = mock.MagicMock()
+
+    client = get_cached_client(client_class, object(), 'sub-1')
+    close_cached_clients()
+
+    client.close.assert_called_once()
+
+
+def test_map_concurrently_keeps_order():
+    assert map_concurrently(lambda x: x * 2, range(50)) == [x * 2 for x in range(50)]
+
+
+@mock.patch.object(cartography.intel.azure, '_load_subscription_data')
+@mock.patch.object(
+    cartography.intel.azure, '_get_subscription_data',
+    side_effect=lambda credentials, subscription_id: f'data-{subscription_id}',
+)
+@mock.patch.object(cartography.intel.azure.subscription, 'sync')
+def test_sync_multiple_subscriptions(mock_subscription_sync, mock_get_data, mock_load_data):
+    subscriptions = [
+        {'subscriptionId': f'sub-{i}'} for i in range(3 * cartography.intel.azure.AZURE_MAX_CONCURRENT_SUBSCRIPTIONS)
+    ]
+    neo4j_session = mock.MagicMock()
+    common_job_parameters = {'UPDATE_TAG': 1}
+
+    cartography.intel.azure._sync_multiple_subscriptions(
+        neo4j_session, mock.MagicMock(), 'tenant', subscriptions, 1, common_job_parameters,
+    )
+
+    loaded = {c.args[1]: c for c in mock_load_data.call_args_list}
+    assert sorted(loaded) == sorted(sub['subscriptionId'] for sub in subscriptions)
+    for subscription_id, call in loaded.items():
+        assert call.args[0] is neo4j_session
+        assert call.args[2] == f'data-{subscription_id}'
+        # Each subscription's cleanup jobs are scoped to it.
+        assert call.args[4] == {'UPDATE_TAG': 1, 'AZURE_SUBSCRIPTION_ID': subscription_id}
+    assert common_job_parameters == {'UPDATE_TAG': 1}
@@ -0,0 +1,34 @@
+import copy
+from unittest import mock
+
+from cartography.intel.azure import cosmosdb
+from cartography.models.azure.cosmosdb import AzureCosmosDBLocationSchema
+from tests.data.azure.cosmosdb import DESCRIBE_DATABASE_ACCOUNTS
+
+TEST_SUBSCRIPTION_ID = '00-00-00-00'
+TEST_UPDATE_TAG = 123456789
+da1 = "/subscriptions/00-00-00-00/resourceGroups/RG/providers/Microsoft.DocumentDB/databaseAccounts/DA1"
+
+
+@mock.patch.object(cosmosdb, 'load')
+def test_sync_database_account_data_resources_writes_each_kind_once(mock_load):
+    database_accounts = copy.deepcopy(DESCRIBE_DATABASE_ACCOUNTS)
+
+    cosmosdb.sync_database_account_data_resources(
+        mock.MagicMock(), TEST_SUBSCRIPTION_ID, database_accounts, TEST_UPDATE_TAG,
+    )
+
+    # One write per kind of resource, however many database accounts there are.
+    assert mock_load.call_count == 7
+    location_rows = [
+        row
+        for call in mock_load.call_args_list if isinstance(call.args[1], AzureCosmosDBLocationSchema)
+        for row in call.args[2]
+    ]
+    assert {
+        (row['id'], row.get('write_database_account_id')) for row in location_rows
+        if 'write_database_account_id' in row
+    } == {("DA1-eastus", da1), ("DA1-centralindia", da1)}
+    assert {row['id'] for row in location_rows if 'associated_database_account_id' in row} == {
+        "DA1-eastus", "DA1-centralindia", "DA1-japaneast",
+    }
@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from cartography.intel.crowdstrike import spotlight
+
+
+PAGES = [[f'id{i}'] for i in range(10)]
+
+
+def _fetch(client, ids):
+    return [{'id': vuln_id} for vuln_id in ids]
+
+
+@patch.object(spotlight, 'Spotlight_Vulnerabilities')
+@patch.object(spotlight, 'load_vulnerability_data')
+@patch.object(spotlight, 'get_spotlight_vulnerabilities', side_effect=_fetch)
+def test_sync_vulnerabilities_loads_every_page_in_order(mock_get, mock_load, mock_client):
+    with patch.object(spotlight, 'iter_spotlight_vulnerability_ids', return_value=iter(PAGES)):
+        spotlight.sync_vulnerabilities(MagicMock(), 1, MagicMock())
+
+    assert [c.args[1] for c in mock_load.call_args_list] == [[{'id': ids[0]}] for ids in PAGES]
+
+
+@patch.object(spotlight, 'SPOTLIGHT_MAX_PENDING_PAGES', 2)
+@patch.object(spotlight, 'Spotlight_Vulnerabilities')
+@patch.object(spotlight, 'load_vulnerability_data')
+@patch.object(spotlight, 'get_spotlight_vulnerabilities', side_effect=_fetch)
+def test_sync_vulnerabilities_bounds_pending_pages(mock_get, mock_load, mock_client):
+    pending_counts = []
+
+    def iter_ids(client):
+        for i, ids in enumerate(PAGES):
+            # Pages submitted so far but not loaded yet
+            pending_counts.append(i - mock_load.call_count)
+            yield ids
+
+    with patch.object(spotlight, 'iter_spotlight_vulnerability_ids', side_effect=iter_ids):
+        spotlight.sync_vulnerabilities(MagicMock(), 1, MagicMock())
+
+    assert max(pending_counts) == 2
+    assert mock_load.call_count == len(PAGES)
+
+
+@patch.object(spotlight, 'Spotlight_Vulnerabilities')
+@patch.object(spotlight, 'load_vulnerability_data')
+def test_sync_vulnerabilities_raises_fetch_errors(mock_load, mock_client):
+    def fetch(client, ids):
+        if ids == PAGES[3]:
+            raise RuntimeError('boom')
+        return _fetch(client, ids)
+
+    with patch.object(spotlight, 'get_spotlight_vulnerabilities', side_effect=fetch), \
+            patch.object(spotlight, 'iter_spotlight_vulnerability_ids', return_value=iter(PAGES)):
+        with pytest.raises(RuntimeError):
+            spotlight.sync_vulnerabilities(MagicMock(), 1, MagicMock())
+
+    assert mock_load.call_count == 3
@@ -1,3 +1,5 @@
+from unittest import mock
+
 import cartography.intel.gcp.compute
 from tests.data.gcp.compute import LIST_FIREWALLS_RESPONSE
 from tests.data.gcp.compute import VPC_RESPONSE
@@ -63,3 +65,52 @@ def test_transform_gcp_firewall():
     assert sample_fw_icmp_rule['fromport'] is None
     assert sample_fw_icmp_rule['toport'] is None
     assert sample_fw_icmp_rule['protocol'] == 'icmp'
+
+
+def test_flatten_firewall_rules():
+    fw_list = cartography.intel.gcp.compute.transform_gcp_firewall(LIST_FIREWALLS_RESPONSE)
+
+    rows = cartography.intel.gcp.compute._flatten_firewall_rules(fw_list)
+
+    assert len(rows.allow_rules) == 7
+    assert rows.deny_rules == []
+    # 0.0.0.0/0 is the source range of four of the firewalls but is written once.
+    assert rows.ranges == [{'range': '0.0.0.0/0'}, {'range': '10.128.0.0/9'}]
+    assert {
+        'range': '10.128.0.0/9',
+        'ruleid': 'projects/project-abc/global/firewalls/default-allow-internal/allow/icmp',
+    } in rows.memberships
+    assert len(rows.memberships) == 7
+
+
+def test_get_gcp_instance_responses_aggregated():
+    """
+    Ensure that the aggregatedList pages are followed and reshaped into one response object per zone, and that zones
+    without instances are left out.
+    """
+    page_1 = {
+        'items': {
+            'zones/europe-west2-b': {'instances': [{'name': 'instance-1'}]},
+            'zones/us-east1-b': {'warning': {'code': 'NO_RESULTS_ON_PAGE'}},
+        },
+    }
+    page_2 = {
+        'items': {
+            'zones/europe-west2-b': {'instances': [{'name': 'instance-2'}]},
+        },
+    }
+    compute = mock.MagicMock()
+    compute.instances.return_value.aggregatedList.return_value.execute.return_value = page_1
+    page_2_req = mock.MagicMock()
+    page_2_req.execute.return_value = page_2
+    compute.instances.return_value.aggregatedList_next.side_effect = [page_2_req, None]
+
+    responses = cartography.intel.gcp.compute.get_gcp_instance_responses_aggregated('project-abc', compute)
+
+    assert responses == [
+        {
+            'id': 'projects/project-abc/zones/europe-west2-b/instances',
+            'items': [{'name': 'instance-1'}, {'name': 'instance-2'}],
+        },
+    ]
+    compute.instances.return_value.aggregatedList.assert_called_once_with(project='project-abc')
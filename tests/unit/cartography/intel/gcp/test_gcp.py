@@ -0,0 +1,60 @@
+from unittest import mock
+
+import cartography.intel.gcp
+
+
+@mock.patch.object(cartography.intel.gcp.iam, 'get_gcp_roles', return_value=[])
+@mock.patch.object(cartography.intel.gcp.iam, 'get_gcp_service_accounts', return_value=[])
+@mock.patch.object(cartography.intel.gcp.dns, 'get_dns_rrs', return_value=[])
+@mock.patch.object(cartography.intel.gcp.dns, 'get_dns_zones', return_value=[])
+@mock.patch.object(cartography.intel.gcp.gke, 'get_gke_clusters', return_value={})
+@mock.patch.object(cartography.intel.gcp.storage, 'get_gcp_buckets', return_value={})
+@mock.patch.object(cartography.intel.gcp.compute, 'get_project_compute_data', return_value=None)
+@mock.patch.object(
+    cartography.intel.gcp, '_services_enabled_on_project',
+    side_effect=lambda serviceusage, project_id: {f'{project_id}.googleapis.com'},
+)
+def test_get_project_loads_only_fetches_enabled_services(
+    mock_services_enabled, mock_compute, mock_storage, mock_gke, mock_dns_zones, mock_dns_rrs,
+    mock_service_accounts, mock_roles,
+):
+    resources = mock.MagicMock()
+
+    loads = cartography.intel.gcp._get_project_loads(resources, 'dns', 1)
+
+    mock_services_enabled.assert_called_once_with(resources.serviceusage, 'dns')
+    mock_dns_zones.assert_called_once_with(resources.dns, 'dns')
+    assert [load_func for load_func, _ in loads] == [
+        cartography.intel.gcp.dns.load_dns_zones,
+        cartography.intel.gcp.dns.load_rrs,
+    ]
+    for mock_get in (mock_compute, mock_storage, mock_gke, mock_service_accounts, mock_roles):
+        mock_get.assert_not_called()
+
+
+@mock.patch.object(cartography.intel.gcp, '_initialize_project_resources')
+@mock.patch.object(cartography.intel.gcp, '_cleanup_projects')
+@mock.patch.object(cartography.intel.gcp, '_get_project_loads')
+@mock.patch.object(cartography.intel.gcp.crm, 'sync_gcp_projects')
+def test_sync_multiple_projects_loads_every_project_then_cleans_up_once(
+    mock_sync_projects, mock_get_project_loads, mock_cleanup, mock_init_resources,
+):
+    load_func = mock.MagicMock()
+    mock_get_project_loads.side_effect = lambda resources, project_id, update_tag: [(load_func, (project_id,))]
+    projects = [
+        {'projectId': f'project-{i}'} for i in range(3 * cartography.intel.gcp.GCP_MAX_CONCURRENT_PROJECTS)
+    ]
+    neo4j_session = mock.MagicMock()
+    credentials = mock.MagicMock()
+
+    cartography.intel.gcp._sync_multiple_projects(neo4j_session, projects, 1, {}, credentials)
+
+    assert sorted(c.args[1] for c in mock_get_project_loads.call_args_list) == sorted(
+        p['projectId'] for p in projects
+    )
+    assert sorted(c.args[1] for c in load_func.call_args_list) == sorted(p['projectId'] for p in projects)
+    assert all(c.args[0] is neo4j_session for c in load_func.call_args_list)
+    mock_cleanup.assert_called_once_with(neo4j_session, {})
+    # Each worker thread builds its own resource objects, at most once.
+    assert mock_init_resources.call_count <= cartography.intel.gcp.GCP_MAX_CONCURRENT_PROJECTS
+    assert all(c.args[0] is credentials for c in mock_init_resources.call_args_list)
@@ -1,9 +1,14 @@
+import copy
+import time
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
 
 from cartography.intel.github.repos import _get_repo_collaborators_for_multiple_repos
+from cartography.intel.github.repos import sync
+from cartography.intel.github.repos import UserAffiliationAndRepoPermission
+from tests.data.github.repos import GET_REPOS
 
 
 @patch('time.sleep', return_value=None)
@@ -35,3 +40,75 @@ def test_get_team_users_github_returns_none(mock_backoff_handler, mock_get_team_
     assert mock_sleep.call_count == 4
     assert mock_get_team_collaborators.call_count == 5
     assert mock_backoff_handler.call_count == 4
+
+
+@patch('cartography.intel.github.repos._get_repo_collaborators_for_multiple_repos')
+@patch('cartography.intel.github.repos.load')
+@patch('cartography.intel.github.repos.run_cleanup_job')
+@patch('cartography.intel.github.repos.get')
+def test_sync_reuses_cached_collaborators_for_unchanged_repos(
+    mock_get, mock_cleanup, mock_load, mock_get_collabs, tmp_path,
+):
+    # Arrange
+    repos = copy.deepcopy(GET_REPOS)
+    mock_get.return_value = repos
+    mock_get_collabs.side_effect = lambda repo_data, affiliation, *args: {
+        repo['url']: [UserAffiliationAndRepoPermission({'url': 'https://github.com/user'}, 'WRITE', affiliation)]
+        for repo in repo_data
+    }
+
+    # Act: the first run has no cache and fetches collaborators for every repo
+    sync(MagicMock(), {'UPDATE_TAG': 1}, 'token', 'https://api.github.com/graphql', 'example_org', str(tmp_path))
+
+    # Assert
+    assert [len(c.args[0]) for c in mock_get_collabs.call_args_list] == [len(repos), len(repos)]
+
+    # Arrange: one repo receives a push
+    mock_get_collabs.reset_mock()
+    repos = copy.deepcopy(GET_REPOS)
+    repos[0]['pushedAt'] = '2030-01-01T00:00:00Z'
+    mock_get.return_value = repos
+
+    # Act
+    sync(MagicMock(), {'UPDATE_TAG': 2}, 'token', 'https://api.github.com/graphql', 'example_org', str(tmp_path))
+
+    # Assert that only the changed repo was queried and the rest came from the cache
+    assert [c.args[0] for c in mock_get_collabs.call_args_list] == [[repos[0]], [repos[0]]]
+    repo_data = mock_load.call_args.args[2]
+    assert {u['repo_url'] for u in repo_data['repo_direct_collaborators']['WRITE']} == {r['url'] for r in repos}
+
+
+def _loaded_permissions(mock_load):
+    collaborators = mock_load.call_args.args[2]['repo_direct_collaborators']
+    return {permission for permission, users in collaborators.items() if users}
+
+
+@patch('cartography.intel.github.repos._get_repo_collaborators_for_multiple_repos')
+@patch('cartography.intel.github.repos.load')
+@patch('cartography.intel.github.repos.run_cleanup_job')
+@patch('cartography.intel.github.repos.get')
+def test_sync_refreshes_cached_collaborators_after_max_age(
+    mock_get, mock_cleanup, mock_load, mock_get_collabs, tmp_path,
+):
+    # Arrange
+    mock_get.side_effect = lambda *args: copy.deepcopy(GET_REPOS)
+    permission = 'WRITE'
+    mock_get_collabs.side_effect = lambda repo_data, affiliation, *args: {
+        repo['url']: [UserAffiliationAndRepoPermission({'url': 'https://github.com/user'}, permission, affiliation)]
+        for repo in repo_data
+    }
+    sync(MagicMock(), {'UPDATE_TAG': 1}, 'token', 'https://api.github.com/graphql', 'example_org', str(tmp_path))
+
+    # Act: the permission of the collaborator changes, which changes none of the fields of the repos
+    permission = 'ADMIN'
+    sync(MagicMock(), {'UPDATE_TAG': 2}, 'token', 'https://api.github.com/graphql', 'example_org', str(tmp_path))
+
+    # Assert that the stale permission is still read from the cache
+    assert _loaded_permissions(mock_load) == {'WRITE'}
+
+    # Act: sync again once the cached entries are older than the max age
+    with patch('time.time', return_value=time.time() + 25 * 3600):
+        sync(MagicMock(), {'UPDATE_TAG': 3}, 'token', 'https://api.github.com/graphql', 'example_org', str(tmp_path))
+
+    # Assert that the collaborators were fetched again and the new permission is loaded
+    assert _loaded_permissions(mock_load) == {'ADMIN'}
@@ -1,6 +1,9 @@
 from unittest import mock
 from unittest.mock import patch
 
+import pytest
+from googleapiclient.errors import HttpError
+
 from cartography.intel.gsuite import api
 
 
@@ -56,6 +59,93 @@ def test_get_all_groups():
     assert sorted(emails) == sorted(expected)
 
 
+def _mock_batch_client(pages):
+    """
+    Returns a mock admin client whose batch requests answer members().list calls from `pages`, a dict mapping
+    (group email, page token) to either a response dict or an exception.
+    """
+    client = mock.MagicMock()
+    client.members().list.side_effect = lambda groupKey, maxResults, pageToken: (groupKey, pageToken)
+    batch_sizes = []
+
+    def new_batch_http_request(callback):
+        batch_request = mock.MagicMock()
+        added = []
+        batch_request.add.side_effect = lambda request, request_id: added.append((request_id, request))
+
+        def execute():
+            batch_sizes.append(len(added))
+            for request_id, request in added:
+                response = pages[request].pop(0) if isinstance(pages[request], list) else pages[request]
+                if isinstance(response, Exception):
+                    callback(request_id, None, response)
+                else:
+                    callback(request_id, response, None)
+        batch_request.execute.side_effect = execute
+        return batch_request
+
+    client.new_batch_http_request.side_effect = new_batch_http_request
+    return client, batch_sizes
+
+
+@patch('time.sleep', return_value=None)
+def test_get_members_for_groups(mock_sleep):
+    throttled = HttpError(mock.MagicMock(status=429), b'rate limited')
+    client, batch_sizes = _mock_batch_client({
+        ('group1@test.lyft.com', None): {'members': [{'id': 'user1'}], 'nextPageToken': 'page2'},
+        ('group1@test.lyft.com', 'page2'): {'members': [{'id': 'user2'}]},
+        ('group2@test.lyft.com', None): [throttled, {'members': [{'id': 'user3'}]}],
+        ('group3@test.lyft.com', None): {},
+    })
+
+    result = api.get_members_for_groups(
+        client, ['group1@test.lyft.com', 'group2@test.lyft.com', 'group3@test.lyft.com'],
+    )
+
+    assert result == {
+        'group1@test.lyft.com': [{'id': 'user1'}, {'id': 'user2'}],
+        'group2@test.lyft.com': [{'id': 'user3'}],
+        'group3@test.lyft.com': [],
+    }
+    # First pages of all groups go in one batch, then the next page and the retry go in a second one
+    assert batch_sizes == [3, 2]
+    mock_sleep.assert_called_once_with(2)
+
+
+def test_get_members_for_groups_raises_on_permanent_error():
+    forbidden = HttpError(mock.MagicMock(status=403), b'forbidden')
+    client, _ = _mock_batch_client({('group1@test.lyft.com', None): forbidden})
+
+    with pytest.raises(HttpError):
+        api.get_members_for_groups(client, ['group1@test.lyft.com'])
+
+
+@patch('cartography.intel.gsuite.api.load_gsuite_memberships')
+@patch(
+    'cartography.intel.gsuite.api.get_members_for_groups', return_value={
+        'group1@test.lyft.com': [{'id': 'user1'}, {'id': 'group2'}],
+        'group2@test.lyft.com': [{'id': 'user2'}],
+    },
+)
+def test_sync_gsuite_members(get_members_for_groups, load_gsuite_memberships):
+    admin_client = mock.MagicMock()
+    session = mock.MagicMock()
+    groups = [{'id': 'group1', 'email': 'group1@test.lyft.com'}, {'id': 'group2', 'email': 'group2@test.lyft.com'}]
+
+    api.sync_gsuite_members(groups, session, admin_client, 1)
+
+    get_members_for_groups.assert_called_once_with(admin_client, ['group1@test.lyft.com', 'group2@test.lyft.com'])
+    load_gsuite_memberships.assert_called_once_with(
+        session,
+        [
+            {'group_id': 'group1', 'member_id': 'user1'},
+            {'group_id': 'group1', 'member_id': 'group2'},
+            {'group_id': 'group2', 'member_id': 'user2'},
+        ],
+        1,
+    )
+
+
 @patch('cartography.intel.gsuite.api.cleanup_gsuite_users')
 @patch('cartography.intel.gsuite.api.load_gsuite_users')
 @patch(
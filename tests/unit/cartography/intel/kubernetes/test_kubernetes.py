@@ -0,0 +1,101 @@
+from unittest import mock
+
+import pytest
+from kubernetes.client.exceptions import ApiException
+
+from cartography.intel.kubernetes import sync_clusters
+from cartography.intel.kubernetes.util import list_paginated
+
+
+def _list_response(items, _continue):
+    response = mock.MagicMock()
+    response.items = items
+    response.metadata._continue = _continue
+    return response
+
+
+def test_list_paginated():
+    list_func = mock.MagicMock(
+        side_effect=[_list_response([1, 2], 'token'), _list_response([3], None)],
+    )
+
+    assert list(list_paginated(list_func, page_size=2)) == [[1, 2], [3]]
+    assert list_func.call_args_list == [
+        mock.call(limit=2, _continue=None),
+        mock.call(limit=2, _continue='token'),
+    ]
+
+
+def test_list_paginated_restarts_after_expired_continue_token():
+    list_func = mock.MagicMock(
+        side_effect=[
+            _list_response([1, 2], 'token'),
+            ApiException(status=410),
+            _list_response([1, 2], 'token2'),
+            _list_response([3], None),
+        ],
+    )
+
+    assert list(list_paginated(list_func, page_size=2)) == [[1, 2], [1, 2], [3]]
+    assert list_func.call_args_list[2] == mock.call(limit=2, _continue=None)
+
+
+def test_list_paginated_raises_other_api_errors():
+    list_func = mock.MagicMock(side_effect=[_list_response([1, 2], 'token'), ApiException(status=500)])
+
+    with pytest.raises(ApiException):
+        list(list_paginated(list_func, page_size=2))
+
+
+@mock.patch('cartography.intel.kubernetes.merge_cluster_sync_metadata')
+@mock.patch('cartography.intel.kubernetes.load_secrets')
+@mock.patch('cartography.intel.kubernetes.load_services')
+@mock.patch('cartography.intel.kubernetes.load_pods')
+@mock.patch('cartography.intel.kubernetes.load_namespaces')
+@mock.patch('cartography.intel.kubernetes.get_secrets_paginated', return_value=iter([[{'uid': 'secret'}]]))
+@mock.patch('cartography.intel.kubernetes.get_services', return_value=[{'uid': 'service'}])
+@mock.patch(
+    'cartography.intel.kubernetes.get_pods_paginated',
+    side_effect=lambda client, cluster: iter([
+        [{'uid': f'{client.name}-pod1', 'labels': {'app': 'a'}}],
+        [{'uid': f'{client.name}-pod2', 'labels': {'app': 'b'}}, {'uid': f'{client.name}-pod3', 'labels': None}],
+    ]),
+)
+@mock.patch(
+    'cartography.intel.kubernetes.get_namespaces',
+    side_effect=lambda client: ({'uid': client.name, 'name': client.name}, []),
+)
+def test_sync_clusters_loads_pages_in_order_on_calling_thread(
+    mock_get_namespaces, mock_get_pods, mock_get_services, mock_get_secrets,
+    mock_load_namespaces, mock_load_pods, mock_load_services, mock_load_secrets, mock_merge,
+):
+    session = mock.MagicMock()
+    clients = [mock.MagicMock(), mock.MagicMock()]
+    clients[0].name = 'cluster1'
+    clients[1].name = 'cluster2'
+
+    sync_clusters(session, clients, 1)
+
+    assert mock_load_namespaces.call_count == 2
+    loaded_pods = [c.args[1][0]['uid'] for c in mock_load_pods.call_args_list]
+    for cluster in ('cluster1', 'cluster2'):
+        # Pages of the same cluster are loaded in the order they were fetched
+        assert [p for p in loaded_pods if p.startswith(cluster)] == [f'{cluster}-pod1', f'{cluster}-pod2']
+    # Services are matched against the labels of every labelled pod of the cluster
+    for c in mock_get_services.call_args_list:
+        cluster_name = c.args[1]['name']
+        assert c.args[2] == [
+            {'uid': f'{cluster_name}-pod1', 'labels': {'app': 'a'}},
+            {'uid': f'{cluster_name}-pod2', 'labels': {'app': 'b'}},
+        ]
+    assert mock_load_services.call_count == 2
+    assert all(c.args[0] is session for c in mock_load_pods.call_args_list)
+
+
+@mock.patch('cartography.intel.kubernetes.get_namespaces', side_effect=RuntimeError('boom'))
+def test_sync_clusters_raises_producer_errors(mock_get_namespaces):
+    client = mock.MagicMock()
+    client.name = 'cluster1'
+
+    with pytest.raises(RuntimeError):
+        sync_clusters(mock.MagicMock(), [client], 1)
@@ -1,4 +1,8 @@
+from unittest import mock
+
+from cartography.intel.okta.factors import sync_users_factors
 from cartography.intel.okta.factors import transform_okta_user_factor
+from cartography.intel.okta.sync_state import OktaSyncState
 from tests.data.okta.userfactors import create_test_factor
 
 
@@ -53,3 +57,19 @@ def test_factor_transform_with_lastupdated_none():
     }
 
     assert result == expected
+
+
+@mock.patch('cartography.intel.okta.factors._load_user_factors')
+@mock.patch('cartography.intel.okta.factors._get_factor_for_user_id')
+@mock.patch('cartography.intel.okta.factors._create_factor_client')
+def test_sync_users_factors_batches_loads(mock_create_client, mock_get_factors, mock_load):
+    state = OktaSyncState()
+    state.users = ['user1', 'user2', 'user3']
+    mock_get_factors.side_effect = lambda client, user_id, rate_limiter: [create_test_factor()]
+
+    sync_users_factors(mock.MagicMock(), 'example_org', 1, 'key', state)
+
+    # All users' factors are written in a single batch instead of one transaction per user
+    mock_load.assert_called_once()
+    loaded_factors = mock_load.call_args[0][1]
+    assert [f['user_id'] for f in loaded_factors] == ['user1', 'user2', 'user3']
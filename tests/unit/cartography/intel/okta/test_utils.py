@@ -4,6 +4,8 @@ from unittest import mock
 import pytest
 
 from cartography.intel.okta.utils import check_rate_limit
+from cartography.intel.okta.utils import fetch_concurrently
+from cartography.intel.okta.utils import OktaRateLimiter
 from tests.data.okta.utils import create_long_timeout_response
 from tests.data.okta.utils import create_response
 from tests.data.okta.utils import create_throttled_response
@@ -33,3 +35,32 @@ def test_utils_log_rate_limit_reset():
 
     with pytest.raises(Exception):
         check_rate_limit(response)
+
+
+@mock.patch.object(time, 'sleep', return_value=None)
+def test_rate_limiter_does_not_wait_below_threshold(mock_sleep: mock.MagicMock):
+    rate_limiter = OktaRateLimiter()
+    rate_limiter.update(create_response())
+
+    rate_limiter.wait()
+
+    mock_sleep.assert_not_called()
+
+
+@mock.patch.object(time, 'sleep', return_value=None)
+def test_rate_limiter_waits_after_throttled_response(mock_sleep: mock.MagicMock):
+    rate_limiter = OktaRateLimiter()
+    rate_limiter.update(create_throttled_response())
+    # A later response with plenty of budget left must not cancel the pending wait
+    rate_limiter.update(create_response())
+
+    rate_limiter.wait()
+
+    mock_sleep.assert_called_once()
+    assert 0 < mock_sleep.call_args[0][0] <= 3
+
+
+def test_fetch_concurrently_preserves_order():
+    result = list(fetch_concurrently(lambda entity_id: entity_id.upper(), ['a', 'b', 'c', 'd'], max_workers=2))
+
+    assert result == [('a', 'A'), ('b', 'B'), ('c', 'C'), ('d', 'D')]
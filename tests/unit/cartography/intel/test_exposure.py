@@ -0,0 +1,105 @@
+from unittest import mock
+
+from cartography.intel import exposure
+from cartography.intel.aws.ec2.security_groups import get_exposure_fingerprints
+from cartography.intel.gcp.compute import get_vpc_exposure_fingerprints
+
+
+def _mock_session(stored_fingerprints):
+    neo4j_session = mock.MagicMock()
+    neo4j_session.read_transaction.side_effect = lambda tx_func, query, Ids=None, **kwargs: [
+        {'id': node_id, 'fingerprint': stored_fingerprints.get(node_id)} for node_id in Ids
+    ]
+    return neo4j_session
+
+
+@mock.patch.dict(exposure._changes, clear=True)
+def test_record_exposure_changes_keeps_only_changed_nodes():
+    neo4j_session = _mock_session({'sg-1': 'a', 'sg-2': 'b'})
+
+    exposure.record_exposure_changes(neo4j_session, 'EC2SecurityGroup', {'sg-1': 'a', 'sg-2': 'c', 'sg-3': 'd'})
+    exposure.record_exposure_changes(neo4j_session, 'EC2Instance', {})
+
+    assert exposure.get_exposure_changes(['EC2SecurityGroup', 'EC2Instance']) == {
+        'EC2SecurityGroup': {'sg-2': 'c', 'sg-3': 'd'},
+        'EC2Instance': {},
+    }
+    # A label whose changes were not recorded makes the change set unusable.
+    assert exposure.get_exposure_changes(['EC2SecurityGroup', 'LoadBalancer']) is None
+
+
+@mock.patch.dict(exposure._changes, clear=True)
+@mock.patch.object(exposure, 'load_graph_data')
+@mock.patch.object(exposure, 'run_analysis_job')
+def test_run_aws_ec2_exposure_analysis_incremental(mock_run_analysis_job, mock_load_graph_data):
+    for label in exposure.AWS_EC2_EXPOSURE_LABELS:
+        exposure._changes[label] = {}
+    exposure._changes['EC2SecurityGroup'] = {'sg-1': 'a'}
+    neo4j_session = mock.MagicMock()
+    neo4j_session.read_transaction.return_value = ['i-1']
+
+    exposure.run_aws_ec2_exposure_analysis(neo4j_session, {'UPDATE_TAG': 1})
+
+    mock_run_analysis_job.assert_called_once()
+    job_name, _, parameters = mock_run_analysis_job.call_args[0]
+    assert job_name == 'aws_ec2_asset_exposure_incremental.json'
+    assert parameters['UPDATE_TAG'] == 1
+    assert parameters['INSTANCE_IDS'] == ['i-1']
+    # The fingerprints are stored once the exposure is up to date, and the change set is cleared.
+    assert mock_load_graph_data.call_args_list[0][0][2] == [{'id': 'sg-1', 'fingerprint': 'a'}]
+    assert exposure.get_exposure_changes(exposure.AWS_EC2_EXPOSURE_LABELS) is None
+
+
+@mock.patch.dict(exposure._changes, clear=True)
+@mock.patch.object(exposure, 'load_graph_data')
+@mock.patch.object(exposure, 'run_analysis_job')
+def test_run_gcp_compute_exposure_analysis_falls_back_to_full_job(mock_run_analysis_job, mock_load_graph_data):
+    # The changes of GCPInstance were not recorded in this run.
+    exposure._changes['GCPVpc'] = {}
+    neo4j_session = mock.MagicMock()
+
+    exposure.run_gcp_compute_exposure_analysis(neo4j_session, {'UPDATE_TAG': 1})
+
+    mock_run_analysis_job.assert_called_once_with(
+        'gcp_compute_asset_inet_exposure.json', neo4j_session, {'UPDATE_TAG': 1},
+    )
+    neo4j_session.read_transaction.assert_not_called()
+
+
+@mock.patch.dict(exposure._changes, clear=True)
+@mock.patch.object(exposure, 'EXPOSURE_INCREMENTAL_MAX_NODES', 1)
+@mock.patch.object(exposure, 'load_graph_data')
+@mock.patch.object(exposure, 'run_analysis_job')
+def test_run_aws_ec2_exposure_analysis_falls_back_when_too_many_changes(mock_run_analysis_job, mock_load_graph_data):
+    for label in exposure.AWS_EC2_EXPOSURE_LABELS:
+        exposure._changes[label] = {}
+    exposure._changes['EC2Instance'] = {'i-1': 'a', 'i-2': 'b'}
+
+    exposure.run_aws_ec2_exposure_analysis(mock.MagicMock(), {'UPDATE_TAG': 1})
+
+    assert mock_run_analysis_job.call_args[0][0] == 'aws_ec2_asset_exposure.json'
+
+
+def test_security_group_exposure_fingerprints():
+    group = {'GroupId': 'sg-1', 'GroupName': 'web', 'IpPermissions': [], 'Description': 'before'}
+    before = get_exposure_fingerprints([group])
+    # Fields that the exposure analysis does not read do not change the fingerprint.
+    assert get_exposure_fingerprints([{**group, 'Description': 'after'}]) == before
+    opened = {**group, 'IpPermissions': [{'IpProtocol': '-1', 'IpRanges': [{'CidrIp': '0.0.0.0/0'}]}]}
+    assert get_exposure_fingerprints([opened]) != before
+
+
+def test_vpc_exposure_fingerprints_change_when_a_firewall_is_deleted():
+    vpcs = [{'partial_uri': 'projects/p/global/networks/default'}]
+    firewall = {
+        'id': 'projects/p/global/firewalls/allow-ssh',
+        'vpc_partial_uri': 'projects/p/global/networks/default',
+        'direction': 'INGRESS',
+        'allowed': [{'IPProtocol': 'tcp', 'ports': ['22']}],
+    }
+
+    with_firewall = get_vpc_exposure_fingerprints(vpcs, [firewall])
+    without_firewall = get_vpc_exposure_fingerprints(vpcs, [])
+
+    assert set(without_firewall) == {'projects/p/global/networks/default'}
+    assert with_firewall != without_firewall
@@ -0,0 +1,52 @@
+import json
+import threading
+from unittest import mock
+
+from cartography.intel import google_discovery
+
+TEST_DOCUMENT = json.dumps({
+    'name': 'test', 'version': 'v1', 'rootUrl': 'https://test.googleapis.com/', 'servicePath': '',
+    'resources': {}, 'schemas': {},
+})
+
+
+@mock.patch.object(google_discovery, '_documents', {})
+@mock.patch.object(google_discovery, '_fetch_document', return_value=TEST_DOCUMENT)
+@mock.patch.object(google_discovery.googleapiclient.discovery_cache, 'get_static_doc', return_value=None)
+def test_get_discovery_document_fetches_once_then_uses_disk_cache(mock_static_doc, mock_fetch, tmp_path):
+    with mock.patch.object(google_discovery, 'DISCOVERY_CACHE_DIR', str(tmp_path)):
+        assert google_discovery.get_discovery_document('test', 'v1') == TEST_DOCUMENT
+        # A new process starts with an empty in-memory cache but finds the document on disk.
+        google_discovery._documents.clear()
+        assert google_discovery.get_discovery_document('test', 'v1') == TEST_DOCUMENT
+
+    mock_fetch.assert_called_once_with('test', 'v1')
+    assert (tmp_path / google_discovery.GOOGLEAPICLIENT_VERSION / 'test.v1.json').read_text() == TEST_DOCUMENT
+
+
+@mock.patch.object(google_discovery, '_documents', {})
+@mock.patch.object(google_discovery, '_fetch_document')
+def test_get_discovery_document_uses_bundled_documents(mock_fetch, tmp_path):
+    with mock.patch.object(google_discovery, 'DISCOVERY_CACHE_DIR', str(tmp_path)):
+        document = google_discovery.get_discovery_document('compute', 'v1')
+
+    assert json.loads(document)['name'] == 'compute'
+    mock_fetch.assert_not_called()
+    assert not any(tmp_path.iterdir())
+
+
+@mock.patch.object(google_discovery, 'get_discovery_document', return_value=TEST_DOCUMENT)
+def test_get_resource_is_shared_per_thread_and_credentials(mock_get_document):
+    credentials = mock.MagicMock()
+    resource = google_discovery.get_resource('test', 'v1', credentials)
+
+    assert google_discovery.get_resource('test', 'v1', credentials) is resource
+    assert google_discovery.get_resource('test', 'v1', mock.MagicMock()) is not resource
+
+    other_thread_resources = []
+    thread = threading.Thread(
+        target=lambda: other_thread_resources.append(google_discovery.get_resource('test', 'v1', credentials)),
+    )
+    thread.start()
+    thread.join()
+    assert other_thread_resources[0] is not resource
@@ -0,0 +1,65 @@
+import json
+from unittest import mock
+
+from cartography import profiler
+from cartography.util import timeit
+
+
+@timeit
+def _load_things():
+    profiler.record_neo4j_transaction(rows_written=10)
+
+
+def test_profile_span_is_noop_when_disabled():
+    profiler.disable_profiling()
+    with profiler.profile_span('stage', 'aws'):
+        profiler.record_api_calls()
+    assert profiler.get_profiler() is None
+
+
+@mock.patch.object(profiler.time, 'perf_counter')
+def test_profiler_nests_spans_and_counts(mock_perf_counter, tmp_path):
+    mock_perf_counter.side_effect = [0.0, 0.0, 1.0, 4.0, 10.0, 10.0]
+    p = profiler.enable_profiling()
+    try:
+        with profiler.profile_span('stage', 'aws'):
+            profiler.record_api_calls(2)
+            with profiler.profile_span('aws_resource', 'ec2:instance'):
+                profiler.record_api_calls()
+                profiler.record_neo4j_transaction(rows_written=5)
+
+        stacks = p.get_stacks()
+        outer = stacks[(('stage', 'aws'),)]
+        inner = stacks[(('stage', 'aws'), ('aws_resource', 'ec2:instance'))]
+        assert inner.wall_seconds == 3.0
+        assert inner.api_calls == 1
+        assert inner.rows_written == 5
+        assert outer.wall_seconds == 10.0
+        assert outer.self_seconds == 7.0
+        assert outer.api_calls == 3
+        assert outer.neo4j_transactions == 1
+
+        p.write_reports(str(tmp_path))
+        report = json.loads((tmp_path / profiler.PROFILE_JSON_FILENAME).read_text())
+        assert report['totals'] == {
+            'api_calls': 3, 'backoff_seconds': 0.0, 'neo4j_transactions': 1, 'rows_written': 5,
+        }
+        assert [entry['name'] for entry in report['summary']] == ['aws', 'ec2:instance']
+        assert (tmp_path / profiler.PROFILE_FOLDED_FILENAME).read_text() == (
+            'stage:aws 7000000\n'
+            'stage:aws;aws_resource:ec2:instance 3000000\n'
+        )
+        assert 'ec2:instance' in (tmp_path / profiler.PROFILE_HTML_FILENAME).read_text()
+    finally:
+        profiler.disable_profiling()
+
+
+def test_timeit_records_function_spans():
+    p = profiler.enable_profiling()
+    try:
+        with profiler.profile_span('stage', 'aws'):
+            _load_things()
+        path = (('stage', 'aws'), ('function', f'{__name__}._load_things'))
+        assert p.get_stacks()[path].rows_written == 10
+    finally:
+        profiler.disable_profiling()
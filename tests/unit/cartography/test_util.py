@@ -7,6 +7,7 @@ import pytest
 
 import cartography.util
 from cartography import util
+from cartography.graph.job import GraphJob
 from cartography.util import aws_handle_regions
 from cartography.util import batch
 from cartography.util import run_analysis_and_ensure_deps
@@ -26,6 +27,13 @@ def test_run_analysis_job_custom_package(mocker):
     read_text_mock.assert_called_once_with('a.b.c', 'test.json')
 
 
+def test_run_analysis_job_runs_graph_job_from_json(mocker):
+    run_from_json_mock = mocker.patch.object(GraphJob, 'run_from_json')
+    mocker.patch('cartography.util.read_text', return_value='{}')
+    util.run_scoped_analysis_job('test.json', mocker.Mock(), {})
+    run_from_json_mock.assert_called_once()
+
+
 def test_run_scoped_analysis_job_default_package(mocker):
     mocker.patch('cartography.util.GraphJob')
     read_text_mock = mocker.patch('cartography.util.read_text')